@@ -107,6 +107,19 @@ impl DefaultAdapterFactory {
         let query_comment =
             QueryCommentConfig::from_query_comment(query_comment, adapter_type, true, cloud_config);
 
+        if crate::mock::warehouse::is_enabled() {
+            return Ok(Arc::new(AdbcEngine::new_mock(
+                adapter_type,
+                auth,
+                adapter_config,
+                quoting,
+                type_ops,
+                stmt_splitter,
+                relation_cache,
+                behavior_flag_overrides,
+            )));
+        }
+
         let engine = Arc::new(AdbcEngine::new(
             adapter_type,
             auth,
@@ -0,0 +1,289 @@
+//! Adaptive connection concurrency.
+//!
+//! The [`ConnectionBackpressure`](crate::connection::ConnectionBackpressure) gate
+//! admits as many nodes at once as `threads` allows. Set too low, the warehouse
+//! idles; set too high, queries pile up in the warehouse queue until they time
+//! out. With `--max-threads`, the limit instead starts at `threads` and moves
+//! between `--min-threads` and `--max-threads` following an AIMD (additive
+//! increase, multiplicative decrease) rule fed by the latency of every query:
+//!
+//! * queries are judged in windows of about `limit` completions, comparing the
+//!   window's median latency to a slow-moving baseline of earlier windows;
+//! * a window whose median is over [`LATENCY_TOLERANCE`] times the baseline, or
+//!   any query that timed out, means queries are queuing: the limit shrinks by
+//!   a quarter;
+//! * otherwise, if nodes were waiting at the gate during the window, the limit
+//!   grows by one.
+//!
+//! Every change is logged at debug level with what caused it, so the limit over
+//! time can be read back from the invocation's telemetry.
+
+use std::sync::atomic::{AtomicBool, AtomicU32, Ordering};
+use std::time::Duration;
+
+use dbt_common::tracing::dbt_emit::emit_debug_log_message;
+use parking_lot::Mutex;
+
+use crate::connection::{has_backpressure_waiters, wake_backpressure_waiters};
+
+/// Ratio of a window's median latency to the baseline above which queries are
+/// considered to be queuing.
+const LATENCY_TOLERANCE: f64 = 2.0;
+/// Factor the limit is multiplied by when queries are queuing.
+const DECREASE_FACTOR: f64 = 0.75;
+/// Weight of each new window's median in the baseline latency.
+const BASELINE_SMOOTHING: f64 = 0.1;
+/// Fewest queries a window holds, so a small limit is not judged on one query.
+const MIN_WINDOW: usize = 4;
+
+/// A change of the limit and what caused it.
+#[derive(Debug, Clone, PartialEq)]
+pub(crate) struct LimitChange {
+    pub from: u32,
+    pub to: u32,
+    pub reason: String,
+}
+
+/// AIMD limit between fixed bounds.
+#[derive(Debug)]
+pub(crate) struct Aimd {
+    min: u32,
+    max: u32,
+    limit: u32,
+    /// Latencies, in seconds, of the queries in the current window.
+    window: Vec<f64>,
+    /// Whether nodes were waiting for admission at any point in the window.
+    saturated: bool,
+    /// Smoothed median latency of earlier windows.
+    baseline: Option<f64>,
+}
+
+impl Aimd {
+    pub(crate) fn new(min: u32, max: u32, initial: u32) -> Self {
+        let min = min.max(1);
+        let max = max.max(min);
+        Self {
+            min,
+            max,
+            limit: initial.clamp(min, max),
+            window: Vec::new(),
+            saturated: false,
+            baseline: None,
+        }
+    }
+
+    pub(crate) fn limit(&self) -> u32 {
+        self.limit
+    }
+
+    /// Records a finished query. `saturated` tells whether nodes were waiting
+    /// for admission when it finished.
+    pub(crate) fn record(
+        &mut self,
+        latency: Duration,
+        timed_out: bool,
+        saturated: bool,
+    ) -> Option<LimitChange> {
+        if timed_out {
+            self.window.clear();
+            self.saturated = false;
+            return self.set_limit(self.decreased(), "a query timed out".to_string());
+        }
+
+        self.window.push(latency.as_secs_f64());
+        self.saturated |= saturated;
+        if self.window.len() < (self.limit as usize).max(MIN_WINDOW) {
+            return None;
+        }
+
+        self.window.sort_by(f64::total_cmp);
+        let median = self.window[self.window.len() / 2];
+        self.window.clear();
+        let saturated = std::mem::take(&mut self.saturated);
+        let baseline = self.baseline.unwrap_or(median);
+        self.baseline = Some(baseline + BASELINE_SMOOTHING * (median - baseline));
+
+        if median > LATENCY_TOLERANCE * baseline {
+            self.set_limit(
+                self.decreased(),
+                format!(
+                    "median query latency {median:.2}s is over {LATENCY_TOLERANCE}x \
+                     the {baseline:.2}s baseline"
+                ),
+            )
+        } else if saturated {
+            self.set_limit(
+                self.limit.saturating_add(1),
+                format!("nodes are waiting and median query latency is {median:.2}s"),
+            )
+        } else {
+            None
+        }
+    }
+
+    fn decreased(&self) -> u32 {
+        ((self.limit as f64 * DECREASE_FACTOR) as u32).min(self.limit - 1)
+    }
+
+    fn set_limit(&mut self, limit: u32, reason: String) -> Option<LimitChange> {
+        let limit = limit.clamp(self.min, self.max);
+        if limit == self.limit {
+            return None;
+        }
+        let from = std::mem::replace(&mut self.limit, limit);
+        Some(LimitChange {
+            from,
+            to: limit,
+            reason,
+        })
+    }
+}
+
+struct Controller {
+    min: u32,
+    max: u32,
+    /// Created once the gate reports the configured limit to start from.
+    aimd: Option<Aimd>,
+}
+
+static ENABLED: AtomicBool = AtomicBool::new(false);
+/// The current limit, read by the gate without locking; `0` until started.
+static LIMIT: AtomicU32 = AtomicU32::new(0);
+static CONTROLLER: Mutex<Option<Controller>> = Mutex::new(None);
+
+fn to_u32(n: usize) -> u32 {
+    n.min(u32::MAX as usize) as u32
+}
+
+/// Adapts the number of concurrently admitted nodes between `(min, max)`, or
+/// turns adaptation off with `None`. Resets any limit learned by a previous
+/// invocation in this process.
+pub fn configure_adaptive_concurrency(bounds: Option<(usize, usize)>) {
+    let mut controller = CONTROLLER.lock();
+    *controller = bounds.map(|(min, max)| Controller {
+        min: to_u32(min),
+        max: to_u32(max),
+        aimd: None,
+    });
+    LIMIT.store(0, Ordering::Release);
+    ENABLED.store(controller.is_some(), Ordering::Release);
+}
+
+/// Number of nodes the gate may admit at once, where `high_water_mark` is the
+/// limit derived from `threads`.
+pub(crate) fn admission_limit(high_water_mark: u32) -> u32 {
+    if !ENABLED.load(Ordering::Acquire) {
+        return high_water_mark;
+    }
+    match LIMIT.load(Ordering::Acquire) {
+        0 => start(high_water_mark),
+        limit => limit,
+    }
+}
+
+fn start(high_water_mark: u32) -> u32 {
+    let mut controller = CONTROLLER.lock();
+    let Some(controller) = controller.as_mut() else {
+        return high_water_mark;
+    };
+    let (min, max) = (controller.min, controller.max);
+    let limit = controller
+        .aimd
+        .get_or_insert_with(|| {
+            let aimd = Aimd::new(min, max, high_water_mark);
+            emit_debug_log_message(format!(
+                "Adaptive concurrency: connection limit starts at {} (between {} and {})",
+                aimd.limit, aimd.min, aimd.max
+            ));
+            aimd
+        })
+        .limit();
+    LIMIT.store(limit, Ordering::Release);
+    limit
+}
+
+/// Feeds a finished query to the controller, if adaptive concurrency is on.
+pub(crate) fn record_query(latency: Duration, timed_out: bool) {
+    if !ENABLED.load(Ordering::Acquire) {
+        return;
+    }
+    let saturated = has_backpressure_waiters();
+    let change = {
+        let mut controller = CONTROLLER.lock();
+        let Some(aimd) = controller
+            .as_mut()
+            .and_then(|controller| controller.aimd.as_mut())
+        else {
+            return;
+        };
+        let Some(change) = aimd.record(latency, timed_out, saturated) else {
+            return;
+        };
+        LIMIT.store(change.to, Ordering::Release);
+        change
+    };
+    emit_debug_log_message(format!(
+        "Adaptive concurrency: connection limit {} -> {}: {}",
+        change.from, change.to, change.reason
+    ));
+    if change.to > change.from {
+        wake_backpressure_waiters(change.to - change.from);
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn feed(aimd: &mut Aimd, count: usize, latency_ms: u64, saturated: bool) -> Vec<u32> {
+        (0..count)
+            .filter_map(|_| aimd.record(Duration::from_millis(latency_ms), false, saturated))
+            .map(|change| change.to)
+            .collect()
+    }
+
+    #[test]
+    fn limit_grows_by_one_per_window_while_nodes_wait() {
+        let mut aimd = Aimd::new(1, 6, 4);
+        assert_eq!(feed(&mut aimd, 4 + 5 + 6, 100, true), [5, 6]);
+        // Capped at the maximum
+        assert_eq!(feed(&mut aimd, 20, 100, true), []);
+        assert_eq!(aimd.limit(), 6);
+    }
+
+    #[test]
+    fn limit_holds_while_nobody_waits() {
+        let mut aimd = Aimd::new(1, 16, 4);
+        assert_eq!(feed(&mut aimd, 40, 100, false), []);
+        assert_eq!(aimd.limit(), 4);
+    }
+
+    #[test]
+    fn queuing_latency_shrinks_the_limit_multiplicatively() {
+        let mut aimd = Aimd::new(2, 64, 16);
+        assert_eq!(feed(&mut aimd, 16, 100, false), []);
+        // Latency triples: queries are queuing
+        assert_eq!(feed(&mut aimd, 16, 300, true), [12]);
+        assert_eq!(feed(&mut aimd, 12, 300, true), [9]);
+        // The baseline drifts towards the new latency, after which waiting nodes
+        // grow the limit again
+        assert_eq!(feed(&mut aimd, 9 + 7, 300, true), [6, 7]);
+    }
+
+    #[test]
+    fn timeouts_shrink_the_limit_down_to_the_minimum() {
+        let mut aimd = Aimd::new(3, 8, 8);
+        let limits: Vec<u32> = (0..5)
+            .filter_map(|_| aimd.record(Duration::from_secs(60), true, true))
+            .map(|change| change.to)
+            .collect();
+        assert_eq!(limits, [6, 4, 3]);
+    }
+
+    #[test]
+    fn initial_limit_is_clamped_to_the_bounds() {
+        assert_eq!(Aimd::new(4, 8, 48).limit(), 8);
+        assert_eq!(Aimd::new(4, 8, 2).limit(), 4);
+        assert_eq!(Aimd::new(0, 0, 2).limit(), 1);
+    }
+}
@@ -1,4 +1,5 @@
 use std::cell::RefCell;
+use std::cmp::Reverse;
 use std::marker::PhantomData;
 use std::ops::{Deref, DerefMut};
 use std::pin::Pin;
@@ -24,6 +25,10 @@ use tracing::Span;
 use crate::AdapterEngine;
 use crate::errors::AdapterError;
 
+/// Position of a [`ConnectionBackpressure`] waiter in the wake queue: higher
+/// priority first, then registration time, then a tie-breaking sequence number.
+type WakerKey = (Reverse<u64>, Instant, u64);
+
 /// Global atomic for generating unique connection IDs.
 static CONN_SEQ_NUM: AtomicU64 = AtomicU64::new(0);
 
@@ -299,9 +304,11 @@ impl Drop for ConnectionGuard<'_> {
 pub struct ConnectionBackpressure {
     high_water_mark: u32,
     span: Option<Span>,
+    /// Scheduling priority; waiters with a higher priority are woken first.
+    priority: u64,
     /// Key assigned on first registration into [`wakers`](pri::BackpressureState::wakers).
     /// Reused across re-polls so the task keeps its original queue position.
-    key: Option<(Instant, u64)>,
+    key: Option<WakerKey>,
 }
 
 impl ConnectionBackpressure {
@@ -313,10 +320,21 @@ impl ConnectionBackpressure {
         Self {
             high_water_mark,
             span: None,
+            priority: 0,
             key: None,
         }
     }
 
+    /// Set the scheduling priority of this waiter.
+    ///
+    /// When capacity frees up, waiters with a higher priority are woken before
+    /// those with a lower one, regardless of how long the latter have been
+    /// waiting. Waiters of equal priority are woken in arrival order.
+    pub fn with_priority(mut self, priority: u64) -> Self {
+        self.priority = priority;
+        self
+    }
+
     /// Create a new backpressure [Future] based on the given adapter type and `threads`
     /// configuration option.
     pub fn from_config(adapter_type: AdapterType, threads: Option<usize>) -> Self {
@@ -331,10 +349,11 @@ impl ConnectionBackpressure {
     /// prevents priority inversion [1]. The lower the key, the earlier the task
     /// is in the `wakers` queue and the sooner it will be woken when capacity is
     /// available.
-    fn ordered_key(&mut self) -> (Instant, u64) {
+    fn ordered_key(&mut self) -> WakerKey {
+        let priority = self.priority;
         *self.key.get_or_insert_with(|| {
             let seq = BACKPRESSURE_STATE.fresh_waker_seq();
-            (Instant::now(), seq)
+            (Reverse(priority), Instant::now(), seq)
         })
     }
 
@@ -418,7 +437,8 @@ pub struct NextBackpressureWakerGuard;
 
 impl NextBackpressureWakerGuard {
     fn try_new(high_water_mark: u32) -> Option<Self> {
-        if BACKPRESSURE_STATE.try_acquire_active_node(high_water_mark as usize) {
+        let limit = crate::concurrency::admission_limit(high_water_mark);
+        if BACKPRESSURE_STATE.try_acquire_active_node(limit as usize) {
             Some(Self)
         } else {
             None
@@ -433,6 +453,19 @@ impl Drop for NextBackpressureWakerGuard {
     }
 }
 
+/// Whether any node is waiting at the [`ConnectionBackpressure`] gate.
+pub(crate) fn has_backpressure_waiters() -> bool {
+    BACKPRESSURE_STATE.has_backpressure_waiters()
+}
+
+/// Wakes up to `n` nodes waiting at the [`ConnectionBackpressure`] gate, e.g.
+/// after the admission limit was raised.
+pub(crate) fn wake_backpressure_waiters(n: u32) {
+    for _ in 0..n {
+        BACKPRESSURE_STATE.wake_next_backpressure_waiter();
+    }
+}
+
 mod pri {
     use super::*;
 
@@ -449,7 +482,7 @@ mod pri {
         /// including nodes that have not borrowed a connection yet.
         active_nodes: CachePadded<AtomicUsize>,
         /// Wakers registered by [`ConnectionBackpressure`] futures waiting for capacity.
-        wakers: LazyLock<SkipMap<(Instant, u64), Waker>>,
+        wakers: LazyLock<SkipMap<WakerKey, Waker>>,
     }
 
     impl BackpressureState {
@@ -499,16 +532,21 @@ mod pri {
             debug_assert!(prev > 0, "ACTIVE_CONNECTIONS counter underflow");
         }
 
-        /// Wake the longest-waiting backpressure waiter, if any.
+        /// Wake the highest-priority, longest-waiting backpressure waiter, if any.
         ///
-        /// The [`SkipMap`] is sorted by insertion key, so `pop_front` removes the
-        /// entry with the smallest key — the oldest registered waker.
+        /// The [`SkipMap`] is sorted by [`WakerKey`], so `pop_front` removes the
+        /// entry with the smallest key — the oldest registered waker of the
+        /// highest priority.
         pub fn wake_next_backpressure_waiter(&self) {
             if let Some(entry) = self.wakers.pop_front() {
                 entry.value().wake_by_ref();
             }
         }
 
+        pub fn has_backpressure_waiters(&self) -> bool {
+            !self.wakers.is_empty()
+        }
+
         pub fn num_active_connections(&self) -> isize {
             self.active_connections.load(Ordering::Acquire)
         }
@@ -517,11 +555,11 @@ mod pri {
             self.waker_seq.fetch_add(1, Ordering::AcqRel)
         }
 
-        pub fn register_waker(&self, key: (Instant, u64), waker: Waker) {
+        pub fn register_waker(&self, key: WakerKey, waker: Waker) {
             self.wakers.insert(key, waker);
         }
 
-        pub fn unregister_waker(&self, key: (Instant, u64)) {
+        pub fn unregister_waker(&self, key: WakerKey) {
             #[allow(clippy::used_underscore_binding)]
             let _removed = self.wakers.remove(&key).is_some();
         }
@@ -722,6 +760,20 @@ mod tests {
         _assert_sync::<pri::ConnectionRecyclingPool>();
     }
 
+    #[test]
+    fn higher_priority_waiters_are_queued_first() {
+        let mut early = ConnectionBackpressure::new(1);
+        let mut urgent = ConnectionBackpressure::new(1).with_priority(10);
+        let mut late = ConnectionBackpressure::new(1);
+        let (early, urgent, late) = (
+            early.ordered_key(),
+            urgent.ordered_key(),
+            late.ordered_key(),
+        );
+        assert!(urgent < early, "priority wins over arrival order");
+        assert!(early < late, "equal priorities are woken in arrival order");
+    }
+
     #[test]
     fn tls_container_stores_tlocal_connections() {
         let c = pri::TlsConnectionContainer::new();
@@ -447,6 +447,9 @@ pub(crate) fn adbc_execute_with_options(
                 // cancellation.
                 Cancellable::Error(_) if token.is_cancelled() => (cancelled(), None, None),
                 Cancellable::Error(e) => {
+                    if matches!(e.status, adbc_core::error::Status::Timeout) {
+                        crate::concurrency::record_query(t_do_execute.elapsed(), true);
+                    }
                     let error_message = Some(format!("{:?}: {}", e.status, e.message));
                     let vendor_code = Some(e.vendor_code);
                     let adapter_error = adbc_error_to_adapter_error(e);
@@ -469,9 +472,11 @@ pub(crate) fn adbc_execute_with_options(
             return Err(adapter_error);
         }
     };
+    let execute_duration = t_do_execute.elapsed();
+    crate::concurrency::record_query(execute_duration, false);
     log_step_duration(
         "do_execute(conn) (closure: stmt.execute + schema + batch loop)",
-        t_do_execute.elapsed(),
+        execute_duration,
     );
     let t_post = std::time::Instant::now();
     let schema = match rows_affected {
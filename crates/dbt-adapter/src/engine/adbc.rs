@@ -504,6 +504,7 @@ impl AdapterEngine for AdbcEngine {
         token: CancellationToken,
     ) -> AdapterResult<RecordBatch> {
         if matches!(self.mode, EngineMode::Mock) {
+            crate::mock::warehouse::simulate_query();
             return Ok(RecordBatch::new_empty(Arc::new(Schema::empty())));
         }
         adbc_execute_with_options(self, state, ctx, conn, sql, options, fetch, token)
@@ -11,6 +11,8 @@ pub mod adapter;
 pub mod cache;
 pub mod catalog_relation;
 pub mod column;
+/// Adaptive connection concurrency.
+pub mod concurrency;
 /// Connection management, thread-local storage, and connection backpressure.
 pub mod connection;
 pub mod engine;
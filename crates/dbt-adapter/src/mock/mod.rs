@@ -1 +1,2 @@
 pub mod adapter;
+pub mod warehouse;
@@ -0,0 +1,216 @@
+//! Simulated warehouse for benchmarking the scheduler.
+//!
+//! With `--mock-warehouse <LATENCY>`, adapters are built on a mock engine: no
+//! driver is loaded, connections are [`NoopConnection`]s and every query returns
+//! an empty result after sleeping for a latency drawn from a [`QueryLatency`]
+//! distribution. Parse, scheduling, compilation and the connection backpressure
+//! all run for real, so a synthetic project can be pushed through a whole
+//! `dbt build` to measure the engine itself, at warehouse-like query times.
+//!
+//! Latencies are drawn from a generator seeded when the warehouse is configured,
+//! so the sequence of latencies is the same on every run (although which query
+//! gets which latency depends on scheduling).
+//!
+//! [`NoopConnection`]: crate::engine::noop_connection::NoopConnection
+
+use std::fmt;
+use std::str::FromStr;
+use std::sync::atomic::{AtomicBool, Ordering};
+use std::time::Duration;
+
+use dbt_adbc::duration::parse_duration;
+use parking_lot::Mutex;
+
+/// Distribution of simulated query latencies.
+#[derive(Debug, Clone, PartialEq)]
+pub enum QueryLatency {
+    /// Every query takes the same time.
+    Fixed(Duration),
+    /// Uniformly distributed between the bounds.
+    Uniform(Duration, Duration),
+    /// Log-normally distributed around `median`: most queries are quick and a
+    /// few take many times longer, as on a real warehouse. `sigma` is the
+    /// standard deviation of the latency's logarithm.
+    LogNormal { median: Duration, sigma: f64 },
+}
+
+impl QueryLatency {
+    fn sample(&self, rng: &mut SplitMix64) -> Duration {
+        match *self {
+            QueryLatency::Fixed(latency) => latency,
+            QueryLatency::Uniform(low, high) => low + (high - low).mul_f64(rng.next_f64()),
+            QueryLatency::LogNormal { median, sigma } => {
+                median.mul_f64((sigma * rng.next_standard_normal()).exp())
+            }
+        }
+    }
+}
+
+impl FromStr for QueryLatency {
+    type Err = String;
+
+    /// Parses `20ms` or `fixed:20ms`, `uniform:10ms..200ms` and
+    /// `lognormal:50ms,0.8` (median and sigma).
+    fn from_str(s: &str) -> Result<Self, Self::Err> {
+        let duration = |s: &str| {
+            parse_duration(s.trim()).map_err(|e| format!("invalid latency '{s}': {}", e.message))
+        };
+        let (kind, spec) = s.split_once(':').unwrap_or(("fixed", s));
+        match kind.trim() {
+            "fixed" => Ok(QueryLatency::Fixed(duration(spec)?)),
+            "uniform" => {
+                let (low, high) = spec
+                    .split_once("..")
+                    .ok_or_else(|| format!("expected uniform:<MIN>..<MAX>, got '{s}'"))?;
+                let (low, high) = (duration(low)?, duration(high)?);
+                if low > high {
+                    return Err(format!("uniform latency bounds are reversed in '{s}'"));
+                }
+                Ok(QueryLatency::Uniform(low, high))
+            }
+            "lognormal" => {
+                let (median, sigma) = spec
+                    .split_once(',')
+                    .ok_or_else(|| format!("expected lognormal:<MEDIAN>,<SIGMA>, got '{s}'"))?;
+                let sigma = sigma
+                    .trim()
+                    .parse::<f64>()
+                    .ok()
+                    .filter(|sigma| sigma.is_finite() && *sigma >= 0.0)
+                    .ok_or_else(|| format!("invalid lognormal sigma '{}'", sigma.trim()))?;
+                Ok(QueryLatency::LogNormal {
+                    median: duration(median)?,
+                    sigma,
+                })
+            }
+            other => Err(format!(
+                "unknown latency distribution '{other}' (expected fixed, uniform or lognormal)"
+            )),
+        }
+    }
+}
+
+impl fmt::Display for QueryLatency {
+    fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        match self {
+            QueryLatency::Fixed(latency) => write!(f, "fixed:{latency:?}"),
+            QueryLatency::Uniform(low, high) => write!(f, "uniform:{low:?}..{high:?}"),
+            QueryLatency::LogNormal { median, sigma } => write!(f, "lognormal:{median:?},{sigma}"),
+        }
+    }
+}
+
+/// Small, fast, seedable pseudo-random generator (SplitMix64).
+#[derive(Debug)]
+struct SplitMix64(u64);
+
+impl SplitMix64 {
+    fn next_u64(&mut self) -> u64 {
+        self.0 = self.0.wrapping_add(0x9E37_79B9_7F4A_7C15);
+        let mut z = self.0;
+        z = (z ^ (z >> 30)).wrapping_mul(0xBF58_476D_1CE4_E5B9);
+        z = (z ^ (z >> 27)).wrapping_mul(0x94D0_49BB_1331_11EB);
+        z ^ (z >> 31)
+    }
+
+    /// Uniform in `[0, 1)`.
+    fn next_f64(&mut self) -> f64 {
+        (self.next_u64() >> 11) as f64 / (1u64 << 53) as f64
+    }
+
+    /// Standard normal, by the Box-Muller transform.
+    fn next_standard_normal(&mut self) -> f64 {
+        let u = 1.0 - self.next_f64();
+        let v = self.next_f64();
+        (-2.0 * u.ln()).sqrt() * (std::f64::consts::TAU * v).cos()
+    }
+}
+
+const SEED: u64 = 0x5EED_DB7F;
+
+static ENABLED: AtomicBool = AtomicBool::new(false);
+static WAREHOUSE: Mutex<Option<(QueryLatency, SplitMix64)>> = Mutex::new(None);
+
+/// Simulates the warehouse with `latency`, or turns simulation off with `None`.
+pub fn configure_mock_warehouse(latency: Option<QueryLatency>) {
+    let mut warehouse = WAREHOUSE.lock();
+    *warehouse = latency.map(|latency| (latency, SplitMix64(SEED)));
+    ENABLED.store(warehouse.is_some(), Ordering::Release);
+}
+
+/// Whether adapters should be built on the simulated warehouse.
+pub fn is_enabled() -> bool {
+    ENABLED.load(Ordering::Acquire)
+}
+
+/// Blocks for the latency of one simulated query; returns at once when the
+/// warehouse is not simulated.
+pub(crate) fn simulate_query() {
+    if !is_enabled() {
+        return;
+    }
+    let latency = match WAREHOUSE.lock().as_mut() {
+        Some((latency, rng)) => latency.sample(rng),
+        None => return,
+    };
+    std::thread::sleep(latency);
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn samples(latency: &QueryLatency, count: usize) -> Vec<Duration> {
+        let mut rng = SplitMix64(SEED);
+        let mut samples: Vec<Duration> = (0..count).map(|_| latency.sample(&mut rng)).collect();
+        samples.sort();
+        samples
+    }
+
+    #[test]
+    fn latencies_parse_and_round_trip() {
+        let ms = Duration::from_millis;
+        assert_eq!("20ms".parse(), Ok(QueryLatency::Fixed(ms(20))));
+        assert_eq!("fixed:1.5s".parse(), Ok(QueryLatency::Fixed(ms(1500))));
+        assert_eq!(
+            "uniform:10ms..200ms".parse(),
+            Ok(QueryLatency::Uniform(ms(10), ms(200)))
+        );
+        let lognormal = QueryLatency::LogNormal {
+            median: ms(50),
+            sigma: 0.8,
+        };
+        assert_eq!("lognormal:50ms, 0.8".parse(), Ok(lognormal.clone()));
+        assert_eq!(lognormal.to_string().parse(), Ok(lognormal));
+
+        for invalid in [
+            "uniform:200ms..10ms",
+            "uniform:10ms",
+            "lognormal:50ms",
+            "lognormal:50ms,-1",
+            "pareto:1s",
+            "soon",
+        ] {
+            assert!(invalid.parse::<QueryLatency>().is_err(), "{invalid}");
+        }
+    }
+
+    #[test]
+    fn samples_follow_the_distribution() {
+        let ms = Duration::from_millis;
+        let uniform = samples(&QueryLatency::Uniform(ms(10), ms(30)), 1000);
+        assert!(uniform[0] >= ms(10) && uniform[999] < ms(30));
+        assert!(uniform[500] > ms(18) && uniform[500] < ms(22));
+
+        let lognormal = samples(
+            &QueryLatency::LogNormal {
+                median: ms(100),
+                sigma: 1.0,
+            },
+            1000,
+        );
+        assert!(lognormal[500] > ms(85) && lognormal[500] < ms(115));
+        // A long right tail: the 97.5th percentile is about e^1.96 times the median
+        assert!(lognormal[975] > ms(500));
+    }
+}
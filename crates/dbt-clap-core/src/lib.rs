@@ -1791,6 +1791,41 @@ pub struct CommonArgs {
     )]
     pub threads: Option<usize>,
 
+    /// Adapt the number of concurrently running nodes to warehouse query latency,
+    /// starting from `--threads` and never exceeding this
+    #[arg(
+        global = true,
+        long,
+        env = "DBT_MAX_THREADS",
+        help_heading = help_headings::EXECUTION,
+        hide_short_help = true
+    )]
+    pub max_threads: Option<usize>,
+
+    /// The lowest number of concurrently running nodes `--max-threads` may adapt
+    /// down to [default: 1]
+    #[arg(
+        global = true,
+        long,
+        env = "DBT_MIN_THREADS",
+        help_heading = help_headings::EXECUTION,
+        hide_short_help = true
+    )]
+    pub min_threads: Option<usize>,
+
+    /// Run against a simulated warehouse instead of the configured one: no
+    /// connections are opened and every query returns no rows after a latency
+    /// drawn from LATENCY (`20ms`, `uniform:10ms..200ms` or `lognormal:50ms,0.8`).
+    /// Hidden because it is a benchmarking knob.
+    #[arg(
+        global = true,
+        long,
+        env = "DBT_MOCK_WAREHOUSE",
+        value_name = "LATENCY",
+        hide = true
+    )]
+    pub mock_warehouse: Option<String>,
+
     /// Force sequential task execution and sequential parser rendering. Does
     /// not affect the adapter connection pool — use `--threads` for that.
     /// Hidden because it is primarily a test/debug knob.
@@ -1876,6 +1911,16 @@ pub struct CommonArgs {
     #[arg(global = true, long, default_value_t=false, action = ArgAction::SetTrue, env = "DBT_WRITE_CATALOG", value_parser = BoolishValueParser::new(), help_heading = help_headings::ARTIFACTS, hide_short_help = true)]
     pub write_catalog: bool,
 
+    /// Record per-file load, render, SQL analysis and YAML resolution timings during parse to
+    /// target/parse_profile.parquet
+    #[arg(global = true, long, default_value_t=false, action = ArgAction::SetTrue, env = "DBT_PARSE_PROFILE", value_parser = BoolishValueParser::new(), help_heading = help_headings::ARTIFACTS, hide_short_help = true)]
+    pub parse_profile: bool,
+
+    /// Write when every task became ready, was admitted and ran, per worker thread, to this
+    /// Chrome trace event file (open in ui.perfetto.dev), relative to the project directory
+    #[arg(global = true, long, env = "DBT_TIMELINE", value_name = "PATH", help_heading = help_headings::ARTIFACTS, hide_short_help = true)]
+    pub timeline: Option<PathBuf>,
+
     /// Enable full metadata output: incremental parse cache, epoch parquet state, and no JSON
     /// artifacts. Implies --partial-parse --no-write-json.
     ///
@@ -2653,6 +2698,9 @@ impl CommonArgs {
             // separate `no_parallel` flag below.
             num_threads: self.threads,
             no_parallel: self.no_parallel,
+            adaptive_threads: self
+                .max_threads
+                .map(|max| (self.min_threads.unwrap_or(1).min(max), max)),
             select: select_option,
             exclude: exclude_option,
             indirect_selection: self.indirect_selection,
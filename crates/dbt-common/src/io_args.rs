@@ -497,6 +497,9 @@ pub struct EvalArgs {
     /// Force sequential task execution and sequential parser rendering without
     /// constraining the connection pool. Set by `--no-parallel`.
     pub no_parallel: bool,
+    /// `(min, max)` bounds between which the connection backpressure limit
+    /// adapts to query latency. Set by `--min-threads` / `--max-threads`.
+    pub adaptive_threads: Option<(usize, usize)>,
     /// yaml selector
     pub selector: Option<String>,
     /// Select nodes to operate on
@@ -1457,6 +1460,147 @@ fn parse_boolish_env(value: &OsStr) -> Option<bool> {
         .ok()
 }
 
+/// Which generic tests `batch_tests` may combine into one query.
+#[derive(Debug, Clone, Copy, Default, PartialEq, Eq, Hash)]
+pub enum TestBatchScope {
+    /// `not_null` or `unique` tests on columns of the same relation.
+    #[default]
+    Relation,
+    /// `not_null`, `unique` and `accepted_values` tests on any relations of the
+    /// same schema. Trades isolation for fewer queries: a batch waits on every
+    /// member's upstreams, so in `build` one failed model skips the tests of
+    /// all relations batched with it.
+    Schema,
+}
+
+impl FromStr for TestBatchScope {
+    type Err = String;
+
+    fn from_str(s: &str) -> Result<Self, Self::Err> {
+        match s.to_lowercase().as_str() {
+            "relation" => Ok(TestBatchScope::Relation),
+            "schema" => Ok(TestBatchScope::Schema),
+            _ => Err(format!("Invalid test batch scope: {s}")),
+        }
+    }
+}
+
+/// How `batch_tests` combines generic tests.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub struct TestBatching {
+    pub scope: TestBatchScope,
+    /// Most tests sharing one query.
+    pub max_batch_size: usize,
+}
+
+pub const DEFAULT_TEST_BATCH_SIZE: usize = 100;
+
+impl Default for TestBatching {
+    fn default() -> Self {
+        Self {
+            scope: TestBatchScope::default(),
+            max_batch_size: DEFAULT_TEST_BATCH_SIZE,
+        }
+    }
+}
+
+pub const BATCH_TESTS_SCOPE_ENV: &str = "DBT_ENGINE_BATCH_TESTS_SCOPE";
+pub const BATCH_TESTS_MAX_SIZE_ENV: &str = "DBT_ENGINE_BATCH_TESTS_MAX_SIZE";
+
+/// Resolves the test batching strategy from the environment, then the
+/// `batch_tests_scope` and `batch_tests_max_size` project flags. Invalid values
+/// fall back to the defaults.
+pub fn resolve_test_batching(project_flags: Option<&Value>) -> TestBatching {
+    resolve_test_batching_with_env_lookup(project_flags, |name| std::env::var_os(name))
+}
+
+fn resolve_test_batching_with_env_lookup(
+    project_flags: Option<&Value>,
+    get_env: impl Fn(&str) -> Option<OsString>,
+) -> TestBatching {
+    let setting = |env_var: &str, project_flag: &str| -> Option<String> {
+        match get_env(env_var) {
+            Some(value) => value.into_string().ok(),
+            None => project_flags
+                .and_then(|flags| project_flags_get_value(flags, project_flag))
+                .and_then(|value| match value {
+                    Value::String(s, _) => Some(s.clone()),
+                    Value::Number(n, _) => Some(n.to_string()),
+                    _ => None,
+                }),
+        }
+    };
+    let defaults = TestBatching::default();
+    TestBatching {
+        scope: setting(BATCH_TESTS_SCOPE_ENV, "batch_tests_scope")
+            .and_then(|scope| scope.trim().parse().ok())
+            .unwrap_or(defaults.scope),
+        max_batch_size: setting(BATCH_TESTS_MAX_SIZE_ENV, "batch_tests_max_size")
+            .and_then(|size| size.trim().parse().ok())
+            .filter(|&size| size >= 2)
+            .unwrap_or(defaults.max_batch_size),
+    }
+}
+
+/// A named execution pool, selected by nodes with a `pool` entry in their
+/// `meta` config. Nodes without one run in the `default` pool, if configured.
+#[derive(Debug, Clone, Copy, Default, PartialEq, Eq)]
+pub struct SchedulingPool {
+    /// Most nodes of the pool executing at once; only `threads` bounds the pool
+    /// when `None`.
+    pub threads: Option<usize>,
+    /// Ready nodes of a pool with a higher priority start before those of
+    /// pools with a lower one, whatever their critical paths.
+    pub priority: u64,
+}
+
+/// Scheduling pools by name.
+pub type SchedulingPools = BTreeMap<String, SchedulingPool>;
+
+/// The pool of nodes that do not name one.
+pub const DEFAULT_SCHEDULING_POOL: &str = "default";
+
+pub const SCHEDULING_POOLS_ENV: &str = "DBT_ENGINE_SCHEDULING_POOLS";
+
+/// Resolves the scheduling pools from the environment, a YAML mapping such as
+/// `{heavy: {threads: 2, priority: 10}}`, or else the `scheduling_pools` project
+/// flag. Pools with an invalid `threads` or `priority` are ignored.
+pub fn resolve_scheduling_pools(project_flags: Option<&Value>) -> SchedulingPools {
+    resolve_scheduling_pools_with_env_lookup(project_flags, |name| std::env::var_os(name))
+}
+
+fn resolve_scheduling_pools_with_env_lookup(
+    project_flags: Option<&Value>,
+    get_env: impl Fn(&str) -> Option<OsString>,
+) -> SchedulingPools {
+    let from_env = get_env(SCHEDULING_POOLS_ENV)
+        .and_then(|value| value.into_string().ok())
+        .and_then(|value| dbt_yaml::from_str::<Value>(&value).ok());
+    let pools = match &from_env {
+        Some(pools) => Some(pools),
+        None => project_flags.and_then(|flags| project_flags_get_value(flags, "scheduling_pools")),
+    };
+    let Some(Value::Mapping(pools, _)) = pools else {
+        return SchedulingPools::new();
+    };
+    pools
+        .iter()
+        .filter_map(|(name, pool)| Some((name.as_str()?.to_string(), parse_scheduling_pool(pool)?)))
+        .collect()
+}
+
+fn parse_scheduling_pool(pool: &Value) -> Option<SchedulingPool> {
+    let threads = match project_flags_get_value(pool, "threads") {
+        Some(threads) => Some(threads.as_u64().filter(|&threads| threads >= 1)? as usize),
+        None => None,
+    };
+    let priority = match project_flags_get_value(pool, "priority") {
+        Some(priority) => priority.as_u64()?,
+        None => 0,
+    };
+    Some(SchedulingPool { threads, priority })
+}
+
 pub const LATEST_VERSION_POINTER_ENABLED_BY_DEFAULT_ENV: &str =
     "DBT_LATEST_VERSION_POINTER_ENABLED_BY_DEFAULT";
 
@@ -1801,6 +1945,67 @@ mod tests {
         assert!(resolved.contains(&OptimizeTestsOptions::TestStaticAnalysis));
     }
 
+    #[test]
+    fn test_batching_env_overrides_project_flags() {
+        let project_flags: Value =
+            dbt_yaml::from_str("batch_tests_scope: schema\nbatch_tests_max_size: 25\n").unwrap();
+        let batching = |env: &[(&str, &str)]| {
+            resolve_test_batching_with_env_lookup(Some(&project_flags), |name| {
+                env.iter()
+                    .find_map(|(key, value)| (*key == name).then(|| OsString::from(*value)))
+            })
+        };
+
+        assert_eq!(
+            batching(&[]),
+            TestBatching {
+                scope: TestBatchScope::Schema,
+                max_batch_size: 25,
+            }
+        );
+        assert_eq!(
+            batching(&[(BATCH_TESTS_SCOPE_ENV, "Relation")]).scope,
+            TestBatchScope::Relation
+        );
+        // Invalid values fall back to the defaults
+        assert_eq!(
+            batching(&[(BATCH_TESTS_MAX_SIZE_ENV, "1")]).max_batch_size,
+            DEFAULT_TEST_BATCH_SIZE
+        );
+        assert_eq!(
+            resolve_test_batching_with_env_lookup(None, |_| None),
+            TestBatching::default()
+        );
+    }
+
+    #[test]
+    fn scheduling_pools_env_overrides_project_flags() {
+        let project_flags: Value = dbt_yaml::from_str(
+            "scheduling_pools:\n  heavy: {threads: 2, priority: 10}\n  light: {}\n  broken: {threads: 0}\n",
+        )
+        .unwrap();
+
+        let pools = resolve_scheduling_pools_with_env_lookup(Some(&project_flags), |_| None);
+        assert_eq!(
+            pools.get("heavy"),
+            Some(&SchedulingPool {
+                threads: Some(2),
+                priority: 10,
+            })
+        );
+        assert_eq!(pools.get("light"), Some(&SchedulingPool::default()));
+        // Invalid pools are ignored
+        assert!(!pools.contains_key("broken"));
+
+        let pools = resolve_scheduling_pools_with_env_lookup(Some(&project_flags), |name| {
+            (name == SCHEDULING_POOLS_ENV).then(|| OsString::from("{default: {threads: 4}}"))
+        });
+        assert_eq!(pools.len(), 1);
+        assert_eq!(pools[DEFAULT_SCHEDULING_POOL].threads, Some(4));
+
+        assert!(resolve_scheduling_pools_with_env_lookup(None, |_| None).is_empty());
+    }
+
     #[test]
     fn optimize_tests_skip_redundant_tests_is_build_only() {
         let mut explicit_cli = HashSet::default();
@@ -90,6 +90,15 @@ pub struct Stat {
     pub status: NodeStatus,
     pub thread_id: String,
     pub message: Option<String>,
+    /// How long the node waited for a slot in its scheduling pool.
+    pub pool_wait: Option<PoolWait>,
+}
+
+/// Time a node spent ready to run but held back by its scheduling pool.
+#[derive(Debug, Clone, PartialEq)]
+pub struct PoolWait {
+    pub pool: String,
+    pub queue_wait: Duration,
 }
 
 impl Stat {
@@ -113,6 +122,7 @@ impl Stat {
             status,
             thread_id: format!("Thread-{} (worker)", thread_id),
             message,
+            pool_wait: None,
         }
     }
 
@@ -33,8 +33,8 @@ use dbt_loader::{
     loader_hooks::LoaderHooks,
 };
 use dbt_metadata::parse_cache::{
-    PreviousResolvedState, add_all_unchanged_nodes,
-    determine_cache_state_from_previous_previous_resolved_nodes, drop_all_unchanged_nodes,
+    PreviousResolvedState, add_all_unchanged_nodes, determine_cache_state_with_changed_packages,
+    drop_all_unchanged_nodes,
 };
 use dbt_parser::args::ResolveArgs;
 use dbt_parser::resolver_hooks::ResolverHooks;
@@ -123,7 +123,12 @@ async fn resolve_phase(
     let dbt_state = if let Some(cache) = cache_state {
         // only clone if we have a cache state
         let mut dbt_state = dbt_state.as_ref().clone();
-        drop_all_unchanged_nodes(io, &mut dbt_state, &cache.file_changes.unimpacted_files);
+        drop_all_unchanged_nodes(
+            io,
+            &mut dbt_state,
+            &cache.file_changes.unimpacted_files,
+            &cache.changed_packages,
+        );
         Arc::new(dbt_state)
     } else {
         dbt_state
@@ -188,6 +193,32 @@ async fn resolve_phase(
 struct FileChangeset {
     /// Files that have been modified.
     pub changed: Vec<String>,
+    /// Dependency packages with any added, removed or modified file.
+    pub changed_packages: HashSet<String>,
+}
+
+/// Returns true when any tracked file of a dependency package was added, removed or
+/// modified between the two snapshots.
+fn dependency_package_changed(prev_package: &DbtPackage, current_package: &DbtPackage) -> bool {
+    if prev_package.all_paths.len() != current_package.all_paths.len() {
+        return true;
+    }
+    for (key, prev_value) in &prev_package.all_paths {
+        let Some(current_value) = current_package.all_paths.get(key) else {
+            return true;
+        };
+        if prev_value.len() != current_value.len() {
+            return true;
+        }
+        let prev_fs: HashMap<&Path, SystemTime> =
+            prev_value.iter().map(|x| (x.0.as_path(), x.1)).collect();
+        for (path, timestamp) in current_value {
+            if prev_fs.get(path.as_path()) != Some(timestamp) {
+                return true;
+            }
+        }
+    }
+    false
 }
 
 fn is_resource_changeable(kind: &ResourcePathKind) -> bool {
@@ -233,6 +264,7 @@ async fn compute_file_changeset(
     }
 
     let mut changed = Vec::new();
+    let mut changed_packages = HashSet::new();
 
     let mut i = 0;
     while i < prev_packages.len() {
@@ -250,6 +282,17 @@ async fn compute_file_changeset(
             ));
         }
 
+        // Dependency packages are tracked as a unit: any change re-resolves the whole
+        // package and whatever depends on it, rather than forcing a full parse.
+        if i > 0 {
+            token.check_cancellation()?;
+            if dependency_package_changed(prev_package, current_package) {
+                changed_packages.insert(current_package.dbt_project.name.clone());
+            }
+            i += 1;
+            continue;
+        }
+
         let prev_fs_timestamps = prev_package.all_paths.clone();
         let mut new_fs_timestamps = current_package.all_paths.clone();
 
@@ -309,7 +352,12 @@ async fn compute_file_changeset(
                         // Ignore changes to non-md files if our path-kind is a doc.
                         continue;
                     }
-                    if !is_resource_changeable(&key) {
+                    // Macro `.sql` files are incremental: `determine_cache_state_*`
+                    // re-resolves only the nodes that invoked their macros. Macro
+                    // property files still require a full parse.
+                    let is_macro_sql =
+                        key == ResourcePathKind::MacroPaths && current.0.has_extension("sql");
+                    if !is_resource_changeable(&key) && !is_macro_sql {
                         return Err(fs_err!(
                             ErrorCode::CacheError,
                             "Non-incremental file changed: '{}' (kind {:?}) — full parse required",
@@ -317,17 +365,6 @@ async fn compute_file_changeset(
                             key
                         ));
                     }
-                    // Only root-package (i=0) model/analysis changes are safe for incremental.
-                    // Changes in dependency packages require a full parse because their nodes
-                    // may be referenced by the root and cannot be partially re-resolved.
-                    if i > 0 {
-                        return Err(fs_err!(
-                            ErrorCode::CacheError,
-                            "File '{}' changed in dependency package '{}' — full parse required",
-                            current.0.display(),
-                            current_package.dbt_project.name
-                        ));
-                    }
                     // The paths in all_paths are already absolute paths
                     // We need to make them relative to the package root path
                     // For the root package, this is the same as io.in_dir
@@ -344,11 +381,14 @@ async fn compute_file_changeset(
         i += 1;
     }
 
-    if changed.is_empty() {
+    if changed.is_empty() && changed_packages.is_empty() {
         return Err(fs_err!(ErrorCode::NoFilesChanged, "No files changed"));
     }
 
-    Ok(FileChangeset { changed })
+    Ok(FileChangeset {
+        changed,
+        changed_packages,
+    })
 }
 
 #[allow(clippy::too_many_arguments)]
@@ -364,10 +404,11 @@ async fn try_load_cache_state_and_changeset_by_last_write(
 
     let prev_resolved_state = PreviousResolvedState::from_resolved_state(prev_resolved_state);
 
-    let cache = determine_cache_state_from_previous_previous_resolved_nodes(
+    let cache = determine_cache_state_with_changed_packages(
         io,
         prev_resolved_state,
         &changeset.changed,
+        &changeset.changed_packages,
         dbt_state,
     )?;
 
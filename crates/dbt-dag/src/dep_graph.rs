@@ -0,0 +1,307 @@
+//! Compact, integer-indexed view of a dependency map.
+//!
+//! The [`deps_mgmt`](crate::deps_mgmt) functions take `BTreeMap<T, BTreeSet<U>>`
+//! maps keyed by unique ids. Traversing those maps directly spends most of its
+//! time comparing strings and allocating tree nodes, which dominates scheduling
+//! on large projects. A [`DepGraph`] interns every node into a dense `u32` id and
+//! lays the edges out in compressed sparse row (CSR) form, both forward (node →
+//! its dependencies) and reverse (node → its dependents). Traversals run on
+//! integer slices with [`BitSet`] visited sets and only map back to `T` for
+//! their results.
+//!
+//! Ids are assigned in `T`'s order, so visiting ids in increasing order (or
+//! popping them from a max-heap) visits nodes in the same order as the
+//! original `BTreeMap`.
+
+use std::collections::{BTreeMap, BTreeSet, HashMap};
+use std::hash::Hash;
+
+/// A fixed-size set of `u32` ids.
+#[derive(Debug, Clone, PartialEq, Eq)]
+pub struct BitSet {
+    words: Vec<u64>,
+}
+
+impl BitSet {
+    /// An empty set able to hold ids `0..len`.
+    pub fn new(len: usize) -> Self {
+        Self {
+            words: vec![0; len.div_ceil(64)],
+        }
+    }
+
+    /// Adds `id`, returning whether it was newly inserted.
+    pub fn insert(&mut self, id: u32) -> bool {
+        let (word, bit) = (id as usize / 64, 1u64 << (id % 64));
+        let inserted = self.words[word] & bit == 0;
+        self.words[word] |= bit;
+        inserted
+    }
+
+    pub fn remove(&mut self, id: u32) {
+        self.words[id as usize / 64] &= !(1u64 << (id % 64));
+    }
+
+    pub fn contains(&self, id: u32) -> bool {
+        self.words[id as usize / 64] & (1u64 << (id % 64)) != 0
+    }
+
+    pub fn len(&self) -> usize {
+        self.words.iter().map(|w| w.count_ones() as usize).sum()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.words.iter().all(|&w| w == 0)
+    }
+
+    /// The ids in the set, in increasing order.
+    pub fn iter(&self) -> impl Iterator<Item = u32> + '_ {
+        self.words.iter().enumerate().flat_map(|(i, &word)| {
+            let mut word = word;
+            std::iter::from_fn(move || {
+                if word == 0 {
+                    return None;
+                }
+                let bit = word.trailing_zeros();
+                word &= word - 1;
+                Some(i as u32 * 64 + bit)
+            })
+        })
+    }
+}
+
+/// Adjacency lists packed into two flat arrays: the neighbors of `id` are
+/// `targets[offsets[id]..offsets[id + 1]]`, sorted by id.
+#[derive(Debug, Clone)]
+struct Csr {
+    offsets: Vec<u32>,
+    targets: Vec<u32>,
+}
+
+impl Csr {
+    fn from_edges(node_count: usize, edges: &[(u32, u32)]) -> Self {
+        let mut offsets = vec![0u32; node_count + 1];
+        for &(source, _) in edges {
+            offsets[source as usize + 1] += 1;
+        }
+        let mut total = 0;
+        for offset in &mut offsets {
+            total += *offset;
+            *offset = total;
+        }
+        let mut next = offsets.clone();
+        let mut targets = vec![0u32; edges.len()];
+        for &(source, target) in edges {
+            targets[next[source as usize] as usize] = target;
+            next[source as usize] += 1;
+        }
+        for bounds in offsets.windows(2) {
+            targets[bounds[0] as usize..bounds[1] as usize].sort_unstable();
+        }
+        Self { offsets, targets }
+    }
+
+    fn range(&self, id: u32) -> std::ops::Range<usize> {
+        self.offsets[id as usize] as usize..self.offsets[id as usize + 1] as usize
+    }
+
+    fn neighbors(&self, id: u32) -> &[u32] {
+        &self.targets[self.range(id)]
+    }
+}
+
+/// A dependency map with interned node ids and CSR adjacency in both directions.
+#[derive(Debug, Clone)]
+pub struct DepGraph<T> {
+    nodes: Vec<T>,
+    ids: HashMap<T, u32>,
+    dependencies: Csr,
+    dependents: Csr,
+}
+
+impl<T> DepGraph<T>
+where
+    T: Hash + Eq + Clone + Ord,
+{
+    /// Builds the graph of `deps`, where each key depends on its values. Nodes
+    /// that only appear as values are included.
+    pub fn from_deps<U>(deps: &BTreeMap<T, BTreeSet<U>>) -> Self
+    where
+        U: Clone + Into<T>,
+    {
+        // Keys come sorted from the map, so only nodes that appear solely as
+        // values need sorting in.
+        let mut nodes: Vec<T> = deps.keys().cloned().collect();
+        let mut ids: HashMap<T, u32> = HashMap::with_capacity(nodes.len());
+        for (id, node) in nodes.iter().enumerate() {
+            ids.insert(node.clone(), id as u32);
+        }
+
+        let edge_count = deps.values().map(BTreeSet::len).sum();
+        let mut edges = Vec::with_capacity(edge_count);
+        let mut value_only: Vec<(u32, T)> = Vec::new();
+        for (source, values) in deps.values().enumerate() {
+            for value in values {
+                let target: T = value.clone().into();
+                match ids.get(&target) {
+                    Some(&target) => edges.push((source as u32, target)),
+                    None => value_only.push((source as u32, target)),
+                }
+            }
+        }
+
+        if !value_only.is_empty() {
+            let mut extra: Vec<T> = value_only.iter().map(|(_, node)| node.clone()).collect();
+            extra.sort_unstable();
+            extra.dedup();
+            // Merge the two sorted lists, renumbering keys to make room
+            let mut renumbered = Vec::with_capacity(nodes.len());
+            let mut merged = Vec::with_capacity(nodes.len() + extra.len());
+            let mut extra_ids = Vec::with_capacity(extra.len());
+            let mut extra = extra.into_iter().peekable();
+            for key in nodes {
+                while let Some(node) = extra.next_if(|node| *node < key) {
+                    extra_ids.push(merged.len() as u32);
+                    merged.push(node);
+                }
+                renumbered.push(merged.len() as u32);
+                merged.push(key);
+            }
+            for node in extra {
+                extra_ids.push(merged.len() as u32);
+                merged.push(node);
+            }
+            for id in ids.values_mut() {
+                *id = renumbered[*id as usize];
+            }
+            for id in extra_ids {
+                ids.insert(merged[id as usize].clone(), id);
+            }
+            for (source, target) in &mut edges {
+                *source = renumbered[*source as usize];
+                *target = renumbered[*target as usize];
+            }
+            edges.extend(
+                value_only
+                    .into_iter()
+                    .map(|(source, node)| (renumbered[source as usize], ids[&node])),
+            );
+            nodes = merged;
+        }
+
+        let dependencies = Csr::from_edges(nodes.len(), &edges);
+        for edge in &mut edges {
+            *edge = (edge.1, edge.0);
+        }
+        let dependents = Csr::from_edges(nodes.len(), &edges);
+
+        Self {
+            nodes,
+            ids,
+            dependencies,
+            dependents,
+        }
+    }
+
+    /// The id of `node`, if it is in the graph.
+    pub fn id(&self, node: &T) -> Option<u32> {
+        self.ids.get(node).copied()
+    }
+}
+
+impl<T> DepGraph<T> {
+    /// Number of nodes.
+    pub fn len(&self) -> usize {
+        self.nodes.len()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.nodes.is_empty()
+    }
+
+    /// Number of edges.
+    pub fn edge_count(&self) -> usize {
+        self.dependencies.targets.len()
+    }
+
+    /// All ids, in node order.
+    pub fn ids(&self) -> std::ops::Range<u32> {
+        0..self.nodes.len() as u32
+    }
+
+    pub fn node(&self, id: u32) -> &T {
+        &self.nodes[id as usize]
+    }
+
+    /// The nodes `id` depends on, sorted by id.
+    pub fn dependencies(&self, id: u32) -> &[u32] {
+        self.dependencies.neighbors(id)
+    }
+
+    /// The nodes that depend on `id`, sorted by id.
+    pub fn dependents(&self, id: u32) -> &[u32] {
+        self.dependents.neighbors(id)
+    }
+
+    /// Position of the edge `source → target` among all edges, if present.
+    /// Edge positions are dense, so a [`BitSet`] over them can mark edges.
+    pub fn edge_position(&self, source: u32, target: u32) -> Option<u32> {
+        let range = self.dependencies.range(source);
+        let offset = self.dependencies.targets[range.clone()]
+            .binary_search(&target)
+            .ok()?;
+        Some((range.start + offset) as u32)
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn graph() -> DepGraph<String> {
+        // a -> b -> c, d -> b, e
+        let mut deps: BTreeMap<String, BTreeSet<String>> = BTreeMap::new();
+        deps.insert("a".into(), BTreeSet::from(["b".into()]));
+        deps.insert("b".into(), BTreeSet::from(["c".into()]));
+        deps.insert("d".into(), BTreeSet::from(["b".into()]));
+        deps.insert("e".into(), BTreeSet::new());
+        DepGraph::from_deps(&deps)
+    }
+
+    fn names(graph: &DepGraph<String>, ids: impl IntoIterator<Item = u32>) -> Vec<&str> {
+        ids.into_iter().map(|id| graph.node(id).as_str()).collect()
+    }
+
+    #[test]
+    fn ids_follow_node_order_and_include_value_only_nodes() {
+        let graph = graph();
+        assert_eq!(names(&graph, graph.ids()), ["a", "b", "c", "d", "e"]);
+        assert_eq!(graph.edge_count(), 3);
+        let b = graph.id(&"b".to_string()).unwrap();
+        assert_eq!(names(&graph, graph.dependencies(b).to_vec()), ["c"]);
+        assert_eq!(names(&graph, graph.dependents(b).to_vec()), ["a", "d"]);
+        assert!(graph.id(&"z".to_string()).is_none());
+    }
+
+    #[test]
+    fn edge_positions_index_edges_in_source_order() {
+        let graph = graph();
+        let id = |name: &str| graph.id(&name.to_string()).unwrap();
+        assert_eq!(graph.edge_position(id("a"), id("b")), Some(0));
+        assert_eq!(graph.edge_position(id("d"), id("b")), Some(2));
+        assert_eq!(graph.edge_position(id("b"), id("a")), None);
+    }
+
+    #[test]
+    fn bitset_tracks_membership_across_words() {
+        let mut set = BitSet::new(200);
+        assert!(set.is_empty());
+        assert!(set.insert(3));
+        assert!(set.insert(130));
+        assert!(!set.insert(3));
+        assert!(set.contains(130) && !set.contains(64));
+        assert_eq!(set.iter().collect::<Vec<_>>(), [3, 130]);
+        set.remove(3);
+        assert_eq!(set.len(), 1);
+    }
+}
@@ -3,7 +3,11 @@ use std::{
     hash::Hash,
 };
 
-use itertools::Itertools;
+use dbt_common::ErrorCode;
+use dbt_common::tracing::dbt_emit::emit_warn_log_message;
+
+use crate::dep_graph::{BitSet, DepGraph};
+
 pub fn reverse<T, U>(dependencies: &BTreeMap<T, BTreeSet<U>>) -> BTreeMap<U, BTreeSet<T>>
 where
     T: Hash + PartialEq + Eq + Clone + Ord,
@@ -23,15 +27,10 @@ pub fn reverse_dependencies<T, U>(
 {
     for (k, vs) in dependencies {
         for v in vs {
-            if reverted.contains_key(v) {
-                let mut inc = reverted.get(v).unwrap().to_owned();
-                inc.insert(k.to_owned());
-                reverted.insert(v.to_owned(), inc.to_owned());
-            } else {
-                let mut inc = BTreeSet::new();
-                inc.insert(k.to_owned());
-                reverted.insert(v.to_owned(), inc);
-            }
+            reverted
+                .entry(v.to_owned())
+                .or_default()
+                .insert(k.to_owned());
         }
     }
 }
@@ -218,51 +217,60 @@ where
     U: Hash + PartialEq + Eq + Clone + Ord + Into<T>,
 {
     // Compute the nearest upstream ancestors that are also included
-    fn first_upstream_included<T, U>(
-        node: &T,
-        full_deps: &BTreeMap<T, BTreeSet<U>>,
-        subset: &BTreeSet<T>,
-        memoized: &mut BTreeMap<T, BTreeSet<U>>,
-        visiting: &mut BTreeSet<T>,
-    ) -> BTreeSet<U>
-    where
-        T: Hash + PartialEq + Eq + Clone + Ord + Into<U>,
-        U: Hash + PartialEq + Eq + Clone + Ord + Into<T>,
-    {
-        if let Some(cached) = memoized.get(node) {
+    fn first_upstream_included<T>(
+        id: u32,
+        graph: &DepGraph<T>,
+        included: &BitSet,
+        memoized: &mut [Option<Vec<u32>>],
+        visiting: &mut BitSet,
+    ) -> Vec<u32> {
+        if let Some(cached) = &memoized[id as usize] {
             return cached.clone();
         }
         // Guard against cycles
-        if !visiting.insert(node.clone()) {
-            return BTreeSet::new();
+        if !visiting.insert(id) {
+            return Vec::new();
         }
 
-        let mut result = BTreeSet::new();
-        if let Some(parents) = full_deps.get(node) {
-            for parent in parents {
-                let parent_t: T = parent.clone().into();
-                if subset.contains(&parent_t) {
-                    // Direct parent is included -> keep it
-                    result.insert(parent.clone());
-                } else {
-                    // Parent was filtered out -> climb upstream to the first included ancestors
-                    let upstream =
-                        first_upstream_included(&parent_t, full_deps, subset, memoized, visiting);
-                    result.extend(upstream);
-                }
+        let mut result = Vec::new();
+        for &parent in graph.dependencies(id) {
+            if included.contains(parent) {
+                // Direct parent is included -> keep it
+                result.push(parent);
+            } else {
+                // Parent was filtered out -> climb upstream to the first included ancestors
+                result.extend(first_upstream_included(
+                    parent, graph, included, memoized, visiting,
+                ));
             }
         }
+        result.sort_unstable();
+        result.dedup();
 
-        visiting.remove(node);
-        memoized.insert(node.clone(), result.clone());
+        visiting.remove(id);
+        memoized[id as usize] = Some(result.clone());
         result
     }
 
-    let mut memoized = BTreeMap::new();
+    let graph = DepGraph::from_deps(deps);
+    let mut included = BitSet::new(graph.len());
+    for id in subset.iter().filter_map(|node| graph.id(node)) {
+        included.insert(id);
+    }
+
+    let mut memoized = vec![None; graph.len()];
+    let mut visiting = BitSet::new(graph.len());
     let mut out = BTreeMap::new();
     for node in subset.iter() {
-        let parents =
-            first_upstream_included(node, deps, subset, &mut memoized, &mut BTreeSet::new());
+        let parents = match graph.id(node) {
+            Some(id) => {
+                first_upstream_included(id, &graph, &included, &mut memoized, &mut visiting)
+                    .into_iter()
+                    .map(|parent| graph.node(parent).clone().into())
+                    .collect()
+            }
+            None => BTreeSet::new(),
+        };
         out.insert(node.clone(), parents);
     }
     out
@@ -394,6 +402,46 @@ pub fn get_sinks<T, U>(
     }
 }
 
+// Depth-first search from every unvisited node in order, recording the
+// portion of the DFS path that closes each back edge as a cycle.
+fn find_cycles<T>(graph: &DepGraph<T>, cut_edges: &BitSet) -> Vec<Vec<u32>> {
+    let mut cycles = Vec::new();
+    let mut visited = BitSet::new(graph.len());
+    // DFS path, with the index of the next dependency to explore per node
+    let mut path: Vec<(u32, usize)> = Vec::new();
+    let mut path_position = vec![usize::MAX; graph.len()];
+
+    for root in graph.ids() {
+        if !visited.insert(root) {
+            continue;
+        }
+        path_position[root as usize] = 0;
+        path.push((root, 0));
+        while let Some((node, next)) = path.last_mut() {
+            let node = *node;
+            let Some(&neighbor) = graph.dependencies(node).get(*next) else {
+                path_position[node as usize] = usize::MAX;
+                path.pop();
+                continue;
+            };
+            *next += 1;
+            let edge = graph.edge_position(node, neighbor).expect("edge exists");
+            if cut_edges.contains(edge) {
+                continue;
+            }
+            let position = path_position[neighbor as usize];
+            if position != usize::MAX {
+                // Found a cycle
+                cycles.push(path[position..].iter().map(|&(id, _)| id).collect());
+            } else if visited.insert(neighbor) {
+                path_position[neighbor as usize] = path.len();
+                path.push((neighbor, 0));
+            }
+        }
+    }
+    cycles
+}
+
 // Takes a dependency (forward-only) DAG and a cut-point predicate and returns:
 // 1. list of all cycles
 // 2. list of cycle-cut-points options corresponding to each of the cycles in #1
@@ -408,119 +456,58 @@ where
     T: Hash + PartialEq + Eq + Clone + Ord + Into<U> + std::fmt::Debug,
     U: Hash + PartialEq + Eq + Clone + Ord + Into<T> + std::fmt::Debug,
 {
-    fn dfs<T, U>(
-        node: &T,
-        graph: &BTreeMap<T, BTreeSet<U>>,
-        stack: &mut VecDeque<T>,
-        visited: &mut HashSet<T>,
-        stack_set: &mut HashSet<T>,
-        cycles: &mut Vec<Vec<T>>,
-    ) where
-        T: Hash + PartialEq + Eq + Clone + Ord + Into<U> + std::fmt::Debug,
-        U: Hash + PartialEq + Eq + Clone + Ord + Into<T> + std::fmt::Debug,
-    {
-        if stack_set.contains(node) {
-            // Found a cycle
-            let cycle_start_index = stack.iter().position(|n| n == node).unwrap();
-            let cycle = stack.iter().skip(cycle_start_index).cloned().collect();
-            cycles.push(cycle);
-            return;
-        }
-
-        if visited.contains(node) {
-            return;
-        }
-
-        visited.insert(node.clone());
-        stack.push_back(node.clone());
-        stack_set.insert(node.clone());
-
-        if let Some(neighbors) = graph.get(node) {
-            for neighbor in neighbors.iter().sorted() {
-                let neighbor_t = neighbor.to_owned().into();
-                dfs(&neighbor_t, graph, stack, visited, stack_set, cycles);
-            }
-        }
-
-        stack.pop_back();
-        stack_set.remove(node);
-    }
-
-    let mut cycles = Vec::new();
-    let mut all_cycles_cut_deps = deps.clone();
-    let mut res_deps = deps.clone();
-    let mut res_cut_points = vec![];
-    let mut visited;
-    let mut stack;
-    let mut stack_set;
-    let mut cycle_cnt = 0;
+    let graph = DepGraph::from_deps(deps);
+    let mut cycles: Vec<Vec<u32>> = Vec::new();
+    let mut res_cut_points: Vec<Option<u32>> = vec![];
+    // Edges removed to find further cycles; cycles without a cut point are cut at their first node
+    let mut all_cut_edges = BitSet::new(graph.edge_count());
+    // Edges removed from the returned DAG
+    let mut res_cut_edges = Vec::new();
 
     loop {
-        visited = HashSet::new();
-        stack = VecDeque::new();
-        stack_set = HashSet::new();
-
-        for node in all_cycles_cut_deps.keys().sorted() {
-            if !visited.contains(node) {
-                dfs(
-                    node,
-                    &all_cycles_cut_deps,
-                    &mut stack,
-                    &mut visited,
-                    &mut stack_set,
-                    &mut cycles,
-                );
-            }
-        }
-
-        if cycle_cnt == cycles.len() {
+        let new_cycles = find_cycles(&graph, &all_cut_edges);
+        if new_cycles.is_empty() {
             break;
         }
 
-        let mut cut_points = Vec::new();
-
-        // Determine cut points
-        for cycle in &cycles[cycle_cnt..] {
-            let mut cut_point = None;
-            for node in cycle {
-                if cut_point_predicate(node) {
-                    cut_point = Some(node.clone());
-                    break;
+        for cycle in &new_cycles {
+            // Determine cut point
+            let cut_point = cycle
+                .iter()
+                .copied()
+                .find(|&id| cut_point_predicate(graph.node(id)));
+            res_cut_points.push(cut_point);
+
+            // Remove the links based on cut points
+            let cut = cut_point.unwrap_or(cycle[0]);
+            for &node in cycle {
+                if let Some(edge) = graph.edge_position(node, cut) {
+                    all_cut_edges.insert(edge);
+                    if cut_point.is_some() {
+                        res_cut_edges.push((node, cut));
+                    }
                 }
             }
-            cut_points.push(cut_point);
-        }
-
-        res_cut_points.extend(cut_points.iter().cloned());
-
-        // Remove the links based on cut points
-        let x = &cycles[cycle_cnt..];
-        for (cycle, cut_point_opt) in x.iter().zip(cut_points.iter()) {
-            if let Some(cut_point) = cut_point_opt {
-                prune_cycle(cycle, cut_point, &mut res_deps);
-                prune_cycle(cycle, cut_point, &mut all_cycles_cut_deps);
-            } else {
-                let cut_point = &cycle[0];
-                prune_cycle(cycle, cut_point, &mut all_cycles_cut_deps);
-            }
         }
-
-        cycle_cnt = cycles.len();
+        cycles.extend(new_cycles);
     }
 
-    (cycles, res_cut_points, res_deps)
-}
-
-fn prune_cycle<T, U>(cycle: &Vec<T>, cut_point: &T, deps: &mut BTreeMap<T, BTreeSet<U>>)
-where
-    T: Hash + PartialEq + Eq + Clone + Ord + Into<U> + std::fmt::Debug,
-    U: Hash + PartialEq + Eq + Clone + Ord + Into<T> + std::fmt::Debug,
-{
-    for node in cycle {
-        if let Some(neighbors) = deps.get_mut(node) {
-            neighbors.remove(&cut_point.clone().into());
-        }
-    }
+    let mut res_deps = deps.clone();
+    for (node, cut) in res_cut_edges {
+        if let Some(neighbors) = res_deps.get_mut(graph.node(node)) {
+            neighbors.remove(&graph.node(cut).clone().into());
+        }
+    }
+    let to_nodes =
+        |ids: Vec<u32>| -> Vec<T> { ids.into_iter().map(|id| graph.node(id).clone()).collect() };
+    (
+        cycles.into_iter().map(to_nodes).collect(),
+        res_cut_points
+            .into_iter()
+            .map(|cut_point| cut_point.map(|id| graph.node(id).clone()))
+            .collect(),
+        res_deps,
+    )
 }
 
 pub fn show_deps<T: std::fmt::Display + Ord>(deps: &BTreeMap<T, BTreeSet<T>>) -> String {
@@ -554,35 +541,22 @@ where
     T: Hash + PartialEq + Eq + Clone + Ord + Into<U> + std::fmt::Debug,
     U: Hash + PartialEq + Eq + Clone + Ord + Into<T> + std::fmt::Debug,
 {
-    // Topological sort
-    let mut cycle_free_items = vec![];
+    let graph = DepGraph::from_deps(deps);
 
-    let mut in_degree: BTreeMap<T, usize> = BTreeMap::new();
-    for (node, neighbors) in deps.iter() {
-        in_degree.entry(node.clone()).or_insert(0);
-        for neighbor in neighbors.iter() {
-            *in_degree.entry(neighbor.clone().into()).or_insert(0) += 1;
-        }
-    }
-
-    let mut queue: BinaryHeap<T> = BinaryHeap::new();
-    for (node, &deg) in in_degree.iter() {
-        if deg == 0 {
-            queue.push(node.clone());
-        }
-    }
+    // Topological sort; ids follow node order, so the heap pops the greatest node first
+    let mut in_degree: Vec<usize> = graph.ids().map(|id| graph.dependents(id).len()).collect();
+    let mut queue: BinaryHeap<u32> = graph
+        .ids()
+        .filter(|&id| in_degree[id as usize] == 0)
+        .collect();
 
-    while let Some(node) = queue.pop() {
-        cycle_free_items.push(node.clone());
-        if let Some(neighbors) = deps.get(&node) {
-            for neighbor in neighbors {
-                let neighbor_t: T = neighbor.clone().into();
-                if let Some(deg) = in_degree.get_mut(&neighbor_t) {
-                    *deg -= 1;
-                    if *deg == 0 {
-                        queue.push(neighbor_t);
-                    }
-                }
+    let mut cycle_free_items = vec![];
+    while let Some(id) = queue.pop() {
+        cycle_free_items.push(graph.node(id).clone());
+        for &neighbor in graph.dependencies(id) {
+            in_degree[neighbor as usize] -= 1;
+            if in_degree[neighbor as usize] == 0 {
+                queue.push(neighbor);
             }
         }
     }
@@ -596,71 +570,61 @@ where
     T: Hash + PartialEq + Eq + Clone + Ord + Into<U> + std::fmt::Debug,
     U: Hash + PartialEq + Eq + Clone + Ord + Into<T> + std::fmt::Debug,
 {
-    use std::collections::{BTreeMap, BTreeSet};
-
-    let mut levels_map: BTreeMap<T, usize> = BTreeMap::new();
-    let mut cycle_nodes: BTreeSet<T> = BTreeSet::new();
-
-    fn compute_level<T, U>(
-        node: &T,
-        deps: &BTreeMap<T, BTreeSet<U>>,
-        levels_map: &mut BTreeMap<T, usize>,
-        stack: &mut BTreeSet<T>,
-        cycle_nodes: &mut BTreeSet<T>,
-    ) -> Option<usize>
-    where
-        T: Hash + PartialEq + Eq + Clone + Ord + Into<U> + std::fmt::Debug,
-        U: Hash + PartialEq + Eq + Clone + Ord + Into<T> + std::fmt::Debug,
-    {
-        if let Some(&lvl) = levels_map.get(node) {
-            return Some(lvl);
-        }
-        if stack.contains(node) {
-            eprintln!("Cycle detected at node: {node:?}");
-            cycle_nodes.insert(node.clone());
-            return None;
-        }
-        stack.insert(node.clone());
-        let level = match deps.get(node) {
-            Some(neighbors) if !neighbors.is_empty() => {
-                let mut max_level = 0;
-                for n in neighbors {
-                    let n_t: T = n.clone().into();
-                    if let Some(dep_level) =
-                        compute_level(&n_t, deps, levels_map, stack, cycle_nodes)
-                    {
-                        max_level = max_level.max(dep_level);
-                    } else {
-                        // propagate cycle
-                        cycle_nodes.insert(node.clone());
-                        stack.remove(node);
-                        return None;
-                    }
-                }
-                1 + max_level
+    let graph = DepGraph::from_deps(deps);
+
+    // A node's level is one more than the highest level among its dependencies;
+    // nodes without dependencies are level 0. Levels are assigned leaves-first,
+    // so nodes in or depending on a cycle never get one.
+    let mut unresolved: Vec<usize> = graph.ids().map(|id| graph.dependencies(id).len()).collect();
+    let mut levels: Vec<Option<usize>> = vec![None; graph.len()];
+    let mut ready: Vec<u32> = graph
+        .ids()
+        .filter(|&id| unresolved[id as usize] == 0)
+        .collect();
+    for &id in &ready {
+        levels[id as usize] = Some(0);
+    }
+    while let Some(id) = ready.pop() {
+        let level = levels[id as usize].expect("ready nodes have a level") + 1;
+        for &dependent in graph.dependents(id) {
+            let dependent_level = levels[dependent as usize].get_or_insert(level);
+            *dependent_level = (*dependent_level).max(level);
+            unresolved[dependent as usize] -= 1;
+            if unresolved[dependent as usize] == 0 {
+                ready.push(dependent);
             }
-            _ => 0,
-        };
-        stack.remove(node);
-        levels_map.insert(node.clone(), level);
-        Some(level)
+        }
     }
 
-    // Compute levels for all nodes
-    for node in deps.keys() {
-        let mut stack = BTreeSet::new();
-        compute_level(node, deps, &mut levels_map, &mut stack, &mut cycle_nodes);
+    // Nodes in or downstream of a cycle never resolve; warn once per cycle
+    if unresolved.iter().any(|&count| count > 0) {
+        for cycle in find_cycles(&graph, &BitSet::new(graph.edge_count())) {
+            let path = cycle
+                .iter()
+                .chain(cycle.first())
+                .map(|&id| format!("{:?}", graph.node(id)))
+                .collect::<Vec<_>>()
+                .join(" -> ");
+            emit_warn_log_message(
+                ErrorCode::CyclicDependency,
+                format!("Cycle detected: {path}"),
+            );
+        }
     }
 
     // Group nodes by level, skipping nodes in cycles
-    let mut grouped: BTreeMap<usize, Vec<T>> = BTreeMap::new();
-    for (node, lvl) in levels_map {
-        if !cycle_nodes.contains(&node) {
-            grouped.entry(lvl).or_default().push(node);
+    let mut grouped: Vec<Vec<T>> = Vec::new();
+    for id in graph.ids() {
+        if unresolved[id as usize] > 0 {
+            continue;
         }
+        let level = levels[id as usize].expect("resolved nodes have a level");
+        if grouped.len() <= level {
+            grouped.resize_with(level + 1, Vec::new);
+        }
+        grouped[level].push(graph.node(id).clone());
     }
-
-    grouped.into_values().collect()
+    grouped
 }
 
 pub fn prune_self_deps<T, U>(deps: &mut HashMap<T, HashSet<U>>)
@@ -797,6 +761,26 @@ mod tests {
         assert_eq!(levels, Vec::<Vec<&str>>::new());
     }
 
+    #[test]
+    fn test_cycles_are_found_once_regardless_of_downstream_nodes() {
+        // a -> b -> a (cycle), with 50 nodes depending on it
+        let mut deps: BTreeMap<String, BTreeSet<String>> = BTreeMap::new();
+        deps.insert("a".into(), BTreeSet::from(["b".into()]));
+        deps.insert("b".into(), BTreeSet::from(["a".into()]));
+        for i in 0..50 {
+            deps.insert(format!("m{i}"), BTreeSet::from(["a".to_string()]));
+        }
+        let graph = DepGraph::from_deps(&deps);
+
+        let cycles = find_cycles(&graph, &BitSet::new(graph.edge_count()));
+        let named: Vec<Vec<&str>> = cycles
+            .iter()
+            .map(|cycle| cycle.iter().map(|&id| graph.node(id).as_str()).collect())
+            .collect();
+        assert_eq!(named, [["a", "b"]]);
+        assert!(topological_levels(&deps).is_empty());
+    }
+
     #[test]
     fn test_get_all_upstream_deps() {
         // Create a dependency graph
@@ -848,6 +832,43 @@ mod tests {
         assert_eq!(result.len(), 0); // Should be empty
     }
 
+    #[test]
+    fn test_topological_sort_orders_dependencies_first_and_drops_cycles() {
+        // a -> b -> d, a -> c -> d, x -> y -> x (cycle), z -> x
+        let mut deps: BTreeMap<&str, BTreeSet<&str>> = BTreeMap::new();
+        deps.insert("a", BTreeSet::from(["b", "c"]));
+        deps.insert("b", BTreeSet::from(["d"]));
+        deps.insert("c", BTreeSet::from(["d"]));
+        deps.insert("x", BTreeSet::from(["y"]));
+        deps.insert("y", BTreeSet::from(["x"]));
+        deps.insert("z", BTreeSet::from(["x"]));
+
+        // Among ready nodes the greatest is emitted last, matching the previous BTreeMap order
+        assert_eq!(topological_sort(&deps), vec!["d", "b", "c", "a", "z"]);
+    }
+
+    #[test]
+    fn test_find_and_cut_cycles() {
+        // a -> b -> c -> a, c -> d -> c, e -> f
+        let mut deps: BTreeMap<&str, BTreeSet<&str>> = BTreeMap::new();
+        deps.insert("a", BTreeSet::from(["b"]));
+        deps.insert("b", BTreeSet::from(["c"]));
+        deps.insert("c", BTreeSet::from(["a", "d"]));
+        deps.insert("d", BTreeSet::from(["c"]));
+        deps.insert("e", BTreeSet::from(["f"]));
+
+        let (cycles, cut_points, cut_deps) = find_and_cut_cycles(&deps, |node| *node == "b");
+
+        assert_eq!(cycles, vec![vec!["a", "b", "c"], vec!["c", "d"]]);
+        // Only the first cycle has a node satisfying the predicate
+        assert_eq!(cut_points, vec![Some("b"), None]);
+        assert_eq!(cut_deps["a"], BTreeSet::new());
+        // Cycles without a cut point stay in the returned DAG
+        assert_eq!(cut_deps["c"], BTreeSet::from(["a", "d"]));
+        assert_eq!(cut_deps["d"], BTreeSet::from(["c"]));
+        assert_eq!(cut_deps["e"], BTreeSet::from(["f"]));
+    }
+
     #[test]
     fn test_restrict_with_transitive() {
         // a - b - d - e
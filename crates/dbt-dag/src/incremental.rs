@@ -0,0 +1,518 @@
+//! Dependency map maintained under edits, with incremental cycle detection.
+//!
+//! Long-lived sessions re-derive a project's dependency map after every edit,
+//! although an edit usually touches a handful of nodes. [`IncrementalDeps`]
+//! keeps the map up to date edge by edge instead, together with a topological
+//! order of its nodes (every node positioned after its dependencies) maintained
+//! with the dynamic topological sort of Pearce and Kelly: adding an edge the
+//! order already respects is O(1); otherwise only the nodes positioned between
+//! the edge's ends that are connected to them are searched and reordered.
+//!
+//! That search is also how cycles are detected: an edge whose new dependency
+//! already depends on the node closes a cycle. Such edges stay in the map but
+//! are left out of the order, and are retried whenever edges are removed, so
+//! whether the graph is acyclic is always known without a full search.
+
+use std::collections::{BTreeMap, BTreeSet, HashMap, HashSet};
+use std::hash::Hash;
+
+#[derive(Debug, Clone)]
+pub struct IncrementalDeps<T> {
+    /// Node → its dependencies, including edges that close cycles.
+    deps: BTreeMap<T, BTreeSet<T>>,
+    /// Node → its dependents, through ordered edges only.
+    dependents: HashMap<T, HashSet<T>>,
+    /// Position of each node, below the positions of its dependents.
+    position: HashMap<T, u64>,
+    next_position: u64,
+    /// Node → dependencies whose edges close a cycle, left out of the order.
+    cycle_edges: BTreeMap<T, BTreeSet<T>>,
+}
+
+impl<T> Default for IncrementalDeps<T> {
+    fn default() -> Self {
+        Self {
+            deps: BTreeMap::new(),
+            dependents: HashMap::new(),
+            position: HashMap::new(),
+            next_position: 0,
+            cycle_edges: BTreeMap::new(),
+        }
+    }
+}
+
+impl<T> IncrementalDeps<T>
+where
+    T: Hash + Eq + Ord + Clone,
+{
+    pub fn new() -> Self {
+        Self::default()
+    }
+
+    /// Builds the graph of `deps` in one pass, positioning nodes leaves-first so
+    /// only edges in or behind cycles need the incremental path.
+    pub fn from_deps(deps: &BTreeMap<T, BTreeSet<T>>) -> Self {
+        let mut unresolved: BTreeMap<&T, usize> = BTreeMap::new();
+        let mut dependents: HashMap<&T, Vec<&T>> = HashMap::new();
+        for (node, node_deps) in deps {
+            unresolved.insert(node, node_deps.len());
+            for dep in node_deps {
+                unresolved.entry(dep).or_insert(0);
+                dependents.entry(dep).or_default().push(node);
+            }
+        }
+
+        let mut graph = Self::new();
+        let mut ready: Vec<&T> = unresolved
+            .iter()
+            .filter(|(_, count)| **count == 0)
+            .map(|(node, _)| *node)
+            .collect();
+        while let Some(node) = ready.pop() {
+            graph.add_node(node.clone());
+            for &dependent in dependents.get(node).into_iter().flatten() {
+                let count = unresolved.get_mut(dependent).expect("counted");
+                *count -= 1;
+                if *count == 0 {
+                    ready.push(dependent);
+                }
+            }
+        }
+        // Nodes in or behind a cycle go last
+        for node in unresolved.keys() {
+            graph.add_node((*node).clone());
+        }
+
+        for (node, node_deps) in deps {
+            for dep in node_deps {
+                graph.add_dependency(node.clone(), dep.clone());
+            }
+        }
+        graph
+    }
+
+    /// The dependency map, including edges that close cycles.
+    pub fn deps(&self) -> &BTreeMap<T, BTreeSet<T>> {
+        &self.deps
+    }
+
+    pub fn into_deps(self) -> BTreeMap<T, BTreeSet<T>> {
+        self.deps
+    }
+
+    pub fn dependencies(&self, node: &T) -> Option<&BTreeSet<T>> {
+        self.deps.get(node)
+    }
+
+    pub fn contains(&self, node: &T) -> bool {
+        self.deps.contains_key(node)
+    }
+
+    pub fn len(&self) -> usize {
+        self.deps.len()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.deps.is_empty()
+    }
+
+    /// Whether any node depends on `node`.
+    pub fn has_dependents(&self, node: &T) -> bool {
+        self.dependents.get(node).is_some_and(|d| !d.is_empty())
+            || self.cycle_edges.values().any(|deps| deps.contains(node))
+    }
+
+    pub fn is_acyclic(&self) -> bool {
+        self.cycle_edges.is_empty()
+    }
+
+    /// Edges, as `(node, dependency)`, that close a cycle of the graph.
+    pub fn cycle_edges(&self) -> impl Iterator<Item = (&T, &T)> + '_ {
+        self.cycle_edges
+            .iter()
+            .flat_map(|(node, deps)| deps.iter().map(move |dep| (node, dep)))
+    }
+
+    /// All nodes, each after its dependencies (edges closing cycles aside).
+    pub fn topological_order(&self) -> Vec<&T> {
+        let mut nodes: Vec<&T> = self.deps.keys().collect();
+        nodes.sort_by_key(|node| self.position[*node]);
+        nodes
+    }
+
+    /// Adds `node` without dependencies, returning whether it is new.
+    pub fn add_node(&mut self, node: T) -> bool {
+        if self.position.contains_key(&node) {
+            return false;
+        }
+        self.position.insert(node.clone(), self.next_position);
+        self.next_position += 1;
+        self.deps.insert(node, BTreeSet::new());
+        true
+    }
+
+    /// Removes `node` and every edge from or to it, returning whether it existed.
+    pub fn remove_node(&mut self, node: &T) -> bool {
+        let Some(node_deps) = self.deps.remove(node) else {
+            return false;
+        };
+        self.position.remove(node);
+        for dep in &node_deps {
+            if let Some(dependents) = self.dependents.get_mut(dep) {
+                dependents.remove(node);
+            }
+        }
+        self.cycle_edges.remove(node);
+        for dependent in self.dependents.remove(node).into_iter().flatten() {
+            if let Some(deps) = self.deps.get_mut(&dependent) {
+                deps.remove(node);
+            }
+        }
+        let deps = &mut self.deps;
+        self.cycle_edges.retain(|source, targets| {
+            if targets.remove(node)
+                && let Some(source_deps) = deps.get_mut(source)
+            {
+                source_deps.remove(node);
+            }
+            !targets.is_empty()
+        });
+        self.retry_cycle_edges();
+        true
+    }
+
+    /// Makes `node` depend on `dep`, adding either node if new. Returns false if
+    /// the edge closes a cycle.
+    pub fn add_dependency(&mut self, node: T, dep: T) -> bool {
+        self.add_node(node.clone());
+        self.add_node(dep.clone());
+        let node_deps = self.deps.get_mut(&node).expect("added");
+        if !node_deps.insert(dep.clone()) {
+            return !self.is_cycle_edge(&node, &dep);
+        }
+        self.order_edge(node, dep)
+    }
+
+    /// Removes the dependency of `node` on `dep`, returning whether it existed.
+    pub fn remove_dependency(&mut self, node: &T, dep: &T) -> bool {
+        let removed = self.unlink(node, dep);
+        if removed {
+            self.retry_cycle_edges();
+        }
+        removed
+    }
+
+    /// Replaces the dependencies of `node`, adding it if new; only the edges
+    /// that differ are touched.
+    pub fn set_dependencies(&mut self, node: T, deps: BTreeSet<T>) {
+        self.add_node(node.clone());
+        let current = &self.deps[&node];
+        let removed: Vec<T> = current.difference(&deps).cloned().collect();
+        let added: Vec<T> = deps.difference(current).cloned().collect();
+        for dep in &removed {
+            self.unlink(&node, dep);
+        }
+        for dep in added {
+            self.add_dependency(node.clone(), dep);
+        }
+        if !removed.is_empty() {
+            self.retry_cycle_edges();
+        }
+    }
+
+    fn is_cycle_edge(&self, node: &T, dep: &T) -> bool {
+        self.cycle_edges
+            .get(node)
+            .is_some_and(|deps| deps.contains(dep))
+    }
+
+    fn unlink(&mut self, node: &T, dep: &T) -> bool {
+        if !self.deps.get_mut(node).is_some_and(|deps| deps.remove(dep)) {
+            return false;
+        }
+        if let Some(cycle_deps) = self.cycle_edges.get_mut(node)
+            && cycle_deps.remove(dep)
+        {
+            if cycle_deps.is_empty() {
+                self.cycle_edges.remove(node);
+            }
+        } else if let Some(dependents) = self.dependents.get_mut(dep) {
+            dependents.remove(node);
+        }
+        true
+    }
+
+    /// Brings an edge already in `deps` into the order, or records it as
+    /// closing a cycle.
+    fn order_edge(&mut self, node: T, dep: T) -> bool {
+        if node == dep || !self.reorder(&node, &dep) {
+            self.cycle_edges.entry(node).or_default().insert(dep);
+            return false;
+        }
+        self.dependents.entry(dep).or_default().insert(node);
+        true
+    }
+
+    /// Removing edges can open up cycles closed by earlier edges.
+    ///
+    /// Edges are retried one at a time: until its turn, each edge stays flagged
+    /// so the searches of the retries before it do not walk an edge the order
+    /// does not respect.
+    fn retry_cycle_edges(&mut self) {
+        let pending: Vec<(T, T)> = self
+            .cycle_edges()
+            .map(|(node, dep)| (node.clone(), dep.clone()))
+            .collect();
+        for (node, dep) in pending {
+            let cycle_deps = self.cycle_edges.get_mut(&node).expect("pending");
+            cycle_deps.remove(&dep);
+            if cycle_deps.is_empty() {
+                self.cycle_edges.remove(&node);
+            }
+            self.order_edge(node, dep);
+        }
+    }
+
+    /// Repositions nodes so `dep` comes before `node`. Returns false, leaving the
+    /// order untouched, if `dep` already depends on `node`.
+    fn reorder(&mut self, node: &T, dep: &T) -> bool {
+        let (lower, upper) = (self.position[node], self.position[dep]);
+        if upper < lower {
+            return true;
+        }
+
+        // `node` and its dependents positioned before `dep` must move after it
+        let mut forward = vec![node.clone()];
+        let mut seen = HashSet::from([node.clone()]);
+        let mut next = 0;
+        while let Some(current) = forward.get(next).cloned() {
+            next += 1;
+            for dependent in self.dependents.get(&current).into_iter().flatten() {
+                if dependent == dep {
+                    return false;
+                }
+                if self.position[dependent] < upper && seen.insert(dependent.clone()) {
+                    forward.push(dependent.clone());
+                }
+            }
+        }
+
+        // `dep` and its dependencies positioned after `node` must move before it
+        let mut backward = vec![dep.clone()];
+        let mut seen = HashSet::from([dep.clone()]);
+        let mut next = 0;
+        while let Some(current) = backward.get(next).cloned() {
+            next += 1;
+            for dependency in &self.deps[&current] {
+                if self.position[dependency] > lower
+                    && !self.is_cycle_edge(&current, dependency)
+                    && seen.insert(dependency.clone())
+                {
+                    backward.push(dependency.clone());
+                }
+            }
+        }
+
+        // Both sets keep their relative order and share the positions they held,
+        // the dependencies of `dep` first
+        forward.sort_by_key(|n| self.position[n]);
+        backward.sort_by_key(|n| self.position[n]);
+        let mut positions: Vec<u64> = forward
+            .iter()
+            .chain(&backward)
+            .map(|n| self.position[n])
+            .collect();
+        positions.sort_unstable();
+        for (n, position) in backward.into_iter().chain(forward).zip(positions) {
+            self.position.insert(n, position);
+        }
+        true
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::deps_mgmt::find_and_cut_cycles;
+
+    fn deps(edges: &[(&str, &[&str])]) -> BTreeMap<String, BTreeSet<String>> {
+        edges
+            .iter()
+            .map(|(node, deps)| {
+                (
+                    node.to_string(),
+                    deps.iter().map(|dep| dep.to_string()).collect(),
+                )
+            })
+            .collect()
+    }
+
+    /// Every ordered edge points backwards in the order, and the graph knows it
+    /// is acyclic exactly when a full search finds no cycle.
+    fn assert_consistent(graph: &IncrementalDeps<String>) {
+        let order: HashMap<&String, usize> = graph
+            .topological_order()
+            .into_iter()
+            .enumerate()
+            .map(|(i, node)| (node, i))
+            .collect();
+        for (node, node_deps) in graph.deps() {
+            for dep in node_deps {
+                assert!(
+                    graph.is_cycle_edge(node, dep) || order[dep] < order[node],
+                    "{dep} is not ordered before {node}"
+                );
+            }
+        }
+        let (cycles, _, _) = find_and_cut_cycles(graph.deps(), |_| true);
+        assert_eq!(graph.is_acyclic(), cycles.is_empty());
+    }
+
+    #[test]
+    fn edits_keep_dependencies_before_dependents() {
+        let mut graph = IncrementalDeps::from_deps(&deps(&[
+            ("a", &["b", "c"]),
+            ("b", &["d"]),
+            ("c", &["d"]),
+            ("e", &[]),
+        ]));
+        assert_consistent(&graph);
+        assert_eq!(graph.len(), 5);
+
+        // d now depends on e, which was positioned independently
+        assert!(graph.add_dependency("d".to_string(), "e".to_string()));
+        assert_consistent(&graph);
+        graph.set_dependencies("c".to_string(), BTreeSet::from(["f".to_string()]));
+        assert_consistent(&graph);
+        assert_eq!(
+            graph.dependencies(&"c".to_string()),
+            Some(&BTreeSet::from(["f".into()]))
+        );
+
+        assert!(graph.remove_node(&"b".to_string()));
+        assert_consistent(&graph);
+        assert_eq!(
+            graph.dependencies(&"a".to_string()),
+            Some(&BTreeSet::from(["c".into()]))
+        );
+        assert!(!graph.has_dependents(&"d".to_string()));
+    }
+
+    #[test]
+    fn cycles_are_detected_as_edges_close_them_and_clear_when_cut() {
+        let mut graph = IncrementalDeps::from_deps(&deps(&[("a", &["b"]), ("b", &["c"])]));
+        assert!(graph.is_acyclic());
+
+        assert!(!graph.add_dependency("c".to_string(), "a".to_string()));
+        assert!(!graph.is_acyclic());
+        assert_eq!(
+            graph.cycle_edges().collect::<Vec<_>>(),
+            vec![(&"c".to_string(), &"a".to_string())]
+        );
+        assert!(graph.deps()["c"].contains("a"));
+        assert_consistent(&graph);
+
+        // Cutting the cycle elsewhere lets the closing edge into the order
+        assert!(graph.remove_dependency(&"a".to_string(), &"b".to_string()));
+        assert!(graph.is_acyclic());
+        assert_consistent(&graph);
+
+        assert!(!graph.add_dependency("a".to_string(), "a".to_string()));
+        assert!(graph.remove_node(&"a".to_string()));
+        assert!(graph.is_acyclic());
+        assert_consistent(&graph);
+    }
+
+    #[test]
+    fn removing_edges_while_cycles_remain_keeps_them_detected() {
+        let mut graph = IncrementalDeps::new();
+        for (node, dep) in [("3", "2"), ("2", "3"), ("5", "2"), ("5", "3"), ("3", "5")] {
+            graph.add_dependency(node.to_string(), dep.to_string());
+        }
+        assert!(graph.remove_dependency(&"3".to_string(), &"2".to_string()));
+        assert_consistent(&graph);
+        // 2 -> 3 -> 5 -> 2 is still a cycle
+        assert!(graph.remove_dependency(&"5".to_string(), &"3".to_string()));
+        assert!(!graph.is_acyclic());
+        assert_consistent(&graph);
+    }
+
+    #[test]
+    fn from_deps_orders_graphs_with_cycles() {
+        let graph = IncrementalDeps::from_deps(&deps(&[
+            ("a", &["b"]),
+            ("b", &["c"]),
+            ("c", &["a", "d"]),
+            ("e", &["a"]),
+        ]));
+        assert!(!graph.is_acyclic());
+        assert_eq!(graph.cycle_edges().count(), 1);
+        assert_consistent(&graph);
+    }
+
+    #[test]
+    fn random_edits_match_a_full_rebuild() {
+        let mut state: u64 = 0x2545_f491_4f6c_dd1d;
+        let mut next = |bound: usize| {
+            state = state
+                .wrapping_mul(6364136223846793005)
+                .wrapping_add(1442695040888963407);
+            (state >> 33) as usize % bound
+        };
+        let name = |i: usize| format!("model.p.m{i:02}");
+
+        let mut graph = IncrementalDeps::new();
+        for _ in 0..2000 {
+            let (node, dep) = (name(next(30)), name(next(30)));
+            match next(10) {
+                0 => {
+                    graph.remove_node(&node);
+                }
+                1..=3 => {
+                    graph.remove_dependency(&node, &dep);
+                }
+                // Mostly edges from later to earlier nodes, as in a project
+                _ if node > dep || next(20) == 0 => {
+                    graph.add_dependency(node, dep);
+                }
+                _ => {}
+            }
+            assert_consistent(&graph);
+        }
+
+        let rebuilt = IncrementalDeps::from_deps(graph.deps());
+        assert_eq!(rebuilt.deps(), graph.deps());
+        assert_eq!(rebuilt.is_acyclic(), graph.is_acyclic());
+    }
+
+    #[test]
+    fn random_edits_on_a_cyclic_graph_stay_consistent() {
+        let mut state: u64 = 0x2545_f491_4f6c_dd1d;
+        let mut next = |bound: usize| {
+            state = state
+                .wrapping_mul(6364136223846793005)
+                .wrapping_add(1442695040888963407);
+            (state >> 33) as usize % bound
+        };
+        let name = |i: usize| format!("model.p.m{i:02}");
+
+        // Few nodes and edges in either direction, so most edits, removals
+        // included, happen while cycles exist
+        let mut graph = IncrementalDeps::new();
+        for _ in 0..1000 {
+            let (node, dep) = (name(next(12)), name(next(12)));
+            match next(10) {
+                0 => {
+                    graph.remove_node(&node);
+                }
+                1..=4 => {
+                    graph.remove_dependency(&node, &dep);
+                }
+                _ => {
+                    graph.add_dependency(node, dep);
+                }
+            }
+            assert_consistent(&graph);
+        }
+    }
+}
@@ -1,2 +1,4 @@
+pub mod dep_graph;
 pub mod deps_mgmt;
+pub mod incremental;
 pub mod schedule;
@@ -0,0 +1,109 @@
+//! Performance smoke tests for the dependency graph algorithms.
+//!
+//! These are not micro-benchmarks — they measure wall-clock time on synthetic
+//! project-shaped graphs and print results so regressions are visible.
+//! Run with: cargo test -p dbt-dag --release -- --ignored --nocapture
+
+use std::{
+    collections::{BTreeMap, BTreeSet},
+    hint::black_box,
+    time::Instant,
+};
+
+use dbt_dag::dep_graph::DepGraph;
+use dbt_dag::deps_mgmt::{
+    find_and_cut_cycles, get_all_upstream_deps, restrict_with_transitive, reverse,
+    topological_levels, topological_sort,
+};
+use dbt_dag::incremental::IncrementalDeps;
+
+/// `n` models, each depending on up to three earlier ones (pseudo-random but
+/// deterministic), named like real unique ids.
+fn make_deps(n: usize) -> BTreeMap<String, BTreeSet<String>> {
+    let mut state: u64 = 0x2545_f491_4f6c_dd1d;
+    let mut next = |bound: usize| {
+        state = state
+            .wrapping_mul(6364136223846793005)
+            .wrapping_add(1442695040888963407);
+        (state >> 33) as usize % bound
+    };
+    let id = |i: usize| format!("model.analytics.stg_model_{i:07}");
+    (0..n)
+        .map(|i| {
+            let parents = if i < 10 {
+                BTreeSet::new()
+            } else {
+                (0..next(4)).map(|_| id(next(i))).collect()
+            };
+            (id(i), parents)
+        })
+        .collect()
+}
+
+fn timed<R>(results: &mut Vec<String>, label: &str, f: impl FnOnce() -> R) -> R {
+    let start = Instant::now();
+    let result = black_box(f());
+    results.push(format!("{label}={}ms", start.elapsed().as_millis()));
+    result
+}
+
+fn run_perf(n: usize) {
+    let deps = make_deps(n);
+    let edges: usize = deps.values().map(BTreeSet::len).sum();
+    // The last 1% of models, as if selected with `+model` style selectors
+    let selected: BTreeSet<String> = deps.keys().rev().take(n / 100).cloned().collect();
+    // Every other model, as if the rest were excluded
+    let restricted: BTreeSet<String> = deps.keys().step_by(2).cloned().collect();
+
+    let mut results = Vec::new();
+    let graph = timed(&mut results, "intern", || DepGraph::from_deps(&deps));
+    assert_eq!(graph.len(), n);
+    let sorted = timed(&mut results, "topological_sort", || topological_sort(&deps));
+    assert_eq!(sorted.len(), n);
+    timed(&mut results, "topological_levels", || {
+        topological_levels(&deps)
+    });
+    timed(&mut results, "get_all_upstream_deps", || {
+        get_all_upstream_deps(&deps, &selected)
+    });
+    timed(&mut results, "restrict_with_transitive", || {
+        restrict_with_transitive(&deps, &restricted)
+    });
+    let (cycles, _, _) = timed(&mut results, "find_and_cut_cycles", || {
+        find_and_cut_cycles(&deps, |_| true)
+    });
+    assert!(cycles.is_empty());
+    timed(&mut results, "reverse", || reverse(&deps));
+    let mut incremental = timed(&mut results, "incremental_from_deps", || {
+        IncrementalDeps::from_deps(&deps)
+    });
+    // An edit making one root model select from another
+    let (edited, parent) = (
+        deps.keys().nth(5).unwrap().clone(),
+        deps.keys().nth(9).unwrap().clone(),
+    );
+    timed(&mut results, "incremental_edit", || {
+        incremental.set_dependencies(edited, BTreeSet::from([parent]))
+    });
+    assert!(incremental.is_acyclic());
+
+    println!("[perf/dag] nodes={n} edges={edges} | {}", results.join(" "));
+}
+
+#[test]
+#[ignore = "timing only — run locally with: cargo test -p dbt-dag --release -- --ignored"]
+fn perf_10k_nodes() {
+    run_perf(10_000);
+}
+
+#[test]
+#[ignore = "timing only — run locally with: cargo test -p dbt-dag --release -- --ignored"]
+fn perf_100k_nodes() {
+    run_perf(100_000);
+}
+
+#[test]
+#[ignore = "timing only — run locally with: cargo test -p dbt-dag --release -- --ignored"]
+fn perf_500k_nodes() {
+    run_perf(500_000);
+}
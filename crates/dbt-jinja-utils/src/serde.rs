@@ -276,6 +276,32 @@ where
         show_errors_or_warnings,
         dependency_package_name,
     )?;
+    from_yaml_value_raw(value, show_errors_or_warnings, dependency_package_name)
+}
+
+/// Parses a Yaml string into a `Value` without deserializing it, returning the
+/// duplicate-key diagnostics instead of emitting them.
+///
+/// Together with [`from_yaml_value_raw`] this splits [`from_yaml_raw`] so the
+/// parse can run off the calling thread (or be reused) while diagnostics are
+/// still reported by the caller, in order.
+pub fn parse_yaml_raw(
+    input: &str,
+    error_display_path: Option<&Path>,
+) -> FsResult<(Value, Vec<FsError>)> {
+    value_from_str_collecting(dbt_sanitize_yml(input), error_display_path)
+}
+
+/// Deserializes a `Value` produced by [`parse_yaml_raw`] into a Rust type T,
+/// without applying Jinja.
+pub fn from_yaml_value_raw<T>(
+    value: Value,
+    show_errors_or_warnings: bool,
+    dependency_package_name: Option<&str>,
+) -> FsResult<T>
+where
+    T: DeserializeOwned,
+{
     // Use the identity transform for the 'raw' version of this function.
     let expand_jinja = |_: &Value| Ok(None);
 
@@ -331,8 +357,24 @@ fn value_from_str(
     show_errors_or_warnings: bool,
     dependency_package_name: Option<&str>,
 ) -> FsResult<Value> {
+    let (value, duplicate_keys) = value_from_str_collecting(input, error_display_path)?;
+    if show_errors_or_warnings {
+        for duplicate_key_error in duplicate_keys {
+            emit_strict_parse_error(duplicate_key_error, dependency_package_name);
+        }
+    }
+    Ok(value)
+}
+
+/// Like [`value_from_str`], but returns duplicate-key diagnostics to the caller.
+fn value_from_str_collecting(
+    input: &str,
+    error_display_path: Option<&Path>,
+) -> FsResult<(Value, Vec<FsError>)> {
     let _f = dbt_yaml::with_filename(error_display_path.map(PathBuf::from));
 
+    let mut duplicate_keys = Vec::new();
+
     let mut value = Value::from_str(input, |path, key, existing_key| {
         let key_repr = dbt_yaml::to_string(&key).unwrap_or_else(|_| "<opaque>".to_string());
         let path = strip_dunder_fields_from_path(&path.to_string());
@@ -346,10 +388,7 @@ fn value_from_str(
             existing_key.span().start.column,
             path
         );
-
-        if show_errors_or_warnings {
-            emit_strict_parse_error(*duplicate_key_error, dependency_package_name);
-        }
+        duplicate_keys.push(*duplicate_key_error);
         // last key wins:
         dbt_yaml::mapping::DuplicateKey::Overwrite
     })
@@ -358,7 +397,7 @@ fn value_from_str(
         .apply_merge()
         .map_err(|e| yaml_to_fs_error(e, error_display_path))?;
 
-    Ok(value)
+    Ok((value, duplicate_keys))
 }
 
 /// Variant of into_typed_with_jinja which returns diagnostics rather than emitting them.
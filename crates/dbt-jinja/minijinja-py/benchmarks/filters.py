@@ -0,0 +1,84 @@
+"""Compares builtin (Rust) filters with equivalent Python callbacks.
+
+Run after `make develop-release`:
+
+    .venv/bin/python benchmarks/filters.py
+"""
+
+import json
+import re
+import timeit
+
+from minijinja import Environment
+
+TEMPLATE = """\
+{%- for item in items -%}
+{{ item.tags|length }} tag{{ item.tags|pluralize }}
+{{ item.description|wordcount }} {{ item.size|filesizeformat }}
+{{ item.id|as_text }} {{ item.count|as_number }} {{ item|tojson }}
+{% endfor -%}
+"""
+
+
+def py_pluralize(value, singular="", plural="s"):
+    return singular if len(value) == 1 else plural
+
+
+def py_wordcount(value):
+    return len(re.findall(r"\w+", value))
+
+
+def py_filesizeformat(value):
+    for unit in ("Bytes", "kB", "MB", "GB"):
+        if value < 1000:
+            return "%d %s" % (value, unit)
+        value /= 1000.0
+    return "%.1f TB" % value
+
+
+def py_tojson(value):
+    return json.dumps(value)
+
+
+PY_FILTERS = {
+    "pluralize": py_pluralize,
+    "wordcount": py_wordcount,
+    "filesizeformat": py_filesizeformat,
+    "as_text": str,
+    "as_number": int,
+    "tojson": py_tojson,
+}
+
+
+def make_items(count):
+    return [
+        {
+            "id": i,
+            "count": str(i),
+            "size": i * 1024,
+            "tags": ["a"] * (i % 3),
+            "description": "lorem ipsum dolor sit amet " * (i % 5 + 1),
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    items = make_items(1000)
+    envs = {
+        "rust": Environment(
+            templates={"bench": TEMPLATE}, builtin_filter_sets=["contrib", "dbt"]
+        ),
+        "python": Environment(templates={"bench": TEMPLATE}, filters=PY_FILTERS),
+    }
+    for name, env in envs.items():
+        env.render_template("bench", items=items)
+        runs = 20
+        seconds = timeit.timeit(
+            lambda: env.render_template("bench", items=items), number=runs
+        )
+        print("%-8s %8.2f ms/render" % (name, seconds / runs * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Measures the conversion of Python values into template values.
+
+Renders templates over dict-heavy contexts so that every value is converted
+once per access.  Run after `make develop-release`:
+
+    .venv/bin/python benchmarks/typeconv.py
+"""
+
+import timeit
+
+from minijinja import Environment, safe
+
+ITEMS = 10_000
+
+TEMPLATE = """\
+{%- for row in rows -%}
+{{ row.name }}{{ row.id }}{{ row.score }}{{ row.active }}{{ row.missing }}
+{%- endfor -%}
+"""
+
+
+def make_rows(count, name_factory=str):
+    return [
+        {
+            "name": name_factory("row-%d" % i),
+            "id": i,
+            "score": i / 3,
+            "active": i % 2 == 0,
+            "missing": None,
+        }
+        for i in range(count)
+    ]
+
+
+def bench(label, env, **context):
+    env.render_str(TEMPLATE, **context)
+    runs = 10
+    seconds = timeit.timeit(lambda: env.render_str(TEMPLATE, **context), number=runs)
+    values = len(context["rows"]) * 5
+    print(
+        "%-16s %8.2f ms/render %8.0f ns/value"
+        % (label, seconds / runs * 1000, seconds / runs / values * 1e9)
+    )
+
+
+def main():
+    env = Environment()
+    bench("builtin types", env, rows=make_rows(ITEMS))
+    bench("safe strings", env, rows=make_rows(ITEMS, safe))
+
+
+if __name__ == "__main__":
+    main()
@@ -43,6 +43,9 @@ class Environment(_lowlevel.Environment):
         comment_end_string="#}",
         line_statement_prefix=None,
         line_comment_prefix=None,
+        load_cache=None,
+        cache_stamp=None,
+        builtin_filter_sets=None,
     ):
         super().__init__()
         if loader is not None:
@@ -53,6 +56,9 @@ class Environment(_lowlevel.Environment):
             self.loader = dict(templates).get
         if fuel is not None:
             self.fuel = fuel
+        if builtin_filter_sets:
+            for name in builtin_filter_sets:
+                self.add_builtin_filter_set(name)
         if filters:
             for name, callback in filters.items():
                 self.add_filter(name, callback)
@@ -90,6 +96,10 @@ class Environment(_lowlevel.Environment):
         self.line_statement_prefix = line_statement_prefix
         self.line_comment_prefix = line_comment_prefix
 
+        # Last, so restored templates are precompiled with the final syntax
+        if load_cache is not None:
+            self.load_cache(load_cache, stamp=cache_stamp, precompile=True)
+
 
 DEFAULT_ENVIRONMENT = Environment()
 
@@ -5,11 +5,12 @@ from typing import (
     Literal,
     TypeVar,
     Protocol,
+    TypedDict,
     overload,
 )
 from typing_extensions import Final, TypeAlias, Self
 from minijinja._lowlevel import State
-from collections.abc import Mapping
+from collections.abc import Iterable, Mapping
 
 __all__ = [
     "Environment",
@@ -30,7 +31,16 @@ class _PassesState(Protocol[_A_contra, _R_co]):
     __minijinja_pass_state__: Literal[True]
 
 _StrPath: TypeAlias = PurePath | str
+_LoaderResult: TypeAlias = str | tuple[str, Callable[[], bool] | None] | None
 _Behavior = Literal["strict", "lenient", "chainable"]
+_BuiltinFilterSet = Literal["contrib", "dbt"]
+
+class _ProfileEntry(TypedDict):
+    kind: Literal["template", "macro", "filter", "test", "function"]
+    name: str
+    calls: int
+    total_time: float
+    self_time: float
 
 DEFAULT_ENVIRONMENT: Final[Environment]
 
@@ -38,7 +48,7 @@ def render_str(source: str, name: str | None = None, /, **context: Any) -> str:
 def eval_expr(expression: str, /, **context: Any) -> Any: ...
 
 class Environment:
-    loader: Callable[[str], str] | None
+    loader: Callable[[str], _LoaderResult] | None
     fuel: int | None
     debug: bool
     undefined_behavior: _Behavior
@@ -57,11 +67,13 @@ class Environment:
     comment_end_string: str
     line_statement_prefix: str | None
     line_comment_prefix: str | None
+    @property
+    def profiling(self) -> bool: ...
 
     @overload
     def __init__(
         self,
-        loader: Callable[[str], str] | None = None,
+        loader: Callable[[str], _LoaderResult] | None = None,
         templates: Mapping[str, str] | None = None,
         filters: Mapping[str, Callable[[Any], Any]] | None = None,
         tests: Mapping[str, Callable[[Any], bool]] | None = None,
@@ -84,11 +96,14 @@ class Environment:
         comment_end_string: str = "#}",
         line_statement_prefix: str | None = None,
         line_comment_prefix: str | None = None,
+        load_cache: _StrPath | None = None,
+        cache_stamp: Callable[[str], str | None] | None = None,
+        builtin_filter_sets: Iterable[_BuiltinFilterSet] | None = None,
     ) -> None: ...
     @overload
     def __init__(
         self,
-        loader: Callable[[str], str] | None = None,
+        loader: Callable[[str], _LoaderResult] | None = None,
         templates: Mapping[str, str] | None = None,
         filters: Mapping[str, Callable[[Any], Any]] | None = None,
         tests: Mapping[str, Callable[[Any], bool]] | None = None,
@@ -111,7 +126,11 @@ class Environment:
         comment_end_string: str = "#}",
         line_statement_prefix: str | None = None,
         line_comment_prefix: str | None = None,
+        load_cache: _StrPath | None = None,
+        cache_stamp: Callable[[str], str | None] | None = None,
+        builtin_filter_sets: Iterable[_BuiltinFilterSet] | None = None,
     ) -> None: ...
+    def add_builtin_filter_set(self, name: _BuiltinFilterSet) -> None: ...
     def remove_filter(self, name: str) -> None: ...
     def add_test(self, name: str, test: Callable[[Any], bool]) -> None: ...
     def remove_test(self, name: str) -> None: ...
@@ -122,6 +141,22 @@ class Environment:
         self, source: str, name: str | None = None, /, **context: Any
     ) -> str: ...
     def eval_expr(self, expression: str, /, **context: Any) -> Any: ...
+    def reload(self) -> None: ...
+    def loader_cache_info(self) -> dict[str, int]: ...
+    def save_cache(
+        self, path: _StrPath, stamp: Callable[[str], str | None] | None = None
+    ) -> None: ...
+    def load_cache(
+        self,
+        path: _StrPath,
+        stamp: Callable[[str], str | None] | None = None,
+        precompile: bool = False,
+    ) -> int: ...
+    def enable_profiling(self) -> None: ...
+    def disable_profiling(self) -> None: ...
+    def profile_stats(self) -> list[_ProfileEntry]: ...
+    def write_folded_stacks(self, path: _StrPath) -> None: ...
+    def reset_profile(self) -> None: ...
 
 class TemplateError(RuntimeError):
     def __init__(self, message: str) -> None: ...
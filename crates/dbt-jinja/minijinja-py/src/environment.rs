@@ -1,7 +1,9 @@
 use std::borrow::Cow;
+use std::collections::HashMap;
 use std::ffi::c_void;
+use std::path::PathBuf;
 use std::sync::atomic::{AtomicBool, AtomicPtr, Ordering};
-use std::sync::Mutex;
+use std::sync::{Arc, Mutex};
 
 use minijinja::syntax::SyntaxConfig;
 use minijinja::value::{Rest, Value};
@@ -12,9 +14,12 @@ use pyo3::pybacked::PyBackedStr;
 use pyo3::types::{PyDict, PyTuple};
 
 use crate::error_support::{report_unraisable, to_minijinja_error, to_py_error};
+use crate::profiler::{Profiler, ProfilingListener};
 use crate::state::bind_state;
+use crate::template_cache;
 use crate::typeconv::{
-    get_custom_autoescape, to_minijinja_value, to_python_args, to_python_value, DynamicObject,
+    clear_html_method_cache, get_custom_autoescape, to_minijinja_value, to_python_args,
+    to_python_value, DynamicObject,
 };
 
 thread_local! {
@@ -91,9 +96,30 @@ macro_rules! syntax_getter {
     }};
 }
 
+/// Bookkeeping for templates that were produced by the loader.
+///
+/// The compiled templates themselves live in the MiniJinja environment.  This
+/// only remembers the `uptodate` callback the loader returned for each name so
+/// that a reload can keep templates that did not change.
+#[derive(Default)]
+struct LoaderCache {
+    uptodate: HashMap<String, Option<Py<PyAny>>>,
+    loads: u64,
+    hits: u64,
+    invalidations: u64,
+}
+
+/// Template sources restored from a persisted cache, keyed by name.
+///
+/// Entries are handed to MiniJinja (and compiled) when they are precompiled or
+/// the first time the template is requested, and are consumed in the process.
+type PreloadedSources = Arc<Mutex<HashMap<String, String>>>;
+
 struct Inner {
     env: minijinja::Environment<'static>,
     loader: Option<Py<PyAny>>,
+    loader_cache: Arc<Mutex<LoaderCache>>,
+    preloaded: PreloadedSources,
     auto_escape_callback: Option<Py<PyAny>>,
     finalizer_callback: Option<Py<PyAny>>,
     path_join_callback: Option<Py<PyAny>>,
@@ -103,8 +129,10 @@ struct Inner {
 /// Represents a MiniJinja environment.
 #[pyclass(subclass, module = "minijinja._lowlevel")]
 pub struct Environment {
-    inner: Mutex<Inner>,
+    /// Shared with the thread precompiling templates restored by `load_cache`.
+    inner: Arc<Mutex<Inner>>,
     reload_before_render: AtomicBool,
+    profiler: Arc<Profiler>,
 }
 
 #[pymethods]
@@ -112,15 +140,18 @@ impl Environment {
     #[new]
     fn py_new() -> PyResult<Self> {
         Ok(Environment {
-            inner: Mutex::new(Inner {
+            inner: Arc::new(Mutex::new(Inner {
                 env: minijinja::Environment::new(),
                 loader: None,
+                loader_cache: Arc::new(Mutex::new(LoaderCache::default())),
+                preloaded: Arc::new(Mutex::new(HashMap::new())),
                 auto_escape_callback: None,
                 finalizer_callback: None,
                 path_join_callback: None,
                 syntax: None,
-            }),
+            })),
             reload_before_render: AtomicBool::new(false),
+            profiler: Arc::new(Profiler::default()),
         })
     }
 
@@ -194,17 +225,21 @@ impl Environment {
             return Err(PyRuntimeError::new_err("expected callback"));
         }
         let callback: Py<PyAny> = callback.clone().unbind();
+        let profiler = self.profiler.clone();
+        let profile_name = name.to_string();
         self.inner.lock().unwrap().env.add_filter(
             name.to_string(),
             move |state: &State, args: Rest<Value>| -> Result<Value, Error> {
-                Python::with_gil(|py| {
-                    bind_state(state, || {
-                        let (py_args, py_kwargs) = to_python_args(py, callback.bind(py), &args)
-                            .map_err(to_minijinja_error)?;
-                        let rv = callback
-                            .call_bound(py, py_args, py_kwargs.as_ref())
-                            .map_err(to_minijinja_error)?;
-                        Ok(to_minijinja_value(rv.bind(py)))
+                profiler.scope("filter", &profile_name, || {
+                    Python::with_gil(|py| {
+                        bind_state(state, || {
+                            let (py_args, py_kwargs) = to_python_args(py, callback.bind(py), &args)
+                                .map_err(to_minijinja_error)?;
+                            let rv = callback
+                                .call_bound(py, py_args, py_kwargs.as_ref())
+                                .map_err(to_minijinja_error)?;
+                            Ok(to_minijinja_value(rv.bind(py)))
+                        })
                     })
                 })
             },
@@ -212,6 +247,39 @@ impl Environment {
         Ok(())
     }
 
+    /// Registers a set of filters implemented natively in Rust.
+    ///
+    /// `"contrib"` adds the utility filters from `minijinja-contrib` (`pluralize`,
+    /// `filesizeformat`, `truncate`, `wordcount`, `wordwrap`, `datetimeformat`,
+    /// `dateformat` and `timeformat`), `"dbt"` adds the dbt filters (`as_native`,
+    /// `as_text`, `as_bool` and `as_number`).  Unlike filters registered with
+    /// `add_filter` these do not need to call back into Python.
+    #[pyo3(text_signature = "(self, name)")]
+    pub fn add_builtin_filter_set(&self, name: &str) -> PyResult<()> {
+        let mut inner = self.inner.lock().unwrap();
+        let env = &mut inner.env;
+        match name {
+            "contrib" => {
+                use minijinja_contrib::filters;
+                env.add_filter("pluralize", filters::pluralize);
+                env.add_filter("filesizeformat", filters::filesizeformat);
+                env.add_filter("truncate", filters::truncate);
+                env.add_filter("wordcount", filters::wordcount);
+                env.add_filter("wordwrap", filters::wordwrap);
+                env.add_filter("datetimeformat", filters::datetimeformat);
+                env.add_filter("dateformat", filters::dateformat);
+                env.add_filter("timeformat", filters::timeformat);
+            }
+            "dbt" => dbt_jinja_filters::register_filters(env),
+            _ => {
+                return Err(PyRuntimeError::new_err(format!(
+                    "unknown builtin filter set {name:?}"
+                )))
+            }
+        }
+        Ok(())
+    }
+
     /// Removes a filter function.
     #[pyo3(text_signature = "(self, name)")]
     pub fn remove_filter(&self, name: &str) -> PyResult<()> {
@@ -226,17 +294,21 @@ impl Environment {
             return Err(PyRuntimeError::new_err("expected callback"));
         }
         let callback: Py<PyAny> = callback.clone().unbind();
+        let profiler = self.profiler.clone();
+        let profile_name = name.to_string();
         self.inner.lock().unwrap().env.add_test(
             name.to_string(),
             move |state: &State, args: Rest<Value>| -> Result<bool, Error> {
-                Python::with_gil(|py| {
-                    bind_state(state, || {
-                        let (py_args, py_kwargs) = to_python_args(py, callback.bind(py), &args)
-                            .map_err(to_minijinja_error)?;
-                        let rv = callback
-                            .call_bound(py, py_args, py_kwargs.as_ref())
-                            .map_err(to_minijinja_error)?;
-                        Ok(to_minijinja_value(rv.bind(py)).is_true())
+                profiler.scope("test", &profile_name, || {
+                    Python::with_gil(|py| {
+                        bind_state(state, || {
+                            let (py_args, py_kwargs) = to_python_args(py, callback.bind(py), &args)
+                                .map_err(to_minijinja_error)?;
+                            let rv = callback
+                                .call_bound(py, py_args, py_kwargs.as_ref())
+                                .map_err(to_minijinja_error)?;
+                            Ok(to_minijinja_value(rv.bind(py)).is_true())
+                        })
                     })
                 })
             },
@@ -253,17 +325,21 @@ impl Environment {
 
     fn add_function(&self, name: &str, callback: &Bound<'_, PyAny>) -> PyResult<()> {
         let callback: Py<PyAny> = callback.clone().unbind();
+        let profiler = self.profiler.clone();
+        let profile_name = name.to_string();
         self.inner.lock().unwrap().env.add_function(
             name.to_string(),
             move |state: &State, args: Rest<Value>| -> Result<Value, Error> {
-                Python::with_gil(|py| {
-                    bind_state(state, || {
-                        let (py_args, py_kwargs) = to_python_args(py, callback.bind(py), &args)
-                            .map_err(to_minijinja_error)?;
-                        let rv = callback
-                            .call_bound(py, py_args, py_kwargs.as_ref())
-                            .map_err(to_minijinja_error)?;
-                        Ok(to_minijinja_value(rv.bind(py)))
+                profiler.scope("function", &profile_name, || {
+                    Python::with_gil(|py| {
+                        bind_state(state, || {
+                            let (py_args, py_kwargs) = to_python_args(py, callback.bind(py), &args)
+                                .map_err(to_minijinja_error)?;
+                            let rv = callback
+                                .call_bound(py, py_args, py_kwargs.as_ref())
+                                .map_err(to_minijinja_error)?;
+                            Ok(to_minijinja_value(rv.bind(py)))
+                        })
                     })
                 })
             },
@@ -405,6 +481,11 @@ impl Environment {
     /// The loader function is invoked with the name of the template to load.  If the
     /// template exists the source code of the template should be returned a string,
     /// otherwise `None` can be used to indicate that the template does not exist.
+    ///
+    /// Alternatively the loader can return a `(source, uptodate)` tuple where
+    /// `uptodate` is a callable that returns `True` as long as the template has not
+    /// changed.  Such templates survive a reload without being loaded or compiled
+    /// again.
     #[setter]
     pub fn set_loader(&self, callback: Option<&Bound<'_, PyAny>>) -> PyResult<()> {
         let callback = match callback {
@@ -420,19 +501,42 @@ impl Environment {
         Python::with_gil(|py| {
             inner.loader = callback.as_ref().map(|x| x.clone_ref(py));
         });
+        inner.loader_cache.lock().unwrap().uptodate.clear();
 
         if let Some(callback) = callback {
+            let loader_cache = inner.loader_cache.clone();
+            let preloaded = inner.preloaded.clone();
             inner.env.set_loader(move |name| {
+                if let Some(source) = preloaded.lock().unwrap().remove(name) {
+                    return Ok(Some(source));
+                }
                 Python::with_gil(|py| {
                     let callback = callback.bind(py);
                     let rv = callback
                         .call1(PyTuple::new_bound(py, [name]))
                         .map_err(to_minijinja_error)?;
                     if rv.is_none() {
-                        Ok(None)
-                    } else {
-                        Ok(Some(rv.to_string()))
+                        return Ok(None);
                     }
+                    let (source, uptodate) = match rv.downcast::<PyTuple>() {
+                        Ok(tup) if tup.len() == 2 => {
+                            let uptodate = tup.get_item(1).map_err(to_minijinja_error)?;
+                            if !uptodate.is_none() && !uptodate.is_callable() {
+                                return Err(to_minijinja_error(PyRuntimeError::new_err(
+                                    "loader returned a non callable uptodate value",
+                                )));
+                            }
+                            (
+                                tup.get_item(0).map_err(to_minijinja_error)?.to_string(),
+                                (!uptodate.is_none()).then(|| uptodate.unbind()),
+                            )
+                        }
+                        _ => (rv.to_string(), None),
+                    };
+                    let mut loader_cache = loader_cache.lock().unwrap();
+                    loader_cache.loads += 1;
+                    loader_cache.uptodate.insert(name.to_string(), uptodate);
+                    Ok(Some(source))
                 })
             })
         }
@@ -440,6 +544,100 @@ impl Environment {
         Ok(())
     }
 
+    /// Writes the sources of all known templates to a cache file.
+    ///
+    /// The file can be passed to `load_cache` in another process to register the
+    /// templates without calling the loader.  If given, `stamp` is called with
+    /// each template name and returns a freshness token for it (or `None`), which
+    /// `load_cache` compares to tell whether the template changed since.
+    #[pyo3(signature = (path, stamp=None))]
+    pub fn save_cache(
+        &self,
+        py: Python<'_>,
+        path: PathBuf,
+        stamp: Option<&Bound<'_, PyAny>>,
+    ) -> PyResult<()> {
+        let templates = {
+            let inner = self.inner.lock().unwrap();
+            let preloaded = inner.preloaded.lock().unwrap();
+            inner
+                .env
+                .templates()
+                .map(|(name, tmpl)| (name.to_string(), tmpl.source().to_string()))
+                .chain(
+                    preloaded
+                        .iter()
+                        .map(|(name, source)| (name.clone(), source.clone())),
+                )
+                .collect::<Vec<_>>()
+        };
+        let stamps = templates
+            .iter()
+            .map(|(name, _)| call_stamp(py, stamp, name))
+            .collect::<PyResult<Vec<_>>>()?;
+        let buf = template_cache::encode(
+            templates
+                .iter()
+                .zip(&stamps)
+                .map(|((name, source), stamp)| (&**name, &**source, stamp.as_deref())),
+        );
+        std::fs::write(path, buf)?;
+        Ok(())
+    }
+
+    /// Restores templates from a cache file written by `save_cache`.
+    ///
+    /// The cache skips loader calls.  With `precompile`, the restored templates
+    /// are also compiled on a background thread, one at a time so renders are not
+    /// held up; a template rendered before its turn is compiled by that render.
+    /// The environment must be configured (syntax, whitespace options) before.
+    /// Without `precompile`, restored templates are compiled on first use.  If `stamp` is given, an entry is only restored
+    /// if it was saved with a stamp equal to what `stamp` returns for its name
+    /// now, so that templates changed on disk go through the loader again.
+    /// Without `stamp`, entries are trusted as they are.  Files written by another
+    /// version are ignored and entries that fail validation are skipped, in which
+    /// case the loader is used as usual.  Returns the number of restored
+    /// templates.
+    #[pyo3(signature = (path, stamp=None, precompile=false))]
+    pub fn load_cache(
+        &self,
+        py: Python<'_>,
+        path: PathBuf,
+        stamp: Option<&Bound<'_, PyAny>>,
+        precompile: bool,
+    ) -> PyResult<usize> {
+        let entries = match std::fs::read(path) {
+            Ok(buf) => template_cache::decode(&buf),
+            Err(err) if err.kind() == std::io::ErrorKind::NotFound => return Ok(0),
+            Err(err) => return Err(err.into()),
+        };
+        let mut fresh = HashMap::new();
+        for (name, entry) in entries {
+            if stamp.is_some() {
+                let current = call_stamp(py, stamp, &name)?;
+                if current.is_none() || current != entry.stamp {
+                    continue;
+                }
+            }
+            fresh.insert(name, entry.source);
+        }
+        let names = precompile.then(|| fresh.keys().cloned().collect::<Vec<_>>());
+        let mut inner = self.inner.lock().unwrap();
+        let rv = fresh.len();
+        inner.preloaded.lock().unwrap().extend(fresh);
+        if inner.loader.is_none() {
+            let preloaded = inner.preloaded.clone();
+            inner
+                .env
+                .set_loader(move |name| Ok(preloaded.lock().unwrap().remove(name)));
+        }
+        drop(inner);
+        if let Some(names) = names {
+            spawn_precompile(self.inner.clone(), names);
+        }
+        Ok(rv)
+    }
+
     /// Returns the current loader.
     #[getter]
     pub fn get_loader(&self, py: Python<'_>) -> Option<Py<PyAny>> {
@@ -489,15 +687,61 @@ impl Environment {
     }
 
     /// Triggers a reload of the templates.
+    ///
+    /// Templates for which the loader returned an `uptodate` callback are only
+    /// dropped if that callback reports a change.  All other templates are
+    /// dropped unconditionally.
     pub fn reload(&self, py: Python<'_>) -> PyResult<()> {
         let mut inner = self.inner.lock().unwrap();
-        let loader = inner.loader.as_ref().map(|x| x.clone_ref(py));
-        if loader.is_some() {
-            inner.env.clear_templates();
+        if inner.loader.is_none() {
+            return Ok(());
+        }
+        let loader_cache = inner.loader_cache.clone();
+        let mut loader_cache = loader_cache.lock().unwrap();
+        let names = inner
+            .env
+            .templates()
+            .map(|(name, _)| name.to_string())
+            .collect::<Vec<_>>();
+        for name in names {
+            let fresh = match loader_cache.uptodate.get(&name) {
+                Some(Some(uptodate)) => {
+                    match uptodate.call0(py).and_then(|rv| rv.bind(py).is_truthy()) {
+                        Ok(fresh) => fresh,
+                        Err(err) => {
+                            report_unraisable(py, err);
+                            false
+                        }
+                    }
+                }
+                _ => false,
+            };
+            if fresh {
+                loader_cache.hits += 1;
+            } else {
+                loader_cache.invalidations += 1;
+                loader_cache.uptodate.remove(&name);
+                inner.env.remove_template(&name);
+            }
         }
         Ok(())
     }
 
+    /// Returns statistics about the loader cache.
+    ///
+    /// `loads` counts invocations of the loader, `hits` counts templates that were
+    /// kept by a reload and `invalidations` counts templates that were dropped.
+    pub fn loader_cache_info(&self, py: Python<'_>) -> PyResult<Py<PyDict>> {
+        let inner = self.inner.lock().unwrap();
+        let loader_cache = inner.loader_cache.lock().unwrap();
+        let rv = PyDict::new_bound(py);
+        rv.set_item("loads", loader_cache.loads)?;
+        rv.set_item("hits", loader_cache.hits)?;
+        rv.set_item("invalidations", loader_cache.invalidations)?;
+        rv.set_item("size", loader_cache.uptodate.len())?;
+        Ok(rv.unbind())
+    }
+
     /// Can be used to instruct the environment to automatically reload templates
     /// before each render.
     #[setter]
@@ -635,6 +879,56 @@ impl Environment {
         Ok(self.inner.lock().unwrap().env.lstrip_blocks())
     }
 
+    /// Starts recording call counts and timings for templates, filters, tests
+    /// and functions.
+    pub fn enable_profiling(&self) {
+        self.profiler.set_enabled(true);
+    }
+
+    /// Stops recording timings.  Already collected data is kept.
+    pub fn disable_profiling(&self) {
+        self.profiler.set_enabled(false);
+    }
+
+    /// Indicates if profiling is currently enabled.
+    #[getter]
+    pub fn get_profiling(&self) -> bool {
+        self.profiler.is_enabled()
+    }
+
+    /// Returns the collected profile as a list of dicts.
+    ///
+    /// Each entry has a `kind`, a `name`, the number of `calls` and the
+    /// cumulative `total_time` and `self_time` in seconds.  Entries are sorted
+    /// by total time, slowest first.
+    pub fn profile_stats(&self, py: Python<'_>) -> PyResult<Vec<Py<PyDict>>> {
+        self.profiler
+            .entries()
+            .into_iter()
+            .map(|(kind, name, entry)| {
+                let rv = PyDict::new_bound(py);
+                rv.set_item("kind", kind)?;
+                rv.set_item("name", name)?;
+                rv.set_item("calls", entry.calls)?;
+                rv.set_item("total_time", entry.total_ns as f64 / 1e9)?;
+                rv.set_item("self_time", entry.self_ns as f64 / 1e9)?;
+                Ok(rv.unbind())
+            })
+            .collect()
+    }
+
+    /// Writes the collected profile as folded stacks (self time in microseconds)
+    /// which can be turned into a flamegraph.
+    pub fn write_folded_stacks(&self, path: PathBuf) -> PyResult<()> {
+        std::fs::write(path, self.profiler.folded_stacks())?;
+        Ok(())
+    }
+
+    /// Discards all collected profiling data.
+    pub fn reset_profile(&self) {
+        self.profiler.reset();
+    }
+
     /// Manually adds a template to the environment.
     pub fn add_template(&self, name: String, source: String) -> PyResult<()> {
         let mut inner = self.inner.lock().unwrap();
@@ -646,12 +940,18 @@ impl Environment {
 
     /// Removes a loaded template.
     pub fn remove_template(&self, name: &str) {
-        self.inner.lock().unwrap().env.remove_template(name);
+        let mut inner = self.inner.lock().unwrap();
+        inner.loader_cache.lock().unwrap().uptodate.remove(name);
+        inner.preloaded.lock().unwrap().remove(name);
+        inner.env.remove_template(name);
     }
 
     /// Clears all loaded templates.
     pub fn clear_templates(&self) {
-        self.inner.lock().unwrap().env.clear_templates();
+        let mut inner = self.inner.lock().unwrap();
+        inner.loader_cache.lock().unwrap().uptodate.clear();
+        inner.preloaded.lock().unwrap().clear();
+        inner.env.clear_templates();
     }
 
     /// Renders a template looked up from the loader.
@@ -668,13 +968,19 @@ impl Environment {
         if slf.reload_before_render.load(Ordering::Relaxed) {
             slf.reload(py)?;
         }
-        bind_environment(slf.as_ptr(), || {
-            let inner = slf.inner.lock().unwrap();
-            let tmpl = inner.env.get_template(template_name).map_err(to_py_error)?;
-            let ctx = ctx
-                .map(|ctx| Value::from_object(DynamicObject::new(ctx.as_any().clone().unbind())))
-                .unwrap_or_else(|| context!());
-            tmpl.render(ctx).map_err(to_py_error)
+        let profiler = slf.profiler.clone();
+        profiler.scope("template", template_name, || {
+            bind_environment(slf.as_ptr(), || {
+                let inner = slf.inner.lock().unwrap();
+                let tmpl = inner.env.get_template(template_name).map_err(to_py_error)?;
+                let ctx = ctx
+                    .map(|ctx| {
+                        Value::from_object(DynamicObject::new(ctx.as_any().clone().unbind()))
+                    })
+                    .unwrap_or_else(|| context!());
+                let listeners = ProfilingListener::for_render(&profiler);
+                tmpl.render(ctx, &listeners).map_err(to_py_error)
+            })
         })
     }
 
@@ -689,16 +995,23 @@ impl Environment {
         name: Option<&str>,
         ctx: Option<&Bound<'_, PyDict>>,
     ) -> PyResult<String> {
-        bind_environment(slf.as_ptr(), || {
-            let ctx = ctx
-                .map(|ctx| Value::from_object(DynamicObject::new(ctx.as_any().clone().unbind())))
-                .unwrap_or_else(|| context!());
-            slf.inner
-                .lock()
-                .unwrap()
-                .env
-                .render_named_str(name.unwrap_or("<string>"), source, ctx)
-                .map_err(to_py_error)
+        let profiler = slf.profiler.clone();
+        let name = name.unwrap_or("<string>");
+        profiler.scope("template", name, || {
+            bind_environment(slf.as_ptr(), || {
+                let ctx = ctx
+                    .map(|ctx| {
+                        Value::from_object(DynamicObject::new(ctx.as_any().clone().unbind()))
+                    })
+                    .unwrap_or_else(|| context!());
+                let listeners = ProfilingListener::for_render(&profiler);
+                slf.inner
+                    .lock()
+                    .unwrap()
+                    .env
+                    .render_named_str(name, source, ctx, &listeners)
+                    .map_err(to_py_error)
+            })
         })
     }
 
@@ -741,6 +1054,9 @@ pub fn with_environment<R, F: FnOnce(Py<Environment>) -> PyResult<R>>(f: F) -> P
 pub fn bind_environment<R, F: FnOnce() -> R>(envptr: *mut pyo3::ffi::PyObject, f: F) -> R {
     let old_handle = CURRENT_ENV
         .with(|handle| handle.swap(envptr as *const _ as *mut c_void, Ordering::Relaxed));
+    if old_handle.is_null() {
+        clear_html_method_cache();
+    }
     let rv = std::panic::catch_unwind(std::panic::AssertUnwindSafe(f));
     CURRENT_ENV.with(|handle| handle.store(old_handle, Ordering::Relaxed));
     match rv {
@@ -748,3 +1064,41 @@ pub fn bind_environment<R, F: FnOnce() -> R>(envptr: *mut pyo3::ffi::PyObject, f
         Err(payload) => std::panic::resume_unwind(payload),
     }
 }
+
+/// Compiles the restored templates `names` into the environment off the
+/// calling thread.
+///
+/// The environment lock is taken per template, and an entry is only taken out
+/// of `preloaded` under it, so a render that needs a template first compiles it
+/// through the loader as usual.  Templates that fail to compile are put back,
+/// so the error surfaces from the render that uses them.
+fn spawn_precompile(inner: Arc<Mutex<Inner>>, names: Vec<String>) {
+    std::thread::spawn(move || {
+        for name in names {
+            let mut inner = inner.lock().unwrap();
+            let Some(source) = inner.preloaded.lock().unwrap().remove(&name) else {
+                continue;
+            };
+            if inner
+                .env
+                .add_template_owned(name.clone(), source.clone())
+                .is_err()
+            {
+                inner.preloaded.lock().unwrap().insert(name, source);
+            }
+        }
+    });
+}
+
+/// Calls a `save_cache`/`load_cache` stamp callback for the template `name`.
+fn call_stamp(
+    py: Python<'_>,
+    stamp: Option<&Bound<'_, PyAny>>,
+    name: &str,
+) -> PyResult<Option<String>> {
+    let Some(stamp) = stamp else {
+        return Ok(None);
+    };
+    let rv = stamp.call1(PyTuple::new_bound(py, [name]))?;
+    Ok((!rv.is_none()).then(|| rv.to_string()))
+}
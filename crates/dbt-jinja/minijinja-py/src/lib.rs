@@ -2,7 +2,9 @@ use pyo3::prelude::*;
 
 mod environment;
 mod error_support;
+mod profiler;
 mod state;
+mod template_cache;
 mod typeconv;
 
 #[pymodule]
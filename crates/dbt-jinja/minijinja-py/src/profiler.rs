@@ -0,0 +1,222 @@
+use std::cell::RefCell;
+use std::collections::HashMap;
+use std::fmt::Write;
+use std::path::Path;
+use std::rc::Rc;
+use std::sync::atomic::{AtomicBool, Ordering};
+use std::sync::{Arc, Mutex};
+use std::time::Instant;
+
+use minijinja::listener::RenderingEventListener;
+use minijinja::machinery::Span;
+use minijinja::CodeLocation;
+
+thread_local! {
+    static STACK: RefCell<Vec<Frame>> = const { RefCell::new(Vec::new()) };
+}
+
+struct Frame {
+    kind: &'static str,
+    name: String,
+    label: String,
+    start: Instant,
+    child_ns: u64,
+}
+
+/// Aggregated timings for a single profiled item.
+#[derive(Default, Clone)]
+pub struct ProfileEntry {
+    pub calls: u64,
+    pub total_ns: u64,
+    pub self_ns: u64,
+}
+
+#[derive(Default)]
+struct ProfileData {
+    entries: HashMap<(&'static str, String), ProfileEntry>,
+    folded: HashMap<String, u64>,
+}
+
+/// Records call counts and timings for templates, macros and callbacks.
+///
+/// When profiling is disabled the only cost of a profiled call is a relaxed
+/// atomic load.
+#[derive(Default)]
+pub struct Profiler {
+    enabled: AtomicBool,
+    data: Mutex<ProfileData>,
+}
+
+impl Profiler {
+    pub fn set_enabled(&self, yes: bool) {
+        self.enabled.store(yes, Ordering::Relaxed);
+    }
+
+    pub fn is_enabled(&self) -> bool {
+        self.enabled.load(Ordering::Relaxed)
+    }
+
+    /// Invokes `f` and records it as a call of `kind` named `name`.
+    pub fn scope<R, F: FnOnce() -> R>(&self, kind: &'static str, name: &str, f: F) -> R {
+        if !self.is_enabled() {
+            return f();
+        }
+        self.enter(kind, name);
+        let _guard = ScopeGuard { profiler: self };
+        f()
+    }
+
+    /// Opens a frame of `kind` named `name` on the current thread.  Every
+    /// call must be balanced by a call to [`Profiler::exit`].
+    fn enter(&self, kind: &'static str, name: &str) {
+        STACK.with(|stack| {
+            stack.borrow_mut().push(Frame {
+                kind,
+                name: name.to_string(),
+                label: format!("{}:{}", kind, name.replace([';', '\n'], "_")),
+                start: Instant::now(),
+                child_ns: 0,
+            })
+        });
+    }
+
+    /// Closes the innermost frame opened by [`Profiler::enter`] and records it.
+    fn exit(&self) {
+        let finished = STACK.with(|stack| {
+            let mut stack = stack.borrow_mut();
+            let frame = stack.pop()?;
+            let total_ns = frame.start.elapsed().as_nanos() as u64;
+            let self_ns = total_ns.saturating_sub(frame.child_ns);
+            let mut folded = stack
+                .iter()
+                .map(|x| x.label.as_str())
+                .collect::<Vec<_>>()
+                .join(";");
+            if !folded.is_empty() {
+                folded.push(';');
+            }
+            folded.push_str(&frame.label);
+            if let Some(parent) = stack.last_mut() {
+                parent.child_ns += total_ns;
+            }
+            Some((frame.kind, frame.name, folded, total_ns, self_ns))
+        });
+        if let Some((kind, name, folded, total_ns, self_ns)) = finished {
+            self.record(kind, name, folded, total_ns, self_ns);
+        }
+    }
+
+    /// Returns a snapshot of the aggregated timings.
+    pub fn entries(&self) -> Vec<(&'static str, String, ProfileEntry)> {
+        let data = self.data.lock().unwrap();
+        let mut rv = data
+            .entries
+            .iter()
+            .map(|((kind, name), entry)| (*kind, name.clone(), entry.clone()))
+            .collect::<Vec<_>>();
+        rv.sort_by(|a, b| b.2.total_ns.cmp(&a.2.total_ns));
+        rv
+    }
+
+    /// Renders the collected stacks in the folded format understood by
+    /// flamegraph tools.  Values are self times in microseconds.
+    pub fn folded_stacks(&self) -> String {
+        let data = self.data.lock().unwrap();
+        let mut stacks = data.folded.iter().collect::<Vec<_>>();
+        stacks.sort();
+        let mut rv = String::new();
+        for (stack, self_ns) in stacks {
+            writeln!(rv, "{} {}", stack, self_ns / 1000).unwrap();
+        }
+        rv
+    }
+
+    pub fn reset(&self) {
+        let mut data = self.data.lock().unwrap();
+        data.entries.clear();
+        data.folded.clear();
+    }
+
+    fn record(&self, kind: &'static str, name: String, stack: String, total_ns: u64, self_ns: u64) {
+        let mut data = self.data.lock().unwrap();
+        let entry = data.entries.entry((kind, name)).or_default();
+        entry.calls += 1;
+        entry.total_ns += total_ns;
+        entry.self_ns += self_ns;
+        *data.folded.entry(stack).or_default() += self_ns;
+    }
+}
+
+struct ScopeGuard<'a> {
+    profiler: &'a Profiler,
+}
+
+impl Drop for ScopeGuard<'_> {
+    fn drop(&mut self) {
+        self.profiler.exit();
+    }
+}
+
+/// Rendering listener that records every macro body executed during a
+/// render as a `macro` frame.
+///
+/// The engine has no hook around `{% include %}` and only reports repeated
+/// loop iterations, so time spent in includes and loops is attributed to the
+/// enclosing template or macro.
+pub struct ProfilingListener {
+    profiler: Arc<Profiler>,
+}
+
+impl ProfilingListener {
+    /// Returns the listeners to pass to a render call: a profiling listener
+    /// while profiling is enabled, none otherwise.
+    pub fn for_render(profiler: &Arc<Profiler>) -> Vec<Rc<dyn RenderingEventListener>> {
+        if profiler.is_enabled() {
+            vec![Rc::new(ProfilingListener {
+                profiler: profiler.clone(),
+            })]
+        } else {
+            Vec::new()
+        }
+    }
+}
+
+impl std::fmt::Debug for ProfilingListener {
+    fn fmt(&self, f: &mut std::fmt::Formatter<'_>) -> std::fmt::Result {
+        f.debug_struct("ProfilingListener").finish_non_exhaustive()
+    }
+}
+
+impl RenderingEventListener for ProfilingListener {
+    fn as_any(&self) -> &dyn std::any::Any {
+        self
+    }
+
+    fn name(&self) -> &str {
+        "ProfilingListener"
+    }
+
+    fn on_macro_start(&self, _file_path: Option<&Path>, _line: &u32, _col: &u32, _offset: &u32) {}
+
+    fn on_macro_stop(&self, _file_path: Option<&Path>, _line: &u32, _col: &u32, _offset: &u32) {}
+
+    fn on_malicious_return(&self, _location: &CodeLocation) {}
+
+    fn on_function_start(&self) {}
+
+    fn on_function_end(&self) {}
+
+    fn on_macro_execute_start(
+        &self,
+        name: &str,
+        _call_site: Option<(&Path, &Span)>,
+        _def_path: &Path,
+        _def_span: &Span,
+    ) {
+        self.profiler.enter("macro", name);
+    }
+
+    fn on_macro_execute_end(&self, _name: &str) {
+        self.profiler.exit();
+    }
+}
@@ -0,0 +1,144 @@
+//! Persisted template cache.
+//!
+//! The file stores the sources of loaded templates so that a fresh process can
+//! register them without invoking the loader.  Compiled instructions borrow from
+//! the template source and are not serializable, so restored templates still
+//! have to be compiled; `Environment.load_cache` can do that on a background
+//! thread (see `spawn_precompile`) rather than on first use.
+//!
+//! Each entry carries an optional stamp, an opaque freshness token (such as the
+//! modification time of the template file) that is compared on load so that
+//! templates changed since the cache was written are loaded again.
+//!
+//! Layout (all integers little endian):
+//!
+//! ```text
+//! magic           8 bytes   b"MJPYTPLC"
+//! format version  u32
+//! crate version   u32 length + utf-8 bytes
+//! entry count     u32
+//! entries         u64 source hash, u32 length + name, u32 length + source,
+//!                 u8 has stamp, u32 length + stamp (if present)
+//! ```
+use std::collections::HashMap;
+
+const MAGIC: &[u8; 8] = b"MJPYTPLC";
+const FORMAT_VERSION: u32 = 2;
+
+/// Hashes a template source (FNV-1a, stable across processes and platforms).
+pub fn source_hash(source: &str) -> u64 {
+    let mut rv: u64 = 0xcbf2_9ce4_8422_2325;
+    for byte in source.as_bytes() {
+        rv ^= *byte as u64;
+        rv = rv.wrapping_mul(0x0100_0000_01b3);
+    }
+    rv
+}
+
+/// A template restored from a cache file.
+pub struct Entry {
+    pub source: String,
+    pub stamp: Option<String>,
+}
+
+/// Serializes the given `(name, source, stamp)` triples into the cache format.
+pub fn encode<'a, I>(entries: I) -> Vec<u8>
+where
+    I: IntoIterator<Item = (&'a str, &'a str, Option<&'a str>)>,
+{
+    let entries = entries.into_iter().collect::<Vec<_>>();
+    let mut rv = Vec::new();
+    rv.extend_from_slice(MAGIC);
+    rv.extend_from_slice(&FORMAT_VERSION.to_le_bytes());
+    write_str(&mut rv, env!("CARGO_PKG_VERSION"));
+    rv.extend_from_slice(&(entries.len() as u32).to_le_bytes());
+    for (name, source, stamp) in entries {
+        rv.extend_from_slice(&source_hash(source).to_le_bytes());
+        write_str(&mut rv, name);
+        write_str(&mut rv, source);
+        match stamp {
+            Some(stamp) => {
+                rv.push(1);
+                write_str(&mut rv, stamp);
+            }
+            None => rv.push(0),
+        }
+    }
+    rv
+}
+
+/// Parses a cache file.
+///
+/// Files written by a different format or crate version yield no entries, as
+/// do truncated files.  Entries whose source does not match the stored hash
+/// are skipped so that the loader is consulted for them instead.
+pub fn decode(buf: &[u8]) -> HashMap<String, Entry> {
+    let mut rv = HashMap::new();
+    let mut reader = Reader { buf, pos: 0 };
+    if reader.take(MAGIC.len()) != Some(&MAGIC[..])
+        || reader.u32() != Some(FORMAT_VERSION)
+        || reader.str() != Some(env!("CARGO_PKG_VERSION"))
+    {
+        return rv;
+    }
+    let Some(count) = reader.u32() else {
+        return rv;
+    };
+    for _ in 0..count {
+        let (Some(hash), Some(name), Some(source)) = (reader.u64(), reader.str(), reader.str())
+        else {
+            break;
+        };
+        let stamp = match reader.take(1) {
+            Some([0]) => None,
+            Some([1]) => match reader.str() {
+                Some(stamp) => Some(stamp.to_string()),
+                None => break,
+            },
+            _ => break,
+        };
+        if source_hash(source) == hash {
+            rv.insert(
+                name.to_string(),
+                Entry {
+                    source: source.to_string(),
+                    stamp,
+                },
+            );
+        }
+    }
+    rv
+}
+
+fn write_str(buf: &mut Vec<u8>, value: &str) {
+    buf.extend_from_slice(&(value.len() as u32).to_le_bytes());
+    buf.extend_from_slice(value.as_bytes());
+}
+
+struct Reader<'a> {
+    buf: &'a [u8],
+    pos: usize,
+}
+
+impl<'a> Reader<'a> {
+    fn take(&mut self, len: usize) -> Option<&'a [u8]> {
+        let rv = self.buf.get(self.pos..self.pos.checked_add(len)?)?;
+        self.pos += len;
+        Some(rv)
+    }
+
+    fn u32(&mut self) -> Option<u32> {
+        self.take(4)
+            .map(|x| u32::from_le_bytes(x.try_into().unwrap()))
+    }
+
+    fn u64(&mut self) -> Option<u64> {
+        self.take(8)
+            .map(|x| u64::from_le_bytes(x.try_into().unwrap()))
+    }
+
+    fn str(&mut self) -> Option<&'a str> {
+        let len = self.u32()? as usize;
+        std::str::from_utf8(self.take(len)?).ok()
+    }
+}
@@ -1,20 +1,23 @@
-use std::collections::BTreeMap;
+use std::collections::{BTreeMap, HashMap};
 use std::fmt;
 use std::sync::{Arc, Mutex};
 
 use minijinja::value::{Enumerator, Object, ObjectRepr, Value, ValueKind};
 use minijinja::{AutoEscape, Error, State};
 
-use once_cell::sync::OnceCell;
+use once_cell::sync::{Lazy, OnceCell};
 use pyo3::prelude::*;
 use pyo3::pybacked::PyBackedStr;
-use pyo3::types::{PyDict, PyList, PySequence, PyTuple};
+use pyo3::types::{PyBool, PyDict, PyFloat, PyInt, PyList, PySequence, PyString, PyTuple, PyType};
 
 use crate::error_support::{to_minijinja_error, to_py_error};
 use crate::state::{bind_state, StateRef};
 
 static AUTO_ESCAPE_CACHE: Mutex<BTreeMap<String, AutoEscape>> = Mutex::new(BTreeMap::new());
 static MARK_SAFE: OnceCell<Py<PyAny>> = OnceCell::new();
+#[allow(clippy::type_complexity)]
+static HTML_METHOD_CACHE: Lazy<Mutex<HashMap<usize, (Py<PyType>, bool)>>> =
+    Lazy::new(Default::default);
 
 fn is_safe_attr(name: &str) -> bool {
     !name.starts_with('_')
@@ -144,30 +147,98 @@ impl Object for DynamicObject {
 }
 
 pub fn to_minijinja_value(value: &Bound<'_, PyAny>) -> Value {
+    // exact builtin types are dispatched on their type pointer first.  This
+    // avoids the failed extractions (and the exceptions they create) of the
+    // generic path below for the overwhelmingly common cases.
     if value.is_none() {
-        Value::from(())
-    } else if let Ok(val) = value.extract::<bool>() {
+        return Value::from(());
+    } else if let Ok(val) = value.downcast_exact::<PyString>() {
+        // exact strings cannot carry an `__html__` method
+        if let Ok(val) = val.to_cow() {
+            return Value::from(&*val);
+        }
+    } else if let Ok(val) = value.downcast_exact::<PyBool>() {
+        return Value::from(val.is_true());
+    } else if let Ok(val) = value.downcast_exact::<PyInt>() {
+        if let Ok(val) = val.extract::<i64>() {
+            return Value::from(val);
+        }
+    } else if let Ok(val) = value.downcast_exact::<PyFloat>() {
+        return Value::from(val.value());
+    } else if value.is_exact_instance_of::<PyDict>()
+        || value.is_exact_instance_of::<PyList>()
+        || value.is_exact_instance_of::<PyTuple>()
+    {
+        return Value::from_object(DynamicObject::new(value.clone().unbind()));
+    }
+
+    // string subclasses (such as markupsafe's `Markup`) are checked before the
+    // numeric extractions which would fail for them.
+    if value.is_instance_of::<PyString>() {
+        if let Ok(val) = value.extract::<PyBackedStr>() {
+            return string_to_minijinja_value(value, val);
+        }
+    }
+
+    if let Ok(val) = value.extract::<bool>() {
         Value::from(val)
     } else if let Ok(val) = value.extract::<i64>() {
         Value::from(val)
     } else if let Ok(val) = value.extract::<f64>() {
         Value::from(val)
     } else if let Ok(val) = value.extract::<PyBackedStr>() {
+        string_to_minijinja_value(value, val)
+    } else {
+        Value::from_object(DynamicObject::new(value.clone().unbind()))
+    }
+}
+
+fn string_to_minijinja_value(value: &Bound<'_, PyAny>, val: PyBackedStr) -> Value {
+    if has_html_method(value) {
         if let Ok(to_html) = value.getattr("__html__") {
-            if to_html.is_callable() {
-                // TODO: if to_minijinja_value returns results we could
-                // report the swallowed error of __html__.
-                if let Ok(html) = to_html.call0() {
-                    if let Ok(val) = html.extract::<PyBackedStr>() {
-                        return Value::from_safe_string(val.to_string());
-                    }
+            // TODO: if to_minijinja_value returns results we could
+            // report the swallowed error of __html__.
+            if let Ok(html) = to_html.call0() {
+                if let Ok(val) = html.extract::<PyBackedStr>() {
+                    return Value::from_safe_string(val.to_string());
                 }
             }
         }
-        Value::from(val.to_string())
-    } else {
-        Value::from_object(DynamicObject::new(value.clone().unbind()))
     }
+    Value::from(val.to_string())
+}
+
+/// Checks if the type of a value has a callable `__html__` attribute.
+///
+/// The result is cached per type until the next top-level render, see
+/// [`clear_html_method_cache`].  The cache retains a reference to the type
+/// so that its address cannot be reused by another type.
+fn has_html_method(value: &Bound<'_, PyAny>) -> bool {
+    let ty = value.get_type();
+    let key = ty.as_ptr() as usize;
+    if let Some((_, rv)) = HTML_METHOD_CACHE.lock().unwrap().get(&key) {
+        return *rv;
+    }
+    // the lookup can run arbitrary Python code so it must not hold the lock
+    let rv = ty
+        .getattr("__html__")
+        .is_ok_and(|to_html| to_html.is_callable());
+    HTML_METHOD_CACHE
+        .lock()
+        .unwrap()
+        .insert(key, (ty.unbind(), rv));
+    rv
+}
+
+/// Forgets all cached `__html__` lookups.
+///
+/// Called when a top-level render starts, so a type that gained or lost
+/// `__html__` since the last render is looked up again and the cache never
+/// keeps a type alive for longer than one render.
+pub fn clear_html_method_cache() {
+    let stale = std::mem::take(&mut *HTML_METHOD_CACHE.lock().unwrap());
+    // releasing the types can run arbitrary Python code, so not under the lock
+    drop(stale);
 }
 
 pub fn to_python_value(value: Value) -> PyResult<Py<PyAny>> {
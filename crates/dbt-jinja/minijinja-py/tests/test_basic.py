@@ -118,6 +118,49 @@ def test_basic_types():
     assert rv == {"a": 42, "b": 42.5, "c": "blah"}
 
 
+def test_python_type_conversion():
+    class MyStr(str):
+        pass
+
+    class MyInt(int):
+        pass
+
+    class Html(str):
+        def __html__(self):
+            return "<b>" + self + "</b>"
+
+    env = Environment()
+    rv = env.eval_expr(
+        "[a, b, c, d, e, f, g, h, i]",
+        a="x",
+        b=True,
+        c=42,
+        d=2**70,
+        e=1.5,
+        f=MyStr("y"),
+        g=MyInt(7),
+        h=None,
+        i=(1, 2),
+    )
+    assert rv == ["x", True, 42, float(2**70), 1.5, "y", 7, None, (1, 2)]
+
+    env = Environment(auto_escape_callback=lambda x: True)
+    rv = env.render_str("{{ x }}{{ x }}{{ y }}", x=Html("z"), y=MyStr("<a>"))
+    assert rv == "<b>z</b><b>z</b>&lt;a&gt;"
+
+
+def test_html_method_added_between_renders():
+    class Late(str):
+        pass
+
+    env = Environment(auto_escape_callback=lambda x: True)
+    assert env.render_str("{{ x }}", x=Late("<a>")) == "&lt;a&gt;"
+    Late.__html__ = lambda self: "<b>" + self + "</b>"
+    assert env.render_str("{{ x }}", x=Late("<a>")) == "<b><a></b>"
+    del Late.__html__
+    assert env.render_str("{{ x }}", x=Late("<a>")) == "&lt;a&gt;"
+
+
 def test_loader():
     called = []
 
@@ -154,6 +197,171 @@ def test_loader_reload():
     assert called == ["index.html", "index.html", "other.html"]
 
 
+def test_loader_uptodate():
+    called = []
+    changed = set()
+
+    def my_loader(name):
+        called.append(name)
+        return "Hello from " + name, lambda: name not in changed
+
+    env = Environment(loader=my_loader, reload_before_render=True)
+    assert env.render_template("index.html") == "Hello from index.html"
+    assert env.render_template("index.html") == "Hello from index.html"
+    assert env.render_template("other.html") == "Hello from other.html"
+    assert called == ["index.html", "other.html"]
+    changed.add("index.html")
+    assert env.render_template("other.html") == "Hello from other.html"
+    assert env.render_template("index.html") == "Hello from index.html"
+    assert called == ["index.html", "other.html", "index.html"]
+    assert env.loader_cache_info() == {
+        "loads": 3,
+        "hits": 4,
+        "invalidations": 1,
+        "size": 2,
+    }
+
+
+def test_template_cache(tmp_path):
+    called = []
+
+    def my_loader(name):
+        called.append(name)
+        return "Hello from " + name
+
+    cache = tmp_path / "templates.cache"
+    env = Environment(loader=my_loader)
+    env.add_template("manual.html", "Hello {{ name }}")
+    assert env.render_template("index.html") == "Hello from index.html"
+    env.save_cache(cache)
+
+    env = Environment(loader=my_loader, load_cache=cache)
+    assert env.render_template("index.html") == "Hello from index.html"
+    assert env.render_template("manual.html", name="World") == "Hello World"
+    assert env.render_template("other.html") == "Hello from other.html"
+    assert called == ["index.html", "other.html"]
+
+    env = Environment(load_cache=cache)
+    assert env.render_template("manual.html", name="World") == "Hello World"
+
+    cache.write_bytes(b"garbage")
+    assert Environment(loader=my_loader).load_cache(cache) == 0
+
+
+def test_template_cache_precompiles_with_the_configured_syntax(tmp_path):
+    called = []
+
+    def my_loader(name):
+        called.append(name)
+        return "Hello ${ name }!"
+
+    syntax = {"variable_start_string": "${", "variable_end_string": "}"}
+    cache = tmp_path / "templates.cache"
+    env = Environment(loader=my_loader, **syntax)
+    env.render_template("index.html", name="World")
+    env.save_cache(cache)
+
+    called.clear()
+    env = Environment(loader=my_loader, load_cache=cache, **syntax)
+    assert env.render_template("index.html", name="World") == "Hello World!"
+    env = Environment(loader=my_loader, **syntax)
+    assert env.load_cache(cache, precompile=True) == 1
+    assert env.render_template("index.html", name="World") == "Hello World!"
+    assert called == []
+
+
+def test_template_cache_stamps(tmp_path):
+    sources = {"index.html": "Hello", "other.html": "Other"}
+    stamps = {"index.html": "1", "other.html": "1"}
+    called = []
+
+    def my_loader(name):
+        called.append(name)
+        return sources[name]
+
+    cache = tmp_path / "templates.cache"
+    env = Environment(loader=my_loader)
+    env.render_template("index.html")
+    env.render_template("other.html")
+    env.save_cache(cache, stamp=stamps.get)
+
+    # Changed on disk since the cache was written
+    sources["index.html"] = "Hello again"
+    stamps["index.html"] = "2"
+    called.clear()
+    env = Environment(loader=my_loader, load_cache=cache, cache_stamp=stamps.get)
+    assert env.render_template("index.html") == "Hello again"
+    assert env.render_template("other.html") == "Other"
+    assert called == ["index.html"]
+
+    # Entries saved without a stamp cannot be validated
+    env = Environment(loader=my_loader)
+    env.render_template("other.html")
+    env.save_cache(cache)
+    assert Environment(loader=my_loader).load_cache(cache, stamp=stamps.get) == 0
+
+
+def test_profiling(tmp_path):
+    env = Environment(
+        templates={
+            "index.html": "{% macro m() %}{{ 'x'|wrap }}{% endmacro %}"
+            "{% include 'item.html' %}|{{ m() }}",
+            "item.html": "{{ 'y'|wrap }}{{ 'z' is fancy }}",
+        },
+        filters={"wrap": lambda x: "[" + x + "]"},
+        tests={"fancy": lambda x: True},
+    )
+    assert not env.profiling
+    env.render_template("index.html")
+    assert env.profile_stats() == []
+
+    env.enable_profiling()
+    assert env.profiling
+    assert env.render_template("index.html") == "[y]true|[x]"
+    stats = {(x["kind"], x["name"]): x for x in env.profile_stats()}
+    assert set(stats) == {
+        ("template", "index.html"),
+        ("macro", "index.m"),
+        ("filter", "wrap"),
+        ("test", "fancy"),
+    }
+    assert stats["template", "index.html"]["calls"] == 1
+    assert stats["macro", "index.m"]["calls"] == 1
+    assert stats["filter", "wrap"]["calls"] == 2
+    entry = stats["template", "index.html"]
+    assert entry["self_time"] <= entry["total_time"]
+
+    path = tmp_path / "profile.folded"
+    env.write_folded_stacks(path)
+    stacks = [line.rsplit(" ", 1)[0] for line in path.read_text().splitlines()]
+    assert stacks == [
+        "template:index.html",
+        "template:index.html;filter:wrap",
+        "template:index.html;macro:index.m",
+        "template:index.html;macro:index.m;filter:wrap",
+        "template:index.html;test:fancy",
+    ]
+
+    env.disable_profiling()
+    env.reset_profile()
+    env.render_template("index.html")
+    assert env.profile_stats() == []
+
+
+def test_builtin_filter_sets():
+    env = Environment(builtin_filter_sets=["contrib", "dbt"])
+    rv = env.render_str(
+        "{{ items|length }} item{{ items|pluralize }}, "
+        "{{ text|wordcount }} words, {{ '42'|as_number + 1 }}",
+        items=[1, 2],
+        text="Hello big world",
+    )
+    assert rv == "2 items, 3 words, 43"
+
+    with pytest.raises(RuntimeError, match="unknown builtin filter set"):
+        env.add_builtin_filter_set("missing")
+
+
 def test_autoescape():
     assert Environment().auto_escape_callback is None
 
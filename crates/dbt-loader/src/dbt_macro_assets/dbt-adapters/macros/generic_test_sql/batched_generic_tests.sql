@@ -0,0 +1,68 @@
+-- funcsign: (list[ANY]) -> string
+{% test batched_generic_tests(members) %}
+    {% set macro = adapter.dispatch('test_batched_generic_tests', 'dbt') %}
+    {{ macro(members) }}
+{% endtest %}
+
+-- funcsign: (list[ANY]) -> string
+{% macro default__test_batched_generic_tests(members) %}
+{#-
+    One failing-row query per member test, each tagged with the member's key in
+    `column_name`, so the aggregated_test materialization counts failures per
+    member. Members are dicts of `key`, `test` (not_null, unique or
+    accepted_values), `model` and `column_name`, plus `values` and `quote` for
+    accepted_values.
+-#}
+{% set union_queries = [] %}
+
+{% for member in members %}
+    {% set key = dbt.string_literal(member['key']) %}
+    {% set column_name = member['column_name'] %}
+    {% if member['test'] == 'not_null' %}
+        {% set query %}
+    select
+        {{ key }} as column_name
+    from {{ member['model'] }}
+    where {{ column_name }} is null
+        {% endset %}
+    {% elif member['test'] == 'unique' %}
+        {% set query %}
+    select
+        {{ key }} as column_name
+    from {{ member['model'] }}
+    where {{ column_name }} is not null
+    group by {{ column_name }}
+    having count(*) > 1
+        {% endset %}
+    {% elif member['test'] == 'accepted_values' %}
+        {% set query %}
+    select
+        {{ key }} as column_name
+    from {{ member['model'] }}
+    where {{ column_name }} not in (
+        {% for value in member['values'] -%}
+            {% if member['quote'] -%}
+            '{{ value }}'
+            {%- else -%}
+            {{ value }}
+            {%- endif -%}
+            {%- if not loop.last -%},{%- endif %}
+        {%- endfor %}
+    )
+    group by {{ column_name }}
+        {% endset %}
+    {% else %}
+        {% do exceptions.raise_compiler_error("Cannot batch generic test '" ~ member['test'] ~ "'") %}
+    {% endif %}
+
+    {% do union_queries.append(query) %}
+{% endfor %}
+
+{% if union_queries %}
+    {{ union_queries | join('\nunion all\n') }}
+{% else %}
+    select
+        cast(null as {{ dbt.type_string() }}) as column_name
+    where 1=0
+{% endif %}
+{% endmacro %}
@@ -0,0 +1,253 @@
+//! Process-level cache for the rendered project/profile skeleton.
+//!
+//! Embedders that invoke dbt repeatedly in one process (the Python runner, the
+//! LSP) otherwise re-read and re-render `dbt_project.yml`, `vars.yml` and
+//! `profiles.yml` on every command. An entry is reused only when:
+//!
+//! * the load arguments that feed rendering are unchanged (project dir,
+//!   `--profiles-dir`, `--profile`, `--target`, `--x-alt-target`, CLI vars);
+//! * `profiles.yml` still resolves to the same path, and none of the three files
+//!   changed size or mtime (a missing file is part of the stamp);
+//! * every environment variable the files reference through `env_var('...')`
+//!   still has the value it had when the entry was stored.
+//!
+//! Files that call `env_var` with anything but a string literal are never
+//! cached, since the set of variables they read cannot be known up front.
+
+use std::collections::{BTreeMap, HashMap};
+use std::path::{Path, PathBuf};
+use std::sync::Mutex;
+use std::time::SystemTime;
+
+use dbt_common::constants::{DBT_PROJECT_YML, DBT_VARS_YML};
+use dbt_profile::find_profiles_path;
+use dbt_schemas::schemas::project::DbtProjectSimplified;
+use dbt_schemas::state::DbtProfile;
+
+use crate::args::LoadArgs;
+
+pub(crate) type ProjectAndProfile = (
+    DbtProjectSimplified,
+    DbtProfile,
+    BTreeMap<String, dbt_yaml::Value>,
+);
+
+#[derive(Debug, Clone, PartialEq, Eq, Hash)]
+struct CacheKey {
+    in_dir: PathBuf,
+    profiles_dir: Option<PathBuf>,
+    profile: Option<String>,
+    target: Option<String>,
+    x_alt_target: Option<String>,
+    /// CLI vars serialized the same way partial parsing hashes them.
+    cli_vars: String,
+}
+
+impl CacheKey {
+    fn new(arg: &LoadArgs) -> Self {
+        Self {
+            in_dir: arg.io.in_dir.clone(),
+            profiles_dir: arg.profiles_dir.clone(),
+            profile: arg.profile.clone(),
+            target: arg.target.clone(),
+            x_alt_target: arg.x_alt_target.clone(),
+            cli_vars: serde_json::to_string(&arg.vars).unwrap_or_default(),
+        }
+    }
+}
+
+/// Size and mtime of a file, `None` if it does not exist.
+type FileStamp = Option<(u64, SystemTime)>;
+
+fn stamp(path: &Path) -> FileStamp {
+    let meta = std::fs::metadata(path).ok()?;
+    Some((meta.len(), meta.modified().ok()?))
+}
+
+/// Snapshot of everything a load reads, taken before the load so that an edit
+/// made while loading leaves the stored entry stale rather than current.
+#[derive(Debug, Clone, PartialEq)]
+pub(crate) struct Inputs {
+    profiles_path: Option<PathBuf>,
+    stamps: Vec<(PathBuf, FileStamp)>,
+    env_vars: BTreeMap<String, Option<String>>,
+}
+
+impl Inputs {
+    /// Captures the current state of everything the load depends on, or `None`
+    /// if the files read environment variables that cannot be enumerated.
+    fn capture(arg: &LoadArgs) -> Option<Self> {
+        let profiles_path = find_profiles_path(arg.profiles_dir.as_deref()).ok();
+        let mut paths = vec![
+            arg.io.in_dir.join(DBT_PROJECT_YML),
+            arg.io.in_dir.join(DBT_VARS_YML),
+        ];
+        paths.extend(profiles_path.clone());
+
+        let mut stamps = Vec::with_capacity(paths.len());
+        let mut env_vars = BTreeMap::new();
+        for path in paths {
+            let file_stamp = stamp(&path);
+            if file_stamp.is_some() {
+                let contents = std::fs::read_to_string(&path).ok()?;
+                for name in literal_env_var_refs(&contents)? {
+                    let value = std::env::var(&name).ok();
+                    env_vars.insert(name, value);
+                }
+            }
+            stamps.push((path, file_stamp));
+        }
+        Some(Self {
+            profiles_path,
+            stamps,
+            env_vars,
+        })
+    }
+
+    /// Whether nothing captured has changed since, without re-reading the files.
+    fn is_current(&self, arg: &LoadArgs) -> bool {
+        find_profiles_path(arg.profiles_dir.as_deref()).ok() == self.profiles_path
+            && self
+                .stamps
+                .iter()
+                .all(|(path, file_stamp)| stamp(path) == *file_stamp)
+            && self
+                .env_vars
+                .iter()
+                .all(|(name, value)| std::env::var(name).ok() == *value)
+    }
+}
+
+/// Names passed to `env_var` in `contents`, or `None` if any use of `env_var`
+/// is not a call with a string literal as its first argument.
+fn literal_env_var_refs(contents: &str) -> Option<Vec<String>> {
+    let mut names = Vec::new();
+    let mut rest = contents;
+    while let Some(pos) = rest.find("env_var") {
+        let after = &rest[pos + "env_var".len()..];
+        let preceded_by_ident = rest[..pos]
+            .chars()
+            .next_back()
+            .is_some_and(|c| c.is_alphanumeric() || c == '_');
+        let followed_by_ident = after
+            .chars()
+            .next()
+            .is_some_and(|c| c.is_alphanumeric() || c == '_');
+        if preceded_by_ident || followed_by_ident {
+            rest = after;
+            continue;
+        }
+        let call = after.trim_start().strip_prefix('(')?.trim_start();
+        let quote = call.chars().next().filter(|c| *c == '\'' || *c == '"')?;
+        let literal = &call[1..];
+        let end = literal.find(quote)?;
+        names.push(literal[..end].to_string());
+        rest = &literal[end + 1..];
+    }
+    Some(names)
+}
+
+struct CacheEntry {
+    inputs: Inputs,
+    value: ProjectAndProfile,
+}
+
+static CACHE: Mutex<Option<HashMap<CacheKey, CacheEntry>>> = Mutex::new(None);
+
+/// Returns the cached load for `arg` if none of its inputs changed.
+pub(crate) fn get(arg: &LoadArgs) -> Option<ProjectAndProfile> {
+    let cache = CACHE.lock().unwrap_or_else(|e| e.into_inner());
+    let entry = cache.as_ref()?.get(&CacheKey::new(arg))?;
+    entry.inputs.is_current(arg).then(|| entry.value.clone())
+}
+
+/// Captures the inputs of a load for `arg`; call it before loading and pass the
+/// result to [`insert`].
+pub(crate) fn capture(arg: &LoadArgs) -> Option<Inputs> {
+    Inputs::capture(arg)
+}
+
+/// Remembers a successful load for `arg` under the `inputs` captured before it
+/// ran. Loads whose inputs could not be fully captured are not stored.
+pub(crate) fn insert(arg: &LoadArgs, inputs: Option<Inputs>, value: &ProjectAndProfile) {
+    let Some(inputs) = inputs else {
+        return;
+    };
+    let mut cache = CACHE.lock().unwrap_or_else(|e| e.into_inner());
+    cache.get_or_insert_with(HashMap::new).insert(
+        CacheKey::new(arg),
+        CacheEntry {
+            inputs,
+            value: value.clone(),
+        },
+    );
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn literal_env_var_refs_collects_names() {
+        let yml = r#"
+host: "{{ env_var('DBT_HOST') }}"
+port: '{{ env_var("DBT_PORT", "5432") | as_number }}'
+schema: "{{ env_var( 'DBT_SCHEMA' ) }}"
+"#;
+        assert_eq!(
+            literal_env_var_refs(yml).unwrap(),
+            ["DBT_HOST", "DBT_PORT", "DBT_SCHEMA"]
+        );
+        assert_eq!(
+            literal_env_var_refs("name: plain").unwrap(),
+            Vec::<String>::new()
+        );
+        // Identifiers that merely contain the name are not calls.
+        assert!(
+            literal_env_var_refs("my_env_var_suffix: 1")
+                .unwrap()
+                .is_empty()
+        );
+    }
+
+    #[test]
+    fn dynamic_env_var_use_is_not_cacheable() {
+        assert!(literal_env_var_refs("user: \"{{ env_var(prefix ~ '_USER') }}\"").is_none());
+        assert!(literal_env_var_refs("{% set f = env_var %}").is_none());
+    }
+
+    #[test]
+    fn inputs_change_with_files_and_referenced_env_vars() {
+        let dir = tempfile::tempdir().unwrap();
+        let project = dir.path().join(DBT_PROJECT_YML);
+        let profiles = dir.path().join("profiles.yml");
+        std::fs::write(&project, "name: p\nprofile: p\n").unwrap();
+        std::fs::write(
+            &profiles,
+            "p:\n  outputs:\n    dev:\n      schema: \"{{ env_var('DBT_LOAD_CACHE_TEST_SCHEMA') }}\"\n",
+        )
+        .unwrap();
+
+        let mut arg = LoadArgs::default();
+        arg.io.in_dir = dir.path().to_path_buf();
+        arg.profiles_dir = Some(dir.path().to_path_buf());
+
+        let inputs = Inputs::capture(&arg).unwrap();
+        assert!(inputs.env_vars.contains_key("DBT_LOAD_CACHE_TEST_SCHEMA"));
+        assert!(inputs.is_current(&arg));
+
+        // SAFETY: the variable name is unique to this test.
+        unsafe { std::env::set_var("DBT_LOAD_CACHE_TEST_SCHEMA", "analytics") };
+        assert!(!inputs.is_current(&arg));
+        let inputs = Inputs::capture(&arg).unwrap();
+        assert!(inputs.is_current(&arg));
+
+        std::fs::write(&project, "name: p\nprofile: p\nversion: '1.0'\n").unwrap();
+        assert!(!inputs.is_current(&arg));
+
+        let inputs = Inputs::capture(&arg).unwrap();
+        std::fs::write(dir.path().join(DBT_VARS_YML), "vars: {}\n").unwrap();
+        assert!(!inputs.is_current(&arg));
+        unsafe { std::env::remove_var("DBT_LOAD_CACHE_TEST_SCHEMA") };
+    }
+}
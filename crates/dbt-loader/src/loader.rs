@@ -60,6 +60,7 @@ use dbt_schemas::state::{DbtAsset, DbtPackage, DbtState, ResourcePathKind};
 
 use crate::args::LoadArgs;
 use crate::dbt_project_yml_loader::load_project_yml;
+use crate::load_cache;
 use crate::loader_hooks::LoaderHooks;
 use crate::utils::{collect_file_info, identify_package_dependencies};
 use crate::{
@@ -760,12 +761,32 @@ fn deep_merge_yaml(base: &mut dbt_yaml::Value, overlay: &dbt_yaml::Value) {
     }
 }
 
+/// Renders `dbt_project.yml` and resolves the selected profile.
+///
+/// Results are reused within the process while the inputs they were rendered
+/// from are unchanged; see [`crate::load_cache`].
 pub async fn load_simplified_project_and_profiles(
     arg: &LoadArgs,
 ) -> FsResult<(
     DbtProjectSimplified,
     DbtProfile,
     BTreeMap<String, dbt_yaml::Value>,
+)> {
+    if let Some(cached) = load_cache::get(arg) {
+        return Ok(cached);
+    }
+    let inputs = load_cache::capture(arg);
+    let loaded = load_simplified_project_and_profiles_uncached(arg)?;
+    load_cache::insert(arg, inputs, &loaded);
+    Ok(loaded)
+}
+
+fn load_simplified_project_and_profiles_uncached(
+    arg: &LoadArgs,
+) -> FsResult<(
+    DbtProjectSimplified,
+    DbtProfile,
+    BTreeMap<String, dbt_yaml::Value>,
 )> {
     // Read the input file
     let dbt_project_path = arg.io.in_dir.join(DBT_PROJECT_YML);
@@ -1,5 +1,6 @@
 pub mod cloud_http_client;
 mod deps;
+mod load_cache;
 mod load_packages;
 mod load_profiles;
 mod load_vars;
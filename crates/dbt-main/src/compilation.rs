@@ -32,8 +32,12 @@ use dbt_jinja_utils::{
     phases::{build_operation_context_btreemap, configure_compile_and_run_jinja_environment},
 };
 use dbt_loader::args::*;
+use dbt_metadata_parquet::parse_profile::{PARSE_PROFILE_FILE_NAME, write_parse_profile};
+use dbt_metadata_parquet::python_model_info::PYTHON_MODEL_INFO_FILE_NAME;
 use dbt_parser::args::ResolveArgs;
+use dbt_parser::python_model_cache::PythonModelCache;
 use dbt_scheduler::args::SchedulerArgs;
+use dbt_scheduler::selection_cache::next_parse_generation;
 use dbt_schema_store::{
     SchemaStoreTrait,
     store::{DataStore, SchemaStore},
@@ -57,6 +61,7 @@ use dbt_common::{
     io_args::{
         EvalArgs, EvalArgsBuilder, ListOutputFormat, Phases, ShowOptions,
         optimize_test_defaults_from_project_flags, resolve_effective_optimize_tests,
+        resolve_scheduling_pools, resolve_test_batching,
     },
     io_utils::{checkpoint_error_count_maybe_exit, checkpoint_maybe_exit},
     path::DbtPath,
@@ -122,7 +127,7 @@ use serde_json::to_string_pretty;
 
 use crate::utils::update_manifest_with_macro_depends_on;
 
-use dbt_schemas::state::NodeResolverTracker;
+use dbt_schemas::state::{NodeResolverTracker, ProjectPaths, SelectionState};
 
 fn should_skip_tasks_when_no_selected_nodes(
     command: &FsCommand,
@@ -424,7 +429,11 @@ impl<'a> CompilationPhasesExecutor<'a> {
                 .lock()
                 .map(|m| m.clone())
                 .unwrap_or_default();
-            let changed_nodes = build_cache_changes.map(|c| c.changed_nodes.as_ref());
+            // A changed dependency package or macro file can add or delete nodes and
+            // macros, which a delta epoch cannot express; rewrite the full state instead.
+            let changed_nodes = build_cache_changes
+                .filter(|c| c.changed_packages.is_empty() && c.changed_macro_files.is_empty())
+                .map(|c| c.changed_nodes.as_ref());
             if let Err(e) = dbt_metadata::partial_parse::save_parse_state(
                 &self.arg.io,
                 &dbt_state,
@@ -551,6 +560,7 @@ impl<'a> CompilationPhasesExecutor<'a> {
                                 status: NodeStatus::Errored,
                                 thread_id: "main".to_string(),
                                 message: Some("Compilation Error".to_string()),
+                                pool_wait: None,
                             })
                             .collect(),
                         nodes: Some(resolved_state.nodes.clone()),
@@ -698,6 +708,9 @@ pub struct DbtProjectCompilation {
     /// (either via the fast path or filtered incremental load). False on a full parse
     /// or when the filter fell back to None. Used to gate --verify-partial-load checks.
     pub(crate) partial_load_filter_applied: bool,
+    /// Identifies `resolved_state` to the scheduler's process-level caches
+    /// (see `dbt_scheduler::selection_cache`); assigned once per resolve.
+    pub(crate) parse_generation: u64,
 }
 
 pub struct DbtProjectCompilationCacheState {
@@ -1278,6 +1291,14 @@ impl DbtProjectCompilation {
             )
             .await?;
 
+        // Before resolving, so a project that fails to resolve still reports them.
+        artifacts_sink.project_paths = Some(ProjectPaths::from_dbt_state(
+            &loaded_project.dbt_state(),
+            &executor.arg.io.out_dir,
+            executor.arg.io.log_path.as_deref(),
+            executor.arg.packages_install_path.as_deref(),
+        ));
+
         // PHASE 2: Use Pipeline for Resolve
         // ========================================================================
 
@@ -1286,11 +1307,22 @@ impl DbtProjectCompilation {
             CompleteStateWithKind::from_dbt_state(&executor.arg.io, &loaded_project.dbt_state())?;
         token.check_cancellation()?;
 
-        let (mut resolved_state, jinja_env) = {
-            let resolve_args = ResolveArgs::try_from_eval_args(executor.arg.as_ref())?;
+        let parse_profile = executor.cli.common_args.parse_profile;
+        if parse_profile {
+            dbt_parser::parse_profile::start();
+        }
+        let resolved = {
+            let mut resolve_args = ResolveArgs::try_from_eval_args(executor.arg.as_ref())?;
+            if executor.cli.common_args.effective_partial_parse() {
+                resolve_args.python_model_cache = Some(Arc::new(PythonModelCache::open(
+                    &dbt_metadata::parse_state::cache_dir(&executor.arg.io.out_dir)
+                        .join(PYTHON_MODEL_INFO_FILE_NAME),
+                )));
+            }
+            let python_model_cache = resolve_args.python_model_cache.clone();
             let invocation_args = InvocationArgs::from_eval_args(executor.arg.as_ref());
 
-            loaded_project
+            let resolved = loaded_project
                 .resolve(
                     resolve_args,
                     &invocation_args,
@@ -1299,9 +1331,32 @@ impl DbtProjectCompilation {
                     jinja_type_checking_event_listener_factory.clone(),
                     feature_stack.resolver.hooks.clone(),
                 )
-                .await?
+                .await;
+            // Saved once for all packages: packages of a wave resolve concurrently.
+            if let Some(cache) = python_model_cache
+                && let Err(e) = cache.save()
+            {
+                tracing::warn!("Failed to save the Python model analysis cache: {e}");
+            }
+            resolved
         };
+        // Written even when resolve failed: the slow file is often the one that errored.
+        if parse_profile {
+            let rows = dbt_parser::parse_profile::finish();
+            let path = executor.arg.io.out_dir.join(PARSE_PROFILE_FILE_NAME);
+            match write_parse_profile(&path, &rows) {
+                Ok(()) => artifacts_sink.parse_profile_path = Some(path),
+                Err(e) => tracing::warn!("Failed to write parse profile: {e}"),
+            }
+        }
+        let (mut resolved_state, jinja_env) = resolved?;
         token.check_cancellation()?;
+        let parse_generation = next_parse_generation();
+        // Before any early exit, so `parse` leaves it for embedders too.
+        artifacts_sink.selection_state = Some(SelectionState::from_resolver_state(
+            &resolved_state,
+            parse_generation,
+        ));
 
         feature_stack
             .cli
@@ -1407,6 +1462,9 @@ impl DbtProjectCompilation {
         if let Some(prev_state) = &maybe_previous_state {
             prev_state.set_test_name_truncations(&resolved_state.test_name_truncations);
         }
+        if let Some(selection_state) = artifacts_sink.selection_state.as_mut() {
+            selection_state.previous_state = maybe_previous_state.clone();
+        }
 
         // Refresh node_resolver (no renaming needed - sample plan is resolved after scheduling)
         executor.refresh_node_resolver(
@@ -1437,6 +1495,7 @@ impl DbtProjectCompilation {
                 previous_state: maybe_previous_state,
                 invocation_id,
                 partial_load_filter_applied: false,
+                parse_generation,
             },
             Arc::into_inner(jinja_env).expect("should have one reference"),
             compilation_cache_changes,
@@ -1459,8 +1518,9 @@ impl DbtProjectCompilation {
 
         // For Pull command, use its select args for scheduling
         let pull_select = cli.sample_select();
-        let scheduler_args =
+        let mut scheduler_args =
             SchedulerArgs::from_eval_args_with_exclude_unique_ids(arg, exclude_unique_ids);
+        scheduler_args.parse_generation = Some(self.parse_generation);
 
         let schedule = if let Some(ref pull_select_args) = pull_select {
             let pull_exclude = cli.sample_exclude();
@@ -1557,6 +1617,8 @@ impl DbtProjectCompilation {
             &arg.optimize_tests,
             &project_optimize_tests,
         );
+        let test_batching = resolve_test_batching(self.root_project().flags.as_ref());
+        let scheduling_pools = resolve_scheduling_pools(self.root_project().flags.as_ref());
 
         // ========================================================================
         // PHASE 3: Use Pipeline for Schedule
@@ -1769,7 +1831,10 @@ impl DbtProjectCompilation {
                 Cow::Owned(
                     build_schedule_from_resolved(
                         &self.resolved_state,
-                        SchedulerArgs::from_eval_args(arg),
+                        SchedulerArgs {
+                            parse_generation: Some(self.parse_generation),
+                            ..SchedulerArgs::from_eval_args(arg)
+                        },
                         maybe_previous_state.as_ref().map(|x| x.as_ref()),
                         arg.local_execution_backend,
                         token,
@@ -1865,6 +1930,8 @@ impl DbtProjectCompilation {
                 RunTasksArgs::from_eval_args(arg, feature_stack.cli.fail_fast.clone())
                     .with_resolved_profile(&self.resolved_state.dbt_profile);
             run_task_args.optimize_tests = optimize_tests;
+            run_task_args.test_batching = test_batching;
+            run_task_args.scheduling_pools = scheduling_pools;
             run_task_args.sample_renaming = BTreeMap::new();
             run_task_args.previous_batch_results = previous_batch_results;
             run_task_args.into()
@@ -2219,6 +2286,14 @@ impl DbtProjectCompilation {
                 // error, so any failure still reports `SessionEnd` instead of
                 // leaving the session open. No-ops if a session never started.
                 let run_cache_ctx_on_error = ctx.clone();
+                let timeline_path = cli
+                    .common_args
+                    .timeline
+                    .as_ref()
+                    .map(|path| arg.io.in_dir.join(path));
+                if timeline_path.is_some() {
+                    dbt_tasks_core::timeline::start();
+                }
                 let run_result = task_runner
                     .run(
                         Arc::clone(&run_task_args),
@@ -2230,6 +2305,14 @@ impl DbtProjectCompilation {
                         token.clone(),
                     )
                     .await;
+                // Written even when the run failed, to show where it stalled.
+                if let Some(path) = timeline_path {
+                    let timings = dbt_tasks_core::timeline::finish();
+                    match dbt_tasks_core::timeline::write_chrome_trace(&path, &timings) {
+                        Ok(()) => artifacts_sink.timeline_path = Some(path),
+                        Err(e) => tracing::warn!("Failed to write timeline: {e}"),
+                    }
+                }
                 if run_result.is_err() {
                     run_cache_service_after_run_failed(
                         &run_cache_ctx_on_error,
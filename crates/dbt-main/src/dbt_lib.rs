@@ -561,6 +561,23 @@ pub async fn execute_setup_and_all_phases(
     )?;
 
     check_options(cli);
+    dbt_adapter::concurrency::configure_adaptive_concurrency(eval_arg.adaptive_threads);
+    let mock_warehouse = cli
+        .common_args()
+        .mock_warehouse
+        .as_deref()
+        .map(str::parse::<dbt_adapter::mock::warehouse::QueryLatency>)
+        .transpose();
+    match mock_warehouse {
+        Ok(latency) => dbt_adapter::mock::warehouse::configure_mock_warehouse(latency),
+        Err(e) => {
+            emit_error_log_from_fs_error(*fs_err!(
+                ErrorCode::InvalidArgument,
+                "Invalid --mock-warehouse: {e}"
+            ));
+            return Err(FsError::exit_with_status(1));
+        }
+    }
     if let Err(e) = validate_engine_env_vars() {
         emit_error_log_from_fs_error(*e);
         return Err(FsError::exit_with_status(1));
@@ -1202,6 +1219,7 @@ impl<'a> AllPhasesExecutor<'a> {
                                         status: dbt_common::stats::NodeStatus::Errored,
                                         thread_id: "main".to_string(),
                                         message: Some("Compilation Error".to_string()),
+                                        pool_wait: None,
                                     })
                                     .collect(),
                                 nodes: Some(compilation.nodes().clone()),
@@ -173,6 +173,12 @@ pub fn run_cli_with_code(cli: Box<Cli>, arg: SystemArgs, feature_stack: Arc<Feat
         run_future_with_ctrlc_support(cst, future, fail_fast, fail_fast_flag),
     );
 
+    // Let a parse-state compaction started in the background finish merging,
+    // unless the run was cancelled: the merge is safe to abandon.
+    if !matches!(result, Ok(Some(_))) {
+        dbt_metadata::parse_state::wait_for_background_compaction();
+    }
+
     // Shut down telemetry file writers (fast: ~300µs, must happen before exit).
     if let Err(errors) = feature_stack.tracing.shutdown_once() {
         for err in errors {
@@ -14,6 +14,7 @@ use dbt_metadata::{
         unique_id_filter_for_dirty, unique_id_filter_for_selector,
     },
 };
+use dbt_scheduler::selection_cache::next_parse_generation;
 use dbt_schemas::{
     schemas::common::ResolvedQuoting,
     state::{DbtRuntimeConfig, DbtState, NodeResolverTracker, ResolverState},
@@ -281,6 +282,7 @@ pub fn try_load_prev_compilation(
         previous_state: None,
         invocation_id: uuid::Uuid::new_v4().to_string(),
         partial_load_filter_applied: false,
+        parse_generation: next_parse_generation(),
     });
 
     (
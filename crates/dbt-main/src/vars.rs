@@ -1,5 +1,8 @@
 use dbt_common::{
-    io_args::{BATCH_TESTS_ENV, SKIP_REDUNDANT_TESTS_ENV},
+    io_args::{
+        BATCH_TESTS_ENV, BATCH_TESTS_MAX_SIZE_ENV, BATCH_TESTS_SCOPE_ENV, SCHEDULING_POOLS_ENV,
+        SKIP_REDUNDANT_TESTS_ENV,
+    },
     tracing::dbt_emit::emit_warn_log_message,
 };
 use dbt_init::{ErrorCode, FsResult, fs_err};
@@ -119,6 +122,8 @@ const KNOWN_UNUSED_ENGINE_ENV_VARS: &[&str] = &[
 /// These are NOT aliases of DBT_* vars - they are unique to the engine.
 const USED_ENGINE_ENV_VARS: &[&str] = &[
     BATCH_TESTS_ENV,
+    BATCH_TESTS_MAX_SIZE_ENV,
+    BATCH_TESTS_SCOPE_ENV,
     "DBT_ENGINE_BETA_PACKAGE_PARSING",
     "DBT_ENGINE_BETA_PARSING",
     "DBT_ENGINE_EXPERIMENTAL_LIST_UDFS",
@@ -129,6 +134,7 @@ const USED_ENGINE_ENV_VARS: &[&str] = &[
     "DBT_ENGINE_RECORDER_MODE",
     "DBT_ENGINE_RECORDER_ROW_LIMIT",
     "DBT_ENGINE_RECORDER_TYPES",
+    SCHEDULING_POOLS_ENV,
     SKIP_REDUNDANT_TESTS_ENV,
     "DBT_ENGINE_STATE_API_URL",
     "DBT_ENGINE_STATE_AUTH_URL",
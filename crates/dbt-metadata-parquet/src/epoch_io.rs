@@ -125,3 +125,33 @@ pub fn should_compact(delta_len: usize, total_alive: usize, file_count: usize) -
     let row_threshold = (total_alive / 10).max(10);
     delta_len > row_threshold || file_count > 8
 }
+
+/// Lower bound for the [`deltas_outgrew_base`] size signal, so tiny projects
+/// are not compacted on every save.
+pub const MIN_COMPACT_DELTA_BYTES: u64 = 256 * 1024;
+
+/// On-disk size in bytes of the base epoch (`N == 0`) and of all delta epochs
+/// (`N > 0`) for the given directory and version prefix.
+pub fn epoch_sizes(dir: &Path, prefix: &str) -> (u64, u64) {
+    let mut base_bytes = 0;
+    let mut delta_bytes = 0;
+    for (n, path) in existing_epochs(dir, prefix) {
+        let len = std::fs::metadata(&path).map(|m| m.len()).unwrap_or(0);
+        if n == 0 {
+            base_bytes += len;
+        } else {
+            delta_bytes += len;
+        }
+    }
+    (base_bytes, delta_bytes)
+}
+
+/// Returns true when the delta epochs together exceed a quarter of the base
+/// epoch (and at least [`MIN_COMPACT_DELTA_BYTES`]).
+///
+/// Complements [`should_compact`], which only sizes the latest delta: a run of
+/// small deltas each stays under its row threshold while the superseded rows
+/// they carry still have to be decoded on every load.
+pub fn deltas_outgrew_base(base_bytes: u64, delta_bytes: u64) -> bool {
+    delta_bytes > (base_bytes / 4).max(MIN_COMPACT_DELTA_BYTES)
+}
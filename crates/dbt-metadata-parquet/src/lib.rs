@@ -8,6 +8,8 @@ pub mod invocations;
 pub mod parse_alive;
 pub mod parse_columns;
 pub mod parse_nodes;
+pub mod parse_profile;
 pub mod parse_test_metadata;
+pub mod python_model_info;
 pub mod runtime_freshness;
 pub mod runtime_results;
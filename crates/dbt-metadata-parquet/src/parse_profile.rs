@@ -0,0 +1,145 @@
+//! Per-file parse timings written by `dbt parse --parse-profile`.
+//!
+//! Files land at:
+//! ```text
+//! target/
+//!   parse_profile.parquet   ← overwritten by every profiled parse, one row per file
+//! ```
+//!
+//! ## Design
+//! * **One row per source file** — SQL and YAML files alike. A phase that did not
+//!   run for a file (no Jinja render for a YAML file, no YAML resolution for a
+//!   SQL file) is null rather than zero, so sums over a column stay meaningful.
+//! * **Microsecond integers** — wall time spent in each phase for that file. With
+//!   parallel parsing the per-file times overlap; they do not add up to the
+//!   command's elapsed time.
+//! * **Not an epoch table** — the file describes a single invocation and is
+//!   replaced atomically on the next profiled parse.
+
+use std::path::Path;
+
+use arrow::datatypes::{DataType, Field};
+use dbt_common::{FsResult, stdfs};
+use serde::{Deserialize, Serialize};
+
+use crate::epoch_io;
+
+/// File name of the profile inside the target directory.
+pub const PARSE_PROFILE_FILE_NAME: &str = "parse_profile.parquet";
+
+// ── row schema ────────────────────────────────────────────────────────────────
+
+#[derive(Debug, Clone, Default, PartialEq, Serialize, Deserialize)]
+pub struct ParseProfileRow {
+    pub package_name: String,
+    /// Path of the file relative to the project directory.
+    pub file_path: String,
+    /// Reading the file from disk.
+    pub load_us: Option<i64>,
+    /// Rendering the file's Jinja.
+    pub render_us: Option<i64>,
+    /// Static analysis (type checking) of the file's SQL.
+    pub sql_analysis_us: Option<i64>,
+    /// Deserializing and resolving the file's YAML properties.
+    pub yaml_resolution_us: Option<i64>,
+    pub bytes_read: i64,
+}
+
+impl ParseProfileRow {
+    /// Sum of all recorded phases, in microseconds.
+    pub fn total_us(&self) -> i64 {
+        [
+            self.load_us,
+            self.render_us,
+            self.sql_analysis_us,
+            self.yaml_resolution_us,
+        ]
+        .into_iter()
+        .flatten()
+        .sum()
+    }
+}
+
+fn parse_profile_fields() -> Vec<Field> {
+    vec![
+        Field::new("package_name", DataType::Utf8, false),
+        Field::new("file_path", DataType::Utf8, false),
+        Field::new("load_us", DataType::Int64, true),
+        Field::new("render_us", DataType::Int64, true),
+        Field::new("sql_analysis_us", DataType::Int64, true),
+        Field::new("yaml_resolution_us", DataType::Int64, true),
+        Field::new("bytes_read", DataType::Int64, false),
+    ]
+}
+
+// ── public API ────────────────────────────────────────────────────────────────
+
+/// Writes the profile to `path`, replacing any previous profile.
+pub fn write_parse_profile(path: &Path, rows: &[ParseProfileRow]) -> FsResult<()> {
+    let tmp_path = path.with_extension("parquet.tmp");
+    epoch_io::write_rows(&tmp_path, &parse_profile_fields(), rows)?;
+    stdfs::rename(&tmp_path, path)?;
+    Ok(())
+}
+
+/// Reads a profile written by [`write_parse_profile`]. Empty if the file is
+/// missing or unreadable.
+pub fn read_parse_profile(path: &Path) -> Vec<ParseProfileRow> {
+    epoch_io::read_rows(path)
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_write_and_read_parse_profile() {
+        let dir = tempfile::tempdir().unwrap();
+        let path = dir.path().join(PARSE_PROFILE_FILE_NAME);
+
+        let rows = vec![
+            ParseProfileRow {
+                package_name: "my_project".to_string(),
+                file_path: "models/orders.sql".to_string(),
+                load_us: Some(12),
+                render_us: Some(340),
+                sql_analysis_us: Some(55),
+                yaml_resolution_us: None,
+                bytes_read: 128,
+            },
+            ParseProfileRow {
+                package_name: "my_project".to_string(),
+                file_path: "models/schema.yml".to_string(),
+                load_us: Some(8),
+                render_us: None,
+                sql_analysis_us: None,
+                yaml_resolution_us: Some(900),
+                bytes_read: 2048,
+            },
+        ];
+        write_parse_profile(&path, &rows).unwrap();
+
+        assert_eq!(read_parse_profile(&path), rows);
+        assert_eq!(rows[0].total_us(), 12 + 340 + 55);
+        assert_eq!(rows[1].total_us(), 8 + 900);
+    }
+
+    #[test]
+    fn test_rewrite_replaces_previous_profile() {
+        let dir = tempfile::tempdir().unwrap();
+        let path = dir.path().join(PARSE_PROFILE_FILE_NAME);
+
+        let row = |file_path: &str| ParseProfileRow {
+            package_name: "p".to_string(),
+            file_path: file_path.to_string(),
+            ..ParseProfileRow::default()
+        };
+        write_parse_profile(&path, &[row("a.sql"), row("b.sql")]).unwrap();
+        write_parse_profile(&path, &[row("c.sql")]).unwrap();
+
+        let rows = read_parse_profile(&path);
+        assert_eq!(rows.len(), 1);
+        assert_eq!(rows[0].file_path, "c.sql");
+        assert!(!path.with_extension("parquet.tmp").exists());
+    }
+}
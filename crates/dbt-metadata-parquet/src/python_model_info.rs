@@ -0,0 +1,106 @@
+//! Cached AST analysis of Python models, written when `--partial-parse` is on.
+//!
+//! Files land at:
+//! ```text
+//! target/metadata/parse/
+//!   python_model_info.parquet   ← rewritten when a Python model was (re)analyzed
+//! ```
+//!
+//! ## Design
+//! * **One row per Python model file** — keyed by absolute path; a re-analyzed file
+//!   replaces its previous row.
+//! * **Content-hash validation** — `checksum` is the SHA-256 of the stripped source
+//!   (the model's `DbtChecksum`). A row is only reused while it matches, so mtimes
+//!   and clock skew never matter.
+//! * **Opaque payload** — `info_json` is the extracted refs, sources, config and
+//!   config accessors as JSON; its shape is owned by the parser, which stamps every
+//!   row with its `version` and drops the file when that no longer matches.
+//! * **Not an epoch table** — the file is small (one row per Python model) and is
+//!   replaced atomically.
+
+use std::path::Path;
+
+use arrow::datatypes::{DataType, Field};
+use dbt_common::{FsResult, stdfs};
+use serde::{Deserialize, Serialize};
+
+use crate::epoch_io;
+
+/// File name of the cache inside the parse cache directory.
+pub const PYTHON_MODEL_INFO_FILE_NAME: &str = "python_model_info.parquet";
+
+// ── row schema ────────────────────────────────────────────────────────────────
+
+#[derive(Debug, Clone, Default, PartialEq, Serialize, Deserialize)]
+pub struct PythonModelInfoRow {
+    /// Absolute path of the model file.
+    pub file_path: String,
+    /// SHA-256 of the stripped model source.
+    pub checksum: String,
+    /// Extracted analysis, serialized by the parser.
+    pub info_json: String,
+    /// Version of the parser and payload format that wrote `info_json`.
+    pub version: String,
+}
+
+fn python_model_info_fields() -> Vec<Field> {
+    vec![
+        Field::new("file_path", DataType::Utf8, false),
+        Field::new("checksum", DataType::Utf8, false),
+        Field::new("info_json", DataType::Utf8, false),
+        Field::new("version", DataType::Utf8, false),
+    ]
+}
+
+// ── public API ────────────────────────────────────────────────────────────────
+
+/// Writes the cache to `path`, replacing any previous contents.
+pub fn write_python_model_info(path: &Path, rows: &[PythonModelInfoRow]) -> FsResult<()> {
+    let tmp_path = path.with_extension("parquet.tmp");
+    epoch_io::write_rows(&tmp_path, &python_model_info_fields(), rows)?;
+    stdfs::rename(&tmp_path, path)?;
+    Ok(())
+}
+
+/// Reads a cache written by [`write_python_model_info`]. Empty if the file is
+/// missing or unreadable.
+pub fn read_python_model_info(path: &Path) -> Vec<PythonModelInfoRow> {
+    epoch_io::read_rows(path)
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_write_and_read_python_model_info() {
+        let dir = tempfile::tempdir().unwrap();
+        let path = dir
+            .path()
+            .join("metadata/parse")
+            .join(PYTHON_MODEL_INFO_FILE_NAME);
+
+        assert!(read_python_model_info(&path).is_empty());
+
+        let rows = vec![
+            PythonModelInfoRow {
+                file_path: "/project/models/a.py".to_string(),
+                checksum: "abc".to_string(),
+                info_json: r#"{"refs":[]}"#.to_string(),
+                version: "2.0.0/v1".to_string(),
+            },
+            PythonModelInfoRow {
+                file_path: "/project/models/b.py".to_string(),
+                checksum: "def".to_string(),
+                info_json: r#"{"refs":[["a",null,null]]}"#.to_string(),
+                version: "2.0.0/v1".to_string(),
+            },
+        ];
+        write_python_model_info(&path, &rows).unwrap();
+        assert_eq!(read_python_model_info(&path), rows);
+
+        write_python_model_info(&path, &rows[1..]).unwrap();
+        assert_eq!(read_python_model_info(&path), rows[1..]);
+        assert!(!path.with_extension("parquet.tmp").exists());
+    }
+}
@@ -12,6 +12,7 @@
 //!   all files are merged into a single file preserving all rows.
 //! * **Schema versioning** — filename prefix `v1_` allows future schema changes.
 
+use std::collections::HashMap;
 use std::path::{Path, PathBuf};
 
 use std::sync::Arc;
@@ -101,6 +102,18 @@ pub fn read_runtime_results(dir: &Path) -> Vec<RuntimeResultRow> {
     all_rows
 }
 
+/// Latest `execution_time` (seconds) per `unique_id`, across all invocations.
+///
+/// Rows of skipped and reused nodes are ignored: their near-zero times say
+/// nothing about how long the node takes to build.
+pub fn latest_execution_times(dir: &Path) -> HashMap<String, f64> {
+    read_runtime_results(dir)
+        .into_iter()
+        .filter(|row| !matches!(row.status.as_str(), "skipped" | "reused"))
+        .filter_map(|row| Some((row.unique_id, row.execution_time?)))
+        .collect()
+}
+
 // ── consolidation ─────────────────────────────────────────────────────────────
 
 fn consolidate(dir: &Path, files: &[(u32, PathBuf)]) -> FsResult<()> {
@@ -208,6 +221,50 @@ mod tests {
         assert_eq!(existing_files(dir_path).len(), 3);
     }
 
+    #[test]
+    fn test_latest_execution_times_ignore_skipped_and_reused_runs() {
+        let dir = tempfile::tempdir().unwrap();
+        let dir_path = dir.path();
+
+        let row = |invocation: i64, unique_id: &str, status: &str, execution_time: f64| {
+            RuntimeResultRow {
+                invocation_id: format!("inv-{invocation:03}"),
+                unique_id: unique_id.to_string(),
+                status: status.to_string(),
+                message: None,
+                execution_time: Some(execution_time),
+                thread_id: None,
+                failures: None,
+                compiled_code_hash: None,
+                relation_name: None,
+                adapter_response: None,
+                timing: None,
+                ingested_at: 1_700_000_000_000_000 + invocation,
+            }
+        };
+        write_runtime_results(
+            dir_path,
+            &[
+                row(0, "model.pkg.a", "success", 30.0),
+                row(0, "model.pkg.b", "success", 5.0),
+            ],
+        )
+        .unwrap();
+        write_runtime_results(
+            dir_path,
+            &[
+                row(1, "model.pkg.a", "reused", 0.1),
+                row(1, "model.pkg.b", "error", 7.0),
+            ],
+        )
+        .unwrap();
+
+        let times = latest_execution_times(dir_path);
+        assert_eq!(times.len(), 2);
+        assert_eq!(times["model.pkg.a"], 30.0);
+        assert_eq!(times["model.pkg.b"], 7.0);
+    }
+
     #[test]
     fn test_consolidation() {
         let dir = tempfile::tempdir().unwrap();
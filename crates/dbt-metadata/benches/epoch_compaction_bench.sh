@@ -0,0 +1,104 @@
+#!/usr/bin/env bash
+# Benchmark: parse-state load time and disk usage across many incremental runs.
+#
+# Simulates a long-lived workspace: after a cold parse, each cycle edits one
+# model and runs `dbt parse --partial-parse`, which appends a delta epoch under
+# target/metadata/parse/nodes/ (merged back into v1_0.parquet once compaction
+# triggers). After every cycle the number of epoch files, the size of nodes/,
+# and the wall time of a following no-op parse (dominated by loading the
+# epochs) are reported.
+#
+# Usage:
+#   DBT_BIN=~/fs/target/release/dbt \
+#   bash fs/sa/crates/dbt-metadata/benches/epoch_compaction_bench.sh
+#
+# Environment:
+#   DBT_BENCH_PROJECT  where the synthetic project is generated (default ~/tmp/epochs_2k)
+#   BENCH_MODELS       number of models to generate (default 2000)
+#   BENCH_CYCLES       number of edit + parse cycles (default 40)
+#
+# Set DBT_PP_TIMING=1 to additionally print compaction timings to stderr.
+
+set -euo pipefail
+
+DBT_BENCH_PROJECT="${DBT_BENCH_PROJECT:-${HOME}/tmp/epochs_2k}"
+DBT_BIN="${DBT_BIN:-${HOME}/fs/target/release/dbt}"
+MODELS="${BENCH_MODELS:-2000}"
+CYCLES="${BENCH_CYCLES:-40}"
+NODES="${DBT_BENCH_PROJECT}/target/metadata/parse/nodes"
+
+die() { echo "ERROR: $*" >&2; exit 1; }
+
+[[ -x "${DBT_BIN}" ]] || die "dbt binary not found: ${DBT_BIN}"
+
+# ── project generation ───────────────────────────────────────────────────────
+
+generate_project() {
+    echo "Generating ${MODELS} models in ${DBT_BENCH_PROJECT}..."
+    rm -rf "${DBT_BENCH_PROJECT}"
+    mkdir -p "${DBT_BENCH_PROJECT}/models"
+    cat > "${DBT_BENCH_PROJECT}/dbt_project.yml" <<'YML'
+name: 'epochs_2k'
+config-version: 2
+version: '0.1'
+profile: 'epochs_2k'
+model-paths: ["models"]
+models:
+  epochs_2k:
+    +materialized: view
+YML
+    cat > "${DBT_BENCH_PROJECT}/profiles.yml" <<'YML'
+epochs_2k:
+  target: duckdb_mem
+  outputs:
+    duckdb_mem:
+      type: duckdb
+      path: ':memory:'
+      threads: 1
+      schema: main
+YML
+    local i
+    for (( i=0; i<MODELS; i++ )); do
+        if (( i == 0 )); then
+            echo "select 1 as id" > "${DBT_BENCH_PROJECT}/models/m${i}.sql"
+        else
+            echo "select id from {{ ref('m$(( i - 1 ))') }}" > "${DBT_BENCH_PROJECT}/models/m${i}.sql"
+        fi
+    done
+}
+
+if [[ ! -f "${DBT_BENCH_PROJECT}/dbt_project.yml" ]]; then
+    generate_project
+fi
+
+run_parse() {
+    "${DBT_BIN}" parse --partial-parse \
+        --project-dir "${DBT_BENCH_PROJECT}" \
+        --profiles-dir "${DBT_BENCH_PROJECT}" >/dev/null 2>&1 || true
+}
+
+epoch_files() { find "${NODES}" -name '*.parquet' 2>/dev/null | wc -l; }
+nodes_bytes() { du -sb "${NODES}" 2>/dev/null | cut -f1; }
+
+echo "=================================================================="
+echo " Epoch compaction benchmark"
+echo " Project : ${DBT_BENCH_PROJECT} (${MODELS} models)"
+echo " Binary  : ${DBT_BIN}"
+echo " Cycles  : ${CYCLES}"
+echo "=================================================================="
+
+rm -rf "${DBT_BENCH_PROJECT}/target/metadata/parse"
+run_parse
+printf "  %-6s %-7s %-12s %s\n" "cycle" "epochs" "nodes bytes" "load ms"
+printf "  %-6s %-7s %-12s %s\n" "cold" "$(epoch_files)" "$(nodes_bytes)" "-"
+
+for (( c=1; c<=CYCLES; c++ )); do
+    # Edit a different model each cycle so every delta carries one new row.
+    model="${DBT_BENCH_PROJECT}/models/m$(( c % MODELS )).sql"
+    echo "-- edit ${c}" >> "${model}"
+    run_parse
+    t0=$(date +%s%3N)
+    run_parse
+    t1=$(date +%s%3N)
+    printf "  %-6s %-7s %-12s %s\n" "${c}" "$(epoch_files)" "$(nodes_bytes)" "$(( t1 - t0 ))"
+done
@@ -0,0 +1,117 @@
+#!/usr/bin/env bash
+# Benchmark: no-op `dbt parse --partial-parse` on a generated 20k-file project.
+#
+# Measures the cost of deciding that nothing changed: stat-ing every tracked file
+# and validating the content hashes of profiles.yml / dbt_project.yml (served
+# from content_stamps.parquet when their stamps match).
+#
+# Usage:
+#   DBT_BIN=~/fs/target/release/dbt \
+#   bash fs/sa/crates/dbt-metadata/benches/noop_parse_bench.sh
+#
+# Environment:
+#   DBT_BENCH_PROJECT  where the synthetic project is generated (default ~/tmp/noop_20k)
+#   BENCH_FILES        number of files to generate (default 20000; half .sql, half .yml)
+#   BENCH_REPS         repetitions per measurement (default 5, median reported)
+#
+# Set DBT_PP_TIMING=1 to additionally print per-phase cache timings to stderr.
+
+set -euo pipefail
+
+DBT_BENCH_PROJECT="${DBT_BENCH_PROJECT:-${HOME}/tmp/noop_20k}"
+DBT_BIN="${DBT_BIN:-${HOME}/fs/target/release/dbt}"
+FILES="${BENCH_FILES:-20000}"
+REPS="${BENCH_REPS:-5}"
+CACHE="${DBT_BENCH_PROJECT}/target/metadata/parse"
+
+die() { echo "ERROR: $*" >&2; exit 1; }
+
+[[ -x "${DBT_BIN}" ]] || die "dbt binary not found: ${DBT_BIN}"
+
+# ── project generation ───────────────────────────────────────────────────────
+
+generate_project() {
+    local models=$(( FILES / 2 ))
+    echo "Generating ${models} models + ${models} property files in ${DBT_BENCH_PROJECT}..."
+    rm -rf "${DBT_BENCH_PROJECT}"
+    mkdir -p "${DBT_BENCH_PROJECT}/models"
+    cat > "${DBT_BENCH_PROJECT}/dbt_project.yml" <<'YML'
+name: 'noop_20k'
+config-version: 2
+version: '0.1'
+profile: 'noop_20k'
+model-paths: ["models"]
+models:
+  noop_20k:
+    +materialized: view
+YML
+    cat > "${DBT_BENCH_PROJECT}/profiles.yml" <<'YML'
+noop_20k:
+  target: duckdb_mem
+  outputs:
+    duckdb_mem:
+      type: duckdb
+      path: ':memory:'
+      threads: 1
+      schema: main
+YML
+    local i dir
+    for (( i=0; i<models; i++ )); do
+        dir="${DBT_BENCH_PROJECT}/models/d$(( i / 500 ))"
+        mkdir -p "${dir}"
+        if (( i == 0 )); then
+            echo "select 1 as id" > "${dir}/m${i}.sql"
+        else
+            echo "select id from {{ ref('m$(( i - 1 ))') }}" > "${dir}/m${i}.sql"
+        fi
+        printf 'version: 2\nmodels:\n  - name: m%d\n    description: "model %d"\n' \
+            "${i}" "${i}" > "${dir}/m${i}.yml"
+    done
+    # Age every file so freshly written mtimes do not fall into the racy window.
+    find "${DBT_BENCH_PROJECT}" -type f -exec touch -m -d "1 minute ago" {} +
+}
+
+if [[ ! -f "${DBT_BENCH_PROJECT}/dbt_project.yml" ]]; then
+    generate_project
+fi
+
+run_parse() {
+    "${DBT_BIN}" parse --partial-parse \
+        --project-dir "${DBT_BENCH_PROJECT}" \
+        --profiles-dir "${DBT_BENCH_PROJECT}" >/dev/null 2>&1 || true
+}
+
+# Median wall time in ms of REPS no-op parses.
+time_noop() {
+    local times=() i t0 t1
+    for (( i=0; i<REPS; i++ )); do
+        t0=$(date +%s%3N)
+        run_parse
+        t1=$(date +%s%3N)
+        times+=("$(( t1 - t0 ))")
+    done
+    printf '%s\n' "${times[@]}" | sort -n | sed -n "$(( REPS / 2 + 1 ))p"
+}
+
+echo "=================================================================="
+echo " No-op partial-parse benchmark"
+echo " Project : ${DBT_BENCH_PROJECT} ($(find "${DBT_BENCH_PROJECT}/models" -type f | wc -l) files)"
+echo " Binary  : ${DBT_BIN}"
+echo " Reps    : ${REPS} (median reported)"
+echo "=================================================================="
+
+rm -rf "${CACHE}"
+t0=$(date +%s%3N)
+run_parse
+t1=$(date +%s%3N)
+printf "  %-50s %s ms\n" "cold parse (writes cache)" "$(( t1 - t0 ))"
+
+printf "  %-50s %s ms\n" "no-op parse" "$(time_noop)"
+
+# Dropping the stamp file forces the three hashed config files to be re-read on
+# the next run; the difference is the per-invocation cost the stamps save.
+rm -f "${CACHE}/content_stamps.parquet"
+t0=$(date +%s%3N)
+run_parse
+t1=$(date +%s%3N)
+printf "  %-50s %s ms\n" "no-op parse (content stamps dropped)" "$(( t1 - t0 ))"
@@ -198,6 +198,20 @@ remove_model "${NEW_MODEL}"
     --project-dir "${DBT_BENCH_PROJECT}" \
     --profiles-dir "${DBT_BENCH_PROJECT}" >/dev/null 2>&1 || true
 
+# Bump a single dependency package (simulates `dbt deps` upgrading one package by
+# rewriting its files). Only that package and its dependents are re-resolved.
+BUMP_PKG=$(find "${DBT_BENCH_PROJECT}/dbt_packages" -mindepth 1 -maxdepth 1 -type d 2>/dev/null \
+    | head -1)
+if [[ -n "${BUMP_PKG}" ]]; then
+    record "parse  warm  pp   1 package bumped ($(basename "${BUMP_PKG}"))" \
+        "$(time_cmd "${REPS}" --pre-hook "find '${BUMP_PKG}' -type f -exec touch {} +" \
+            parse --partial-parse)"
+    find "${BUMP_PKG}" -type f -exec touch -m -d "1 second ago" {} +
+    "${DBT_BIN}" parse --partial-parse \
+        --project-dir "${DBT_BENCH_PROJECT}" \
+        --profiles-dir "${DBT_BENCH_PROJECT}" >/dev/null 2>&1 || true
+fi
+
 echo ""
 
 # ── SECTION 2: compile ───────────────────────────────────────────────────────
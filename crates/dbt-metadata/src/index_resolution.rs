@@ -36,6 +36,7 @@ const INDEX_COLUMNS: &[&str] = &[
     "fqn",
     "tags",
     "depends_on",
+    "macro_depends_on",
     "materialization",
 ];
 
@@ -196,11 +197,12 @@ pub fn dirty_seed_ids_from_index(out_dir: &Path) -> Option<HashSet<String>> {
     )?;
     let touched = detect_dirty_files(&packages);
     let all_rows = read_node_index_rows(&dir);
-    let seed_ids = all_rows
+    let mut seed_ids = all_rows
         .iter()
         .filter(|row| touched.contains(&(row.package_name.clone(), row.original_path.clone())))
         .map(|row| row.unique_id.clone())
         .collect();
+    replace_macros_with_callers(&all_rows, &mut seed_ids);
     Some(seed_ids)
 }
 
@@ -248,11 +250,12 @@ pub fn resolve_dirty_unique_ids_from_index(
         return None;
     }
 
-    let seed_ids: HashSet<String> = all_rows
+    let mut seed_ids: HashSet<String> = all_rows
         .iter()
         .filter(|row| touched.contains(&(row.package_name.clone(), row.original_path.clone())))
         .map(|row| row.unique_id.clone())
         .collect();
+    replace_macros_with_callers(&all_rows, &mut seed_ids);
 
     let (parents_of, children_of) =
         build_edge_maps(&all_rows, children_depth.is_some() || include_indirect);
@@ -381,6 +384,57 @@ fn add_all_macros(parents_of: &HashMap<String, Vec<String>>, result: &mut HashSe
     }
 }
 
+/// Replaces the macros in `seeds` with the nodes whose rendering (transitively) invoked
+/// them.
+///
+/// Uses the persisted reverse index: macro rows store the macros they call in
+/// `depends_on`, other rows store the macros invoked during rendering in
+/// `macro_depends_on`. Macros themselves are dropped from `seeds`; they are always
+/// loaded anyway (see [`add_all_macros`]).
+fn replace_macros_with_callers(rows: &[NodeIndexRow], seeds: &mut HashSet<String>) {
+    if !seeds.iter().any(|uid| uid.starts_with("macro.")) {
+        return;
+    }
+    let mut callers_of: HashMap<&str, Vec<&str>> = HashMap::new();
+    for row in rows {
+        let called = if row.resource_type == "macro" {
+            &row.depends_on
+        } else if let Some(macros) = &row.macro_depends_on {
+            macros
+        } else {
+            continue;
+        };
+        for macro_id in called {
+            callers_of
+                .entry(macro_id.as_str())
+                .or_default()
+                .push(row.unique_id.as_str());
+        }
+    }
+
+    let mut visited: HashSet<&str> = HashSet::new();
+    let mut queue: Vec<&str> = seeds
+        .iter()
+        .filter(|uid| uid.starts_with("macro."))
+        .map(String::as_str)
+        .collect();
+    let mut callers: Vec<String> = Vec::new();
+    while let Some(current) = queue.pop() {
+        if !visited.insert(current) {
+            continue;
+        }
+        if !current.starts_with("macro.") {
+            callers.push(current.to_string());
+            continue;
+        }
+        if let Some(next) = callers_of.get(current) {
+            queue.extend(next.iter().copied());
+        }
+    }
+    seeds.retain(|uid| !uid.starts_with("macro."));
+    seeds.extend(callers);
+}
+
 fn detect_dirty_files(packages: &[PackageSnapshot]) -> HashSet<(String, String)> {
     let mut touched = HashSet::new();
     for pkg in packages {
@@ -388,7 +442,9 @@ fn detect_dirty_files(packages: &[PackageSnapshot]) -> HashSet<(String, String)>
         for (kind, files) in &pkg.all_paths {
             let safe = matches!(
                 kind,
-                ResourcePathKind::ModelPaths | ResourcePathKind::AnalysisPaths
+                ResourcePathKind::ModelPaths
+                    | ResourcePathKind::AnalysisPaths
+                    | ResourcePathKind::MacroPaths
             );
             if !safe {
                 continue;
@@ -449,6 +505,7 @@ mod tests {
             fqn: vec!["pkg".to_string(), uid.to_string()],
             tags: vec![],
             depends_on: deps.iter().map(|s| (*s).to_string()).collect(),
+            macro_depends_on: None,
             materialization: "table".to_string(),
         }
     }
@@ -583,6 +640,39 @@ mod tests {
         assert!(!result.contains("model.pkg.a"));
     }
 
+    // ── replace_macros_with_callers ──────────────────────────────────────────
+
+    #[test]
+    fn touched_macro_is_replaced_by_transitive_callers() {
+        let macro_row = |uid: &str, calls: &[&str]| NodeIndexRow {
+            resource_type: "macro".to_string(),
+            ..row(uid, calls)
+        };
+        let model_row = |uid: &str, calls: &[&str]| NodeIndexRow {
+            macro_depends_on: Some(calls.iter().map(|s| (*s).to_string()).collect()),
+            ..row(uid, &[])
+        };
+        let rows = vec![
+            macro_row("macro.pkg.helper", &[]),
+            macro_row("macro.pkg.wrapper", &["macro.pkg.helper"]),
+            macro_row("macro.pkg.other", &[]),
+            model_row("model.pkg.direct", &["macro.pkg.helper"]),
+            model_row("model.pkg.indirect", &["macro.pkg.wrapper"]),
+            model_row("model.pkg.unrelated", &["macro.pkg.other"]),
+            row("model.pkg.old_epoch", &[]),
+        ];
+        let mut seeds = HashSet::from(["macro.pkg.helper".to_string(), "model.pkg.x".to_string()]);
+        replace_macros_with_callers(&rows, &mut seeds);
+        assert_eq!(
+            seeds,
+            HashSet::from([
+                "model.pkg.direct".to_string(),
+                "model.pkg.indirect".to_string(),
+                "model.pkg.x".to_string(),
+            ])
+        );
+    }
+
     // ── fqn/tag helpers ──────────────────────────────────────────────────────
 
     #[test]
@@ -14,6 +14,25 @@
 //!
 //! When `None`: full resolve — all files processed, no prior nodes reused.
 //!
+//! # Changed dependency packages
+//!
+//! A change inside a dependency package (e.g. a version bump via `dbt deps`) does not
+//! discard the whole cache. The package is re-resolved as a whole, and only the nodes
+//! that transitively depend on its nodes or macros are dropped from the cache; every
+//! other package keeps its resolved nodes and macros.
+//!
+//! # Changed macro files
+//!
+//! Editing a `.sql` file under the root package's macro paths re-parses that file and
+//! re-resolves only the nodes whose rendering invoked one of its macros, directly or
+//! through other macros. The reverse index comes from `depends_on.macros`, recorded by
+//! the Jinja listener while each node is rendered, and from the macro→macro edges found
+//! by typechecking (see `invalidated_by_changed_macros`). The macro names each changed
+//! file defines are diffed against the previous parse: a newly defined name may shadow a
+//! macro of another package or another dispatch candidate, so the callers of those are
+//! re-resolved too (see `shadowed_macro_ids`). Macros that run outside of node rendering
+//! (`generate_*_name`, materializations) still fall back to a full parse.
+//!
 //! # Threshold
 //!
 //! If more than `INCREMENTAL_CACHE_FILE_THRESHOLD` files are impacted, the per-file
@@ -45,6 +64,10 @@ use dbt_schemas::{
     },
 };
 use dbt_yaml::Value;
+use minijinja::compiler::ast::{MacroKind, Stmt};
+use minijinja::compiler::parser::Parser;
+use minijinja::machinery::WhitespaceConfig;
+use minijinja::syntax::SyntaxConfig;
 use std::{
     collections::{HashMap, HashSet},
     ffi::OsStr,
@@ -84,8 +107,8 @@ fn drop_unchanged_nodes_from_assets(
 /// For the root package (index 0) and local-path deps: filter all asset lists
 /// so only changed files remain for re-resolution.
 ///
-/// For pinned dep packages (hub / git / tarball / private): their content is
-/// guaranteed unchanged by the `package-lock.yml` hash check in `validate()`.
+/// For pinned dep packages (hub / git / tarball / private) that are not in
+/// `changed_packages`: `compute_file_changeset` found every file unchanged.
 /// We keep the package entry in `dbt_state.packages` so that:
 ///
 ///   1. The macro-resolution loop in `resolver.rs` can re-register their macro
@@ -96,12 +119,19 @@ fn drop_unchanged_nodes_from_assets(
 ///
 /// We clear their asset lists so no files are re-parsed — their resolved nodes
 /// and macros come from the cache via `add_all_unchanged_nodes`.
+///
+/// Packages in `changed_packages` keep all of their assets so they are re-resolved
+/// in full.
 pub fn drop_all_unchanged_nodes(
     io: &IoArgs,
     dbt_state: &mut DbtState,
     unchanged_files: &HashSet<DbtPath>,
+    changed_packages: &HashSet<String>,
 ) {
     for (i, package) in dbt_state.packages.iter_mut().enumerate() {
+        if i > 0 && changed_packages.contains(&package.dbt_project.name) {
+            continue;
+        }
         let is_root = i == 0;
         // Non-root deps installed via `dbt deps` land under dbt_packages/<name>.
         // Local-path deps (`local: ../foo`) live outside dbt_packages — they need
@@ -125,8 +155,8 @@ pub fn drop_all_unchanged_nodes(
             drop_unchanged_nodes_from_assets(io, unchanged_files, &mut package.snapshot_files);
             drop_unchanged_nodes_from_assets(io, unchanged_files, &mut package.fixture_files);
         } else {
-            // Pinned dep (hub/git/tarball/private): lock-file hash guarantees
-            // content unchanged. Clear all asset lists so nothing is re-parsed.
+            // Unchanged pinned dep (hub/git/tarball/private): clear all asset
+            // lists so nothing is re-parsed.
             // The package entry itself stays so its name is registered as a
             // known macro namespace in the JinjaEnv.
             package.dbt_properties.clear();
@@ -165,6 +195,64 @@ pub fn add_all_unchanged_nodes(resolved_state: &mut ResolverState, cached_nodes:
 
 type DbtNodeRef = Arc<dyn InternalDbtNodeAttributes>;
 
+/// Macros dbt invokes outside of node rendering (while resolving configs). Their callers
+/// are not recorded in `depends_on.macros`, so a change to one can affect every node.
+const PROJECT_WIDE_MACRO_NAMES: &[&str] = &[
+    "generate_schema_name",
+    "generate_alias_name",
+    "generate_database_name",
+];
+
+/// Names of the macros, tests and materializations `source` defines, including nested
+/// ones, or `None` when the file does not parse.
+fn defined_macro_names(source: &str, path: &str) -> Option<HashSet<String>> {
+    fn collect(stmt: &Stmt<'_>, names: &mut HashSet<String>) {
+        match stmt {
+            Stmt::Template(template) => {
+                for child in &template.children {
+                    collect(child, names);
+                }
+            }
+            Stmt::Macro((macro_node, kind, _)) => {
+                if matches!(
+                    kind,
+                    MacroKind::Macro | MacroKind::Test | MacroKind::Materialization
+                ) {
+                    names.insert(macro_node.name.to_string());
+                }
+                for child in &macro_node.body {
+                    collect(child, names);
+                }
+            }
+            _ => {}
+        }
+    }
+
+    let mut parser = Parser::new(
+        source,
+        path,
+        false,
+        #[allow(clippy::default_constructed_unit_structs)]
+        SyntaxConfig::builder().build().unwrap(),
+        WhitespaceConfig::default(),
+    );
+    let ast = parser
+        .parse_top_level_statements(&["macro", "test", "materialization", "snapshot"])
+        .ok()?;
+    let mut names = HashSet::new();
+    collect(&ast, &mut names);
+    Some(names)
+}
+
+/// Returns true for macros whose callers the reverse index cannot see: see
+/// [`PROJECT_WIDE_MACRO_NAMES`]. Covers dispatched variants (`default__…`) too.
+pub(crate) fn is_project_wide_macro(name: &str) -> bool {
+    let base = name.split_once("__").map_or(name, |(_, base)| base);
+    name.starts_with("materialization_")
+        || PROJECT_WIDE_MACRO_NAMES.contains(&name)
+        || PROJECT_WIDE_MACRO_NAMES.contains(&base)
+}
+
 fn is_sql_file_path(path: &Path) -> bool {
     path.extension() == Some(OsStr::new("sql"))
 }
@@ -393,6 +481,134 @@ fn filter_dbt_nodes_by_file_changes(
     Ok((keep, invalidated))
 }
 
+/// Returns the unique ids of every node and macro invalidated by a change to
+/// `changed_packages`: everything those packages define, plus everything that
+/// transitively depends on it through `depends_on.nodes` or `depends_on.macros`.
+pub fn invalidated_by_changed_packages(
+    nodes: &Nodes,
+    macros: &Macros,
+    changed_packages: &HashSet<String>,
+) -> HashSet<String> {
+    let seeds = nodes
+        .iter()
+        .filter(|(_, node)| changed_packages.contains(&node.common().package_name))
+        .map(|(unique_id, _)| unique_id.clone())
+        .chain(
+            macros
+                .macros
+                .iter()
+                .filter(|(_, mac)| changed_packages.contains(&mac.package_name))
+                .map(|(unique_id, _)| unique_id.clone()),
+        )
+        .collect();
+    with_transitive_dependents(nodes, macros, seeds)
+}
+
+/// Returns true when an `on-run-start`/`on-run-end` hook is defined by one of
+/// `changed_packages` or invokes a macro in `invalidated`, the transitive invalidation
+/// of both changed packages and changed or shadowed macros.
+///
+/// Hooks are restored from the cache as a whole and never re-resolved on the
+/// incremental path, so such a hook would keep its stale rendering.
+pub fn hooks_depend_on_changes(
+    operations: &Operations,
+    changed_packages: &HashSet<String>,
+    invalidated: &HashSet<String>,
+) -> bool {
+    operations
+        .on_run_start
+        .iter()
+        .chain(operations.on_run_end.iter())
+        .any(|op| {
+            changed_packages.contains(&op.__common_attr__.package_name)
+                || op
+                    .__base_attr__
+                    .depends_on
+                    .macros
+                    .iter()
+                    .any(|mac| invalidated.contains(mac))
+        })
+}
+
+/// Returns `changed_macros` plus the unique ids of every node and macro that invoked
+/// one of them, directly or through other macros.
+///
+/// Node→macro edges are the macros the Jinja listener saw while rendering each node
+/// (`depends_on.macros`); macro→macro edges come from typechecking macro bodies. Both
+/// are persisted with the parse state, so this is a reverse-index walk with no
+/// re-rendering.
+pub fn invalidated_by_changed_macros(
+    nodes: &Nodes,
+    macros: &Macros,
+    changed_macros: &HashSet<String>,
+) -> HashSet<String> {
+    with_transitive_dependents(nodes, macros, changed_macros.clone())
+}
+
+/// Returns the unique ids of the previously resolved macros that a newly defined macro
+/// named in `added_names` may take the place of: macros of the same name in any package
+/// and, for a dispatch implementation (`<prefix>__<name>`), every other candidate of the
+/// same dispatched macro. Their callers resolved to the old macro and must be re-resolved.
+pub fn shadowed_macro_ids(macros: &Macros, added_names: &HashSet<String>) -> HashSet<String> {
+    let dispatched: HashSet<&str> = added_names
+        .iter()
+        .filter_map(|name| name.split_once("__").map(|(_, base)| base))
+        .collect();
+    macros
+        .macros
+        .iter()
+        .filter(|(_, mac)| {
+            added_names.contains(&mac.name)
+                || dispatched.contains(
+                    mac.name
+                        .split_once("__")
+                        .map_or(mac.name.as_str(), |(_, base)| base),
+                )
+        })
+        .map(|(unique_id, _)| unique_id.clone())
+        .collect()
+}
+
+/// Extends `invalidated` with everything that transitively depends on one of its
+/// entries through `depends_on.nodes` or `depends_on.macros`.
+fn with_transitive_dependents(
+    nodes: &Nodes,
+    macros: &Macros,
+    mut invalidated: HashSet<String>,
+) -> HashSet<String> {
+    let mut reverse_deps: HashMap<&str, Vec<&str>> = HashMap::new();
+    for (unique_id, node) in nodes.iter() {
+        let depends_on = &node.base().depends_on;
+        for dep in depends_on.nodes.iter().chain(depends_on.macros.iter()) {
+            reverse_deps
+                .entry(dep.as_str())
+                .or_default()
+                .push(unique_id.as_str());
+        }
+    }
+    for (unique_id, mac) in &macros.macros {
+        for dep in &mac.depends_on.macros {
+            reverse_deps
+                .entry(dep.as_str())
+                .or_default()
+                .push(unique_id.as_str());
+        }
+    }
+
+    let mut to_process: Vec<String> = invalidated.iter().cloned().collect();
+    while let Some(current) = to_process.pop() {
+        let Some(dependents) = reverse_deps.get(current.as_str()) else {
+            continue;
+        };
+        for dependent in dependents {
+            if invalidated.insert((*dependent).to_string()) {
+                to_process.push((*dependent).to_string());
+            }
+        }
+    }
+    invalidated
+}
+
 pub struct PreviousResolvedState<'a> {
     pub nodes: &'a Nodes,
     pub disabled_nodes: &'a Nodes,
@@ -441,6 +657,7 @@ fn determine_changeset_from_previous_resolved_nodes<'a>(
     mut unimpacted_files: HashSet<PathBuf>,
     mut impacted_files: HashSet<PathBuf>,
     mut impacted_schema_files: HashSet<PathBuf>,
+    changed_packages: &HashSet<String>,
 ) -> FsResult<Option<CacheState>> {
     let prev_nodes = prev_resolved_state.nodes;
     let prev_node_statuses = &prev_resolved_state.node_statuses;
@@ -486,6 +703,112 @@ fn determine_changeset_from_previous_resolved_nodes<'a>(
         .map(|node| (node.1.common().unique_id.to_string(), node.1.clone()))
         .collect::<HashMap<_, _>>();
 
+    // Nodes that depend on a changed package are re-resolved through their input
+    // files. Files of the changed packages themselves are not queued as schema files:
+    // the package is re-resolved as a whole and the file may no longer exist.
+    let package_invalidated = if changed_packages.is_empty() {
+        HashSet::new()
+    } else {
+        invalidated_by_changed_packages(prev_nodes, prev_resolved_state.macros, changed_packages)
+    };
+
+    // Macros of changed root-package macro files are re-parsed; the nodes whose rendering
+    // invoked them are re-resolved through their input files, like package dependents.
+    let root_package = dbt_state.root_package();
+    let changed_macro_files: HashSet<String> = root_package
+        .macro_files
+        .iter()
+        .map(|asset| strip_in_dir_from_asset(io, asset).display().to_string())
+        .filter(|path| changed_files.contains(path))
+        .collect();
+    let changed_macros: HashSet<String> = prev_resolved_state
+        .macros
+        .macros
+        .iter()
+        .filter(|(_, mac)| {
+            mac.package_name == root_package.dbt_project.name
+                && changed_macro_files.contains(&mac.original_file_path.display().to_string())
+        })
+        .map(|(unique_id, _)| unique_id.clone())
+        .collect();
+    // Diff the macro names the changed files define against the previous parse. A name
+    // that is new to the project may shadow a same-named macro of another package, or a
+    // dispatch candidate of the same macro, so the callers of those are re-resolved too.
+    let previous_names: HashSet<String> = changed_macros
+        .iter()
+        .map(|unique_id| prev_resolved_state.macros.macros[unique_id].name.clone())
+        .collect();
+    let mut current_names = HashSet::new();
+    for path in &changed_macro_files {
+        let Some(names) = stdfs::read_to_string(io.in_dir.join(path))
+            .ok()
+            .and_then(|source| defined_macro_names(&source, path))
+        else {
+            eprintln!(
+                "[partial-parse] changed macro file {path} could not be parsed, \
+                 falling back to full parse"
+            );
+            return Ok(None);
+        };
+        current_names.extend(names);
+    }
+    if previous_names
+        .iter()
+        .chain(current_names.iter())
+        .any(|name| is_project_wide_macro(name))
+    {
+        eprintln!(
+            "[partial-parse] changed macro file defines a materialization or \
+             generate_*_name macro, falling back to full parse"
+        );
+        return Ok(None);
+    }
+    let added_names = current_names.difference(&previous_names).cloned().collect();
+    let shadowed_macros = shadowed_macro_ids(prev_resolved_state.macros, &added_names);
+    let macro_invalidated = if changed_macros.is_empty() && shadowed_macros.is_empty() {
+        HashSet::new()
+    } else {
+        invalidated_by_changed_macros(
+            prev_nodes,
+            prev_resolved_state.macros,
+            &changed_macros.union(&shadowed_macros).cloned().collect(),
+        )
+    };
+    if hooks_depend_on_changes(
+        prev_resolved_state.operations,
+        changed_packages,
+        &package_invalidated
+            .union(&macro_invalidated)
+            .cloned()
+            .collect(),
+    ) {
+        eprintln!(
+            "[partial-parse] changed dependency package or macro feeds an on-run hook, \
+             falling back to full parse"
+        );
+        return Ok(None);
+    }
+
+    let mut changed_package_files: HashSet<PathBuf> = HashSet::new();
+    for unique_id in package_invalidated.iter().chain(macro_invalidated.iter()) {
+        let Some(node) = prev_dbt_nodes.get(unique_id) else {
+            continue;
+        };
+        let Some(input_files) = input_file_lookup.get(unique_id) else {
+            continue;
+        };
+        let in_changed_package = changed_packages.contains(&node.common().package_name);
+        for input_file in input_files {
+            unimpacted_files.remove(input_file);
+            impacted_files.insert(input_file.clone());
+            if in_changed_package {
+                changed_package_files.insert(input_file.clone());
+            } else if is_yml_file_path(input_file) {
+                impacted_schema_files.insert(input_file.clone());
+            }
+        }
+    }
+
     let mut changed_nodes = HashSet::new();
     for node in prev_dbt_nodes.values() {
         let Some(input_files) = input_file_lookup.get(&node.common().unique_id) else {
@@ -546,6 +869,32 @@ fn determine_changeset_from_previous_resolved_nodes<'a>(
         prev_resolved_state.get_columns_in_relation_calls.clone();
     let mut patterned_dangling_sources = prev_resolved_state.patterned_dangling_sources.clone();
 
+    // Macros and disabled nodes of changed packages are rebuilt when the package is
+    // re-resolved. Macros of other packages are kept even when they call into a changed
+    // package: their sources are unchanged and calls are resolved at render time.
+    resolved_nodes
+        .macros
+        .macros
+        .retain(|_, m| !changed_packages.contains(&m.package_name));
+    resolved_nodes
+        .macros
+        .docs_macros
+        .retain(|_, m| !changed_packages.contains(&m.package_name));
+    let disabled_in_changed_packages: Vec<String> = prev_resolved_state
+        .disabled_nodes
+        .iter()
+        .filter(|(_, node)| changed_packages.contains(&node.common().package_name))
+        .map(|(unique_id, _)| unique_id.clone())
+        .collect();
+    for unique_id in &disabled_in_changed_packages {
+        remove_node(&mut resolved_nodes.disabled_nodes, unique_id);
+    }
+    // Changed macros are re-parsed from their files. Their callers are kept: only the
+    // nodes rendered through them need to be re-resolved.
+    for unique_id in &changed_macros {
+        resolved_nodes.macros.macros.remove(unique_id);
+    }
+
     let impacted_nodes = invalidated.keys().cloned().collect();
     for node in invalidated {
         let unique_id = node.0;
@@ -567,11 +916,19 @@ fn determine_changeset_from_previous_resolved_nodes<'a>(
         unimpacted_patterned_dangling_sources: patterned_dangling_sources,
         changed_nodes: Arc::new(changed_nodes),
         impacted_nodes: Arc::new(impacted_nodes),
+        changed_packages: Arc::new(changed_packages.clone()),
+        changed_macro_files: Arc::new(changed_macro_files.into_iter().map(DbtPath::from).collect()),
     };
 
     // If too many files changed, the incremental cache is more expensive than a full
-    // parse. Fall back and tell the user why so the slowdown is diagnosable.
-    let impacted_total = nodes_with_changeset.file_changes.impacted_files.len()
+    // parse. Fall back and tell the user why so the slowdown is diagnosable. Files of
+    // changed packages don't count: those packages are re-resolved wholesale anyway.
+    let impacted_total = nodes_with_changeset
+        .file_changes
+        .impacted_files
+        .iter()
+        .filter(|f| !changed_package_files.contains(f.as_path()))
+        .count()
         + nodes_with_changeset.file_changes.new_files.len()
         + nodes_with_changeset.file_changes.deleted_files.len();
     if impacted_total > INCREMENTAL_CACHE_FILE_THRESHOLD {
@@ -592,6 +949,25 @@ pub fn determine_cache_state_from_previous_previous_resolved_nodes<'a>(
     prev_resolved_state: PreviousResolvedState<'a>,
     changed_files_list: &[String],
     dbt_state: &DbtState,
+) -> FsResult<Option<CacheState>> {
+    determine_cache_state_with_changed_packages(
+        io,
+        prev_resolved_state,
+        changed_files_list,
+        &HashSet::new(),
+        dbt_state,
+    )
+}
+
+/// Like [`determine_cache_state_from_previous_previous_resolved_nodes`], but also
+/// re-resolves the dependency packages in `changed_packages` and everything that
+/// depends on them.
+pub fn determine_cache_state_with_changed_packages<'a>(
+    io: &IoArgs,
+    prev_resolved_state: PreviousResolvedState<'a>,
+    changed_files_list: &[String],
+    changed_packages: &HashSet<String>,
+    dbt_state: &DbtState,
 ) -> FsResult<Option<CacheState>> {
     // Collect all current files from dbt_state
     let mut all_current_files: HashSet<PathBuf> = HashSet::new();
@@ -646,5 +1022,6 @@ pub fn determine_cache_state_from_previous_previous_resolved_nodes<'a>(
         unchanged_files,
         changed_files,
         changed_schema_files,
+        changed_packages,
     )
 }
@@ -8,6 +8,7 @@
 //! target/parse_state/
 //!   project.parquet              — project-level key/value pairs (profile, vars, deps, kinds, …)
 //!   filestamps.parquet           — per-package file timestamps
+//!   content_stamps.parquet       — (size, mtime, inode) → content hash for hashed files
 //!   alive.parquet                — snapshot of all currently-alive unique_ids
 //!   nodes/v1_0.parquet           — base epoch (or compacted)
 //!   nodes/v1_1.parquet           — delta epoch
@@ -21,8 +22,14 @@
 //! - Incremental (`changed_nodes = Some(set)`): write a new `nodes/N.parquet`
 //!   with only the changed rows.
 //! - Read: collect all epoch files in order, latest epoch wins by `unique_id`.
-//! - Compact: when delta row count > 10% of alive nodes OR file count > 8,
-//!   merge all into `nodes/0.parquet` and delete the rest.
+//! - Compact: when delta row count > 10% of alive nodes, file count > 8, OR the
+//!   delta files together exceed a quarter of the base file's size, merge all
+//!   into `nodes/0.parquet` and delete the rest. With
+//!   [`SaveArgs::background_compaction`] the merge runs on a background thread
+//!   while the command continues; every reader of the epoch files (and the next
+//!   save) first waits for it via [`wait_for_background_compaction`]. The merged
+//!   file is written to a temporary path and renamed into place, so a process
+//!   that exits mid-merge leaves the previous epochs intact.
 //!
 //! # Liveness invariant
 //!
@@ -43,7 +50,8 @@ use std::{
     collections::{BTreeMap, BTreeSet, HashMap, HashSet},
     fs,
     path::{Path, PathBuf},
-    sync::Arc,
+    sync::{Arc, Mutex},
+    thread::JoinHandle,
     time::{Duration, Instant, SystemTime, UNIX_EPOCH},
 };
 
@@ -103,6 +111,10 @@ fn filestamps_path(dir: &Path) -> PathBuf {
     dir.join("filestamps.parquet")
 }
 
+fn content_stamps_path(dir: &Path) -> PathBuf {
+    dir.join("content_stamps.parquet")
+}
+
 pub(crate) fn nodes_dir(dir: &Path) -> PathBuf {
     dir.join("nodes")
 }
@@ -126,6 +138,7 @@ fn existing_epochs(dir: &Path) -> Vec<u32> {
 
 /// Returns `(epoch_number, path)` pairs for the nodes directory.
 pub(crate) fn existing_epoch_paths(dir: &Path) -> Vec<(u32, PathBuf)> {
+    wait_for_background_compaction();
     let prefix = version_prefix();
     dbt_metadata_parquet::epoch_io::existing_epochs(&nodes_dir(dir), &prefix)
 }
@@ -160,7 +173,6 @@ pub struct GenerationRow {
     pub profile_file_hash: String,
     pub project_file_hash: String,
     pub cli_vars_hash: String,
-    pub packages_lock_hash: String,
 }
 
 /// Single-row record written every parse (cold and incremental). Contains resolver
@@ -199,6 +211,15 @@ struct FilestampRow {
     ingested_at: i64,
 }
 
+#[derive(Serialize, Deserialize, Clone)]
+struct ContentStampRow {
+    path: String,
+    size: i64,
+    mtime_ns: i64,
+    inode: i64,
+    hash: String,
+}
+
 #[derive(Serialize, Deserialize, Clone, Default)]
 pub(crate) struct NodeRow {
     pub unique_id: String,
@@ -232,6 +253,11 @@ pub(crate) struct NodeRow {
     pub group_name: Option<String>,
     pub source_name: Option<String>,
     pub identifier: Option<String>,
+    /// Macros invoked while rendering the node (`depends_on.macros`, as recorded by the
+    /// Jinja listener). Null for macro rows, whose macro→macro edges live in
+    /// `depends_on`, and for epoch files written before this column existed.
+    #[serde(default)]
+    pub macro_depends_on: Option<Vec<String>>,
 }
 
 /// Index-only view of NodeRow — columns needed for selector evaluation, excluding `payload`.
@@ -247,6 +273,8 @@ pub(crate) struct NodeIndexRow {
     pub fqn: Vec<String>,
     pub tags: Vec<String>,
     pub depends_on: Vec<String>,
+    #[serde(default)]
+    pub macro_depends_on: Option<Vec<String>>,
     /// Kept for future lazy-load logic that distinguishes ephemeral / view materializations.
     #[allow(dead_code)]
     pub materialization: String,
@@ -296,7 +324,6 @@ fn generation_fields() -> Vec<FieldRef> {
         str_field("profile_file_hash"),
         str_field("project_file_hash"),
         str_field("cli_vars_hash"),
-        str_field("packages_lock_hash"),
     ]
 }
 
@@ -334,6 +361,16 @@ fn filestamp_fields() -> Vec<FieldRef> {
     ]
 }
 
+fn content_stamp_fields() -> Vec<FieldRef> {
+    vec![
+        str_field("path"),
+        i64_field("size"),
+        i64_field("mtime_ns"),
+        i64_field("inode"),
+        str_field("hash"),
+    ]
+}
+
 fn nullable_str_field(name: &str) -> FieldRef {
     Arc::new(Field::new(name, DataType::Utf8, true))
 }
@@ -346,6 +383,14 @@ fn list_str_field(name: &str) -> FieldRef {
     ))
 }
 
+fn nullable_list_str_field(name: &str) -> FieldRef {
+    Arc::new(Field::new(
+        name,
+        DataType::List(Arc::new(Field::new("item", DataType::Utf8, false))),
+        true,
+    ))
+}
+
 fn node_fields() -> Vec<FieldRef> {
     vec![
         str_field("unique_id"),
@@ -375,6 +420,7 @@ fn node_fields() -> Vec<FieldRef> {
         nullable_str_field("group_name"),
         nullable_str_field("source_name"),
         nullable_str_field("identifier"),
+        nullable_list_str_field("macro_depends_on"),
     ]
 }
 
@@ -389,6 +435,7 @@ where
     let fqn = c.fqn.clone();
     let tags = c.tags.clone();
     let depends_on = b.depends_on.nodes.clone();
+    let macro_depends_on = Some(b.depends_on.macros.clone());
     let uses_graph = if c.raw_code.as_deref().unwrap_or("").contains("graph") {
         1
     } else {
@@ -433,6 +480,7 @@ where
         alias,
         relation_name: b.relation_name.clone(),
         group_name,
+        macro_depends_on,
         ..Default::default()
     }
 }
@@ -703,14 +751,198 @@ fn collect_alive_rows(
     rows
 }
 
+// ── content stamps ────────────────────────────────────────────────────────────
+
+/// Stat fields that identify a particular version of a file without reading it.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub struct FileStamp {
+    pub size: u64,
+    pub mtime_ns: u64,
+    pub inode: u64,
+}
+
+impl FileStamp {
+    pub fn of(path: &Path) -> Option<Self> {
+        let meta = fs::metadata(path).ok()?;
+        #[cfg(unix)]
+        let inode = std::os::unix::fs::MetadataExt::ino(&meta);
+        #[cfg(not(unix))]
+        let inode = 0;
+        Some(Self {
+            size: meta.len(),
+            mtime_ns: system_time_to_nanos(meta.modified().unwrap_or(UNIX_EPOCH)),
+            inode,
+        })
+    }
+}
+
+/// Files modified this recently are hashed but not remembered: a write landing in
+/// the same mtime tick as our read would otherwise leave a stale hash behind an
+/// unchanged stamp.
+const RACY_STAMP_WINDOW: Duration = Duration::from_secs(2);
+
+/// Content hashes keyed by path and guarded by a [`FileStamp`].
+///
+/// A file is only re-read when its stamp differs from the one recorded with its
+/// hash, so repeated partial-parse validation of an unchanged project does not
+/// read `profiles.yml` or `dbt_project.yml` at all.
+#[derive(Debug, Clone, Default)]
+pub struct ContentStamps {
+    entries: HashMap<String, (FileStamp, String)>,
+    dirty: bool,
+}
+
+impl ContentStamps {
+    pub fn load(out_dir: &Path) -> Self {
+        let entries = read_rows::<ContentStampRow>(&content_stamps_path(&cache_dir(out_dir)))
+            .into_iter()
+            .map(|row| {
+                let stamp = FileStamp {
+                    size: row.size as u64,
+                    mtime_ns: row.mtime_ns as u64,
+                    inode: row.inode as u64,
+                };
+                (row.path, (stamp, row.hash))
+            })
+            .collect();
+        Self {
+            entries,
+            dirty: false,
+        }
+    }
+
+    /// Returns the content hash of `path`, reading the file only when its stamp
+    /// does not match the recorded one. Does not update the cache.
+    pub fn hash(&self, path: &Path) -> String {
+        if let Some(stamp) = FileStamp::of(path)
+            && let Some((cached, hash)) = self.entries.get(path.to_string_lossy().as_ref())
+            && *cached == stamp
+        {
+            return hash.clone();
+        }
+        crate::partial_parse::hash_file_at_path(path)
+    }
+
+    /// Like [`ContentStamps::hash`], but remembers freshly computed hashes.
+    pub fn record(&mut self, path: &Path) -> String {
+        let key = path.to_string_lossy().into_owned();
+        let Some(stamp) = FileStamp::of(path) else {
+            if self.entries.remove(&key).is_some() {
+                self.dirty = true;
+            }
+            return crate::partial_parse::hash_file_at_path(path);
+        };
+        if let Some((cached, hash)) = self.entries.get(&key)
+            && *cached == stamp
+        {
+            return hash.clone();
+        }
+        let hash = crate::partial_parse::hash_file_at_path(path);
+        let now_ns = system_time_to_nanos(SystemTime::now());
+        if now_ns.saturating_sub(stamp.mtime_ns) >= RACY_STAMP_WINDOW.as_nanos() as u64 {
+            self.entries.insert(key, (stamp, hash.clone()));
+            self.dirty = true;
+        } else if self.entries.remove(&key).is_some() {
+            self.dirty = true;
+        }
+        hash
+    }
+
+    /// Writes `content_stamps.parquet` if any entry changed since [`ContentStamps::load`].
+    pub fn save(&self, out_dir: &Path) -> Result<(), String> {
+        if !self.dirty {
+            return Ok(());
+        }
+        let dir = cache_dir(out_dir);
+        fs::create_dir_all(&dir).map_err(|e| e.to_string())?;
+        let mut rows: Vec<ContentStampRow> = self
+            .entries
+            .iter()
+            .map(|(path, (stamp, hash))| ContentStampRow {
+                path: path.clone(),
+                size: stamp.size as i64,
+                mtime_ns: stamp.mtime_ns as i64,
+                inode: stamp.inode as i64,
+                hash: hash.clone(),
+            })
+            .collect();
+        rows.sort_by(|a, b| a.path.cmp(&b.path));
+        if !write_rows_with_fields(&content_stamps_path(&dir), &content_stamp_fields(), &rows) {
+            return Err("failed to write content_stamps.parquet".to_string());
+        }
+        Ok(())
+    }
+}
+
 // ── epoch compaction ──────────────────────────────────────────────────────────
 
+/// Compaction started by the last [`save`] with `background_compaction` set.
+static BACKGROUND_COMPACTION: Mutex<Option<JoinHandle<()>>> = Mutex::new(None);
+
+/// Blocks until a compaction started in the background by [`save`] has
+/// finished. Returns immediately when none is running.
+///
+/// Called before any read of the node epochs; the CLI also calls it before
+/// exiting so the merge is not cut short.
+pub fn wait_for_background_compaction() {
+    let handle = BACKGROUND_COMPACTION
+        .lock()
+        .ok()
+        .and_then(|mut pending| pending.take());
+    if let Some(handle) = handle {
+        let tw = Instant::now();
+        let _ = handle.join();
+        t("wait for background compaction", tw);
+    }
+}
+
+/// Whether the node epochs should be merged after writing a delta of
+/// `delta_len` rows: see [`dbt_metadata_parquet::epoch_io::should_compact`]
+/// (row and file count) and
+/// [`dbt_metadata_parquet::epoch_io::deltas_outgrew_base`] (accumulated size).
+fn needs_compaction(dir: &Path, delta_len: usize, total_alive: usize) -> bool {
+    use dbt_metadata_parquet::epoch_io::{deltas_outgrew_base, epoch_sizes, should_compact};
+    let prefix = version_prefix();
+    if should_compact(delta_len, total_alive, existing_epochs(dir).len()) {
+        return true;
+    }
+    let (base_bytes, delta_bytes) = epoch_sizes(&nodes_dir(dir), &prefix);
+    deltas_outgrew_base(base_bytes, delta_bytes)
+}
+
+/// Runs [`compact`] on a background thread, or inline when `background` is
+/// false or the thread cannot be spawned.
+fn schedule_compaction(dir: &Path, background: bool) {
+    if !background {
+        compact(dir);
+        return;
+    }
+    let owned = dir.to_path_buf();
+    match std::thread::Builder::new()
+        .name("parse-state-compaction".to_string())
+        .spawn(move || compact(&owned))
+    {
+        Ok(handle) => {
+            if let Ok(mut pending) = BACKGROUND_COMPACTION.lock() {
+                *pending = Some(handle);
+            }
+        }
+        Err(_) => compact(dir),
+    }
+}
+
 /// Merge all epoch files into `nodes/0.parquet`, delete the rest.
+///
+/// The merged rows are written to a temporary file that replaces epoch 0 by
+/// rename, and delta files are deleted only afterwards. Interrupting the merge
+/// at any point therefore leaves a readable state: either the old epochs, or
+/// the merged base plus deltas whose rows it already contains.
 fn compact(dir: &Path) {
     let epochs = existing_epochs(dir);
     if epochs.len() <= 1 {
         return;
     }
+    let tc = Instant::now();
     // Read all epochs in order; latest epoch wins by unique_id.
     // We build a HashMap keyed by unique_id; later epochs overwrite earlier ones.
     let mut by_id: HashMap<String, NodeRow> = HashMap::new();
@@ -721,17 +953,33 @@ fn compact(dir: &Path) {
     }
     let merged: Vec<NodeRow> = by_id.into_values().collect();
     // Write to epoch 0. ingested_at of each winning row is preserved naturally.
-    if write_rows_with_fields(&node_epoch_path(dir, 0), &node_fields(), &merged) {
-        // Delete all other epoch files.
-        for epoch in epochs.iter().filter(|&&e| e != 0) {
-            fs::remove_file(node_epoch_path(dir, *epoch)).ok();
-        }
+    let tmp = nodes_dir(dir).join(format!("{}0.parquet.tmp", version_prefix()));
+    if !write_rows_with_fields(&tmp, &node_fields(), &merged) {
+        fs::remove_file(&tmp).ok();
+        return;
     }
+    if fs::rename(&tmp, node_epoch_path(dir, 0)).is_err() {
+        fs::remove_file(&tmp).ok();
+        return;
+    }
+    // Delete all other epoch files.
+    for epoch in epochs.iter().filter(|&&e| e != 0) {
+        fs::remove_file(node_epoch_path(dir, *epoch)).ok();
+    }
+    t(
+        &format!(
+            "compact {} epochs into nodes/0.parquet ({} rows)",
+            epochs.len(),
+            merged.len()
+        ),
+        tc,
+    );
 }
 
 // ── read all node rows (latest-epoch wins) ────────────────────────────────────
 
 fn read_node_rows(dir: &Path) -> Vec<NodeRow> {
+    wait_for_background_compaction();
     let epochs = existing_epochs(dir);
     if epochs.is_empty() {
         return vec![];
@@ -800,8 +1048,6 @@ pub struct SaveArgs<'a> {
     pub profile_file_hash: &'a str,
     pub project_file_hash: &'a str,
     pub cli_vars_hash: &'a str,
-    /// blake3 hash of `package-lock.yml`. Empty string when no lock file exists.
-    pub packages_lock_hash: &'a str,
     pub dbt_profile_json: &'a str,
     pub vars_json: &'a str,
     pub env_vars_json: &'a str,
@@ -816,6 +1062,9 @@ pub struct SaveArgs<'a> {
     pub disabled_nodes: &'a Nodes,
     pub macros: &'a Macros,
     pub changed_nodes: Option<&'a HashSet<String>>,
+    /// Run a compaction triggered by this save on a background thread instead
+    /// of before returning. See [`wait_for_background_compaction`].
+    pub background_compaction: bool,
     pub ingested_at: i64,
     pub selectors_json: &'a str,
     pub git_sha: &'a str,
@@ -842,7 +1091,6 @@ impl<'a> SaveArgs<'a> {
             profile_file_hash: "",
             project_file_hash: "",
             cli_vars_hash: "",
-            packages_lock_hash: "",
             dbt_profile_json: "{}",
             vars_json: "{}",
             env_vars_json: "{}",
@@ -861,6 +1109,7 @@ impl<'a> SaveArgs<'a> {
             disabled_nodes: EMPTY_NODES.get_or_init(Nodes::default),
             macros: EMPTY_MACROS.get_or_init(Macros::default),
             changed_nodes: None,
+            background_compaction: false,
             ingested_at: 0,
         }
     }
@@ -976,6 +1225,9 @@ pub fn save(args: &SaveArgs<'_>) -> Result<(), String> {
         }
     }
 
+    // A merge left running by the previous save must not race this one.
+    wait_for_background_compaction();
+
     let t0 = Instant::now();
     let dir = cache_dir(args.out_dir);
     fs::create_dir_all(&dir).map_err(|e| e.to_string())?;
@@ -1069,7 +1321,6 @@ pub fn save(args: &SaveArgs<'_>) -> Result<(), String> {
                     profile_file_hash: args.profile_file_hash.to_string(),
                     project_file_hash: args.project_file_hash.to_string(),
                     cli_vars_hash: args.cli_vars_hash.to_string(),
-                    packages_lock_hash: args.packages_lock_hash.to_string(),
                 }],
             );
 
@@ -1135,13 +1386,10 @@ pub fn save(args: &SaveArgs<'_>) -> Result<(), String> {
                     tw,
                 );
 
-                // Periodic compaction: row-count (delta > 10% of alive) OR file-count (>8).
-                if dbt_metadata_parquet::epoch_io::should_compact(
-                    delta.len(),
-                    total_nodes,
-                    existing_epochs(&dir).len(),
-                ) {
-                    compact(&dir);
+                // Periodic compaction: row-count (delta > 10% of alive), file-count (>8)
+                // OR accumulated delta size (> 25% of the base file).
+                if needs_compaction(&dir, delta.len(), total_nodes) {
+                    schedule_compaction(&dir, args.background_compaction);
                 }
                 any_uses_graph
             }
@@ -1244,7 +1492,6 @@ pub struct LoadedState {
     pub profile_file_hash: String,
     pub project_file_hash: String,
     pub cli_vars_hash: String,
-    pub packages_lock_hash: String,
     pub dbt_profile_json: String,
     pub vars_json: String,
     pub env_vars_json: String,
@@ -1343,7 +1590,6 @@ pub fn load_filtered_with_unique_ids(
         profile_file_hash: generation.profile_file_hash,
         project_file_hash: generation.project_file_hash,
         cli_vars_hash: generation.cli_vars_hash,
-        packages_lock_hash: generation.packages_lock_hash,
         dbt_profile_json: rs.dbt_profile_json,
         vars_json: rs.vars_json,
         env_vars_json: rs.env_vars_json,
@@ -1724,6 +1970,76 @@ mod tests {
         assert!(by_id.is_empty(), "unexpected extra rows: {by_id:?}");
     }
 
+    /// Many small deltas stay under the per-delta row and file-count thresholds;
+    /// the size signal still compacts once they outgrow the base file.
+    #[test]
+    fn compaction_triggers_when_deltas_outgrow_base() {
+        let tmp = TempDir::new().unwrap();
+        let dir = cache_dir(tmp.path());
+        fs::create_dir_all(nodes_dir(&dir)).unwrap();
+
+        let base = vec![
+            make_row("a", "{}"),
+            make_row("b", "{}"),
+            make_row("c", "{}"),
+        ];
+        write_rows_with_fields(&node_epoch_path(&dir, 0), &node_fields(), &base);
+        assert!(!needs_compaction(&dir, 1, base.len()));
+
+        // Hex digits of an LCG: poorly compressible, so each delta file stays large.
+        let mut seed: u64 = 42;
+        for i in 1u32..=3 {
+            let payload: String = (0..300_000)
+                .map(|_| {
+                    seed = seed.wrapping_mul(6364136223846793005).wrapping_add(1);
+                    char::from_digit(((seed >> 60) & 0xf) as u32, 16).unwrap()
+                })
+                .collect();
+            write_rows_with_fields(
+                &node_epoch_path(&dir, i),
+                &node_fields(),
+                &[make_row("a", &payload)],
+            );
+        }
+        assert!(!dbt_metadata_parquet::epoch_io::should_compact(
+            1,
+            base.len(),
+            4
+        ));
+        assert!(needs_compaction(&dir, 1, base.len()));
+    }
+
+    /// A background compaction is joined before the epochs are read, and leaves
+    /// only the merged base behind.
+    #[test]
+    fn background_compaction_is_joined_before_reads() {
+        let tmp = TempDir::new().unwrap();
+        let dir = cache_dir(tmp.path());
+        fs::create_dir_all(nodes_dir(&dir)).unwrap();
+
+        let base = vec![make_row("a", r#"{"v":0}"#), make_row("b", r#"{"v":0}"#)];
+        write_rows_with_fields(&node_epoch_path(&dir, 0), &node_fields(), &base);
+        for i in 1u32..=9 {
+            let delta = vec![make_row("a", &format!(r#"{{"v":{i}}}"#))];
+            write_rows_with_fields(&node_epoch_path(&dir, i), &node_fields(), &delta);
+        }
+
+        schedule_compaction(&dir, true);
+        let rows = read_node_rows(&dir);
+
+        assert_eq!(existing_epochs(&dir), vec![0]);
+        let names: Vec<_> = fs::read_dir(nodes_dir(&dir))
+            .unwrap()
+            .flatten()
+            .map(|e| e.file_name().to_string_lossy().into_owned())
+            .collect();
+        assert_eq!(names, vec![format!("{}0.parquet", version_prefix())]);
+        let by_id: HashMap<String, String> =
+            rows.into_iter().map(|r| (r.unique_id, r.payload)).collect();
+        assert_eq!(by_id["a"], r#"{"v":9}"#);
+        assert_eq!(by_id["b"], r#"{"v":0}"#);
+    }
+
     /// Verify that all new NodeRow columns survive a write→read round-trip through parquet.
     #[test]
     fn node_fact_row_new_columns_round_trip() {
@@ -2309,4 +2625,68 @@ mod tests {
         assert_eq!(reconstructed.dbt_project.name, "my_project");
         assert_eq!(reconstructed.package_root_path, user.package_root_path);
     }
+
+    fn write_with_old_mtime(path: &Path, contents: &str) {
+        fs::write(path, contents).unwrap();
+        let file = fs::File::options().write(true).open(path).unwrap();
+        file.set_modified(SystemTime::now() - Duration::from_secs(60))
+            .unwrap();
+    }
+
+    #[test]
+    fn content_stamps_skip_rehash_when_stamp_unchanged() {
+        let tmp = TempDir::new().unwrap();
+        let file = tmp.path().join("dbt_project.yml");
+        write_with_old_mtime(&file, "name: a\n");
+        let mut stamps = ContentStamps::default();
+        let original = stamps.record(&file);
+        assert_eq!(original, crate::partial_parse::hash_file_at_path(&file));
+
+        // Same size, same inode, mtime restored: the stamp matches, so the recorded
+        // hash is returned without reading the new contents.
+        let stamp = FileStamp::of(&file).unwrap();
+        fs::write(&file, "name: b\n").unwrap();
+        let f = fs::File::options().write(true).open(&file).unwrap();
+        f.set_modified(UNIX_EPOCH + Duration::from_nanos(stamp.mtime_ns))
+            .unwrap();
+        assert_eq!(stamps.hash(&file), original);
+
+        // A size change alters the stamp and forces a rehash.
+        write_with_old_mtime(&file, "name: changed\n");
+        assert_ne!(stamps.hash(&file), original);
+        assert_eq!(
+            stamps.hash(&file),
+            crate::partial_parse::hash_file_at_path(&file)
+        );
+    }
+
+    #[test]
+    fn content_stamps_do_not_remember_recently_modified_files() {
+        let tmp = TempDir::new().unwrap();
+        let file = tmp.path().join("profiles.yml");
+        fs::write(&file, "x").unwrap();
+        let mut stamps = ContentStamps::default();
+        stamps.record(&file);
+        assert!(stamps.entries.is_empty());
+        assert!(!stamps.dirty);
+    }
+
+    #[test]
+    fn content_stamps_round_trip() {
+        let tmp = TempDir::new().unwrap();
+        let out_dir = tmp.path().join("target");
+        let file = tmp.path().join("package-lock.yml");
+        write_with_old_mtime(&file, "packages: []\n");
+
+        let mut stamps = ContentStamps::load(&out_dir);
+        let hash = stamps.record(&file);
+        stamps.save(&out_dir).unwrap();
+
+        let reloaded = ContentStamps::load(&out_dir);
+        assert!(!reloaded.dirty);
+        assert_eq!(
+            reloaded.entries.get(file.to_string_lossy().as_ref()),
+            Some(&(FileStamp::of(&file).unwrap(), hash))
+        );
+    }
 }
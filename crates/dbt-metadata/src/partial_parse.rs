@@ -24,8 +24,10 @@
 //! |---------------------------------|--------------------------------|-------------|------------------|
 //! | No files changed                | all file mtimes match          | Fast-path   | ~10ms            |
 //! | model / analysis `.sql` changed | file mtime changed             | Incremental | ~500ms           |
+//! | macro `.sql` changed (***)      | file mtime changed             | Incremental | —                |
 //! | any other file changed          | file mtime + kind/ext check    | FullParse   | ~1.8s            |
 //! | any file deleted                | stat fails                     | FullParse   | ~1.8s            |
+//! | dependency package changed (**) | per-package file mtimes        | Incremental | —                |
 //! | new file added                  | not in all_paths — not seen    | Incremental | ~500ms (*)       |
 //! | `dbt_project.yml` changed       | blake3 content hash            | FullParse   | ~1.8s            |
 //! | `profiles.yml` changed          | blake3 content hash            | FullParse   | ~1.8s            |
@@ -37,6 +39,20 @@
 //! discovered by WalkDir inside `initialize()` on the Incremental path — new model files
 //! are compiled, new macro/yml files trigger a FullParse from `compute_file_changeset`.
 //!
+//! (**) Includes `dbt deps` upgrades that rewrite `package-lock.yml`. `compute_file_changeset`
+//! compares every dependency package as a unit; a changed package is re-resolved in full and
+//! only the nodes that depend on its nodes or macros are dropped from the cache (see
+//! `parse_cache::invalidated_by_changed_packages`). Adding, removing or reordering packages
+//! still triggers a FullParse, and so does a changed package that defines an on-run hook or
+//! whose macros a hook calls, since hooks are always restored from the cache.
+//!
+//! (***) Root package only. The macros of the file are re-parsed and only the nodes whose
+//! rendering invoked them (transitively, via `depends_on.macros`) are re-resolved; see
+//! `parse_cache::invalidated_by_changed_macros`. A macro name the file newly defines also
+//! re-resolves the callers of the macros it may shadow (`parse_cache::shadowed_macro_ids`).
+//! Files that define a materialization or a `generate_*_name` macro still trigger a
+//! FullParse from `parse_cache`.
+//!
 //! # What `--partial-load` adds
 //!
 //! Without `--partial-load` the cache always loads *all* nodes from parquet.
@@ -86,7 +102,9 @@ use std::{
     time::{Duration, SystemTime, UNIX_EPOCH},
 };
 
-const INCREMENTAL_STATE_VERSION: u32 = 3;
+use crate::parse_state::ContentStamps;
+
+const INCREMENTAL_STATE_VERSION: u32 = 4;
 
 pub struct IncrementalState {
     pub version: u32,
@@ -101,11 +119,6 @@ pub struct IncrementalState {
     pub project_file_hash: String,
     /// blake3 hash of serialized CLI --vars — catches variable overrides between invocations.
     pub cli_vars_hash: String,
-    /// blake3 hash of `package-lock.yml` bytes.
-    /// Covers all pinned dep types (hub, git, tarball, private). When unchanged,
-    /// dep macro files are guaranteed identical — no file scanning needed.
-    /// Empty string when no lock file exists (new project / local-only deps).
-    pub packages_lock_hash: String,
     pub dbt_profile: DbtProfile,
     pub vars: BTreeMap<String, IndexMap<String, DbtVars>>,
     pub nodes: Nodes,
@@ -134,6 +147,8 @@ pub struct IncrementalState {
     pub git_sha: String,
     pub git_branch: String,
     pub git_is_dirty: bool,
+    /// Stamp-guarded content hashes so `validate()` only re-reads hashed files that changed.
+    pub content_stamps: ContentStamps,
 }
 
 impl IncrementalState {
@@ -152,21 +167,13 @@ impl IncrementalState {
         if let Some(root_pkg) = self.packages.first() {
             let root_path = Path::new(&root_pkg.package_root_path);
             let profile_path = root_path.join(&self.dbt_profile.relative_profile_path);
-            if self.profile_file_hash != hash_file_at_path(&profile_path) {
+            if self.profile_file_hash != self.content_stamps.hash(&profile_path) {
                 return Some("profiles.yml content changed");
             }
             let project_path = root_path.join("dbt_project.yml");
-            if self.project_file_hash != hash_file_at_path(&project_path) {
+            if self.project_file_hash != self.content_stamps.hash(&project_path) {
                 return Some("dbt_project.yml content changed");
             }
-            // package-lock.yml covers all pinned dep types (hub, git, tarball, private).
-            // Any `dbt deps` run rewrites this file → hash changes → full re-parse.
-            // We skip the check when no lock file existed at save time (empty hash).
-            let lock_path = root_path.join("package-lock.yml");
-            let current_lock_hash = hash_file_at_path(&lock_path);
-            if !self.packages_lock_hash.is_empty() && self.packages_lock_hash != current_lock_hash {
-                return Some("package-lock.yml changed");
-            }
         }
         for (name, old_value) in &self.env_vars {
             match std::env::var(name) {
@@ -193,11 +200,10 @@ impl IncrementalState {
     /// the change (e.g. `.md` docs are ignored by `compute_file_changeset`).
     pub fn needs_full_parse(&self) -> Option<&'static str> {
         for (i, pkg) in self.packages.iter().enumerate() {
-            // Non-root, non-local deps (hub/git/tarball/private) are pinned by
-            // package-lock.yml. validate() already checked that hash, so if we
-            // reach here the lock file is unchanged → their files are unchanged.
-            // Skip file-level scanning for these packages entirely.
-            if i > 0 && !pkg.is_local_dep {
+            // Dependency packages (pinned or local) are compared as a unit by
+            // `compute_file_changeset`; a changed package is re-resolved on the
+            // incremental path, so their files never force a full parse here.
+            if i > 0 {
                 continue;
             }
             let root = Path::new(&pkg.package_root_path);
@@ -211,7 +217,9 @@ impl IncrementalState {
                 }
                 let kind_safe_for_incremental = matches!(
                     kind,
-                    ResourcePathKind::ModelPaths | ResourcePathKind::AnalysisPaths
+                    ResourcePathKind::ModelPaths
+                        | ResourcePathKind::AnalysisPaths
+                        | ResourcePathKind::MacroPaths
                 );
                 let is_docs_path = *kind == ResourcePathKind::DocsPaths;
                 for (path_str, saved_nanos) in files {
@@ -234,7 +242,7 @@ impl IncrementalState {
                     if current_nanos == *saved_nanos {
                         continue;
                     }
-                    // File changed — only model/analysis .sql is safe for incremental.
+                    // File changed — only model/analysis/macro .sql is safe for incremental.
                     let is_sql = Path::new(path_str)
                         .extension()
                         .and_then(|e| e.to_str())
@@ -372,10 +380,8 @@ pub struct PackageSnapshot {
     pub manifest_path_config: ManifestPathConfig,
     pub all_paths: HashMap<ResourcePathKind, Vec<(String, u64)>>,
     pub dependencies: BTreeSet<String>,
-    /// True when this is a local-path dep (`local: ../foo`).
-    /// Local deps are not pinned by `package-lock.yml` so their files must be
-    /// scanned by mtime. Hub / git / tarball / private deps are pinned and
-    /// covered by the lock-file hash — no file scanning needed for those.
+    /// True when this is a local-path dep (`local: ../foo`), which lives outside
+    /// `dbt_packages/`.
     #[serde(default)]
     pub is_local_dep: bool,
 }
@@ -525,11 +531,9 @@ pub fn save_parse_state(
     let packages = snapshot_packages(dbt_state);
     let git_info =
         read_git_info(project_file_path.parent().unwrap_or(&project_file_path)).unwrap_or_default();
-    let lock_file_path = project_file_path
-        .parent()
-        .map(|p| p.join("package-lock.yml"))
-        .unwrap_or_default();
-    let packages_lock_hash = hash_file_at_path(&lock_file_path);
+    let mut content_stamps = ContentStamps::load(&io.out_dir);
+    let profile_file_hash = content_stamps.record(&profile_file_path);
+    let project_file_hash = content_stamps.record(&project_file_path);
 
     crate::parse_state::save(&crate::parse_state::SaveArgs {
         out_dir: &io.out_dir,
@@ -538,10 +542,9 @@ pub fn save_parse_state(
         project_name: packages.first().map_or("", |p| p.package_name.as_str()),
         adapter_type: dbt_state.dbt_profile.db_config.adapter_type().into(),
         profile_hash: &dbt_state.dbt_profile.blake3_hash(),
-        profile_file_hash: &hash_file_at_path(&profile_file_path),
-        project_file_hash: &hash_file_at_path(&project_file_path),
+        profile_file_hash: &profile_file_hash,
+        project_file_hash: &project_file_hash,
         cli_vars_hash: &hash_cli_vars(cli_vars),
-        packages_lock_hash: &packages_lock_hash,
         dbt_profile_json: &dbt_profile_json,
         vars_json: &vars_json,
         env_vars_json: &env_vars_json,
@@ -556,6 +559,7 @@ pub fn save_parse_state(
         disabled_nodes: &resolved_state.disabled_nodes,
         macros: &resolved_state.macros,
         changed_nodes,
+        background_compaction: true,
         ingested_at: dbt_state.run_started_at.timestamp_micros(),
         selectors_json: &serde_json::to_string(&resolved_state.manifest_selectors)
             .unwrap_or_default(),
@@ -564,6 +568,9 @@ pub fn save_parse_state(
         git_is_dirty: git_info.is_dirty,
     })
     .map_err(|e| fs_err!(ErrorCode::Generic, "Failed to save incremental state: {e}"))?;
+    content_stamps
+        .save(&io.out_dir)
+        .map_err(|e| fs_err!(ErrorCode::Generic, "Failed to save content stamps: {e}"))?;
 
     Ok(())
 }
@@ -705,8 +712,9 @@ pub fn unique_id_filter_for_selector(eval: &EvalArgs, io: &IoArgs) -> Option<Has
 }
 
 /// Compute the unique_id filter for `--dirty`: nodes whose source files have changed
-/// since the last `--partial-parse` run, plus all their downstream dependents and the
-/// full ancestor closure (so `all_deps_present()` always passes).
+/// since the last `--partial-parse` run (or that invoked a macro from a changed macro
+/// file), plus all their downstream dependents and the full ancestor closure (so
+/// `all_deps_present()` always passes).
 ///
 /// This is the same mtime-index logic previously exposed as the `state:dirty` selector
 /// atom, now accessed directly via the `--dirty` flag instead of a selector string.
@@ -934,7 +942,6 @@ pub fn load_parse_state_filtered_with_unique_ids(
         profile_file_hash: loaded.profile_file_hash,
         project_file_hash: loaded.project_file_hash,
         cli_vars_hash: loaded.cli_vars_hash,
-        packages_lock_hash: loaded.packages_lock_hash,
         dbt_profile,
         vars,
         nodes: loaded.nodes,
@@ -956,6 +963,7 @@ pub fn load_parse_state_filtered_with_unique_ids(
         git_sha: loaded.git_sha,
         git_branch: loaded.git_branch,
         git_is_dirty: loaded.git_is_dirty,
+        content_stamps: ContentStamps::load(&io.out_dir),
     })
 }
 
@@ -1153,7 +1161,6 @@ mod tests {
             profile_file_hash: hash_file_at_path(Path::new("/nonexistent")),
             project_file_hash: hash_file_at_path(Path::new("/nonexistent")),
             cli_vars_hash: hash_cli_vars(&None),
-            packages_lock_hash: String::new(),
             dbt_profile: profile,
             vars: Default::default(),
             nodes: Nodes::default(),
@@ -1178,6 +1185,7 @@ mod tests {
             git_sha: String::new(),
             git_branch: String::new(),
             git_is_dirty: false,
+            content_stamps: ContentStamps::default(),
         }
     }
 
@@ -1554,11 +1562,11 @@ mod tests {
         );
     }
 
-    /// G-2: package-lock.yml content change invalidates the cache.
-    /// `packages_lock_hash` is stored at save time; if the file changes (e.g.
-    /// after `dbt deps`) validate() must return Some so a full re-parse runs.
+    /// G-2: a `package-lock.yml` change (e.g. after `dbt deps`) no longer invalidates the
+    /// cache: changed dependency packages are re-resolved individually on the
+    /// incremental path.
     #[test]
-    fn validate_invalidates_on_package_lock_yml_change() {
+    fn validate_allows_package_lock_yml_change() {
         let tmp = tempfile::tempdir().unwrap();
         std::fs::write(tmp.path().join("profiles.yml"), b"profile: v1").unwrap();
         std::fs::write(tmp.path().join("dbt_project.yml"), b"project: v1").unwrap();
@@ -1567,8 +1575,7 @@ mod tests {
             b"packages:\n- package: dbt-labs/dbt_utils\n  version: 1.3.0\n",
         )
         .unwrap();
-        let mut state = state_for_validation(tmp.path());
-        state.packages_lock_hash = hash_file_at_path(&tmp.path().join("package-lock.yml"));
+        let state = state_for_validation(tmp.path());
         assert!(state.validate(&None).is_none(), "baseline: valid");
 
         // Simulate `dbt deps` rewriting the lock file with a new version.
@@ -1577,33 +1584,9 @@ mod tests {
             b"packages:\n- package: dbt-labs/dbt_utils\n  version: 1.4.0\n",
         )
         .unwrap();
-        assert_eq!(
-            state.validate(&None),
-            Some("package-lock.yml changed"),
-            "package-lock.yml change must invalidate the parse cache"
-        );
-    }
-
-    /// G-6: when `packages_lock_hash` is empty (no lock file at save time),
-    /// the check is skipped — projects without deps and new projects are unaffected.
-    #[test]
-    fn validate_skips_package_lock_check_when_hash_empty() {
-        let tmp = tempfile::tempdir().unwrap();
-        std::fs::write(tmp.path().join("profiles.yml"), b"profile: v1").unwrap();
-        std::fs::write(tmp.path().join("dbt_project.yml"), b"project: v1").unwrap();
-        // state_for_validation leaves packages_lock_hash as String::new() (empty).
-        let state = state_for_validation(tmp.path());
-        assert!(state.packages_lock_hash.is_empty(), "precondition");
-
-        // Even if a lock file now exists, the empty-hash state must not invalidate.
-        std::fs::write(
-            tmp.path().join("package-lock.yml"),
-            b"packages:\n- package: dbt-labs/dbt_utils\n  version: 1.3.0\n",
-        )
-        .unwrap();
         assert!(
             state.validate(&None).is_none(),
-            "empty packages_lock_hash must skip the lock-file check"
+            "package-lock.yml change must not invalidate the whole parse cache"
         );
     }
 
@@ -2646,7 +2629,7 @@ mod tests {
     // CRUD outcomes for needs_full_parse():
     //   Create  → None — new file is NOT in all_paths; WalkDir in initialize() discovers it
     //   Read    — no-op
-    //   Update  → None for model/analysis .sql (incremental)
+    //   Update  → None for model/analysis/macro .sql (incremental)
     //           → Some("non-incremental file changed") for everything else
     //   Delete  → Some("file deleted")
     //
@@ -2767,11 +2750,7 @@ mod tests {
         let r = mtime_check_after(ResourcePathKind::MacroPaths, "my_macro.sql", |f| {
             std::fs::write(f, b"v2").unwrap();
         });
-        assert_eq!(
-            r,
-            Some("non-incremental file changed"),
-            "macro .sql → FullParse"
-        );
+        assert_eq!(r, None, "macro .sql → Incremental (callers re-resolved)");
     }
 
     #[test]
@@ -3102,8 +3081,7 @@ mod tests {
     /// G-4: A pinned dep package (hub/git/tarball/private — `is_local_dep: false`)
     /// is never file-scanned by `needs_full_parse()`.  Even if a macro file inside
     /// the dep has a changed mtime, `needs_full_parse()` returns `None` because
-    /// the lock-file hash check in `validate()` already guarantees pinned-dep
-    /// content is unchanged.
+    /// `compute_file_changeset` detects the changed package and re-resolves it.
     #[test]
     fn needs_full_parse_skips_pinned_dep_package() {
         let tmp = tempfile::tempdir().unwrap();
@@ -3162,14 +3140,14 @@ mod tests {
         assert_eq!(
             state.needs_full_parse(),
             None,
-            "pinned dep file change must not trigger FullParse — lock-file hash covers it"
+            "pinned dep file change must not trigger FullParse — the package is re-resolved on its own"
         );
     }
 
-    /// G-5: A local-path dep (`is_local_dep: true`) IS file-scanned because the
-    /// lock file does not pin its content.  A changed macro file must trigger FullParse.
+    /// G-5: A local-path dep (`is_local_dep: true`) is handled like a pinned dep: a
+    /// changed macro file re-resolves that package instead of triggering FullParse.
     #[test]
-    fn needs_full_parse_scans_local_path_dep_package() {
+    fn needs_full_parse_skips_local_path_dep_package() {
         let tmp = tempfile::tempdir().unwrap();
         // Root package.
         let root_model = tmp.path().join("models").join("my_model.sql");
@@ -3202,21 +3180,20 @@ mod tests {
                 vec![("macros/util.sql".into(), system_time_to_nanos(local_mtime))],
             )]),
             dependencies: BTreeSet::new(),
-            is_local_dep: true, // local-path dep — must be scanned
+            is_local_dep: true,
         };
 
         let mut state = test_state();
         state.packages = vec![root_pkg, local_pkg];
         state.env_vars.clear();
 
-        // Mutate the local dep macro — must be detected.
         sleep_for_mtime_change();
         std::fs::write(&local_macro, b"{% macro util() %}v2{% endmacro %}").unwrap();
 
         assert_eq!(
             state.needs_full_parse(),
-            Some("non-incremental file changed"),
-            "local-path dep macro change must trigger FullParse"
+            None,
+            "local-path dep macro change must not trigger FullParse"
         );
     }
 
@@ -4393,4 +4370,373 @@ mod tests {
             "source: with wildcard must fall back to full load"
         );
     }
+
+    /// Bumping one of many dependency packages invalidates that package's
+    /// nodes and macros plus the root nodes reaching it through `ref` or a
+    /// macro call, and nothing else. A hook defined by the bumped package, or
+    /// calling into it, forces a full parse.
+    #[test]
+    fn bumping_one_package_invalidates_only_its_dependents() {
+        use dbt_schemas::schemas::DbtModel;
+        use dbt_schemas::schemas::common::NodeDependsOn;
+        use dbt_schemas::schemas::macros::{DbtMacro, MacroDependsOn};
+        use dbt_schemas::schemas::manifest::DbtOperation;
+        use dbt_schemas::schemas::nodes::{CommonAttributes, NodeBaseAttributes};
+        use dbt_yaml::Spanned;
+        use std::sync::Arc;
+
+        const PACKAGES: usize = 40;
+        const MODELS_PER_PACKAGE: usize = 50;
+
+        let make_model =
+            |pkg: &str, name: &str, nodes: Vec<String>, macros: Vec<String>| DbtModel {
+                __common_attr__: CommonAttributes {
+                    unique_id: format!("model.{pkg}.{name}"),
+                    name: name.into(),
+                    package_name: pkg.into(),
+                    fqn: vec![pkg.into(), name.into()],
+                    ..CommonAttributes::default()
+                },
+                __base_attr__: NodeBaseAttributes {
+                    depends_on: NodeDependsOn {
+                        nodes,
+                        macros,
+                        ..NodeDependsOn::default()
+                    },
+                    ..NodeBaseAttributes::default()
+                },
+                ..DbtModel::default()
+            };
+        let make_macro = |pkg: &str, name: &str, deps: Vec<String>| DbtMacro {
+            name: name.into(),
+            package_name: pkg.into(),
+            unique_id: format!("macro.{pkg}.{name}"),
+            depends_on: MacroDependsOn { macros: deps },
+            ..DbtMacro::default()
+        };
+
+        let mut nodes = Nodes::default();
+        let mut macros = Macros::default();
+        for p in 0..PACKAGES {
+            let pkg = format!("pkg_{p}");
+            let helper = make_macro(&pkg, "helper", vec![]);
+            macros.macros.insert(helper.unique_id.clone(), helper);
+            for i in 0..MODELS_PER_PACKAGE {
+                let refs = if i == 0 {
+                    vec![]
+                } else {
+                    vec![format!("model.{pkg}.m{}", i - 1)]
+                };
+                let model = make_model(
+                    &pkg,
+                    &format!("m{i}"),
+                    refs,
+                    vec![format!("macro.{pkg}.helper")],
+                );
+                nodes
+                    .models
+                    .insert(model.__common_attr__.unique_id.clone(), Arc::new(model));
+            }
+        }
+        let wrapper = make_macro("root", "wrapper", vec!["macro.pkg_0.helper".into()]);
+        macros.macros.insert(wrapper.unique_id.clone(), wrapper);
+        for model in [
+            make_model("root", "a", vec![], vec!["macro.root.wrapper".into()]),
+            make_model("root", "b", vec!["model.pkg_1.m49".into()], vec![]),
+            make_model("root", "c", vec![], vec![]),
+            make_model("root", "d", vec!["model.root.a".into()], vec![]),
+        ] {
+            nodes
+                .models
+                .insert(model.__common_attr__.unique_id.clone(), Arc::new(model));
+        }
+
+        let changed = HashSet::from(["pkg_0".to_string()]);
+        let invalidated =
+            crate::parse_cache::invalidated_by_changed_packages(&nodes, &macros, &changed);
+
+        for id in [
+            "model.pkg_0.m0",
+            "model.pkg_0.m49",
+            "macro.pkg_0.helper",
+            "macro.root.wrapper",
+            "model.root.a",
+            "model.root.d",
+        ] {
+            assert!(invalidated.contains(id), "{id} should be invalidated");
+        }
+        for id in [
+            "model.root.b",
+            "model.root.c",
+            "model.pkg_1.m0",
+            "macro.pkg_1.helper",
+        ] {
+            assert!(!invalidated.contains(id), "{id} should be kept");
+        }
+        // pkg_0's models and helper, plus root's wrapper, a and d.
+        assert_eq!(invalidated.len(), MODELS_PER_PACKAGE + 1 + 3);
+
+        let make_hook = |pkg: &str, macros: Vec<String>| {
+            Spanned::new(DbtOperation {
+                __common_attr__: CommonAttributes {
+                    unique_id: format!("operation.{pkg}.{pkg}-on-run-end-0"),
+                    package_name: pkg.into(),
+                    ..CommonAttributes::default()
+                },
+                __base_attr__: NodeBaseAttributes {
+                    depends_on: NodeDependsOn {
+                        macros,
+                        ..NodeDependsOn::default()
+                    },
+                    ..NodeBaseAttributes::default()
+                },
+                ..DbtOperation::default()
+            })
+        };
+        let hooks_need_full_parse = |on_run_end| {
+            let operations = Operations {
+                on_run_start: vec![],
+                on_run_end,
+            };
+            crate::parse_cache::hooks_depend_on_changes(&operations, &changed, &invalidated)
+        };
+        assert!(!hooks_need_full_parse(vec![
+            make_hook("root", vec!["macro.pkg_1.helper".into()]),
+            make_hook("pkg_1", vec![]),
+        ]));
+        assert!(hooks_need_full_parse(vec![make_hook("pkg_0", vec![])]));
+        assert!(hooks_need_full_parse(vec![make_hook(
+            "root",
+            vec!["macro.root.wrapper".into()]
+        )]));
+    }
+
+    #[test]
+    fn editing_a_macro_invalidates_only_its_transitive_callers() {
+        use dbt_schemas::schemas::DbtModel;
+        use dbt_schemas::schemas::common::NodeDependsOn;
+        use dbt_schemas::schemas::macros::{DbtMacro, MacroDependsOn};
+        use dbt_schemas::schemas::nodes::{CommonAttributes, NodeBaseAttributes};
+        use std::sync::Arc;
+
+        let make_model = |name: &str, nodes: Vec<String>, macros: Vec<String>| DbtModel {
+            __common_attr__: CommonAttributes {
+                unique_id: format!("model.root.{name}"),
+                name: name.into(),
+                package_name: "root".into(),
+                fqn: vec!["root".into(), name.into()],
+                ..CommonAttributes::default()
+            },
+            __base_attr__: NodeBaseAttributes {
+                depends_on: NodeDependsOn {
+                    nodes,
+                    macros,
+                    ..NodeDependsOn::default()
+                },
+                ..NodeBaseAttributes::default()
+            },
+            ..DbtModel::default()
+        };
+        let make_macro = |name: &str, deps: Vec<String>| DbtMacro {
+            name: name.into(),
+            package_name: "root".into(),
+            unique_id: format!("macro.root.{name}"),
+            depends_on: MacroDependsOn { macros: deps },
+            ..DbtMacro::default()
+        };
+
+        let mut nodes = Nodes::default();
+        let mut macros = Macros::default();
+        for mac in [
+            make_macro("helper", vec![]),
+            make_macro("wrapper", vec!["macro.root.helper".into()]),
+            make_macro("unrelated", vec![]),
+        ] {
+            macros.macros.insert(mac.unique_id.clone(), mac);
+        }
+        for model in [
+            make_model("calls_helper", vec![], vec!["macro.root.helper".into()]),
+            make_model("calls_wrapper", vec![], vec!["macro.root.wrapper".into()]),
+            make_model(
+                "downstream",
+                vec!["model.root.calls_wrapper".into()],
+                vec![],
+            ),
+            make_model(
+                "calls_unrelated",
+                vec![],
+                vec!["macro.root.unrelated".into()],
+            ),
+            make_model("plain", vec![], vec![]),
+        ] {
+            nodes
+                .models
+                .insert(model.__common_attr__.unique_id.clone(), Arc::new(model));
+        }
+
+        let changed = HashSet::from(["macro.root.helper".to_string()]);
+        let invalidated =
+            crate::parse_cache::invalidated_by_changed_macros(&nodes, &macros, &changed);
+        let expected: HashSet<String> = [
+            "macro.root.helper",
+            "macro.root.wrapper",
+            "model.root.calls_helper",
+            "model.root.calls_wrapper",
+            "model.root.downstream",
+        ]
+        .into_iter()
+        .map(String::from)
+        .collect();
+        assert_eq!(invalidated, expected);
+    }
+
+    #[test]
+    fn defining_a_macro_invalidates_callers_of_the_macros_it_shadows() {
+        use dbt_schemas::schemas::DbtModel;
+        use dbt_schemas::schemas::common::NodeDependsOn;
+        use dbt_schemas::schemas::macros::DbtMacro;
+        use dbt_schemas::schemas::nodes::{CommonAttributes, NodeBaseAttributes};
+        use std::sync::Arc;
+
+        let make_model = |name: &str, macros: Vec<String>| DbtModel {
+            __common_attr__: CommonAttributes {
+                unique_id: format!("model.root.{name}"),
+                name: name.into(),
+                package_name: "root".into(),
+                fqn: vec!["root".into(), name.into()],
+                ..CommonAttributes::default()
+            },
+            __base_attr__: NodeBaseAttributes {
+                depends_on: NodeDependsOn {
+                    macros,
+                    ..NodeDependsOn::default()
+                },
+                ..NodeBaseAttributes::default()
+            },
+            ..DbtModel::default()
+        };
+        let make_macro = |package: &str, name: &str| DbtMacro {
+            name: name.into(),
+            package_name: package.into(),
+            unique_id: format!("macro.{package}.{name}"),
+            ..DbtMacro::default()
+        };
+
+        let mut nodes = Nodes::default();
+        let mut macros = Macros::default();
+        for mac in [
+            make_macro("dbt", "current_timestamp"),
+            make_macro("dbt", "default__current_timestamp"),
+            make_macro("dbt", "safe_cast"),
+            make_macro("utils", "pivot"),
+            make_macro("utils", "star"),
+        ] {
+            macros.macros.insert(mac.unique_id.clone(), mac);
+        }
+        for model in [
+            make_model(
+                "calls_timestamp",
+                vec![
+                    "macro.dbt.current_timestamp".into(),
+                    "macro.dbt.default__current_timestamp".into(),
+                ],
+            ),
+            make_model("calls_pivot", vec!["macro.utils.pivot".into()]),
+            make_model("calls_star", vec!["macro.utils.star".into()]),
+            make_model("calls_safe_cast", vec!["macro.dbt.safe_cast".into()]),
+        ] {
+            nodes
+                .models
+                .insert(model.__common_attr__.unique_id.clone(), Arc::new(model));
+        }
+
+        // A root dispatch candidate shadows every candidate of the dispatched macro, and a
+        // root `pivot` shadows the package macro of the same name.
+        let added = HashSet::from([
+            "snowflake__current_timestamp".to_string(),
+            "pivot".to_string(),
+        ]);
+        let shadowed = crate::parse_cache::shadowed_macro_ids(&macros, &added);
+        let expected: HashSet<String> = [
+            "macro.dbt.current_timestamp",
+            "macro.dbt.default__current_timestamp",
+            "macro.utils.pivot",
+        ]
+        .into_iter()
+        .map(String::from)
+        .collect();
+        assert_eq!(shadowed, expected);
+
+        let invalidated =
+            crate::parse_cache::invalidated_by_changed_macros(&nodes, &macros, &shadowed);
+        assert!(invalidated.contains("model.root.calls_timestamp"));
+        assert!(invalidated.contains("model.root.calls_pivot"));
+        assert!(!invalidated.contains("model.root.calls_star"));
+        assert!(!invalidated.contains("model.root.calls_safe_cast"));
+    }
+
+    #[test]
+    fn editing_a_macro_called_only_from_a_hook_invalidates_the_hook() {
+        use dbt_schemas::schemas::common::NodeDependsOn;
+        use dbt_schemas::schemas::macros::{DbtMacro, MacroDependsOn};
+        use dbt_schemas::schemas::manifest::DbtOperation;
+        use dbt_schemas::schemas::nodes::{CommonAttributes, NodeBaseAttributes};
+        use dbt_yaml::Spanned;
+
+        let make_macro = |name: &str, deps: Vec<String>| DbtMacro {
+            name: name.into(),
+            package_name: "root".into(),
+            unique_id: format!("macro.root.{name}"),
+            depends_on: MacroDependsOn { macros: deps },
+            ..DbtMacro::default()
+        };
+        let mut macros = Macros::default();
+        for mac in [
+            make_macro("grant_select", vec![]),
+            make_macro("grant_all", vec!["macro.root.grant_select".into()]),
+        ] {
+            macros.macros.insert(mac.unique_id.clone(), mac);
+        }
+        let operations = Operations {
+            on_run_start: vec![],
+            on_run_end: vec![Spanned::new(DbtOperation {
+                __common_attr__: CommonAttributes {
+                    unique_id: "operation.root.root-on-run-end-0".into(),
+                    package_name: "root".into(),
+                    ..CommonAttributes::default()
+                },
+                __base_attr__: NodeBaseAttributes {
+                    depends_on: NodeDependsOn {
+                        macros: vec!["macro.root.grant_all".into()],
+                        ..NodeDependsOn::default()
+                    },
+                    ..NodeBaseAttributes::default()
+                },
+                ..DbtOperation::default()
+            })],
+        };
+
+        // No node renders the macro, so only the hook can notice the edit
+        let invalidated = crate::parse_cache::invalidated_by_changed_macros(
+            &Nodes::default(),
+            &macros,
+            &HashSet::from(["macro.root.grant_select".to_string()]),
+        );
+        assert!(crate::parse_cache::hooks_depend_on_changes(
+            &operations,
+            &HashSet::new(),
+            &invalidated,
+        ));
+    }
+
+    #[test]
+    fn project_wide_macros_are_matched_by_exact_name() {
+        use crate::parse_cache::is_project_wide_macro;
+
+        assert!(is_project_wide_macro("generate_schema_name"));
+        assert!(is_project_wide_macro("default__generate_alias_name"));
+        assert!(is_project_wide_macro("materialization_table_default"));
+        assert!(!is_project_wide_macro("my_generate_schema_name"));
+        assert!(!is_project_wide_macro("default__my_generate_schema_name"));
+    }
 }
@@ -0,0 +1,108 @@
+#!/usr/bin/env bash
+# Benchmark: full `dbt parse` on a generated project with many SQL files.
+#
+# Measures wall time and peak RSS of the parse phase, which renders SQL files on
+# the bounded work queue in `dbt_parser::parallel::dispatch_maybe_parallel`.
+# Point DBT_BIN_BASELINE at a build from before a change to compare both.
+#
+# Usage:
+#   DBT_BIN=~/fs/target/release/dbt \
+#   DBT_BIN_BASELINE=~/fs-main/target/release/dbt \
+#   bash fs/sa/crates/dbt-parser/benches/parse_dispatch_bench.sh
+#
+# Environment:
+#   DBT_BENCH_PROJECT  where the synthetic project is generated (default ~/tmp/dispatch_30k)
+#   BENCH_FILES        number of SQL files to generate (default 30000)
+#   BENCH_REPS         repetitions per binary (default 3, median reported)
+#
+# Requires GNU time (/usr/bin/time) for peak RSS.
+
+set -euo pipefail
+
+DBT_BENCH_PROJECT="${DBT_BENCH_PROJECT:-${HOME}/tmp/dispatch_30k}"
+DBT_BIN="${DBT_BIN:-${HOME}/fs/target/release/dbt}"
+DBT_BIN_BASELINE="${DBT_BIN_BASELINE:-}"
+FILES="${BENCH_FILES:-30000}"
+REPS="${BENCH_REPS:-3}"
+
+die() { echo "ERROR: $*" >&2; exit 1; }
+
+[[ -x "${DBT_BIN}" ]] || die "dbt binary not found: ${DBT_BIN}"
+[[ -x /usr/bin/time ]] || die "GNU time not found at /usr/bin/time"
+
+# ── project generation ───────────────────────────────────────────────────────
+
+generate_project() {
+    echo "Generating ${FILES} models in ${DBT_BENCH_PROJECT}..."
+    rm -rf "${DBT_BENCH_PROJECT}"
+    mkdir -p "${DBT_BENCH_PROJECT}/models"
+    cat > "${DBT_BENCH_PROJECT}/dbt_project.yml" <<'YML'
+name: 'dispatch_30k'
+config-version: 2
+version: '0.1'
+profile: 'dispatch_30k'
+model-paths: ["models"]
+models:
+  dispatch_30k:
+    +materialized: view
+YML
+    cat > "${DBT_BENCH_PROJECT}/profiles.yml" <<'YML'
+dispatch_30k:
+  target: duckdb_mem
+  outputs:
+    duckdb_mem:
+      type: duckdb
+      path: ':memory:'
+      threads: 1
+      schema: main
+YML
+    local i dir
+    for (( i=0; i<FILES; i++ )); do
+        dir="${DBT_BENCH_PROJECT}/models/d$(( i / 500 ))"
+        mkdir -p "${dir}"
+        if (( i == 0 )); then
+            echo "select 1 as id" > "${dir}/m${i}.sql"
+        else
+            echo "select id from {{ ref('m$(( i - 1 ))') }}" > "${dir}/m${i}.sql"
+        fi
+    done
+}
+
+if [[ ! -f "${DBT_BENCH_PROJECT}/dbt_project.yml" ]]; then
+    generate_project
+fi
+
+# Prints "<wall ms> <peak RSS MiB>" for one full parse with `bin`.
+measure() {
+    local bin="$1" out
+    rm -rf "${DBT_BENCH_PROJECT}/target"
+    out=$( { /usr/bin/time -f '%e %M' "${bin}" parse \
+        --project-dir "${DBT_BENCH_PROJECT}" \
+        --profiles-dir "${DBT_BENCH_PROJECT}" >/dev/null 2>/dev/null; } 2>&1 | tail -n 1)
+    awk '{ printf "%d %d\n", $1 * 1000, $2 / 1024 }' <<<"${out}"
+}
+
+# Median wall time and peak RSS over REPS runs.
+report() {
+    local label="$1" bin="$2" walls=() rss=() i m
+    for (( i=0; i<REPS; i++ )); do
+        m=$(measure "${bin}")
+        walls+=("${m% *}")
+        rss+=("${m#* }")
+    done
+    printf "  %-12s wall %6s ms   peak RSS %6s MiB\n" "${label}" \
+        "$(printf '%s\n' "${walls[@]}" | sort -n | sed -n "$(( REPS / 2 + 1 ))p")" \
+        "$(printf '%s\n' "${rss[@]}" | sort -n | sed -n "$(( REPS / 2 + 1 ))p")"
+}
+
+echo "=================================================================="
+echo " Parse dispatch benchmark"
+echo " Project : ${DBT_BENCH_PROJECT} (${FILES} SQL files)"
+echo " Reps    : ${REPS} (median reported)"
+echo "=================================================================="
+
+if [[ -n "${DBT_BIN_BASELINE}" ]]; then
+    [[ -x "${DBT_BIN_BASELINE}" ]] || die "baseline binary not found: ${DBT_BIN_BASELINE}"
+    report "baseline" "${DBT_BIN_BASELINE}"
+fi
+report "current" "${DBT_BIN}"
@@ -0,0 +1,114 @@
+#!/usr/bin/env bash
+# Benchmark: full `dbt parse` on a generated project dominated by large schema files.
+#
+# Each property file documents one model with BENCH_COLUMNS columns, so the
+# parse is dominated by reading and parsing YAML in
+# `resolve_properties::resolve_minimal_properties`, which parses files on all
+# CPUs. Point DBT_BIN_BASELINE at a build from before a change to compare both;
+# pass `--no-parallel` through DBT_BENCH_ARGS to measure the serial path.
+#
+# Usage:
+#   DBT_BIN=~/fs/target/release/dbt \
+#   DBT_BIN_BASELINE=~/fs-main/target/release/dbt \
+#   bash fs/sa/crates/dbt-parser/benches/yaml_parse_bench.sh
+#
+# Environment:
+#   DBT_BENCH_PROJECT  where the synthetic project is generated (default ~/tmp/yaml_5k)
+#   BENCH_FILES        number of property files (and models) to generate (default 5000)
+#   BENCH_COLUMNS      columns per model (default 200)
+#   BENCH_REPS         repetitions per binary (default 3, median reported)
+#   DBT_BENCH_ARGS     extra arguments passed to `dbt parse`
+
+set -euo pipefail
+
+DBT_BENCH_PROJECT="${DBT_BENCH_PROJECT:-${HOME}/tmp/yaml_5k}"
+DBT_BIN="${DBT_BIN:-${HOME}/fs/target/release/dbt}"
+DBT_BIN_BASELINE="${DBT_BIN_BASELINE:-}"
+FILES="${BENCH_FILES:-5000}"
+COLUMNS="${BENCH_COLUMNS:-200}"
+REPS="${BENCH_REPS:-3}"
+read -r -a EXTRA_ARGS <<<"${DBT_BENCH_ARGS:-}"
+
+die() { echo "ERROR: $*" >&2; exit 1; }
+
+[[ -x "${DBT_BIN}" ]] || die "dbt binary not found: ${DBT_BIN}"
+
+# ── project generation ───────────────────────────────────────────────────────
+
+generate_project() {
+    echo "Generating ${FILES} models with ${COLUMNS}-column property files in ${DBT_BENCH_PROJECT}..."
+    rm -rf "${DBT_BENCH_PROJECT}"
+    mkdir -p "${DBT_BENCH_PROJECT}/models"
+    cat > "${DBT_BENCH_PROJECT}/dbt_project.yml" <<'YML'
+name: 'yaml_5k'
+config-version: 2
+version: '0.1'
+profile: 'yaml_5k'
+model-paths: ["models"]
+models:
+  yaml_5k:
+    +materialized: view
+YML
+    cat > "${DBT_BENCH_PROJECT}/profiles.yml" <<'YML'
+yaml_5k:
+  target: duckdb_mem
+  outputs:
+    duckdb_mem:
+      type: duckdb
+      path: ':memory:'
+      threads: 1
+      schema: main
+YML
+    # One column block, reused for every file.
+    local columns c
+    columns=$(for (( c=0; c<COLUMNS; c++ )); do
+        printf '      - name: col_%d\n        description: "Column %d of the model"\n        data_type: varchar\n        data_tests:\n          - not_null\n' "${c}" "${c}"
+    done)
+    local i dir
+    for (( i=0; i<FILES; i++ )); do
+        dir="${DBT_BENCH_PROJECT}/models/d$(( i / 500 ))"
+        mkdir -p "${dir}"
+        echo "select 1 as id" > "${dir}/m${i}.sql"
+        printf 'version: 2\nmodels:\n  - name: m%d\n    description: "model %d"\n    columns:\n%s\n' \
+            "${i}" "${i}" "${columns}" > "${dir}/m${i}.yml"
+    done
+}
+
+if [[ ! -f "${DBT_BENCH_PROJECT}/dbt_project.yml" ]]; then
+    generate_project
+fi
+
+# Prints the wall time in ms of one full parse with `bin`.
+measure() {
+    local bin="$1" t0 t1
+    rm -rf "${DBT_BENCH_PROJECT}/target"
+    t0=$(date +%s%3N)
+    "${bin}" parse \
+        --project-dir "${DBT_BENCH_PROJECT}" \
+        --profiles-dir "${DBT_BENCH_PROJECT}" \
+        "${EXTRA_ARGS[@]}" >/dev/null 2>&1 || true
+    t1=$(date +%s%3N)
+    echo "$(( t1 - t0 ))"
+}
+
+# Median wall time over REPS runs.
+report() {
+    local label="$1" bin="$2" walls=() i
+    for (( i=0; i<REPS; i++ )); do
+        walls+=("$(measure "${bin}")")
+    done
+    printf "  %-12s wall %6s ms\n" "${label}" \
+        "$(printf '%s\n' "${walls[@]}" | sort -n | sed -n "$(( REPS / 2 + 1 ))p")"
+}
+
+echo "=================================================================="
+echo " YAML property-file parse benchmark"
+echo " Project : ${DBT_BENCH_PROJECT} (${FILES} files x ${COLUMNS} columns)"
+echo " Reps    : ${REPS} (median reported)"
+echo "=================================================================="
+
+if [[ -n "${DBT_BIN_BASELINE}" ]]; then
+    [[ -x "${DBT_BIN_BASELINE}" ]] || die "baseline binary not found: ${DBT_BIN_BASELINE}"
+    report "baseline" "${DBT_BIN_BASELINE}"
+fi
+report "current" "${DBT_BIN}"
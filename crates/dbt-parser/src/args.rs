@@ -8,6 +8,9 @@ use dbt_common::{
 };
 use dbt_schemas::filter::RunFilter;
 use std::collections::BTreeMap;
+use std::sync::Arc;
+
+use crate::python_model_cache::PythonModelCache;
 
 /// Args to be passed into the resolution phase
 #[derive(Clone, Default, Debug)]
@@ -50,6 +53,10 @@ pub struct ResolveArgs {
     /// Maximum size (MiB) for seed files whose contents are hashed
     /// 1 MiB default); `0` means "no limit".
     pub maximum_seed_size_mib: u64,
+    /// Python model analyses cached between parses (inside the partial-parse
+    /// store), shared by every package of the resolve. The caller saves it once
+    /// resolution is done. `None` analyzes every Python model from scratch.
+    pub python_model_cache: Option<Arc<PythonModelCache>>,
 }
 
 impl ResolveArgs {
@@ -73,6 +80,7 @@ impl ResolveArgs {
             store_failures: arg.store_failures,
             skip_creating_generic_tests: arg.skip_creating_generic_tests,
             maximum_seed_size_mib: arg.maximum_seed_size_mib,
+            python_model_cache: None,
         })
     }
 }
@@ -17,10 +17,14 @@ pub mod dbt_namespace;
 pub mod dbt_project_config;
 /// Parallel dispatch utilities
 pub mod parallel;
+/// Per-file parse timings for `--parse-profile`
+pub mod parse_profile;
 /// Python AST parsing utilities
 pub mod python_ast;
 /// Python file information collection
 pub mod python_file_info;
+/// Python model analyses cached in the partial-parse store
+pub mod python_model_cache;
 /// Python model validation
 pub mod python_validation;
 /// Python AST visitor for extracting dbt function calls
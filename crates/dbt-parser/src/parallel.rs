@@ -1,5 +1,8 @@
-use dbt_common::{ErrorCode, FsResult, fs_err};
+use dbt_common::{ErrorCode, FsError, FsResult, fs_err};
 use std::future::Future;
+use std::sync::{Arc, LazyLock};
+use tokio::sync::Semaphore;
+use tokio::task::JoinSet;
 use tracing::Instrument as _;
 
 /// Parallelism budget for the parse phase.
@@ -16,13 +19,32 @@ pub fn effective_parallelism(no_parallel: bool) -> usize {
     }
 }
 
-/// Execute items sequentially or in parallel via `tokio::spawn`.
+/// Number of chunks handed to each worker when splitting a parse input.
 ///
-/// When `parallel` is `true`, each item is spawned as a tokio task with tracing span
-/// propagation. When `false`, items are processed sequentially in a loop.
+/// More chunks than workers lets the bounded queue in [`dispatch_maybe_parallel`]
+/// balance load: a chunk holding a few slow files no longer holds up the whole
+/// phase while the other workers sit idle.
+const CHUNKS_PER_WORKER: usize = 4;
+
+/// Chunk size for splitting `len` items across `max_concurrency` workers.
+pub fn parse_chunk_size(len: usize, max_concurrency: usize) -> usize {
+    if max_concurrency <= 1 {
+        return len.max(1);
+    }
+    len.div_ceil(max_concurrency * CHUNKS_PER_WORKER).max(1)
+}
+
+/// Execute items sequentially, or in parallel on a bounded work queue.
+///
+/// When `max_concurrency` is 1 items are processed sequentially in a loop.
+/// Otherwise at most `max_concurrency` items are in flight at a time, each as a
+/// tokio task with tracing span propagation; the next item is only spawned once
+/// a running one finishes, so large inputs do not create every task (and span)
+/// up front. Results are returned in input order. The first error is returned as
+/// soon as it is observed, and the tasks still in flight are aborted.
 pub async fn dispatch_maybe_parallel<I, R, F, Fut>(
     items: Vec<I>,
-    parallel: bool,
+    max_concurrency: usize,
     process: F,
 ) -> FsResult<Vec<R>>
 where
@@ -31,28 +53,187 @@ where
     F: Fn(I) -> Fut + Clone + Send + 'static,
     Fut: Future<Output = FsResult<R>> + Send + 'static,
 {
-    if !parallel {
+    if max_concurrency <= 1 || items.len() <= 1 {
         let mut results = Vec::with_capacity(items.len());
         for item in items {
             results.push(process(item).await?);
         }
-        Ok(results)
-    } else {
-        let mut handles = Vec::with_capacity(items.len());
-        for item in items {
-            let process = process.clone();
-            handles.push(tokio::spawn(
-                async move { process(item).await.map_err(|e| *e) }.in_current_span(),
-            ));
+        return Ok(results);
+    }
+
+    let mut results: Vec<Option<R>> = std::iter::repeat_with(|| None).take(items.len()).collect();
+    let mut pending = items.into_iter().enumerate();
+    let mut in_flight: JoinSet<(usize, Result<R, FsError>)> = JoinSet::new();
+    let spawn = |in_flight: &mut JoinSet<(usize, Result<R, FsError>)>,
+                 (index, item): (usize, I)| {
+        let process = process.clone();
+        in_flight
+            .spawn(async move { (index, process(item).await.map_err(|e| *e)) }.in_current_span());
+    };
+    for next in pending.by_ref().take(max_concurrency) {
+        spawn(&mut in_flight, next);
+    }
+    // Returning early drops `in_flight`, which aborts the remaining tasks.
+    while let Some(joined) = in_flight.join_next().await {
+        match joined {
+            Ok((index, Ok(r))) => results[index] = Some(r),
+            Ok((_, Err(e))) => return Err(Box::new(e)),
+            Err(e) => return Err(fs_err!(ErrorCode::Unexpected, "Join error: {}", e)),
         }
-        let mut results = Vec::with_capacity(handles.len());
-        for handle in handles {
-            match handle.await {
-                Ok(Ok(r)) => results.push(r),
-                Ok(Err(e)) => return Err(Box::new(e)),
-                Err(e) => return Err(fs_err!(ErrorCode::Unexpected, "Join error: {}", e)),
-            }
+        if let Some(next) = pending.next() {
+            spawn(&mut in_flight, next);
         }
-        Ok(results)
+    }
+    Ok(results
+        .into_iter()
+        .map(|r| r.expect("every dispatched item completes before the queue drains"))
+        .collect())
+}
+
+/// Permits for CPU-bound work moved to the blocking pool by [`run_blocking`].
+///
+/// Shared by the whole process, so packages resolving concurrently (each of
+/// which may split its own input into chunks) never run more blocking parse
+/// work at once than there are CPUs.
+static BLOCKING_PERMITS: LazyLock<Arc<Semaphore>> =
+    LazyLock::new(|| Arc::new(Semaphore::new(effective_parallelism(false))));
+
+/// Run CPU-bound or file-reading work on tokio's blocking pool.
+///
+/// Keeps synchronous work off the async workers that drive
+/// [`dispatch_maybe_parallel`]. The closure waits for one of the
+/// process-wide [`BLOCKING_PERMITS`] before it is handed to the pool and holds
+/// it until it returns, so nested parallelism stays within the CPU budget.
+pub async fn run_blocking<R, F>(f: F) -> FsResult<R>
+where
+    R: Send + 'static,
+    F: FnOnce() -> FsResult<R> + Send + 'static,
+{
+    let permit = BLOCKING_PERMITS
+        .clone()
+        .acquire_owned()
+        .await
+        .expect("blocking permits are never closed");
+    tokio::task::spawn_blocking(move || {
+        let _permit = permit;
+        f()
+    })
+    .await
+    .map_err(|e| fs_err!(ErrorCode::Unexpected, "Join error: {}", e))?
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use std::sync::atomic::{AtomicUsize, Ordering};
+    use std::time::Duration;
+
+    #[tokio::test(flavor = "multi_thread", worker_threads = 4)]
+    async fn bounded_queue_preserves_order_and_limits_in_flight() {
+        let running = Arc::new(AtomicUsize::new(0));
+        let peak = Arc::new(AtomicUsize::new(0));
+        let items: Vec<u64> = (0..64).collect();
+        let results = dispatch_maybe_parallel(items, 3, {
+            let running = running.clone();
+            let peak = peak.clone();
+            move |i: u64| {
+                let running = running.clone();
+                let peak = peak.clone();
+                async move {
+                    let now = running.fetch_add(1, Ordering::SeqCst) + 1;
+                    peak.fetch_max(now, Ordering::SeqCst);
+                    // Later items finish first, so completion order differs from input order.
+                    tokio::time::sleep(Duration::from_micros(64 - i)).await;
+                    running.fetch_sub(1, Ordering::SeqCst);
+                    Ok(i * 2)
+                }
+            }
+        })
+        .await
+        .unwrap();
+
+        assert_eq!(results, (0..64).map(|i| i * 2).collect::<Vec<_>>());
+        assert!(peak.load(Ordering::SeqCst) <= 3);
+    }
+
+    #[tokio::test(flavor = "multi_thread", worker_threads = 4)]
+    async fn first_error_is_returned_without_waiting_for_slow_items() {
+        let started = Arc::new(AtomicUsize::new(0));
+        let items: Vec<u64> = (0..100).collect();
+        let result = dispatch_maybe_parallel(items, 2, {
+            let started = started.clone();
+            move |i: u64| {
+                let started = started.clone();
+                async move {
+                    started.fetch_add(1, Ordering::SeqCst);
+                    if i == 0 {
+                        // A slow first item must not delay reporting the failure below.
+                        tokio::time::sleep(Duration::from_secs(60)).await;
+                    }
+                    if i == 1 {
+                        return Err(fs_err!(ErrorCode::Unexpected, "item {} failed", i));
+                    }
+                    Ok(i)
+                }
+            }
+        });
+        let err = tokio::time::timeout(Duration::from_secs(10), result)
+            .await
+            .expect("error is reported before the slow item finishes")
+            .unwrap_err();
+
+        assert!(err.to_string().contains("item 1 failed"));
+        // Nothing past the failure is dispatched.
+        assert!(started.load(Ordering::SeqCst) <= 2);
+    }
+
+    #[test]
+    fn chunk_size_splits_work_into_several_chunks_per_worker() {
+        assert_eq!(parse_chunk_size(30_000, 1), 30_000);
+        assert_eq!(parse_chunk_size(30_000, 8), 938);
+        assert_eq!(parse_chunk_size(3, 8), 1);
+        assert_eq!(parse_chunk_size(0, 8), 1);
+    }
+
+    #[tokio::test(flavor = "multi_thread", worker_threads = 4)]
+    async fn blocking_work_shares_one_budget_across_callers() {
+        let limit = effective_parallelism(false);
+        let running = Arc::new(AtomicUsize::new(0));
+        let peak = Arc::new(AtomicUsize::new(0));
+        // Several "packages" each splitting their input, as nested dispatch does.
+        let packages: Vec<u64> = (0..limit as u64 + 2).collect();
+        let results = dispatch_maybe_parallel(packages, limit + 2, {
+            let running = running.clone();
+            let peak = peak.clone();
+            move |package: u64| {
+                let running = running.clone();
+                let peak = peak.clone();
+                async move {
+                    let chunks: Vec<u64> = (0..limit as u64 + 2).collect();
+                    let sums = dispatch_maybe_parallel(chunks, limit + 2, move |chunk: u64| {
+                        let running = running.clone();
+                        let peak = peak.clone();
+                        run_blocking(move || {
+                            let now = running.fetch_add(1, Ordering::SeqCst) + 1;
+                            peak.fetch_max(now, Ordering::SeqCst);
+                            std::thread::sleep(Duration::from_millis(2));
+                            running.fetch_sub(1, Ordering::SeqCst);
+                            Ok(package * 100 + chunk)
+                        })
+                    })
+                    .await?;
+                    Ok(sums.into_iter().sum::<u64>())
+                }
+            }
+        })
+        .await
+        .unwrap();
+
+        let chunk_total: u64 = (0..limit as u64 + 2).sum();
+        let expected: Vec<u64> = (0..limit as u64 + 2)
+            .map(|package| package * 100 * (limit as u64 + 2) + chunk_total)
+            .collect();
+        assert_eq!(results, expected);
+        assert!(peak.load(Ordering::SeqCst) <= limit);
     }
 }
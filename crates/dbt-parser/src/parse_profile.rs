@@ -0,0 +1,160 @@
+//! Per-file timings collected for `dbt parse --parse-profile`.
+//!
+//! Recording is process-wide and off by default: the caller brackets the resolve
+//! phase with [`start`] and [`finish`], and the parser records each file's phases
+//! as it goes. While disabled, a record call costs one relaxed atomic load.
+
+use std::collections::HashMap;
+use std::path::Path;
+use std::sync::Mutex;
+use std::sync::atomic::{AtomicBool, Ordering};
+use std::time::Duration;
+
+use dbt_metadata_parquet::parse_profile::ParseProfileRow;
+
+/// A timed step of parsing a single file.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum ParsePhase {
+    /// Reading the file from disk.
+    Load,
+    /// Rendering the file's Jinja.
+    Render,
+    /// Static analysis (type checking) of the file's SQL.
+    SqlAnalysis,
+    /// Deserializing and resolving the file's YAML properties.
+    YamlResolution,
+}
+
+static ENABLED: AtomicBool = AtomicBool::new(false);
+static ROWS: Mutex<Option<HashMap<(String, String), ParseProfileRow>>> = Mutex::new(None);
+
+/// Starts recording, discarding anything left over from an earlier profile.
+pub fn start() {
+    *ROWS.lock().unwrap_or_else(|e| e.into_inner()) = Some(HashMap::new());
+    ENABLED.store(true, Ordering::Relaxed);
+}
+
+/// Stops recording and returns one row per file, ordered by package and path.
+pub fn finish() -> Vec<ParseProfileRow> {
+    ENABLED.store(false, Ordering::Relaxed);
+    let rows = ROWS.lock().unwrap_or_else(|e| e.into_inner()).take();
+    let mut rows: Vec<ParseProfileRow> = rows.unwrap_or_default().into_values().collect();
+    rows.sort_by(|a, b| (&a.package_name, &a.file_path).cmp(&(&b.package_name, &b.file_path)));
+    rows
+}
+
+/// Whether a profile is being recorded.
+pub fn is_enabled() -> bool {
+    ENABLED.load(Ordering::Relaxed)
+}
+
+/// Adds `elapsed` to `phase` of the given file. `bytes_read` is added to the
+/// file's byte count (pass 0 for phases that do not read).
+pub fn record(
+    package_name: &str,
+    file_path: &Path,
+    phase: ParsePhase,
+    elapsed: Duration,
+    bytes_read: usize,
+) {
+    if !is_enabled() {
+        return;
+    }
+    let mut rows = ROWS.lock().unwrap_or_else(|e| e.into_inner());
+    let Some(rows) = rows.as_mut() else {
+        return;
+    };
+    let file_path = file_path.display().to_string();
+    let row = rows
+        .entry((package_name.to_string(), file_path.clone()))
+        .or_insert_with(|| ParseProfileRow {
+            package_name: package_name.to_string(),
+            file_path,
+            ..ParseProfileRow::default()
+        });
+    let slot = match phase {
+        ParsePhase::Load => &mut row.load_us,
+        ParsePhase::Render => &mut row.render_us,
+        ParsePhase::SqlAnalysis => &mut row.sql_analysis_us,
+        ParsePhase::YamlResolution => &mut row.yaml_resolution_us,
+    };
+    *slot = Some(slot.unwrap_or(0) + elapsed.as_micros() as i64);
+    row.bytes_read += bytes_read as i64;
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    const PKG: &str = "parse_profile_test";
+
+    // The recorder is process-wide, so everything that toggles it lives in one test;
+    // rows from other tests rendering concurrently are filtered out by package.
+    #[test]
+    fn records_phases_per_file_only_while_enabled() {
+        record(
+            PKG,
+            Path::new("models/a.sql"),
+            ParsePhase::Load,
+            Duration::from_micros(5),
+            10,
+        );
+        start();
+        record(
+            PKG,
+            Path::new("models/b.sql"),
+            ParsePhase::Load,
+            Duration::from_micros(7),
+            20,
+        );
+        record(
+            PKG,
+            Path::new("models/b.sql"),
+            ParsePhase::Render,
+            Duration::from_micros(30),
+            0,
+        );
+        record(
+            PKG,
+            Path::new("models/a.sql"),
+            ParsePhase::Render,
+            Duration::from_micros(3),
+            0,
+        );
+        record(
+            PKG,
+            Path::new("models/a.sql"),
+            ParsePhase::Render,
+            Duration::from_micros(4),
+            0,
+        );
+        record(
+            PKG,
+            Path::new("models/s.yml"),
+            ParsePhase::YamlResolution,
+            Duration::from_micros(9),
+            0,
+        );
+        let rows: Vec<_> = finish()
+            .into_iter()
+            .filter(|r| r.package_name == PKG)
+            .collect();
+        record(
+            PKG,
+            Path::new("models/c.sql"),
+            ParsePhase::Load,
+            Duration::from_micros(1),
+            1,
+        );
+
+        let paths: Vec<&str> = rows.iter().map(|r| r.file_path.as_str()).collect();
+        assert_eq!(paths, ["models/a.sql", "models/b.sql", "models/s.yml"]);
+        assert_eq!(rows[0].load_us, None);
+        assert_eq!(rows[0].render_us, Some(7));
+        assert_eq!(rows[1].load_us, Some(7));
+        assert_eq!(rows[1].bytes_read, 20);
+        assert_eq!(rows[2].yaml_resolution_us, Some(9));
+        assert_eq!(rows[2].render_us, None);
+        assert!(finish().is_empty());
+    }
+}
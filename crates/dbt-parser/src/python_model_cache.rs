@@ -0,0 +1,308 @@
+//! Python model analysis cached in the partial-parse store.
+//!
+//! Parsing, validating and walking a Python model's AST dominates Python model
+//! resolution. With `--partial-parse` the extracted [`PythonFileInfo`] is stored
+//! per file together with the source checksum, and an unchanged model skips AST
+//! parsing entirely on the next parse. Only models that parsed, validated and
+//! analyzed cleanly are stored, so a broken model reports its errors every time.
+
+use std::collections::BTreeMap;
+use std::path::{Path, PathBuf};
+use std::sync::{Mutex, MutexGuard};
+
+use dbt_common::FsResult;
+use dbt_frontend_common::error::CodeLocation;
+use dbt_metadata_parquet::python_model_info::{
+    PythonModelInfoRow, read_python_model_info, write_python_model_info,
+};
+use dbt_schemas::schemas::common::DbtChecksum;
+use dbt_schemas::schemas::project::ModelConfig;
+use dbt_schemas::schemas::serde::NodeVersion;
+use serde::{Deserialize, Serialize};
+
+use crate::python_file_info::PythonFileInfo;
+
+/// Serialized form of a `PythonFileInfo<ModelConfig>`, minus the checksum
+/// (stored in its own column).
+#[derive(Serialize, Deserialize)]
+struct CachedPythonFileInfo {
+    sources: Vec<(String, String, CodeLocation)>,
+    refs: Vec<(String, Option<String>, Option<NodeVersion>, CodeLocation)>,
+    config: ModelConfig,
+    packages: Vec<String>,
+    config_keys_used: Vec<String>,
+    config_keys_defaults: Vec<serde_json::Value>,
+    meta_keys_used: Vec<String>,
+    meta_keys_defaults: Vec<serde_json::Value>,
+    has_valid_model_function: bool,
+}
+
+fn to_json_values(values: &[minijinja::Value]) -> Vec<serde_json::Value> {
+    values
+        .iter()
+        .map(|value| serde_json::to_value(value).unwrap_or_default())
+        .collect()
+}
+
+fn from_json_values(values: &[serde_json::Value]) -> Vec<minijinja::Value> {
+    values
+        .iter()
+        .map(minijinja::Value::from_serialize)
+        .collect()
+}
+
+/// Bumped whenever [`CachedPythonFileInfo`] changes shape.
+const SCHEMA_VERSION: u32 = 1;
+
+/// Stamp stored with every row. Rows written by another dbt build or payload
+/// format are never decoded: the whole file is dropped instead.
+fn cache_version() -> String {
+    format!("{}/v{SCHEMA_VERSION}", env!("CARGO_PKG_VERSION"))
+}
+
+#[derive(Debug, Default)]
+struct CacheRows {
+    /// `file_path` → (`checksum`, `info_json`)
+    rows: BTreeMap<String, (String, String)>,
+    dirty: bool,
+}
+
+/// Python model analyses loaded from, and written back to, the parse cache.
+///
+/// One cache is opened per resolve and shared by every package, including
+/// packages resolved concurrently, and saved once when the resolve is done.
+#[derive(Debug)]
+pub struct PythonModelCache {
+    path: PathBuf,
+    version: String,
+    inner: Mutex<CacheRows>,
+}
+
+impl PythonModelCache {
+    /// Loads the cache stored at `path`; a missing or unreadable file yields an
+    /// empty cache, and a file written by another version is removed.
+    pub fn open(path: &Path) -> Self {
+        Self::open_with_version(path, cache_version())
+    }
+
+    fn open_with_version(path: &Path, version: String) -> Self {
+        let stored = read_python_model_info(path);
+        let rows = if stored.iter().all(|row| row.version == version) {
+            stored
+                .into_iter()
+                .map(|row| (row.file_path, (row.checksum, row.info_json)))
+                .collect()
+        } else {
+            let _ = std::fs::remove_file(path);
+            BTreeMap::new()
+        };
+        Self {
+            path: path.to_path_buf(),
+            version,
+            inner: Mutex::new(CacheRows { rows, dirty: false }),
+        }
+    }
+
+    fn lock(&self) -> MutexGuard<'_, CacheRows> {
+        self.inner.lock().unwrap_or_else(|e| e.into_inner())
+    }
+
+    /// The stored analysis of `file_path`, if it was made from a source with
+    /// the same `checksum`.
+    pub fn get(
+        &self,
+        file_path: &Path,
+        checksum: &DbtChecksum,
+    ) -> Option<PythonFileInfo<ModelConfig>> {
+        let info_json = {
+            let inner = self.lock();
+            let (stored_checksum, info_json) = inner.rows.get(file_path.to_str()?)?;
+            if stored_checksum != checksum.as_checksum_string() {
+                return None;
+            }
+            info_json.clone()
+        };
+        let cached: CachedPythonFileInfo = serde_json::from_str(&info_json).ok()?;
+        Some(PythonFileInfo {
+            sources: cached.sources,
+            refs: cached.refs,
+            config: Box::new(cached.config),
+            packages: cached.packages,
+            config_keys_used: cached.config_keys_used,
+            config_keys_defaults: from_json_values(&cached.config_keys_defaults),
+            meta_keys_used: cached.meta_keys_used,
+            meta_keys_defaults: from_json_values(&cached.meta_keys_defaults),
+            checksum: checksum.clone(),
+            has_valid_model_function: cached.has_valid_model_function,
+        })
+    }
+
+    /// Stores the analysis of `file_path`, replacing any previous entry.
+    pub fn insert(&self, file_path: &Path, info: &PythonFileInfo<ModelConfig>) {
+        let Some(file_path) = file_path.to_str() else {
+            return;
+        };
+        let cached = CachedPythonFileInfo {
+            sources: info.sources.clone(),
+            refs: info.refs.clone(),
+            config: (*info.config).clone(),
+            packages: info.packages.clone(),
+            config_keys_used: info.config_keys_used.clone(),
+            config_keys_defaults: to_json_values(&info.config_keys_defaults),
+            meta_keys_used: info.meta_keys_used.clone(),
+            meta_keys_defaults: to_json_values(&info.meta_keys_defaults),
+            has_valid_model_function: info.has_valid_model_function,
+        };
+        let Ok(info_json) = serde_json::to_string(&cached) else {
+            return;
+        };
+        let mut inner = self.lock();
+        inner.rows.insert(
+            file_path.to_string(),
+            (info.checksum.as_checksum_string().to_string(), info_json),
+        );
+        inner.dirty = true;
+    }
+
+    /// Writes the cache back if anything was inserted, dropping entries for
+    /// files that no longer exist.
+    pub fn save(&self) -> FsResult<()> {
+        let mut inner = self.lock();
+        if !inner.dirty {
+            return Ok(());
+        }
+        inner
+            .rows
+            .retain(|file_path, _| Path::new(file_path).exists());
+        let rows: Vec<PythonModelInfoRow> = inner
+            .rows
+            .iter()
+            .map(|(file_path, (checksum, info_json))| PythonModelInfoRow {
+                file_path: file_path.clone(),
+                checksum: checksum.clone(),
+                info_json: info_json.clone(),
+                version: self.version.clone(),
+            })
+            .collect();
+        write_python_model_info(&self.path, &rows)?;
+        inner.dirty = false;
+        Ok(())
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::python_ast::parse_python;
+    use crate::python_visitor::analyze_python_file;
+    use dbt_metadata_parquet::python_model_info::PYTHON_MODEL_INFO_FILE_NAME;
+
+    const SOURCE: &str = r#"
+def model(dbt, session):
+    dbt.config(materialized='table')
+    enabled = dbt.config.get('enabled', True)
+    owner = dbt.config.meta_get('owner', {'team': 'data', 'ids': [1, 2]})
+    df = dbt.ref('customers', v=2)
+    return dbt.source('raw', 'orders')
+"#;
+
+    fn analyze(path: &PathBuf, source: &str) -> PythonFileInfo<ModelConfig> {
+        let stmts = parse_python(source, path).unwrap();
+        analyze_python_file(
+            path,
+            source,
+            &stmts,
+            DbtChecksum::hash(source.as_bytes()),
+            None,
+            Some(path.clone()),
+        )
+        .unwrap()
+    }
+
+    #[test]
+    fn analysis_round_trips_while_the_source_is_unchanged() {
+        let dir = tempfile::tempdir().unwrap();
+        let model = dir.path().join("model.py");
+        std::fs::write(&model, SOURCE).unwrap();
+        let cache_path = dir.path().join(PYTHON_MODEL_INFO_FILE_NAME);
+
+        let info = analyze(&model, SOURCE);
+        let cache = PythonModelCache::open(&cache_path);
+        assert!(cache.get(&model, &info.checksum).is_none());
+        cache.insert(&model, &info);
+        cache.save().unwrap();
+
+        let cache = PythonModelCache::open(&cache_path);
+        let cached = cache.get(&model, &info.checksum).unwrap();
+        assert_eq!(cached.refs, info.refs);
+        assert_eq!(cached.sources, info.sources);
+        assert_eq!(cached.config, info.config);
+        assert_eq!(cached.config_keys_used, info.config_keys_used);
+        assert_eq!(
+            cached
+                .config_keys_defaults
+                .iter()
+                .map(|v| v.to_string())
+                .collect::<Vec<_>>(),
+            info.config_keys_defaults
+                .iter()
+                .map(|v| v.to_string())
+                .collect::<Vec<_>>(),
+        );
+        assert_eq!(
+            cached
+                .meta_keys_defaults
+                .iter()
+                .map(|v| v.to_string())
+                .collect::<Vec<_>>(),
+            info.meta_keys_defaults
+                .iter()
+                .map(|v| v.to_string())
+                .collect::<Vec<_>>(),
+        );
+        assert_eq!(cached.checksum, info.checksum);
+        assert_eq!(
+            cached.has_valid_model_function,
+            info.has_valid_model_function
+        );
+
+        let edited = DbtChecksum::hash(format!("{SOURCE}\n# edited").as_bytes());
+        assert!(cache.get(&model, &edited).is_none());
+    }
+
+    #[test]
+    fn entries_for_deleted_files_are_dropped_on_save() {
+        let dir = tempfile::tempdir().unwrap();
+        let kept = dir.path().join("kept.py");
+        let deleted = dir.path().join("deleted.py");
+        std::fs::write(&kept, SOURCE).unwrap();
+        let cache_path = dir.path().join(PYTHON_MODEL_INFO_FILE_NAME);
+
+        let info = analyze(&kept, SOURCE);
+        let cache = PythonModelCache::open(&cache_path);
+        cache.insert(&kept, &info);
+        cache.insert(&deleted, &info);
+        cache.save().unwrap();
+
+        let cache = PythonModelCache::open(&cache_path);
+        assert!(cache.get(&kept, &info.checksum).is_some());
+        assert!(cache.get(&deleted, &info.checksum).is_none());
+    }
+
+    #[test]
+    fn a_cache_written_by_another_version_is_dropped() {
+        let dir = tempfile::tempdir().unwrap();
+        let model = dir.path().join("model.py");
+        std::fs::write(&model, SOURCE).unwrap();
+        let cache_path = dir.path().join(PYTHON_MODEL_INFO_FILE_NAME);
+
+        let info = analyze(&model, SOURCE);
+        let cache = PythonModelCache::open_with_version(&cache_path, "1.0.0/v1".to_string());
+        cache.insert(&model, &info);
+        cache.save().unwrap();
+
+        let cache = PythonModelCache::open(&cache_path);
+        assert!(cache.get(&model, &info.checksum).is_none());
+        assert!(!cache_path.exists());
+    }
+}
@@ -2,6 +2,7 @@
 use crate::args::ResolveArgs;
 use crate::dbt_namespace::DbtNamespace;
 use crate::dbt_project_config::ProjectConfigResolver;
+use crate::parse_profile::{self, ParsePhase};
 use crate::resolve::resolve_properties::MinimalPropertiesEntry;
 use crate::sql_file_info::SqlFileInfo;
 use crate::utils::{
@@ -51,6 +52,7 @@ use std::path::{Path, PathBuf};
 use std::sync::Arc;
 use std::sync::Mutex;
 use std::sync::atomic::{self, AtomicBool};
+use std::time::Instant;
 
 /// Represents the result of rendering a single SQL file
 #[derive(Debug)]
@@ -354,7 +356,15 @@ where
     }
 
     let absolute_path = dbt_asset.base_path.join(&dbt_asset.path);
+    let start = Instant::now();
     let sql = read_to_string(&absolute_path).await.map_err(|e| *e)?;
+    parse_profile::record(
+        package_name,
+        &display_path,
+        ParsePhase::Load,
+        start.elapsed(),
+        sql.len(),
+    );
 
     let sql_resources = Arc::new(Mutex::new(Vec::new()));
     let execute_exists = Arc::new(AtomicBool::new(false));
@@ -401,6 +411,7 @@ where
         && let Ok(unique_id) = model.get_attr("unique_id")
         && let Some(unique_id) = unique_id.as_str()
     {
+        let start = Instant::now();
         let _ = dbt_jinja_utils::typecheck::typecheck(
             &args.io,
             jinja_env.clone(),
@@ -416,6 +427,13 @@ where
             *adapter_type,
             true,
         );
+        parse_profile::record(
+            package_name,
+            &display_path,
+            ParsePhase::SqlAnalysis,
+            start.elapsed(),
+            0,
+        );
     }
 
     // Create listeners for rendering via factory
@@ -432,15 +450,24 @@ where
     let macro_dep_listener = Rc::new(dbt_jinja_utils::listener::MacroDependencyListener::new());
     listeners.push(macro_dep_listener.clone());
 
+    let start = Instant::now();
+    let rendered = render_sql_with_listeners(
+        &sql,
+        jinja_env.as_ref(),
+        &resolve_model_context,
+        &listeners,
+        &[],
+        &display_path,
+    );
+    parse_profile::record(
+        package_name,
+        &display_path,
+        ParsePhase::Render,
+        start.elapsed(),
+        0,
+    );
     let (sql_file_info, resolved_config, status, rendered_sql, macro_spans, macro_dependencies) =
-        match render_sql_with_listeners(
-            &sql,
-            jinja_env.as_ref(),
-            &resolve_model_context,
-            &listeners,
-            &[],
-            &display_path,
-        ) {
+        match rendered {
             Ok(rendered_sql) => {
                 // A `source()` inside a Jinja branch that evaluates to false
                 // during this `execute=false` render is never observed by the
@@ -726,7 +753,7 @@ pub async fn render_unresolved_sql_files<
     if model_sql_files.len() < 50 {
         max_concurrency = 1;
     }
-    let chunk_size = model_sql_files.len().div_ceil(max_concurrency);
+    let chunk_size = crate::parallel::parse_chunk_size(model_sql_files.len(), max_concurrency);
 
     // Split node_properties into per-chunk subsets
     let chunks: Vec<(Vec<DbtAsset>, BTreeMap<String, MinimalPropertiesEntry>)> = model_sql_files
@@ -749,7 +776,7 @@ pub async fn render_unresolved_sql_files<
 
     let chunk_results = crate::parallel::dispatch_maybe_parallel(
         chunks,
-        max_concurrency > 1,
+        max_concurrency,
         move |(chunk, mut chunk_node_properties)| {
             let render_ctx = render_ctx.clone();
             let token = token.clone();
@@ -761,7 +788,8 @@ pub async fn render_unresolved_sql_files<
 
                 for dbt_asset in chunk {
                     token.check_cancellation()?;
-                    if let Some(res) = render_sql_file::<T, S>(
+                    let start = Instant::now();
+                    let rendered = render_sql_file::<T, S>(
                         &render_ctx,
                         &dbt_asset,
                         &mut chunk_node_properties,
@@ -769,8 +797,13 @@ pub async fn render_unresolved_sql_files<
                         &token,
                         jinja_type_checking_event_listener_factory.clone(),
                     )
-                    .await?
-                    {
+                    .await?;
+                    emit_debug_log_message(format!(
+                        "Rendered {} in {:.2}ms",
+                        dbt_asset.path.display(),
+                        start.elapsed().as_secs_f64() * 1000.0
+                    ));
+                    if let Some(res) = rendered {
                         local_results.push(res);
                     }
                 }
@@ -814,7 +847,7 @@ pub async fn collect_adapter_identifiers_detect_unsafe<T: InternalDbtNodeAttribu
 
     let max_concurrency = crate::parallel::effective_parallelism(arg.no_parallel);
     let model_vec: Vec<(String, T)> = node_map.into_iter().collect();
-    let chunk_size = model_vec.len().div_ceil(max_concurrency);
+    let chunk_size = crate::parallel::parse_chunk_size(model_vec.len(), max_concurrency);
 
     let parse_adapter = jinja_env
         .get_adapter()
@@ -829,7 +862,7 @@ pub async fn collect_adapter_identifiers_detect_unsafe<T: InternalDbtNodeAttribu
     let token = token.clone();
 
     let chunk_results =
-        crate::parallel::dispatch_maybe_parallel(chunks, max_concurrency > 1, move |chunk| {
+        crate::parallel::dispatch_maybe_parallel(chunks, max_concurrency, move |chunk| {
             let arg = arg.clone();
             let node_resolver = node_resolver.clone();
             let jinja_env = jinja_env.clone();
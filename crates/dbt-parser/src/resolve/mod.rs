@@ -1,5 +1,7 @@
 /// Utilities for inferring model primary keys from constraints and tests
 pub(crate) mod primary_key_inference;
+/// Parsed schema-file documents reused within a process
+pub(crate) mod properties_cache;
 /// Functions for resolving analyses
 pub mod resolve_analyses;
 /// Functions for resolving exposures
@@ -0,0 +1,205 @@
+//! Parsed schema-file documents, reused across resolves within a process.
+//!
+//! Parsing a large properties file into a spanned `dbt_yaml::Value` dominates
+//! the YAML phase, and long-lived processes (the LSP, repeated invocations from
+//! the Python runner) re-resolve unchanged files whenever anything forces a
+//! re-resolve. Parsed documents are keyed by path and the MD5 of the file
+//! contents, so a hit never depends on mtimes. One-shot CLI runs opt out, since
+//! nothing would ever read the documents back.
+//!
+//! Only documents that parsed without diagnostics are kept, so a file with
+//! duplicate keys reports them on every parse. Each resolve starts by evicting
+//! documents that no longer belong to the project being resolved, see
+//! [`retain_parsed_properties_files`].
+
+use std::collections::HashMap;
+use std::path::{Path, PathBuf};
+use std::sync::{Arc, Mutex};
+use std::time::Instant;
+
+use dbt_common::io_utils::try_read_yml_to_str;
+use dbt_common::{FsError, FsResult};
+use dbt_jinja_utils::serde::parse_yaml_raw;
+
+use crate::parse_profile::{self, ParsePhase};
+
+type ParsedDocuments = HashMap<PathBuf, (md5::Digest, Arc<dbt_yaml::Value>)>;
+
+static PARSED: Mutex<Option<ParsedDocuments>> = Mutex::new(None);
+
+/// Evicts parsed documents for files that were deleted or that lie outside
+/// every one of `package_roots`.
+pub(crate) fn retain_parsed_properties_files<'a>(
+    package_roots: impl IntoIterator<Item = &'a Path>,
+) {
+    let package_roots: Vec<&Path> = package_roots.into_iter().collect();
+    let mut parsed = PARSED.lock().unwrap_or_else(|e| e.into_inner());
+    if let Some(parsed) = parsed.as_mut() {
+        parsed.retain(|path, _| {
+            path.is_file() && package_roots.iter().any(|root| path.starts_with(root))
+        });
+    }
+}
+
+/// Reads and parses a properties file. With `reuse_parsed`, the parsed document
+/// is shared with earlier and later resolves while the file contents stay
+/// unchanged.
+///
+/// The outer result fails only if the file cannot be read. The inner result is
+/// the parsed document along with its duplicate-key diagnostics, which the
+/// caller is expected to emit.
+pub(crate) fn read_and_parse_properties_file(
+    package_name: &str,
+    display_path: &Path,
+    absolute_path: &Path,
+    reuse_parsed: bool,
+) -> FsResult<FsResult<(Arc<dbt_yaml::Value>, Vec<FsError>)>> {
+    let start = Instant::now();
+    let input = try_read_yml_to_str(absolute_path)?;
+    parse_profile::record(
+        package_name,
+        display_path,
+        ParsePhase::Load,
+        start.elapsed(),
+        input.len(),
+    );
+
+    let start = Instant::now();
+    let result = if reuse_parsed {
+        parse_reusing_cached(&input, absolute_path)
+    } else {
+        parse_yaml_raw(&input, Some(absolute_path))
+            .map(|(value, diagnostics)| (Arc::new(value), diagnostics))
+    };
+    parse_profile::record(
+        package_name,
+        display_path,
+        ParsePhase::YamlResolution,
+        start.elapsed(),
+        0,
+    );
+    Ok(result)
+}
+
+fn parse_reusing_cached(
+    input: &str,
+    absolute_path: &Path,
+) -> FsResult<(Arc<dbt_yaml::Value>, Vec<FsError>)> {
+    let digest = md5::compute(input.as_bytes());
+    let cached = PARSED
+        .lock()
+        .unwrap_or_else(|e| e.into_inner())
+        .as_ref()
+        .and_then(|parsed| parsed.get(absolute_path))
+        .filter(|(cached_digest, _)| *cached_digest == digest)
+        .map(|(_, value)| value.clone());
+    if let Some(value) = cached {
+        return Ok((value, Vec::new()));
+    }
+    let (value, diagnostics) = parse_yaml_raw(input, Some(absolute_path))?;
+    let value = Arc::new(value);
+    if diagnostics.is_empty() {
+        PARSED
+            .lock()
+            .unwrap_or_else(|e| e.into_inner())
+            .get_or_insert_with(HashMap::new)
+            .insert(absolute_path.to_path_buf(), (digest, value.clone()));
+    }
+    Ok((value, diagnostics))
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    /// Eviction touches every cached document, so the tests sharing [`PARSED`]
+    /// take turns.
+    static SERIAL: Mutex<()> = Mutex::new(());
+
+    fn serial() -> std::sync::MutexGuard<'static, ()> {
+        SERIAL.lock().unwrap_or_else(|e| e.into_inner())
+    }
+
+    fn parse(path: &Path) -> Arc<dbt_yaml::Value> {
+        let (value, diagnostics) = read_and_parse_properties_file("p", path, path, true)
+            .unwrap()
+            .unwrap();
+        assert!(diagnostics.is_empty());
+        value
+    }
+
+    fn is_cached(path: &Path) -> bool {
+        PARSED
+            .lock()
+            .unwrap()
+            .as_ref()
+            .is_some_and(|p| p.contains_key(path))
+    }
+
+    #[test]
+    fn unchanged_contents_share_the_parsed_document() {
+        let _serial = serial();
+        let dir = tempfile::tempdir().unwrap();
+        let path = dir.path().join("schema.yml");
+        std::fs::write(&path, "version: 2\nmodels:\n  - name: a\n").unwrap();
+
+        let first = parse(&path);
+        assert!(is_cached(&path), "a clean parse is cached");
+        assert!(Arc::ptr_eq(&parse(&path), &first));
+
+        std::fs::write(&path, "version: 2\nmodels:\n  - name: b\n").unwrap();
+        let edited = parse(&path);
+        assert_ne!(edited, first);
+        assert_eq!(edited["models"][0]["name"].as_str(), Some("b"));
+    }
+
+    #[test]
+    fn documents_are_not_kept_unless_reuse_is_requested() {
+        let _serial = serial();
+        let dir = tempfile::tempdir().unwrap();
+        let path = dir.path().join("schema.yml");
+        std::fs::write(&path, "version: 2\n").unwrap();
+
+        read_and_parse_properties_file("p", &path, &path, false)
+            .unwrap()
+            .unwrap();
+        assert!(!is_cached(&path));
+    }
+
+    #[test]
+    fn documents_with_duplicate_keys_are_not_cached() {
+        let _serial = serial();
+        let dir = tempfile::tempdir().unwrap();
+        let path = dir.path().join("schema.yml");
+        std::fs::write(&path, "version: 2\nversion: 2\n").unwrap();
+
+        for _ in 0..2 {
+            let (_, diagnostics) = read_and_parse_properties_file("p", &path, &path, true)
+                .unwrap()
+                .unwrap();
+            assert_eq!(diagnostics.len(), 1);
+        }
+        assert!(!is_cached(&path));
+    }
+
+    #[test]
+    fn deleted_files_and_other_projects_are_evicted() {
+        let _serial = serial();
+        let project = tempfile::tempdir().unwrap();
+        let other_project = tempfile::tempdir().unwrap();
+        let kept = project.path().join("kept.yml");
+        let deleted = project.path().join("deleted.yml");
+        let elsewhere = other_project.path().join("schema.yml");
+        for path in [&kept, &deleted, &elsewhere] {
+            std::fs::write(path, "version: 2\n").unwrap();
+            parse(path);
+        }
+        std::fs::remove_file(&deleted).unwrap();
+
+        retain_parsed_properties_files([project.path()]);
+
+        assert!(is_cached(&kept));
+        assert!(!is_cached(&deleted));
+        assert!(!is_cached(&elsewhere));
+    }
+}
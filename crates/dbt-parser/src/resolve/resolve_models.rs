@@ -1245,6 +1245,7 @@ fn process_python_models(
 ) -> FsResult<Vec<SqlFileRenderResult<ModelConfig, ModelProperties>>> {
     let mut results = Vec::new();
     let dependency_package_name = dependency_package_name_from_ctx(env.as_ref(), base_ctx);
+    let analysis_cache = arg.python_model_cache.as_deref();
 
     for python_asset in python_files {
         // Read and parse Python source
@@ -1252,36 +1253,49 @@ fn process_python_models(
         // Strip leading/trailing whitespace to match dbt-core's behavior (load_file_contents with strip=True)
         let source = std::fs::read_to_string(&absolute_path)?.trim().to_string();
 
-        let stmts = match parse_python(&source, &python_asset.path) {
-            Ok(stmts) => stmts,
-            Err(e) => {
-                emit_error_log_from_fs_error(*e);
-                continue;
-            }
-        };
-
-        // Validate Python model structure (def model(dbt, session): ...)
-        if let Err(e) = validate_python_model(&python_asset.path, &stmts) {
-            emit_error_log_from_fs_error(*e);
-            continue;
-        }
-
-        // Analyze Python AST to extract dbt function calls
         // Use the Python model source to compute the model checksum. This is used by `state:*`
         // selectors (e.g. `state:modified`) when comparing to a deferred/previous-state manifest.
         let checksum = dbt_schemas::schemas::common::DbtChecksum::hash(source.as_bytes());
-        let python_file_info: PythonFileInfo<ModelConfig> = match analyze_python_file(
-            &python_asset.path,
-            &source,
-            &stmts,
-            checksum,
-            dependency_package_name,
-            Some(python_asset.path.clone()),
-        ) {
-            Ok(info) => info,
-            Err(e) => {
-                emit_error_log_from_fs_error(*e);
-                continue;
+
+        // An unchanged model reuses its previous analysis and skips the AST entirely.
+        let cached = analysis_cache.and_then(|cache| cache.get(&absolute_path, &checksum));
+        let python_file_info: PythonFileInfo<ModelConfig> = match cached {
+            Some(info) => info,
+            None => {
+                let stmts = match parse_python(&source, &python_asset.path) {
+                    Ok(stmts) => stmts,
+                    Err(e) => {
+                        emit_error_log_from_fs_error(*e);
+                        continue;
+                    }
+                };
+
+                // Validate Python model structure (def model(dbt, session): ...)
+                if let Err(e) = validate_python_model(&python_asset.path, &stmts) {
+                    emit_error_log_from_fs_error(*e);
+                    continue;
+                }
+
+                // Analyze Python AST to extract dbt function calls
+                match analyze_python_file(
+                    &python_asset.path,
+                    &source,
+                    &stmts,
+                    checksum,
+                    dependency_package_name,
+                    Some(python_asset.path.clone()),
+                ) {
+                    Ok(info) => {
+                        if let Some(cache) = analysis_cache {
+                            cache.insert(&absolute_path, &info);
+                        }
+                        info
+                    }
+                    Err(e) => {
+                        emit_error_log_from_fs_error(*e);
+                        continue;
+                    }
+                }
             }
         };
 
@@ -2,14 +2,18 @@ use crate::args::ResolveArgs;
 use crate::dbt_project_config::{
     ProjectConfigResolver, RootProjectConfigs, disallow_plus_prefix_from_flags, init_project_config,
 };
+use crate::parallel::{
+    dispatch_maybe_parallel, effective_parallelism, parse_chunk_size, run_blocking,
+};
+use crate::parse_profile::{self, ParsePhase};
+use crate::resolve::properties_cache::read_and_parse_properties_file;
 use crate::resolve::resolve_utils::deep_merge_yaml;
 use dbt_common::cancellation::CancellationToken;
-use dbt_common::io_utils::try_read_yml_to_str;
 use dbt_common::tracing::dbt_emit::{emit_strict_parse_error, emit_warn_log_message};
 use dbt_common::tracing::span_info::SpanStatusRecorder as _;
-use dbt_common::{ErrorCode, FsResult, create_debug_span, fs_err};
+use dbt_common::{ErrorCode, FsError, FsResult, create_debug_span, fs_err};
 use dbt_jinja_utils::jinja_environment::JinjaEnv;
-use dbt_jinja_utils::serde::{from_yaml_raw, into_typed_with_jinja};
+use dbt_jinja_utils::serde::{from_yaml_value_raw, into_typed_with_jinja};
 use dbt_jinja_utils::utils::dependency_package_name_from_ctx;
 use dbt_schemas::schemas::properties::{
     AnalysesProperties, DbtPropertiesFileValues, MinimalSchemaValue, MinimalTableValue,
@@ -23,6 +27,8 @@ use itertools::Itertools;
 use minijinja::Value as MinijinjaValue;
 use std::collections::BTreeMap;
 use std::path::{Path, PathBuf};
+use std::sync::Arc;
+use std::time::Instant;
 
 #[derive(Debug, Clone)]
 pub struct MinimalPropertiesEntry {
@@ -592,7 +598,7 @@ fn validate_resource_name(name: &str) -> FsResult<String> {
 }
 
 #[allow(clippy::cognitive_complexity)]
-pub fn resolve_minimal_properties(
+pub async fn resolve_minimal_properties(
     arg: &ResolveArgs,
     package: &DbtPackage,
     root_package: &DbtPackage,
@@ -607,6 +613,21 @@ pub fn resolve_minimal_properties(
         ..Default::default()
     };
 
+    // Reading and parsing each file is independent of the others, so it runs on
+    // the blocking pool up front; merging into `minimal_resolved_properties`
+    // below stays sequential and in file order.
+    let dbt_assets: Vec<_> = package.dbt_properties.iter().dedup().collect();
+    let paths: Vec<(PathBuf, PathBuf)> = dbt_assets
+        .iter()
+        .map(|dbt_asset| {
+            (
+                dbt_asset.to_display_path(&arg.io.in_dir),
+                dbt_asset.base_path.join(&dbt_asset.path),
+            )
+        })
+        .collect();
+    let parsed_files = read_properties_files(arg, &package.dbt_project.name, &paths, token).await?;
+
     let is_dependency = package.dbt_project.name != root_package_name;
     let semantic_model_config_resolver = ProjectConfigResolver::build(
         root_project_configs.semantic_models.clone(),
@@ -621,10 +642,10 @@ pub fn resolve_minimal_properties(
         },
     )?;
 
-    for dbt_asset in package.dbt_properties.iter().dedup() {
+    for ((dbt_asset, (display_path, _)), parsed_file) in
+        dbt_assets.into_iter().zip(paths).zip(parsed_files)
+    {
         token.check_cancellation()?;
-        let absolute_path = dbt_asset.base_path.join(&dbt_asset.path);
-        let display_path = dbt_asset.to_display_path(&arg.io.in_dir);
         let asset_name = dbt_asset
             .path
             .file_stem()
@@ -646,14 +667,18 @@ pub fn resolve_minimal_properties(
 
         {
             let _guard = span.enter();
-            let input = try_read_yml_to_str(&absolute_path)?;
-
-            let result = match from_yaml_raw::<DbtPropertiesFileValues>(
-                &input,
-                Some(&absolute_path),
-                true,
-                dependency_package_name,
-            ) {
+            let start = Instant::now();
+            let typed = parsed_file?.and_then(|(value, duplicate_keys)| {
+                for duplicate_key_error in duplicate_keys {
+                    emit_strict_parse_error(duplicate_key_error, dependency_package_name);
+                }
+                from_yaml_value_raw::<DbtPropertiesFileValues>(
+                    Arc::unwrap_or_clone(value),
+                    true,
+                    dependency_package_name,
+                )
+            });
+            let result = match typed {
                 Ok(properties_file_values) => {
                     let properties_path = &dbt_asset.path;
                     minimal_resolved_properties.extend_from_minimal_properties_file(
@@ -692,6 +717,13 @@ pub fn resolve_minimal_properties(
                 }
                 Err(e) => Err(e),
             };
+            parse_profile::record(
+                &package.dbt_project.name,
+                &display_path,
+                ParsePhase::YamlResolution,
+                start.elapsed(),
+                0,
+            );
 
             // Record both success and failure statuses to the span, but continue processing
             // regardless of outcome.
@@ -704,6 +736,49 @@ pub fn resolve_minimal_properties(
     Ok(minimal_resolved_properties)
 }
 
+type ParsedPropertiesFile = FsResult<FsResult<(Arc<dbt_yaml::Value>, Vec<FsError>)>>;
+
+/// Reads and parses `paths` (display path, absolute path) on the blocking pool,
+/// returning one result per path in input order.
+///
+/// Parsed documents are only reused across resolves in long-lived sessions;
+/// a one-shot CLI run would just pay for keeping them.
+async fn read_properties_files(
+    arg: &ResolveArgs,
+    package_name: &str,
+    paths: &[(PathBuf, PathBuf)],
+    token: &CancellationToken,
+) -> FsResult<Vec<ParsedPropertiesFile>> {
+    let max_concurrency = effective_parallelism(arg.no_parallel);
+    let chunks: Vec<Vec<(PathBuf, PathBuf)>> = paths
+        .chunks(parse_chunk_size(paths.len(), max_concurrency))
+        .map(<[_]>::to_vec)
+        .collect();
+    let package_name = package_name.to_string();
+    let reuse_parsed = !arg.from_main;
+    let token = token.clone();
+    let parsed_chunks = dispatch_maybe_parallel(chunks, max_concurrency, move |chunk| {
+        let package_name = package_name.clone();
+        let token = token.clone();
+        run_blocking(move || {
+            Ok(chunk
+                .iter()
+                .map(|(display_path, absolute_path)| {
+                    token.check_cancellation()?;
+                    read_and_parse_properties_file(
+                        &package_name,
+                        display_path,
+                        absolute_path,
+                        reuse_parsed,
+                    )
+                })
+                .collect::<Vec<_>>())
+        })
+    })
+    .await?;
+    Ok(parsed_chunks.into_iter().flatten().collect())
+}
+
 #[derive(Debug, Clone)]
 pub struct VersionInfo {
     pub version: String,
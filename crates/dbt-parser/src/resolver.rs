@@ -53,6 +53,7 @@ use minijinja::constants::CURRENT_PATH;
 use std::collections::{BTreeMap, HashMap, HashSet};
 use std::sync::Arc;
 
+use crate::resolve::properties_cache::retain_parsed_properties_files;
 use crate::resolve::resolve_analyses::resolve_analyses;
 use crate::resolve::resolve_exposures::resolve_exposures;
 use crate::resolve::resolve_functions::resolve_functions;
@@ -114,6 +115,14 @@ pub async fn resolve(
     // long-lived process (LSP, service) one invocation's scratch state must not
     // be visible to the next. dbt-labs/fs#13454.
     reset_invocation_graph();
+    // Drop parsed schema files this project no longer has, and anything left
+    // over from a different project resolved earlier in the same process.
+    retain_parsed_properties_files(
+        dbt_state
+            .packages
+            .iter()
+            .map(|package| package.package_root_path.as_path()),
+    );
 
     // Get the root project name
     let root_project_name = dbt_state.root_project_name();
@@ -698,7 +707,8 @@ pub async fn resolve_inner(
         &jinja_env,
         &base_ctx,
         token,
-    )?;
+    )
+    .await?;
 
     let package_name = package.dbt_project.name.as_str();
 
@@ -1273,7 +1283,7 @@ async fn resolve_package_waves(
 
         let results = crate::parallel::dispatch_maybe_parallel(
             package_wave,
-            max_concurrency > 1,
+            max_concurrency,
             move |package_name: String| {
                 let arg = arg.clone();
                 let dbt_state = dbt_state.clone();
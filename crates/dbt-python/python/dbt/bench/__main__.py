@@ -0,0 +1,43 @@
+"""Generate a synthetic project and benchmark it on a simulated warehouse.
+
+    python -m dbt.bench --models 5000 --depth 20 --latency lognormal:200ms,1.0
+
+Generates into a temporary directory unless --project-dir names one to keep.
+"""
+
+import argparse
+import tempfile
+from dataclasses import fields
+from pathlib import Path
+from typing import List, Optional
+
+from dbt.bench.harness import run_benchmark
+from dbt.bench.project import ProjectShape, generate_project
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m dbt.bench", description=__doc__)
+    for shape_field in fields(ProjectShape):
+        parser.add_argument(
+            "--" + shape_field.name.replace("_", "-"), type=int, default=shape_field.default
+        )
+    parser.add_argument(
+        "--latency",
+        default="lognormal:50ms,0.8",
+        help="--mock-warehouse query latency; 'none' runs on the generated duckdb profile",
+    )
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--command", choices=["build", "run"], default="build")
+    parser.add_argument("--project-dir", type=Path)
+    args = parser.parse_args(argv)
+
+    shape = ProjectShape(**{f.name: getattr(args, f.name) for f in fields(ProjectShape)})
+    latency = None if args.latency == "none" else args.latency
+    with tempfile.TemporaryDirectory(prefix="dbt-bench-") as tmp:
+        project_dir = generate_project(args.project_dir or Path(tmp), shape)
+        print(f"{shape.models} models, {shape.tests} tests in {project_dir}")
+        print(run_benchmark(project_dir, latency, args.threads, args.command))
+
+
+if __name__ == "__main__":
+    main()
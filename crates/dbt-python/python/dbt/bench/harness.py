@@ -0,0 +1,123 @@
+"""Times parse, scheduling, compilation and execution of a project through dbtRunner."""
+
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dbt.runner import DbtRunnerError, dbtRunner, dbtRunnerResult
+
+
+@dataclass
+class PhaseTiming:
+    name: str
+    seconds: float
+    nodes: int
+
+    @property
+    def throughput(self) -> float:
+        """Nodes per second."""
+        return self.nodes / self.seconds if self.seconds > 0 else float("inf")
+
+
+@dataclass
+class BenchmarkReport:
+    """Timings of one benchmark, in phase order.
+
+    statuses: number of execution results per status.
+    latency: the --mock-warehouse latency executed against, None for the
+        project's own warehouse.
+    """
+
+    command: str
+    threads: int
+    latency: Optional[str]
+    phases: List[PhaseTiming] = field(default_factory=list)
+    statuses: Dict[str, int] = field(default_factory=dict)
+
+    def phase(self, name: str) -> PhaseTiming:
+        return next(phase for phase in self.phases if phase.name == name)
+
+    def __str__(self) -> str:
+        warehouse = f"mock warehouse ({self.latency})" if self.latency else "project warehouse"
+        lines = [
+            f"dbt {self.command} on {warehouse}, {self.threads} threads",
+            f"{'phase':<10} {'nodes':>8} {'seconds':>10} {'nodes/s':>10}",
+        ]
+        lines += [
+            f"{p.name:<10} {p.nodes:>8} {p.seconds:>10.3f} {p.throughput:>10.1f}"
+            for p in self.phases
+        ]
+        lines.append("statuses: " + ", ".join(f"{s}={n}" for s, n in sorted(self.statuses.items())))
+        return "\n".join(lines)
+
+
+def _timed(call: Callable[[], Any]) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = call()
+    return result, time.perf_counter() - start
+
+
+def _task_seconds(phase: str, result: dbtRunnerResult) -> float:
+    """Wall-clock time of the invocation's tasks, read from its --timeline trace.
+
+    The trace starts when the tasks are scheduled, so the parse every invocation
+    repeats is not charged to the compile and execute phases.
+    """
+    if result.timeline is None:
+        raise DbtRunnerError(f"{phase} wrote no timeline: {result.exception}")
+    slices = [event for event in result.timeline["traceEvents"] if event["ph"] == "X"]
+    return max((event["args"]["finished_us"] for event in slices), default=0) / 1_000_000
+
+
+def _checked(phase: str, result: dbtRunnerResult) -> Any:
+    # A handled failure (a failing model or test) still carries its artifact and
+    # is part of the measurement; only an invocation without one is fatal.
+    if result.result is None:
+        raise DbtRunnerError(f"{phase} failed: {result.exception}")
+    return result.result
+
+
+def run_benchmark(
+    project_dir: Path,
+    latency: Optional[str] = "lognormal:50ms,0.8",
+    threads: int = 8,
+    command: str = "build",
+    select: Optional[str] = None,
+    runner: Optional[dbtRunner] = None,
+) -> BenchmarkReport:
+    """Parse, schedule, compile and execute the project in `project_dir`.
+
+    Runs against a simulated warehouse whose queries take `latency` (see
+    `--mock-warehouse`), or against the project's profile if `latency` is None.
+    Reusing a `runner` across benchmarks measures warm invocations. Compile and
+    execute each need an invocation of their own, which parses again; they are
+    timed from their task timelines, so only the parse phase counts parsing.
+    """
+    runner = runner or dbtRunner()
+    project = str(project_dir)
+    args = ["--project-dir", project, "--profiles-dir", project, "--threads", str(threads)]
+    if latency is not None:
+        args += ["--mock-warehouse", latency]
+    if select is not None:
+        args += ["--select", select]
+    report = BenchmarkReport(command=command, threads=threads, latency=latency)
+
+    result, seconds = _timed(lambda: runner.invoke(["parse"] + args))
+    manifest = _checked("parse", result)
+    report.phases.append(PhaseTiming("parse", seconds, len(manifest.nodes)))
+
+    selection, seconds = _timed(lambda: runner.select(select))
+    report.phases.append(PhaseTiming("schedule", seconds, len(selection.unique_ids)))
+
+    timeline = ["--timeline", str(project_dir / "target" / "bench_timeline.json")]
+    result = runner.invoke(["compile"] + args + timeline)
+    compiled = _checked("compile", result)
+    report.phases.append(PhaseTiming("compile", _task_seconds("compile", result), len(compiled)))
+
+    result = runner.invoke([command] + args + timeline)
+    results = _checked(command, result)
+    report.phases.append(PhaseTiming("execute", _task_seconds(command, result), len(results)))
+    report.statuses = dict(Counter(str(r.status) for r in results))
+    return report
@@ -0,0 +1,161 @@
+"""Synthetic dbt projects of a chosen size and shape."""
+
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+# Generic tests cycled through a model's columns, one per requested test.
+_TESTS = ["not_null", "unique"]
+
+
+@dataclass
+class ProjectShape:
+    """What to generate.
+
+    models: number of models.
+    depth: number of DAG layers the models are spread over: 1 makes them all
+        independent, `models` makes one long chain.
+    fan_in: most models a model in a later layer selects from, picked at random
+        among earlier layers.
+    columns: documented columns per model, which sizes the YAML.
+    tests_per_model: generic data tests per model, spread over its columns (at
+        most two per column).
+    macro_depth: depth of the macro call chain every model renders through; 0
+        renders no macros.
+    seed: seed of the random fan-in, so a shape always yields the same project.
+    """
+
+    models: int = 1000
+    depth: int = 10
+    fan_in: int = 3
+    columns: int = 5
+    tests_per_model: int = 2
+    macro_depth: int = 2
+    seed: int = 0
+
+    @property
+    def tests(self) -> int:
+        # Each column takes at most one test of each kind
+        return self.models * min(self.tests_per_model, len(_TESTS) * self.columns)
+
+
+def _model_name(index: int) -> str:
+    return f"model_{index:06d}"
+
+
+def _layers(shape: ProjectShape) -> List[List[int]]:
+    depth = max(1, min(shape.depth, shape.models))
+    return [list(range(shape.models))[layer::depth] for layer in range(depth)]
+
+
+def _parents(shape: ProjectShape) -> Dict[int, List[int]]:
+    rng = random.Random(shape.seed)
+    parents: Dict[int, List[int]] = {}
+    upstream: List[int] = []
+    for layer in _layers(shape):
+        for model in layer:
+            count = min(shape.fan_in, len(upstream))
+            parents[model] = sorted(rng.sample(upstream, count)) if count else []
+        upstream.extend(layer)
+    return parents
+
+
+def _model_sql(shape: ProjectShape, parents: List[int]) -> str:
+    key = "{{ bench_key_0('id') }}" if shape.macro_depth else "id"
+    columns = ",\n    ".join(f"{key} + {n} as col_{n}" for n in range(1, shape.columns))
+    columns = ",\n    ".join(filter(None, ["id", columns]))
+    if not parents:
+        return f"with source as (select 1 as id)\n\nselect\n    {columns}\nfrom source\n"
+    ctes = ",\n\n".join(
+        f"parent_{i} as (select id from {{{{ ref('{_model_name(parent)}') }}}})"
+        for i, parent in enumerate(parents)
+    )
+    union = "\n    union all\n    ".join(f"select id from parent_{i}" for i in range(len(parents)))
+    return f"with {ctes},\n\nsource as (\n    {union}\n)\n\nselect\n    {columns}\nfrom source\n"
+
+
+def _macros(depth: int) -> str:
+    macros = []
+    for level in range(depth):
+        body = (
+            f"{{{{ bench_key_{level + 1}(column) }}}}"
+            if level + 1 < depth
+            else "({{ column }} % 1000)"
+        )
+        macros.append(f"{{% macro bench_key_{level}(column) %}}{body}{{% endmacro %}}\n")
+    return "\n".join(macros)
+
+
+def _schema_yml(shape: ProjectShape, models: List[int]) -> str:
+    lines = ["version: 2", "", "models:"]
+    for model in models:
+        lines += [
+            f"  - name: {_model_name(model)}",
+            f"    description: Synthetic model {model} of a {shape.models} model project.",
+            "    columns:",
+        ]
+        columns = ["id"] + [f"col_{n}" for n in range(1, shape.columns)]
+        tests: Dict[str, List[str]] = {}
+        for n in range(shape.tests_per_model):
+            column = columns[n % len(columns)]
+            tests.setdefault(column, []).append(_TESTS[(n // len(columns)) % len(_TESTS)])
+        for column in columns:
+            lines += [
+                f"      - name: {column}",
+                f"        description: Column {column} of {_model_name(model)}.",
+            ]
+            if column in tests:
+                lines.append(f"        data_tests: [{', '.join(sorted(set(tests[column])))}]")
+    return "\n".join(lines) + "\n"
+
+
+# Models per directory (and per schema file), so no directory grows unwieldy.
+_MODELS_PER_DIR = 100
+
+
+def generate_project(path: Path, shape: ProjectShape) -> Path:
+    """Write a project of `shape` to `path`, with its profiles.yml, and return it.
+
+    Every model selects from its parents (or a constant), so the project builds
+    on the in-memory duckdb of its profile as well as on `--mock-warehouse`.
+    """
+    path = Path(path)
+    (path / "models").mkdir(parents=True, exist_ok=True)
+    (path / "macros").mkdir(exist_ok=True)
+    (path / "dbt_project.yml").write_text(
+        "name: 'bench'\n"
+        "config-version: 2\n"
+        "version: '0.1'\n"
+        "\n"
+        "profile: 'bench'\n"
+        "\n"
+        'model-paths: ["models"]\n'
+        'macro-paths: ["macros"]\n'
+        "\n"
+        "models:\n"
+        "  bench:\n"
+        "    +materialized: table\n"
+    )
+    (path / "profiles.yml").write_text(
+        "bench:\n"
+        "  target: bench\n"
+        "  outputs:\n"
+        "    bench:\n"
+        "      type: duckdb\n"
+        "      path: ':memory:'\n"
+        "      schema: main\n"
+        "      threads: 4\n"
+    )
+    if shape.macro_depth:
+        (path / "macros" / "bench_key.sql").write_text(_macros(shape.macro_depth))
+
+    parents = _parents(shape)
+    for start in range(0, shape.models, _MODELS_PER_DIR):
+        directory = path / "models" / f"group_{start // _MODELS_PER_DIR:04d}"
+        directory.mkdir(exist_ok=True)
+        models = list(range(start, min(start + _MODELS_PER_DIR, shape.models)))
+        for model in models:
+            (directory / f"{_model_name(model)}.sql").write_text(_model_sql(shape, parents[model]))
+        (directory / "schema.yml").write_text(_schema_yml(shape, models))
+    return path
@@ -3,6 +3,7 @@ from dbt.runner import (  # noqa: F401
     DbtRunnerError,
     dbtRunner,
     dbtRunnerResult,
+    dbtSelection,
 )
 
 
@@ -1,4 +1,6 @@
-from typing import Any, Callable, Dict, List, Optional
+import os
+import time
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Sequence, Tuple, Union
 
 import msgpack
 
@@ -47,6 +49,15 @@ class dbtRunnerResult:
         success=False and no exception.
     exit_code: engine exit code — 0 ok, 1 failure, 2 completed with elevated
         warnings. Not reconstructible from (success, exception); read it directly.
+    changed_paths: for results produced by dbtRunner.watch, the project files
+        whose change triggered the parse (empty for the initial parse); else None.
+    parse_profile: with --parse-profile, the rows of target/parse_profile.parquet —
+        one dict per parsed file with package_name, file_path, load_us, render_us,
+        sql_analysis_us, yaml_resolution_us (None where the phase did not run) and
+        bytes_read. Loads directly into a DataFrame. Else None.
+    timeline: with --timeline, the Chrome trace event document it wrote — worker
+        threads' task slices, categorized by phase, plus each task's "queued" wait
+        between becoming ready and being admitted. Else None.
     """
 
     def __init__(
@@ -56,12 +67,18 @@ class dbtRunnerResult:
         exception: Optional[BaseException] = None,
         exit_code: Optional[int] = None,
         catalog: Any = None,
+        changed_paths: Optional[List[str]] = None,
+        parse_profile: Optional[List[Dict[str, Any]]] = None,
+        timeline: Optional[Dict[str, Any]] = None,
     ):
         self.success = success
         self.result = result
         self.exception = exception
         self.exit_code = exit_code
         self.catalog = catalog
+        self.changed_paths = changed_paths
+        self.parse_profile = parse_profile
+        self.timeline = timeline
 
     def __repr__(self) -> str:
         return (
@@ -70,6 +87,41 @@ class dbtRunnerResult:
         )
 
 
+class dbtSelection:
+    """Nodes chosen by dbtRunner.select.
+
+    unique_ids: selected nodes, sorted — what `dbt list` would print.
+    levels: selected nodes grouped by depth. Every node's selected dependencies
+        are in earlier levels, so each level can be fanned out once the previous
+        ones finished.
+    frontier: unselected nodes that selected ones depend on, sorted.
+    """
+
+    def __init__(self, unique_ids: List[str], levels: List[List[str]], frontier: List[str]):
+        self.unique_ids = unique_ids
+        self.levels = levels
+        self.frontier = frontier
+
+    def __repr__(self) -> str:
+        return (
+            f"dbtSelection(unique_ids={self.unique_ids!r}, "
+            f"levels={self.levels!r}, frontier={self.frontier!r})"
+        )
+
+
+_Selector = Union[str, Sequence[str]]
+
+
+def _selector_tokens(selector: Optional[_Selector]) -> Optional[List[str]]:
+    """Split selectors as the CLI does: a string is space-separated, like one
+    --select value; a list holds one selector per item."""
+    if selector is None:
+        return None
+    if isinstance(selector, str):
+        return selector.split()
+    return [token for item in selector for token in item.split()]
+
+
 def _kwargs_to_cli(kwargs: dict) -> List[str]:
     """Turn keyword args into CLI flags.
 
@@ -94,6 +146,111 @@ def _kwargs_to_cli(kwargs: dict) -> List[str]:
     return argv
 
 
+_Stamps = Dict[str, Tuple[int, int]]
+
+
+def _watch_skip_dirs(root: str, argv: List[str]) -> FrozenSet[str]:
+    """Directories the invocation writes to, before the engine has resolved them.
+
+    Each comes from its CLI flag, then its environment variable, then the default;
+    relative paths are relative to the project directory. dbt_project.yml may not
+    move the target or log directory, and its packages-install-path is only known
+    once the engine loaded the project (see _watched_dirs). Watching these would
+    make every parse trigger the next one.
+    """
+
+    def resolve(flag: str, env: str, default: str) -> str:
+        path = _flag_value(argv, flag) or os.environ.get(env) or default
+        return os.path.normpath(os.path.join(root, path))
+
+    packages = resolve("--packages-install-path", "DBT_PACKAGES_INSTALL_PATH", "dbt_packages")
+    return frozenset(
+        [
+            resolve("--target-path", "DBT_TARGET_PATH", "target"),
+            resolve("--log-path", "DBT_LOG_PATH", "logs"),
+            packages,
+            os.path.join(os.path.dirname(packages), "dbt_internal_packages"),
+        ]
+    )
+
+
+# (source_dirs, output_dirs), as DbtRunner.project_paths reports them.
+_ProjectPaths = Tuple[List[str], List[str]]
+
+
+def _watched_dirs(
+    root: str, argv: List[str], project_paths: Optional[_ProjectPaths]
+) -> Tuple[Optional[FrozenSet[str]], FrozenSet[str]]:
+    """(source_dirs, skip_dirs) to scan, from the engine's resolved project paths.
+
+    Until a parse has loaded the project, source_dirs is None, meaning the whole
+    project directory, and skip_dirs falls back to _watch_skip_dirs.
+    """
+    if project_paths is None:
+        return None, _watch_skip_dirs(root, argv)
+    source_dirs, output_dirs = project_paths
+    return (
+        frozenset(os.path.normpath(path) for path in source_dirs),
+        frozenset(os.path.normpath(path) for path in output_dirs),
+    )
+
+
+def _scan_stamps(
+    root: str,
+    skip_dirs: FrozenSet[str] = frozenset(),
+    source_dirs: Optional[FrozenSet[str]] = None,
+) -> _Stamps:
+    """(mtime_ns, size) for every file under root, skipping hidden dirs and skip_dirs.
+
+    With source_dirs, only the files directly in root (dbt_project.yml,
+    packages.yml, ...) and those under source_dirs are stamped.
+    """
+    stamps: _Stamps = {}
+    pending = [(root, source_dirs is None)]
+    pending.extend((path, True) for path in sorted(source_dirs or ()))
+    while pending:
+        path, recurse = pending.pop()
+        try:
+            entries = os.scandir(path)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recurse and os.path.normpath(entry.path) not in skip_dirs:
+                            pending.append((entry.path, True))
+                    elif entry.is_file():
+                        stat = entry.stat()
+                        stamps[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                except OSError:
+                    # Deleted between listing and stat; the next scan settles it.
+                    continue
+    return stamps
+
+
+def _changed_paths(old: _Stamps, new: _Stamps) -> List[str]:
+    """Files added, removed or modified between two scans, sorted."""
+    changed = {path for path, stamp in new.items() if old.get(path) != stamp}
+    changed.update(path for path in old if path not in new)
+    return sorted(changed)
+
+
+def _flag_value(argv: List[str], flag: str) -> Optional[str]:
+    for i, arg in enumerate(argv):
+        if arg == flag and i + 1 < len(argv):
+            return argv[i + 1]
+        if arg.startswith(flag + "="):
+            return arg.split("=", 1)[1]
+    return None
+
+
+def _project_dir(argv: List[str]) -> str:
+    return _flag_value(argv, "--project-dir") or os.getcwd()
+
+
 class dbtRunner:
     """In-process dbt runner. Reuse one instance across calls."""
 
@@ -128,10 +285,102 @@ class dbtRunner:
             if core.catalog_msgpack is not None
             else None
         )
+        parse_profile = (
+            msgpack.unpackb(core.parse_profile_msgpack, raw=False)
+            if core.parse_profile_msgpack is not None
+            else None
+        )
+        timeline = (
+            msgpack.unpackb(core.timeline_msgpack, raw=False)
+            if core.timeline_msgpack is not None
+            else None
+        )
         return dbtRunnerResult(
             success=core.success,
             result=_decode(core.result_kind, core.result_msgpack),
             exception=exception,
             exit_code=core.exit_code,
             catalog=catalog,
+            parse_profile=parse_profile,
+            timeline=timeline,
         )
+
+    def select(
+        self, select: Optional[_Selector] = None, exclude: Optional[_Selector] = None
+    ) -> dbtSelection:
+        """Expand selectors against the project as the last invoke() resolved it.
+
+        Equivalent to `dbt list --select ... --exclude ...` without CLI parsing,
+        log setup or output rendering, so a warm project answers in milliseconds.
+        Expanded selectors are reused until the next invoke() that parses. Any
+        command that parses the project works, e.g. `invoke(["parse"])`; `state:`
+        and `result:` need an invoke that loaded --state.
+
+        Raises RuntimeError if nothing has been parsed yet and ValueError for an
+        invalid selector.
+        """
+        core = self._runner.select(_selector_tokens(select), _selector_tokens(exclude))
+        return dbtSelection(unique_ids=core.unique_ids, levels=core.levels, frontier=core.frontier)
+
+    def watch(
+        self,
+        args: Optional[List[str]] = None,
+        callback: Optional[Callable[[dbtRunnerResult], Any]] = None,
+        poll_interval: float = 0.25,
+        **kwargs,
+    ) -> Optional[Iterator[dbtRunnerResult]]:
+        """Re-parse the project whenever one of its files changes.
+
+        This is a polling wrapper around invoke(): it runs `parse --partial-parse`,
+        then stats the project's files each `poll_interval` seconds and re-invokes
+        the whole command once anything changed. Only the top-level project files
+        and the model, macro, seed, snapshot, test, analysis, docs, function and
+        asset directories the last parse resolved are watched; the target, log and
+        package install directories never are. Each result carries the triggering
+        files on `changed_paths`.
+
+        No parse state is kept in memory between runs and file events are not used:
+        each re-parse reads the partial-parse cache from disk and rediscovers and
+        hashes the project's files like a fresh CLI invocation would, so it costs
+        a warm partial parse rather than only the changed files.
+
+        Without a callback this returns an iterator of results. With one, it blocks
+        and hands every result to `callback` until the callback returns False.
+        """
+        argv = ["parse", "--partial-parse"] + list(args or []) + _kwargs_to_cli(kwargs)
+        results = self._watch(argv, poll_interval)
+        if callback is None:
+            return results
+        for result in results:
+            if callback(result) is False:
+                break
+        return None
+
+    def _watch(self, argv: List[str], poll_interval: float) -> Iterator[dbtRunnerResult]:
+        root = os.path.abspath(_project_dir(argv))
+        changed: List[str] = []
+        project_paths: Optional[_ProjectPaths] = None
+        while True:
+            source_dirs, skip_dirs = _watched_dirs(root, argv, project_paths)
+            # Stamp before parsing so an edit made during the parse is picked up by
+            # the next scan rather than lost.
+            stamps = _scan_stamps(root, skip_dirs, source_dirs)
+            result = self.invoke(argv)
+            result.changed_paths = changed
+            # Re-read per run, since dbt_project.yml may be the file that changed. A
+            # parse that failed before loading the project keeps the previous paths.
+            project_paths = self._runner.project_paths() or project_paths
+            watched = _watched_dirs(root, argv, project_paths)
+            if watched != (source_dirs, skip_dirs):
+                # Newly watched files start from their current stamp; the others
+                # keep the pre-parse one.
+                source_dirs, skip_dirs = watched
+                current = _scan_stamps(root, skip_dirs, source_dirs)
+                stamps = {path: stamps.get(path, stamp) for path, stamp in current.items()}
+            yield result
+            while True:
+                time.sleep(poll_interval)
+                current = _scan_stamps(root, skip_dirs, source_dirs)
+                changed = _changed_paths(stamps, current)
+                if changed:
+                    break
@@ -1,18 +1,27 @@
 use dbt_clap_core::commands::{Command, CoreCommand};
 use dbt_clap_core::{Cli, CliParser, CliParserFactory as _, from_lib, from_main};
+use dbt_common::FsResult;
 use dbt_common::io_args::{FsCommand, SystemArgs};
+use dbt_common::node_selector::parse_model_specifiers;
 use dbt_common::tracing::FsTraceConfig;
 use dbt_common::tracing::dbt_init::{
     InvocationTracingGuard, ProcessTracing, init_tracing_cli_reloadable,
 };
+use dbt_dag::deps_mgmt::topological_levels;
 use dbt_features::cli::DefaultCliParserFactory;
 use dbt_features::feature_stack::{FeatureStack, FeatureStackConfig};
 use dbt_features::feature_stack_builder::FeatureStackBuilder;
 use dbt_features::tracing::TracingFeature;
 use dbt_main::{print_trimmed_error, run_cli_with_code};
+use dbt_metadata_parquet::parse_profile::read_parse_profile;
+use dbt_scheduler::args::SchedulerArgs;
+use dbt_scheduler::schedule::build_schedule;
 use dbt_schemas::schemas::DbtCommandExecutionArtifacts;
+use dbt_schemas::schemas::selectors::ResolvedSelector;
+use dbt_schemas::state::{ProjectPaths, SelectionState};
 use pyo3::prelude::*;
 use pyo3::types::PyBytes;
+use std::path::PathBuf;
 use std::sync::{Arc, Mutex, OnceLock};
 use tracing::level_filters::LevelFilter;
 
@@ -104,6 +113,11 @@ struct DbtRunnerResult {
     /// Kept off `result` so that stays dbt-core-compatible; `--write-catalog` is
     /// global, so any command can populate this.
     catalog_msgpack: Option<Py<PyBytes>>,
+    /// Rows of `target/parse_profile.parquet`, one map per file, when
+    /// `--parse-profile` wrote one.
+    parse_profile_msgpack: Option<Py<PyBytes>>,
+    /// The Chrome trace `--timeline` wrote, as a map.
+    timeline_msgpack: Option<Py<PyBytes>>,
     /// Engine error message, else `None`. Handled failures with run results have
     /// no message.
     exception: Option<String>,
@@ -161,11 +175,73 @@ fn build_catalog_msgpack(
         .transpose()
 }
 
+/// Read back from the file rather than carried in memory, so the table is exactly
+/// what was persisted.
+fn build_parse_profile_msgpack(
+    py: Python<'_>,
+    exec: &DbtCommandExecutionArtifacts,
+) -> PyResult<Option<Py<PyBytes>>> {
+    exec.parse_profile_path
+        .as_deref()
+        .map(|path| contracts::to_msgpack(py, &read_parse_profile(path)))
+        .transpose()
+}
+
+/// Nodes chosen by [`DbtRunner::select`].
+#[pyclass(get_all)]
+struct DbtSelection {
+    /// Selected nodes, sorted; what `list` would print.
+    unique_ids: Vec<String>,
+    /// Selected nodes grouped by depth: a node's dependencies among the
+    /// selection are all in earlier levels.
+    levels: Vec<Vec<String>>,
+    /// Unselected nodes that selected ones depend on.
+    frontier: Vec<String>,
+}
+
+#[pymethods]
+impl DbtSelection {
+    fn __repr__(&self) -> String {
+        format!(
+            "DbtSelection(unique_ids={}, levels={}, frontier={})",
+            self.unique_ids.len(),
+            self.levels.len(),
+            self.frontier.len()
+        )
+    }
+}
+
+/// Read back from the file, like the parse profile.
+fn build_timeline_msgpack(
+    py: Python<'_>,
+    exec: &DbtCommandExecutionArtifacts,
+) -> PyResult<Option<Py<PyBytes>>> {
+    let Some(path) = exec.timeline_path.as_deref() else {
+        return Ok(None);
+    };
+    let trace: serde_json::Value = std::fs::read(path)
+        .ok()
+        .and_then(|bytes| serde_json::from_slice(&bytes).ok())
+        .ok_or_else(|| {
+            pyo3::exceptions::PyIOError::new_err(format!(
+                "failed to read timeline {}",
+                path.display()
+            ))
+        })?;
+    contracts::to_msgpack(py, &trace).map(Some)
+}
+
 /// Runs dbt in-process — no subprocess fork.
 #[pyclass]
 struct DbtRunner {
     /// Built once and reused across `invoke` calls.
     cli_parser: CliParser,
+    /// The project as of the last invocation that resolved it. `select` runs
+    /// under that invocation's parse generation, so it reuses the selectors the
+    /// invocation expanded until the next parse.
+    selection_state: Mutex<Option<Arc<SelectionState>>>,
+    /// The project's directories as the last invocation loaded them.
+    project_paths: Mutex<Option<ProjectPaths>>,
 }
 
 #[pymethods]
@@ -174,6 +250,8 @@ impl DbtRunner {
     fn new() -> Self {
         DbtRunner {
             cli_parser: dbt_core_cli_parser(),
+            selection_state: Mutex::new(None),
+            project_paths: Mutex::new(None),
         }
     }
 
@@ -185,14 +263,27 @@ impl DbtRunner {
 
         // invoke_inner is pure Rust; run it GIL-released, serialize after.
         let cli_parser = &self.cli_parser;
-        let (exit_code, command, exec, exception) =
+        let (exit_code, command, mut exec, exception) =
             py.detach(|| invoke_inner(argv, cli_parser, dbt_core_feature_stack))?;
-        let (result, catalog_msgpack) = match exec {
+        if let Some(state) = exec.as_mut().and_then(|exec| exec.selection_state.take()) {
+            *self
+                .selection_state
+                .lock()
+                .unwrap_or_else(|poisoned| poisoned.into_inner()) = Some(Arc::new(state));
+        }
+        *self
+            .project_paths
+            .lock()
+            .unwrap_or_else(|poisoned| poisoned.into_inner()) =
+            exec.as_mut().and_then(|exec| exec.project_paths.take());
+        let (result, catalog_msgpack, parse_profile_msgpack, timeline_msgpack) = match exec {
             Some(mut exec) => (
                 build_result_msgpack(py, command, &mut exec)?,
                 build_catalog_msgpack(py, &mut exec)?,
+                build_parse_profile_msgpack(py, &exec)?,
+                build_timeline_msgpack(py, &exec)?,
             ),
-            None => (None, None),
+            None => (None, None, None, None),
         };
         let (result_kind, result_msgpack) = match result {
             Some((kind, bytes)) => (Some(kind.to_string()), Some(bytes)),
@@ -204,9 +295,97 @@ impl DbtRunner {
             result_kind,
             result_msgpack,
             catalog_msgpack,
+            parse_profile_msgpack,
+            timeline_msgpack,
             exception,
         })
     }
+
+    /// `(source_dirs, output_dirs)` of the project the last `invoke` loaded:
+    /// the directories the engine reads sources from and those it writes to.
+    /// `None` if that invocation failed before loading a project.
+    fn project_paths(&self) -> Option<(Vec<String>, Vec<String>)> {
+        let to_strings = |dirs: &[PathBuf]| -> Vec<String> {
+            dirs.iter()
+                .map(|dir| dir.to_string_lossy().into_owned())
+                .collect()
+        };
+        self.project_paths
+            .lock()
+            .unwrap_or_else(|poisoned| poisoned.into_inner())
+            .as_ref()
+            .map(|paths| {
+                (
+                    to_strings(&paths.source_dirs),
+                    to_strings(&paths.output_dirs),
+                )
+            })
+    }
+
+    /// Expand `select`/`exclude` selector tokens against the project as last
+    /// resolved by `invoke`, without another invocation; drops the GIL for the
+    /// duration. With no `select`, everything is selected.
+    #[pyo3(signature = (select=None, exclude=None))]
+    fn select(
+        &self,
+        py: Python<'_>,
+        select: Option<Vec<String>>,
+        exclude: Option<Vec<String>>,
+    ) -> PyResult<DbtSelection> {
+        let state = self
+            .selection_state
+            .lock()
+            .unwrap_or_else(|poisoned| poisoned.into_inner())
+            .clone()
+            .ok_or_else(|| {
+                pyo3::exceptions::PyRuntimeError::new_err(
+                    "no parsed project to select from; invoke a command that parses one first",
+                )
+            })?;
+        py.detach(|| select_inner(&state, select.as_deref(), exclude.as_deref()))
+            .map_err(|e| pyo3::exceptions::PyValueError::new_err(e.pretty()))
+    }
+}
+
+/// Schedules `state` the way `list` would, minus tracing and output rendering.
+fn select_inner(
+    state: &SelectionState,
+    select: Option<&[String]>,
+    exclude: Option<&[String]>,
+) -> FsResult<DbtSelection> {
+    let resolved_selectors = ResolvedSelector {
+        include: select.map(parse_model_specifiers).transpose()?,
+        exclude: exclude.map(parse_model_specifiers).transpose()?,
+        selector_definitions: state.selector_definitions.clone(),
+    };
+    let args = SchedulerArgs {
+        command: FsCommand::List,
+        parse_generation: Some(state.parse_generation),
+        ..Default::default()
+    };
+    let schedule = build_schedule(
+        &args,
+        &state.nodes,
+        state.previous_state.as_ref(),
+        &resolved_selectors,
+        &dbt_base::cancel::never_cancels(),
+        state.adapter_type,
+    )?;
+    let levels = topological_levels(&schedule.deps)
+        .into_iter()
+        .map(|level| {
+            level
+                .into_iter()
+                .filter(|id| schedule.all_selected_nodes.contains(id))
+                .collect::<Vec<_>>()
+        })
+        .filter(|level| !level.is_empty())
+        .collect();
+    Ok(DbtSelection {
+        unique_ids: schedule.all_selected_nodes.into_iter().collect(),
+        levels,
+        frontier: schedule.frontier_nodes.into_iter().collect(),
+    })
 }
 
 /// Message for `exception`. An error raised with real context renders itself;
@@ -415,6 +594,7 @@ fn dbt_core_pyo3(m: &Bound<'_, PyModule>) -> PyResult<()> {
     // No artifact classes; they are dataclasses under dbt/artifacts/schemas/.
     m.add_class::<DbtRunner>()?;
     m.add_class::<DbtRunnerResult>()?;
+    m.add_class::<DbtSelection>()?;
     m.add_function(wrap_pyfunction!(run_cli, m)?)?;
     Ok(())
 }
@@ -87,3 +87,43 @@ def test_failing_run_still_writes_run_results(tmp_project, invoke, unique_ids):
     parsed = _read(proj / "target" / "run_results.json")
     assert {r["unique_id"] for r in parsed["results"]} == unique_ids(res.result)
     assert any(r["status"] == "fail" for r in parsed["results"])
+
+
+def test_parse_profile_lists_every_parsed_file(tmp_project, invoke):
+    proj = tmp_project("layered")
+    res = invoke(proj, "parse", "--parse-profile")
+    assert res.success, res.exception
+
+    assert (proj / "target" / "parse_profile.parquet").is_file()
+    rows = {row["file_path"]: row for row in res.parse_profile}
+    assert {"models/stg_people.sql", "models/mart_people.sql", "models/schema.yml"} <= set(rows)
+
+    sql = rows["models/stg_people.sql"]
+    assert sql["render_us"] is not None
+    assert sql["yaml_resolution_us"] is None
+    assert sql["bytes_read"] == (proj / "models" / "stg_people.sql").stat().st_size
+
+    yml = rows["models/schema.yml"]
+    assert yml["yaml_resolution_us"] is not None
+    assert yml["render_us"] is None
+
+
+def test_parse_profile_is_off_by_default(tmp_project, invoke):
+    res = invoke(tmp_project("layered"), "parse")
+    assert res.success, res.exception
+    assert res.parse_profile is None
+
+
+def test_timeline_has_a_slice_per_task(tmp_project, invoke):
+    proj = tmp_project("layered")
+    res = invoke(proj, "build", "--timeline", "target/timeline.json")
+    assert res.success, res.exception
+
+    assert res.timeline == _read(proj / "target" / "timeline.json")
+    slices = [e for e in res.timeline["traceEvents"] if e["ph"] == "X"]
+    phases = {(e["name"], e["cat"]) for e in slices}
+    assert ("model.layered.stg_people", "run") in phases
+    assert ("model.layered.mart_people", "run") in phases
+    for e in slices:
+        assert e["ts"] >= e["args"]["ready_us"]
+        assert abs(e["args"]["finished_us"] - (e["ts"] + e["dur"])) <= 1
@@ -1,3 +1,6 @@
+import pytest
+from dbt.cli.main import dbtRunner
+
 SEED = "seed.layered.people"
 STG = "model.layered.stg_people"
 MART = "model.layered.mart_people"
@@ -57,3 +60,20 @@ def test_list_respects_selection(tmp_project, invoke):
         "layered.not_null_mart_people_id",
         "layered.unique_mart_people_id",
     }, res.result
+
+
+def test_select_without_invoke(tmp_project):
+    project = tmp_project("layered")
+    runner = dbtRunner()
+    parsed = runner.invoke(["parse", "--project-dir", str(project), "--profiles-dir", str(project)])
+    assert parsed.success, parsed.exception
+
+    selection = runner.select("stg_people+", exclude="resource_type:test")
+    assert selection.unique_ids == [MART, STG]
+    assert selection.levels == [[STG], [MART]]
+    assert selection.frontier == [SEED]
+
+    # Same answer as `list`, and repeatable from the cached expansion.
+    assert runner.select("tag:mart").unique_ids == runner.select(["tag:mart"]).unique_ids
+    with pytest.raises(ValueError):
+        runner.select("selector:does_not_exist")
@@ -0,0 +1,45 @@
+"""Unit tests for the synthetic project generator; benchmarks themselves run the engine."""
+
+import re
+
+from dbt.bench.project import ProjectShape, _layers, _parents, generate_project
+
+
+def test_layers_spread_models_from_independent_to_chain():
+    assert _layers(ProjectShape(models=4, depth=1)) == [[0, 1, 2, 3]]
+    assert _layers(ProjectShape(models=5, depth=2)) == [[0, 2, 4], [1, 3]]
+    assert _layers(ProjectShape(models=3, depth=10)) == [[0], [1], [2]]
+
+
+def test_parents_come_from_earlier_layers_up_to_fan_in():
+    shape = ProjectShape(models=200, depth=8, fan_in=3, seed=7)
+    layer_of = {model: n for n, layer in enumerate(_layers(shape)) for model in layer}
+    parents = _parents(shape)
+    for model, model_parents in parents.items():
+        assert len(model_parents) == (0 if layer_of[model] == 0 else 3)
+        assert all(layer_of[parent] < layer_of[model] for parent in model_parents)
+    # Seeded, so a shape always yields the same project
+    assert _parents(shape) == parents
+
+
+def test_generated_project_matches_its_shape(tmp_path):
+    shape = ProjectShape(models=150, depth=3, columns=2, tests_per_model=3, macro_depth=3)
+    project = generate_project(tmp_path / "bench", shape)
+
+    models = sorted(project.glob("models/*/*.sql"))
+    assert len(models) == 150
+    assert len(list(project.glob("models/*/schema.yml"))) == 2
+    tests = sum(
+        len(re.findall(r"not_null|unique", line))
+        for schema in project.glob("models/*/schema.yml")
+        for line in schema.read_text().splitlines()
+        if "data_tests" in line
+    )
+    assert tests == shape.tests == 450
+
+    macros = (project / "macros" / "bench_key.sql").read_text()
+    assert macros.count("{% macro") == 3
+    # Models past the first layer select from their parents through ref()
+    last = models[-1].read_text()
+    assert last.count("ref('model_") == 3
+    assert "bench_key_0('id')" in last
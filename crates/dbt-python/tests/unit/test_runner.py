@@ -4,7 +4,16 @@ Commands run against fixtures live in tests/integration.
 """
 
 import pytest
-from dbt.runner import _kwargs_to_cli, dbtRunner
+from dbt.runner import (
+    _changed_paths,
+    _kwargs_to_cli,
+    _project_dir,
+    _scan_stamps,
+    _selector_tokens,
+    _watch_skip_dirs,
+    _watched_dirs,
+    dbtRunner,
+)
 
 
 def test_manifest_injection_not_implemented():
@@ -31,6 +40,25 @@ def test_kwargs_to_cli_mapping(kwargs, expected):
     assert _kwargs_to_cli(kwargs) == expected
 
 
+@pytest.mark.parametrize(
+    "selector, expected",
+    [
+        (None, None),
+        ("tag:nightly+", ["tag:nightly+"]),
+        ("a  b+", ["a", "b+"]),
+        (["a", "tag:x,b"], ["a", "tag:x,b"]),
+        (["a b", "c"], ["a", "b", "c"]),
+    ],
+)
+def test_selector_tokens(selector, expected):
+    assert _selector_tokens(selector) == expected
+
+
+def test_select_before_any_parse_raises():
+    with pytest.raises(RuntimeError, match="no parsed project"):
+        dbtRunner().select("tag:nightly")
+
+
 def test_unknown_command_captured_as_exception():
     # A bad command is reported on the result, not raised.
     res = dbtRunner().invoke(["this-is-not-a-command"])
@@ -39,3 +67,71 @@ def test_unknown_command_captured_as_exception():
     assert isinstance(res.exception, BaseException)
     # A binding-level failure never reaches the engine, so there is no catalog.
     assert res.catalog is None
+
+
+def test_watch_scan_skips_output_and_hidden_dirs(tmp_path):
+    (tmp_path / "models").mkdir()
+    (tmp_path / "models" / "a.sql").write_text("select 1")
+    for skipped in ("target", "logs", "dbt_packages", "dbt_internal_packages", ".git"):
+        (tmp_path / skipped).mkdir()
+        (tmp_path / skipped / "x.sql").write_text("select 1")
+    skip_dirs = _watch_skip_dirs(str(tmp_path), [])
+    assert list(_scan_stamps(str(tmp_path), skip_dirs)) == [str(tmp_path / "models" / "a.sql")]
+
+
+def test_watch_skip_dirs_follow_configured_paths(tmp_path, monkeypatch):
+    monkeypatch.delenv("DBT_TARGET_PATH", raising=False)
+    monkeypatch.setenv("DBT_LOG_PATH", "out/logs")
+    skip_dirs = _watch_skip_dirs(
+        str(tmp_path), ["parse", "--target-path=build", "--packages-install-path", "vendor/pkgs"]
+    )
+    assert skip_dirs == {
+        str(tmp_path / "build"),
+        str(tmp_path / "out" / "logs"),
+        str(tmp_path / "vendor" / "pkgs"),
+        str(tmp_path / "vendor" / "dbt_internal_packages"),
+    }
+    # The default directory names are ordinary project directories now.
+    (tmp_path / "dbt_project.yml").write_text("name: p\n")
+    (tmp_path / "target").mkdir()
+    (tmp_path / "target" / "x.sql").write_text("select 1")
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "x.sql").write_text("select 1")
+    assert sorted(_scan_stamps(str(tmp_path), skip_dirs)) == [
+        str(tmp_path / "dbt_project.yml"),
+        str(tmp_path / "target" / "x.sql"),
+    ]
+
+
+def test_watch_scans_only_the_resolved_source_dirs(tmp_path):
+    for path in ("models/a.sql", "macros/m.sql", "notes/n.md", "vendor/pkgs/p/x.sql"):
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text("select 1")
+    (tmp_path / "dbt_project.yml").write_text("name: p\n")
+    project_paths = (
+        [str(tmp_path / "models"), str(tmp_path / "macros")],
+        [str(tmp_path / "target"), str(tmp_path / "vendor" / "pkgs")],
+    )
+    source_dirs, skip_dirs = _watched_dirs(str(tmp_path), ["parse"], project_paths)
+    assert skip_dirs == {str(tmp_path / "target"), str(tmp_path / "vendor" / "pkgs")}
+    assert sorted(_scan_stamps(str(tmp_path), skip_dirs, source_dirs)) == [
+        str(tmp_path / "dbt_project.yml"),
+        str(tmp_path / "macros" / "m.sql"),
+        str(tmp_path / "models" / "a.sql"),
+    ]
+    # Before the engine resolved the project, everything but the defaults is watched.
+    source_dirs, skip_dirs = _watched_dirs(str(tmp_path), ["parse"], None)
+    assert source_dirs is None
+    assert str(tmp_path / "notes" / "n.md") in _scan_stamps(str(tmp_path), skip_dirs, source_dirs)
+
+
+def test_watch_changed_paths():
+    old = {"a.sql": (1, 10), "b.sql": (1, 10), "c.sql": (1, 10)}
+    new = {"a.sql": (1, 10), "b.sql": (2, 10), "d.sql": (1, 1)}
+    assert _changed_paths(old, new) == ["b.sql", "c.sql", "d.sql"]
+    assert _changed_paths(new, new) == []
+
+
+def test_watch_project_dir():
+    assert _project_dir(["--project-dir", "proj"]) == "proj"
+    assert _project_dir(["--project-dir=proj"]) == "proj"
@@ -12,6 +12,11 @@ pub struct SchedulerArgs {
     /// This is more efficient than relying on exclusions from resolved selectors.
     /// REVIEW: If we can make expanding exclude selectors fast, then this will not be needed.
     pub exclude_unique_ids: HashSet<String>,
+    /// Identifies the parse `nodes` came from; the invoke path assigns one per
+    /// resolve and embedders reuse it. When set, expanded selections are cached under it
+    /// (see [`crate::selection_cache`]), and the dependency graph is carried
+    /// over from the previous parse and updated (see `deps_cache`).
+    pub parse_generation: Option<u64>,
 }
 
 impl SchedulerArgs {
@@ -22,6 +27,7 @@ impl SchedulerArgs {
             resource_types: arg.resource_types.clone(),
             exclude_resource_types: arg.exclude_resource_types.clone(),
             exclude_unique_ids: Default::default(),
+            parse_generation: None,
         }
     }
 
@@ -35,6 +41,7 @@ impl SchedulerArgs {
             resource_types: arg.resource_types.clone(),
             exclude_resource_types: arg.exclude_resource_types.clone(),
             exclude_unique_ids,
+            parse_generation: None,
         }
     }
 }
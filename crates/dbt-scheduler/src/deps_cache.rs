@@ -0,0 +1,104 @@
+//! Process-level dependency graph, maintained across parses.
+//!
+//! [`derive_deps`] builds the project's dependency map from every node, and
+//! scheduling then searches the selected part of it for cycles. Long-lived
+//! embedders re-parse after each edit, which usually changes the dependencies of
+//! a handful of nodes at most. For schedules with a
+//! [`parse_generation`](crate::args::SchedulerArgs::parse_generation), the graph
+//! of the previous parse is kept as an [`IncrementalDeps`] and brought up to
+//! date instead: only nodes that were added, removed or whose dependencies
+//! changed touch the graph, and cycles are detected as edges are added, so an
+//! acyclic graph needs no cycle search at all.
+//!
+//! Finding the changed nodes still compares every node's declared dependencies
+//! with the graph, a linear scan without allocations. Whenever the update finds
+//! a dependency on a missing node, the graph is dropped and derived afresh, so
+//! errors are reported exactly as [`derive_deps`] reports them.
+
+use std::collections::BTreeSet;
+use std::sync::{Arc, Mutex};
+
+use dbt_common::FsResult;
+use dbt_common::cancellation::CancellationToken;
+use dbt_dag::incremental::IncrementalDeps;
+use dbt_schemas::schemas::Nodes;
+
+use crate::schedule::derive_deps;
+
+/// The graph last derived or updated, and the parse generation it matches.
+static GRAPH: Mutex<Option<(u64, Arc<IncrementalDeps<String>>)>> = Mutex::new(None);
+
+/// Returns the dependency graph of `nodes`, which came from parse `generation`.
+pub(crate) fn maintained_deps(
+    generation: u64,
+    nodes: &Nodes,
+    token: &CancellationToken,
+) -> FsResult<Arc<IncrementalDeps<String>>> {
+    let previous = GRAPH.lock().unwrap_or_else(|e| e.into_inner()).take();
+    let derived = || -> FsResult<_> {
+        Ok(Arc::new(IncrementalDeps::from_deps(&derive_deps(
+            nodes, token,
+        )?)))
+    };
+    let graph = match previous {
+        Some((previous_generation, graph)) if previous_generation == generation => graph,
+        Some((_, mut graph)) => {
+            if update(Arc::make_mut(&mut graph), nodes, token)? {
+                graph
+            } else {
+                derived()?
+            }
+        }
+        None => derived()?,
+    };
+    *GRAPH.lock().unwrap_or_else(|e| e.into_inner()) = Some((generation, graph.clone()));
+    Ok(graph)
+}
+
+/// Brings `graph` up to date with `nodes`. Returns false if `nodes` depend on
+/// nodes that do not exist, leaving `graph` partially updated.
+fn update(
+    graph: &mut IncrementalDeps<String>,
+    nodes: &Nodes,
+    token: &CancellationToken,
+) -> FsResult<bool> {
+    let mut node_count = 0;
+    for (unique_id, node) in nodes.iter() {
+        token.check_cancellation()?;
+        node_count += 1;
+        let declared = &node.base().depends_on.nodes;
+        if graph
+            .dependencies(unique_id)
+            .is_some_and(|current| same_dependencies(declared, current))
+        {
+            continue;
+        }
+        if !declared.iter().all(|dep| nodes.contains(dep)) {
+            return Ok(false);
+        }
+        graph.set_dependencies(unique_id.clone(), declared.iter().cloned().collect());
+    }
+
+    if graph.len() > node_count {
+        let removed: Vec<String> = graph
+            .deps()
+            .keys()
+            .filter(|unique_id| !nodes.contains(unique_id))
+            .cloned()
+            .collect();
+        for unique_id in &removed {
+            if graph.has_dependents(unique_id) {
+                return Ok(false);
+            }
+            graph.remove_node(unique_id);
+        }
+    }
+    Ok(true)
+}
+
+/// Whether `declared`, which may name a dependency more than once, names
+/// exactly the dependencies in `current`.
+fn same_dependencies(declared: &[String], current: &BTreeSet<String>) -> bool {
+    declared.iter().all(|dep| current.contains(dep))
+        && current.iter().all(|dep| declared.contains(dep))
+}
@@ -1,4 +1,6 @@
 pub mod args;
+mod deps_cache;
 pub mod instructions;
 pub mod node_selector;
 pub mod schedule;
+pub mod selection_cache;
@@ -32,7 +32,9 @@ use std::collections::HashMap;
 
 use crate::{
     args::SchedulerArgs,
+    deps_cache::maintained_deps,
     node_selector::{filter_select_criteria, fnmatch},
+    selection_cache::cached_selection,
 };
 
 /// Schedule nodes based on selection criteria and dependencies.
@@ -63,7 +65,20 @@ pub fn build_schedule(
     adapter_type: AdapterType,
 ) -> FsResult<Schedule<String>> {
     token.check_cancellation()?;
-    let deps = derive_deps(nodes, token)?;
+    // With a parse generation, the graph of the previous parse is updated rather
+    // than derived afresh, and is known to be acyclic or not
+    let maintained;
+    let derived;
+    let (deps, deps_acyclic) = match arg.parse_generation {
+        Some(generation) => {
+            maintained = maintained_deps(generation, nodes, token)?;
+            (maintained.deps(), maintained.is_acyclic())
+        }
+        None => {
+            derived = derive_deps(nodes, token)?;
+            (&derived, false)
+        }
+    };
 
     let (converted_include, include_had_columns) =
         if let Some(include) = resolved_selectors.include.clone() {
@@ -96,7 +111,8 @@ pub fn build_schedule(
 
     // Get the schedule with all selectors applied
     let schedule = schedule_graph(
-        &deps,
+        deps,
+        deps_acyclic,
         nodes,
         previous_state,
         &converted_selectors,
@@ -158,6 +174,7 @@ pub fn derive_deps(
 ///
 /// # Arguments
 /// * `deps` - Graph dependencies
+/// * `deps_acyclic` - Whether `deps` is known to have no cycles, so they need not be searched for
 /// * `nodes` - Available nodes
 /// * `previous_state` - Optional previous state for incremental scheduling
 /// * `unused_nodes` - Set of nodes that should be excluded from scheduling
@@ -167,6 +184,7 @@ pub fn derive_deps(
 /// * `FsResult<Schedule<String>>` - The final schedule with all selected nodes and their dependencies
 fn schedule_graph(
     deps: &BTreeMap<String, BTreeSet<String>>,
+    deps_acyclic: bool,
     nodes: &Nodes,
     previous_state: Option<&StateArtifacts>,
     resolved_selectors: &ResolvedSelector,
@@ -183,13 +201,22 @@ fn schedule_graph(
             } else {
                 include.clone()
             };
-            expand_selector(
+            cached_selection(
+                args.parse_generation,
                 &effective_include,
-                deps,
-                nodes,
+                &resolved_selectors.selector_definitions,
                 previous_state,
                 adapter_type,
-                &resolved_selectors.selector_definitions,
+                || {
+                    expand_selector(
+                        &effective_include,
+                        deps,
+                        nodes,
+                        previous_state,
+                        adapter_type,
+                        &resolved_selectors.selector_definitions,
+                    )
+                },
             )?
         }
         None => nodes.materializable_keys().cloned().collect(),
@@ -197,13 +224,22 @@ fn schedule_graph(
 
     // Get fully expanded excluded nodes
     let excluded_nodes = match &resolved_selectors.exclude {
-        Some(exclude) => expand_selector(
+        Some(exclude) => cached_selection(
+            args.parse_generation,
             exclude,
-            deps,
-            nodes,
+            &resolved_selectors.selector_definitions,
             previous_state,
             adapter_type,
-            &resolved_selectors.selector_definitions,
+            || {
+                expand_selector(
+                    exclude,
+                    deps,
+                    nodes,
+                    previous_state,
+                    adapter_type,
+                    &resolved_selectors.selector_definitions,
+                )
+            },
         )?,
         None => BTreeSet::new(),
     };
@@ -342,13 +378,16 @@ fn schedule_graph(
     // They won't have tasks created but need to be in sorted_nodes for processing
     sorted_nodes.extend(frontier_nodes.iter().cloned());
 
-    // Check for cycles in the selected nodes only
-    let (cycle_warnings, cycle_errors) = find_cycle_diagnostics(&selected_deps, nodes);
-    for warning in cycle_warnings {
-        emit_warn_log_from_fs_error(warning);
-    }
-    for error in cycle_errors {
-        emit_error_log_from_fs_error(error);
+    // Check for cycles in the selected nodes only. Restricting an acyclic graph
+    // cannot introduce one.
+    if !deps_acyclic {
+        let (cycle_warnings, cycle_errors) = find_cycle_diagnostics(&selected_deps, nodes);
+        for warning in cycle_warnings {
+            emit_warn_log_from_fs_error(warning);
+        }
+        for error in cycle_errors {
+            emit_error_log_from_fs_error(error);
+        }
     }
 
     // Compute overlapping sources: sources whose relation_name matches a SELECTED seed's relation_name
@@ -1644,9 +1683,11 @@ mod tests {
             resource_types: vec![],
             exclude_resource_types: vec![],
             exclude_unique_ids: Default::default(),
+            parse_generation: None,
         };
         match schedule_graph(
             &deps,
+            false,
             &nodes,
             None,
             &resolved_selectors,
@@ -1697,9 +1738,11 @@ mod tests {
             resource_types: vec![],
             exclude_resource_types: vec![],
             exclude_unique_ids: Default::default(),
+            parse_generation: None,
         };
         match schedule_graph(
             &deps,
+            false,
             &nodes,
             None,
             &resolved_selectors,
@@ -2421,6 +2464,7 @@ mod tests {
             resource_types: vec![],
             exclude_resource_types: vec![],
             exclude_unique_ids: Default::default(),
+            parse_generation: None,
         };
 
         // Run scheduler
@@ -3026,6 +3070,7 @@ mod resource_type_filtering_tests {
     use dbt_common::{
         cancellation::never_cancels,
         io_args::{ClapResourceType, FsCommand, IoArgs, StaticAnalysisKind},
+        node_selector::{MethodName, SelectionCriteria},
     };
     use dbt_schemas::schemas::{
         CommonAttributes, DbtModel, DbtModelAttr, DbtSeed, DbtSeedAttr, DbtTest, DbtUnitTest,
@@ -3126,6 +3171,7 @@ mod resource_type_filtering_tests {
             resource_types: vec![],
             exclude_resource_types: vec![],
             exclude_unique_ids: Default::default(),
+            parse_generation: None,
         };
 
         let schedule = build_schedule(
@@ -3250,6 +3296,7 @@ mod resource_type_filtering_tests {
             resource_types,
             exclude_resource_types: vec![],
             exclude_unique_ids: Default::default(),
+            parse_generation: None,
         }
     }
 
@@ -3451,6 +3498,103 @@ mod resource_type_filtering_tests {
         .unwrap();
         assert!(schedule.selected_nodes.is_empty());
     }
+
+    #[test]
+    fn test_selection_cache_follows_parse_generation() {
+        let token = never_cancels();
+        let mut nodes = basic_nodes();
+        let mut args = make_scheduler_args(vec![]);
+        args.parse_generation = Some(crate::selection_cache::next_parse_generation());
+        let resolved_selectors = ResolvedSelector {
+            include: Some(SelectExpression::Atom(SelectionCriteria::new(
+                MethodName::ResourceType,
+                vec![],
+                "model".to_string(),
+                false,
+                None,
+                None,
+                None,
+                None,
+            ))),
+            exclude: None,
+            ..Default::default()
+        };
+        let selected_ids = |nodes: &Nodes, args: &SchedulerArgs| {
+            let schedule = build_schedule(
+                args,
+                nodes,
+                None,
+                &resolved_selectors,
+                &token,
+                AdapterType::Bigquery,
+            )
+            .unwrap();
+            schedule.selected_nodes.into_iter().collect::<Vec<_>>()
+        };
+        assert_eq!(selected_ids(&nodes, &args), vec!["model.a", "model.b"]);
+        assert_eq!(selected_ids(&nodes, &args), vec!["model.a", "model.b"]);
+
+        // A re-parse gets a new generation, so its nodes are selected afresh
+        let (id, model) = make_model("model.c");
+        nodes.models.insert(id, model);
+        args.parse_generation = Some(crate::selection_cache::next_parse_generation());
+        assert_eq!(
+            selected_ids(&nodes, &args),
+            vec!["model.a", "model.b", "model.c"]
+        );
+    }
+
+    #[test]
+    fn test_maintained_deps_match_derived_deps_across_parses() {
+        use crate::selection_cache::next_parse_generation;
+
+        let token = never_cancels();
+        let resolved_selectors = ResolvedSelector::default();
+        let schedule = |nodes: &Nodes, parse_generation: Option<u64>| {
+            let mut args = make_scheduler_args(vec![]);
+            args.parse_generation = parse_generation;
+            build_schedule(
+                &args,
+                nodes,
+                None,
+                &resolved_selectors,
+                &token,
+                AdapterType::Bigquery,
+            )
+        };
+        let assert_maintained = |nodes: &Nodes| {
+            let maintained = schedule(nodes, Some(next_parse_generation())).unwrap();
+            let derived = schedule(nodes, None).unwrap();
+            assert_eq!(maintained.deps, derived.deps);
+            assert_eq!(maintained.sorted_nodes, derived.sorted_nodes);
+        };
+        let set_model = |nodes: &mut Nodes, id: &str, deps: &[&str]| {
+            let (id, mut model) = make_model(id);
+            Arc::make_mut(&mut model).__base_attr__.depends_on.nodes =
+                deps.iter().map(|dep| dep.to_string()).collect();
+            nodes.models.insert(id, model);
+        };
+
+        let mut nodes = basic_nodes();
+        assert_maintained(&nodes);
+        // A new model, then an edit to an existing one
+        set_model(&mut nodes, "model.c", &["model.a", "seed.a"]);
+        assert_maintained(&nodes);
+        set_model(&mut nodes, "model.b", &["model.c", "model.c"]);
+        assert_maintained(&nodes);
+        // An edit that closes a cycle, and one that breaks it again
+        set_model(&mut nodes, "model.a", &["model.b"]);
+        assert_maintained(&nodes);
+        set_model(&mut nodes, "model.a", &[]);
+        assert_maintained(&nodes);
+
+        // Removing a model that others still depend on fails like a full derivation
+        nodes.models.remove("model.c");
+        let error = schedule(&nodes, Some(next_parse_generation())).unwrap_err();
+        assert_eq!(error.code, ErrorCode::DependencyNotFound);
+        set_model(&mut nodes, "model.b", &[]);
+        assert_maintained(&nodes);
+    }
 }
 
 #[cfg(test)]
@@ -3857,10 +4001,12 @@ mod cycle_detection_tests {
             resource_types: vec![],
             exclude_resource_types: vec![],
             exclude_unique_ids: Default::default(),
+            parse_generation: None,
         };
 
         let schedule = schedule_graph(
             &deps,
+            false,
             &nodes,
             None,
             &resolved_selectors,
@@ -3958,9 +4104,11 @@ mod cycle_detection_tests {
             resource_types: vec![],
             exclude_resource_types: vec![],
             exclude_unique_ids: Default::default(),
+            parse_generation: None,
         };
         schedule_graph(
             deps,
+            false,
             nodes,
             None,
             &resolved_selectors,
@@ -0,0 +1,318 @@
+//! Process-level cache of expanded selector results.
+//!
+//! Long-lived embedders (the Python runner, the LSP) schedule against the same
+//! parsed project many times, and every schedule re-evaluates each selector
+//! against every node: path globs, recursive config matching and tag scans add
+//! up on large projects. Expanded unique_id sets are cached under:
+//!
+//! * the parse generation of the nodes, assigned by the embedder with
+//!   [`next_parse_generation`] whenever it (re)parses, and passed in
+//!   [`SchedulerArgs::parse_generation`](crate::args::SchedulerArgs);
+//! * the select expression, normalized so that reordered or repeated union
+//!   operands share an entry;
+//! * the include expressions of the named selectors it may reference, since
+//!   `selector:` atoms expand through them;
+//! * the adapter type;
+//! * the size and mtime of the state artifacts the selection can read
+//!   (`manifest.json`, `run_results.json` and `sources.json` under `--state`, and
+//!   the current `sources.json` read by `source_status:`).
+//!
+//! Every resolve in the invoke path is assigned a generation, which embedders
+//! also use for selections made outside of an invocation; without one nothing
+//! is cached. Entries of all but the most recent few generations are dropped.
+
+use std::collections::{BTreeSet, HashMap};
+use std::path::{Path, PathBuf};
+use std::sync::Mutex;
+use std::sync::atomic::{AtomicU64, Ordering};
+use std::time::SystemTime;
+
+use dbt_adapter::AdapterType;
+use dbt_common::FsResult;
+use dbt_common::constants::{DBT_MANIFEST_JSON, DBT_SOURCES_JSON};
+use dbt_common::node_selector::SelectExpression;
+use dbt_schemas::schemas::StateArtifacts;
+use dbt_schemas::schemas::selectors::SelectorEntry;
+
+static NEXT_GENERATION: AtomicU64 = AtomicU64::new(1);
+
+/// A parse generation no other parse in this process has used.
+pub fn next_parse_generation() -> u64 {
+    NEXT_GENERATION.fetch_add(1, Ordering::Relaxed)
+}
+
+/// Size and mtime of a file, `None` if it does not exist.
+type FileStamp = Option<(u64, SystemTime)>;
+
+fn stamp(path: &Path) -> FileStamp {
+    let meta = std::fs::metadata(path).ok()?;
+    Some((meta.len(), meta.modified().ok()?))
+}
+
+/// Stamps of every file `previous_state` was loaded from or that selection
+/// methods read through it.
+fn state_stamps(previous_state: Option<&StateArtifacts>) -> Option<Vec<FileStamp>> {
+    let state = previous_state?;
+    let mut paths = vec![
+        state.state_path.join(DBT_MANIFEST_JSON),
+        state.state_path.join("run_results.json"),
+        state.state_path.join(DBT_SOURCES_JSON),
+    ];
+    paths.extend(
+        state
+            .target_path
+            .as_ref()
+            .map(|target| target.join(DBT_SOURCES_JSON)),
+    );
+    Some(paths.iter().map(|path| stamp(path)).collect())
+}
+
+#[derive(Debug, Clone, PartialEq, Eq, Hash)]
+struct CacheKey {
+    generation: u64,
+    expr: SelectExpression,
+    /// `(name, include)` of every named selector, sorted by name.
+    selector_definitions: Vec<(String, SelectExpression)>,
+    adapter_type: AdapterType,
+    state_path: Option<PathBuf>,
+    state_stamps: Option<Vec<FileStamp>>,
+}
+
+impl CacheKey {
+    fn new(
+        generation: u64,
+        expr: &SelectExpression,
+        selector_definitions: &HashMap<String, SelectorEntry>,
+        previous_state: Option<&StateArtifacts>,
+        adapter_type: AdapterType,
+    ) -> Self {
+        let mut selector_definitions: Vec<(String, SelectExpression)> = selector_definitions
+            .iter()
+            .map(|(name, entry)| (name.clone(), normalize(entry.include.clone())))
+            .collect();
+        selector_definitions.sort_by(|(a, _), (b, _)| a.cmp(b));
+        Self {
+            generation,
+            expr: normalize(expr.clone()),
+            selector_definitions,
+            adapter_type,
+            state_path: previous_state.map(|state| state.state_path.clone()),
+            state_stamps: state_stamps(previous_state),
+        }
+    }
+}
+
+/// Flattens nested unions and sorts and dedups their operands. Intersections
+/// keep their order, since `exclude` operands are applied to what precedes them.
+fn normalize(expr: SelectExpression) -> SelectExpression {
+    match expr {
+        SelectExpression::Or(children) => {
+            let mut operands = Vec::with_capacity(children.len());
+            for child in children {
+                match normalize(child) {
+                    SelectExpression::Or(nested) => operands.extend(nested),
+                    child => operands.push(child),
+                }
+            }
+            operands.sort_by_cached_key(|operand| format!("{operand:?}"));
+            operands.dedup();
+            SelectExpression::Or(operands)
+        }
+        SelectExpression::And(children) => {
+            SelectExpression::And(children.into_iter().map(normalize).collect())
+        }
+        SelectExpression::Exclude(child) => SelectExpression::Exclude(Box::new(normalize(*child))),
+        SelectExpression::Atom(mut criteria) => {
+            criteria.exclude = criteria
+                .exclude
+                .map(|exclude| Box::new(normalize(*exclude)));
+            SelectExpression::Atom(criteria)
+        }
+    }
+}
+
+/// Parse generations kept, so a process serving a handful of projects does not
+/// thrash.
+const MAX_GENERATIONS: usize = 4;
+
+static SELECTIONS: Mutex<Option<HashMap<CacheKey, BTreeSet<String>>>> = Mutex::new(None);
+
+/// Returns the unique_ids selected by `expr`, from the cache if `generation` is
+/// set and the same selection was expanded before, otherwise from `expand`.
+pub(crate) fn cached_selection(
+    generation: Option<u64>,
+    expr: &SelectExpression,
+    selector_definitions: &HashMap<String, SelectorEntry>,
+    previous_state: Option<&StateArtifacts>,
+    adapter_type: AdapterType,
+    expand: impl FnOnce() -> FsResult<BTreeSet<String>>,
+) -> FsResult<BTreeSet<String>> {
+    let Some(generation) = generation else {
+        return expand();
+    };
+    let key = CacheKey::new(
+        generation,
+        expr,
+        selector_definitions,
+        previous_state,
+        adapter_type,
+    );
+    let cached = SELECTIONS
+        .lock()
+        .unwrap_or_else(|e| e.into_inner())
+        .as_ref()
+        .and_then(|selections| selections.get(&key).cloned());
+    if let Some(selected) = cached {
+        return Ok(selected);
+    }
+
+    let selected = expand()?;
+    let mut selections = SELECTIONS.lock().unwrap_or_else(|e| e.into_inner());
+    let selections = selections.get_or_insert_with(HashMap::new);
+    selections.insert(key, selected.clone());
+    let generations: BTreeSet<u64> = selections.keys().map(|key| key.generation).collect();
+    if let Some(&oldest_kept) = generations.iter().rev().nth(MAX_GENERATIONS - 1) {
+        selections.retain(|key, _| key.generation >= oldest_kept);
+    }
+    Ok(selected)
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use dbt_common::node_selector::parse_model_specifiers;
+    use dbt_common::{ErrorCode, err};
+    use dbt_schemas::schemas::selectors::SelectorDefinitionValue;
+
+    fn expr(select: &str) -> SelectExpression {
+        let tokens: Vec<String> = select.split_whitespace().map(str::to_string).collect();
+        parse_model_specifiers(&tokens).unwrap()
+    }
+
+    fn selected(ids: &[&str]) -> BTreeSet<String> {
+        ids.iter().map(|id| id.to_string()).collect()
+    }
+
+    #[test]
+    fn unions_normalize_regardless_of_order_and_repetition() {
+        assert_eq!(
+            normalize(expr("tag:a path:models/b tag:a")),
+            normalize(expr("path:models/b tag:a"))
+        );
+        assert_ne!(
+            normalize(expr("tag:a,path:models/b")),
+            normalize(expr("tag:a path:models/b"))
+        );
+    }
+
+    #[test]
+    fn selections_are_reused_within_a_generation() {
+        let generation = next_parse_generation();
+        let select = expr("tag:nightly+ config.materialized:table");
+        let mut expansions = 0;
+        for _ in 0..2 {
+            let result = cached_selection(
+                Some(generation),
+                &select,
+                &HashMap::new(),
+                None,
+                AdapterType::Postgres,
+                || {
+                    expansions += 1;
+                    Ok(selected(&["model.p.a"]))
+                },
+            )
+            .unwrap();
+            assert_eq!(result, selected(&["model.p.a"]));
+        }
+        assert_eq!(expansions, 1);
+
+        // Newer parses, or no parse generation at all, expand again
+        let newer: Vec<u64> = (0..MAX_GENERATIONS)
+            .map(|_| next_parse_generation())
+            .collect();
+        for generation in newer.into_iter().map(Some).chain([None, None]) {
+            cached_selection(
+                generation,
+                &select,
+                &HashMap::new(),
+                None,
+                AdapterType::Postgres,
+                || {
+                    expansions += 1;
+                    Ok(selected(&["model.p.b"]))
+                },
+            )
+            .unwrap();
+        }
+        assert_eq!(expansions, 1 + MAX_GENERATIONS + 2);
+        assert!(
+            !SELECTIONS
+                .lock()
+                .unwrap()
+                .as_ref()
+                .unwrap()
+                .keys()
+                .any(|key| key.generation == generation),
+            "entries of superseded generations are dropped"
+        );
+    }
+
+    #[test]
+    fn failed_expansions_are_not_cached() {
+        let generation = next_parse_generation();
+        let select = expr("selector:missing");
+        let failed = cached_selection(
+            Some(generation),
+            &select,
+            &HashMap::new(),
+            None,
+            AdapterType::Postgres,
+            || err!(ErrorCode::SelectorError, "Unknown selector"),
+        );
+        assert!(failed.is_err());
+        let result = cached_selection(
+            Some(generation),
+            &select,
+            &HashMap::new(),
+            None,
+            AdapterType::Postgres,
+            || Ok(selected(&["model.p.a"])),
+        )
+        .unwrap();
+        assert_eq!(result, selected(&["model.p.a"]));
+    }
+
+    #[test]
+    fn changed_selector_definitions_expand_again() {
+        let generation = next_parse_generation();
+        let select = expr("selector:nightly");
+        let definitions = |include: &str| {
+            HashMap::from([(
+                "nightly".to_string(),
+                SelectorEntry {
+                    include: expr(include),
+                    is_default: false,
+                    description: None,
+                    definition: SelectorDefinitionValue::String(include.to_string()),
+                },
+            )])
+        };
+        let mut expansions = 0;
+        for include in ["tag:nightly", "tag:nightly", "tag:hourly"] {
+            cached_selection(
+                Some(generation),
+                &select,
+                &definitions(include),
+                None,
+                AdapterType::Postgres,
+                || {
+                    expansions += 1;
+                    Ok(selected(&["model.p.a"]))
+                },
+            )
+            .unwrap();
+        }
+        assert_eq!(expansions, 2);
+    }
+}
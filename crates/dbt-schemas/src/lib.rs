@@ -37,7 +37,7 @@ pub mod schemas {
     };
     pub use run_results::{
         BatchResults, ContextRunResult, DbtCommandExecutionArtifacts, RunResultOutput,
-        RunResultsArgs, RunResultsArtifact, RunResultsMetadata, TimingInfo,
+        RunResultsArgs, RunResultsArtifact, RunResultsMetadata, SchedulingPoolResult, TimingInfo,
     };
     pub use user_settings::UserSettings;
 
@@ -3,7 +3,11 @@ use dbt_common::FsResult;
 use dbt_common::io_args::StaticAnalysisOffReason;
 use serde::{Deserialize, Serialize};
 use serde_with::skip_serializing_none;
-use std::{collections::BTreeMap, path::Path, sync::Arc};
+use std::{
+    collections::BTreeMap,
+    path::{Path, PathBuf},
+    sync::Arc,
+};
 
 use crate::schemas::InternalDbtNodeAttributes;
 
@@ -11,6 +15,7 @@ use crate::schemas::legacy_catalog::DbtCatalog;
 use crate::schemas::manifest::DbtManifest;
 use crate::schemas::serde::typed_struct_from_json_file;
 use crate::schemas::sources::FreshnessResultsArtifact;
+use crate::state::{ProjectPaths, SelectionState};
 
 // Type aliases for clarity
 type YmlValue = dbt_yaml::Value;
@@ -49,6 +54,15 @@ pub struct BatchResults {
     pub failed: Vec<(String, String)>,
 }
 
+/// The scheduling pool a node ran in, and how long it waited for a slot there.
+#[derive(Debug, Clone, PartialEq, Serialize, Deserialize)]
+#[serde(rename_all = "snake_case")]
+pub struct SchedulingPoolResult {
+    pub name: String,
+    /// Seconds between the node being ready to run and a slot becoming free.
+    pub queue_wait: f64,
+}
+
 fn serialize_internal_dbt_node<S>(
     node: &Option<Arc<dyn InternalDbtNodeAttributes>>,
     serializer: S,
@@ -67,8 +81,8 @@ where
 /// Note: this struct intentionally does *not* use `#[skip_serializing_none]`. dbt Core always
 /// emits every per-node result key (with a `null` value when empty), and the `dbt-artifacts`
 /// package (among other consumers) relies on keys such as `failures` always being present. The
-/// only exception is `static_analysis_off_reason`, a Fusion-only field with no Core counterpart,
-/// which we keep omitted when `None`.
+/// only exceptions are `static_analysis_off_reason` and `scheduling_pool`, Fusion-only fields
+/// with no Core counterpart, which we keep omitted when `None`.
 #[derive(Debug, Clone, Serialize)]
 #[serde(rename_all = "snake_case")]
 pub struct ContextRunResult {
@@ -99,6 +113,9 @@ pub struct ContextRunResult {
     /// Reason why static analysis was disabled for this node (Fusion-only; omitted when absent).
     #[serde(skip_serializing_if = "Option::is_none")]
     pub static_analysis_off_reason: Option<StaticAnalysisOffReason>,
+    /// Scheduling pool the node waited in (Fusion-only; omitted when absent).
+    #[serde(skip_serializing_if = "Option::is_none")]
+    pub scheduling_pool: Option<SchedulingPoolResult>,
 }
 
 impl From<ContextRunResult> for RunResultOutput {
@@ -128,6 +145,7 @@ impl From<ContextRunResult> for RunResultOutput {
             relation_name,
             batch_results: result.batch_results,
             static_analysis_off_reason: result.static_analysis_off_reason,
+            scheduling_pool: result.scheduling_pool,
         }
     }
 }
@@ -137,8 +155,8 @@ impl From<ContextRunResult> for RunResultOutput {
 /// Note: this struct intentionally does *not* use `#[skip_serializing_none]`. dbt Core always
 /// emits every per-node result key (with a `null` value when empty), and the `dbt-artifacts`
 /// package (among other consumers) relies on keys such as `failures` always being present. The
-/// only exception is `static_analysis_off_reason`, a Fusion-only field with no Core counterpart,
-/// which we keep omitted when `None`. The `#[serde(default)]` on the optional fields keeps
+/// only exceptions are `static_analysis_off_reason` and `scheduling_pool`, Fusion-only fields
+/// with no Core counterpart, which we keep omitted when `None`. The `#[serde(default)]` on the optional fields keeps
 /// deserialization tolerant of older/partial artifacts that may omit a key.
 #[derive(Debug, Clone, Serialize, Deserialize)]
 #[serde(rename_all = "snake_case")]
@@ -176,6 +194,9 @@ pub struct RunResultOutput {
     /// Reason why static analysis was disabled for this node (Fusion-only; omitted when absent).
     #[serde(default, skip_serializing_if = "Option::is_none")]
     pub static_analysis_off_reason: Option<StaticAnalysisOffReason>,
+    /// Scheduling pool the node waited in (Fusion-only; omitted when absent).
+    #[serde(default, skip_serializing_if = "Option::is_none")]
+    pub scheduling_pool: Option<SchedulingPoolResult>,
 }
 
 /// Arguments passed to the dbt command.
@@ -225,6 +246,16 @@ pub struct DbtCommandExecutionArtifacts {
     pub sources: Option<FreshnessResultsArtifact>,
     /// `list`'s selected nodes in selector format.
     pub list_items: Option<Vec<String>>,
+    /// `target/parse_profile.parquet` when `--parse-profile` wrote one.
+    pub parse_profile_path: Option<PathBuf>,
+    /// The Chrome trace file `--timeline` wrote.
+    pub timeline_path: Option<PathBuf>,
+    /// What selector expansion needs from the resolved project, so embedders can
+    /// select against this parse later. Set by every command that resolves.
+    pub selection_state: Option<SelectionState>,
+    /// The root project's source and output directories, so embedders watching
+    /// it know what to scan. Set by every command that loads the project.
+    pub project_paths: Option<ProjectPaths>,
     /// Rendered message of a real (non-exit-status) error, captured before it is
     /// flattened to a bare exit status for CLI callers. Embedders surface this;
     /// the diagnostics also went to the log either way.
@@ -254,6 +285,7 @@ mod tests {
             relation_name: None,
             batch_results: None,
             static_analysis_off_reason: None,
+            scheduling_pool: None,
         }
     }
 
@@ -287,6 +319,10 @@ mod tests {
             !obj.contains_key("static_analysis_off_reason"),
             "Fusion-only `static_analysis_off_reason` should be omitted when None",
         );
+        assert!(
+            !obj.contains_key("scheduling_pool"),
+            "Fusion-only `scheduling_pool` should be omitted when None",
+        );
     }
 
     /// The Jinja-facing `ContextRunResult` (surfaced to the `on-run-end` `results` collection,
@@ -306,6 +342,7 @@ mod tests {
             batch_results: None,
             compiled_code: None,
             static_analysis_off_reason: None,
+            scheduling_pool: None,
         };
 
         let value = serde_json::to_value(&context_result).unwrap();
@@ -11,7 +11,7 @@ use std::{
 };
 
 use crate::schemas::{
-    DbtSource, InternalDbtNodeAttributes, Nodes, ResolvedCloudConfig,
+    DbtSource, InternalDbtNodeAttributes, Nodes, ResolvedCloudConfig, StateArtifacts,
     common::{DbtQuoting, ResolvedQuoting},
     dbt_catalogs::DbtCatalogs,
     macros::{DbtDocsMacro, DbtMacro},
@@ -22,13 +22,15 @@ use crate::schemas::{
         ProjectSnapshotConfig, ProjectSourceConfig, QueryComment,
     },
     relations::base::{BaseRelation, RelationPattern},
-    selectors::ResolvedSelector,
+    selectors::{ResolvedSelector, SelectorEntry},
     serde::{FloatOrString, SpannedStringOrArrayOfStrings, StringOrArrayOfStrings},
 };
 use blake3::Hasher;
 use chrono::{DateTime, Local, Utc};
 use dbt_common::{
-    ErrorCode, FsResult, fs_err,
+    ErrorCode, FsResult,
+    constants::{DBT_INTERNAL_PACKAGES_DIR_NAME, DBT_LOG_DIR_NAME, DBT_PACKAGES_DIR_NAME},
+    fs_err,
     io_args::{FsCommand, resolve_latest_version_pointer_enabled_by_default},
     path::DbtPath,
     warn_error_options::WarnErrorOptions,
@@ -689,6 +691,96 @@ impl ResolverState {
     }
 }
 
+/// The parts of a resolved project that selector expansion reads, captured so
+/// an embedder can select nodes against its last parse without another
+/// invocation.
+#[derive(Debug, Clone)]
+pub struct SelectionState {
+    /// Parse generation the invocation scheduled under, so selections made
+    /// against this state share its cached selector expansions.
+    pub parse_generation: u64,
+    pub adapter_type: AdapterType,
+    pub nodes: Nodes,
+    pub selector_definitions: HashMap<String, SelectorEntry>,
+    /// State loaded from `--state`/`--defer-state`, for `state:` and `result:`
+    /// selectors. `None` for commands that exit before loading it.
+    pub previous_state: Option<StateArtifacts>,
+}
+
+impl SelectionState {
+    pub fn from_resolver_state(resolved_state: &ResolverState, parse_generation: u64) -> Self {
+        Self {
+            parse_generation,
+            adapter_type: resolved_state.adapter_type,
+            nodes: resolved_state.nodes.clone(),
+            selector_definitions: resolved_state
+                .resolved_selectors
+                .selector_definitions
+                .clone(),
+            previous_state: None,
+        }
+    }
+}
+
+/// Where the root project's files are, as an invocation resolved them, so an
+/// embedder watching the project for changes scans what the engine reads and
+/// skips what it writes.
+#[derive(Debug, Clone, Default)]
+pub struct ProjectPaths {
+    /// The root project's model, macro, seed, snapshot, test, analysis, docs,
+    /// function and asset directories; none nested in another.
+    pub source_dirs: Vec<PathBuf>,
+    /// The target, log and package install directories.
+    pub output_dirs: Vec<PathBuf>,
+}
+
+impl ProjectPaths {
+    pub fn from_dbt_state(
+        dbt_state: &DbtState,
+        out_dir: &Path,
+        log_path: Option<&Path>,
+        packages_install_path: Option<&Path>,
+    ) -> Self {
+        let root = &dbt_state.root_package().package_root_path;
+        let project = dbt_state.root_project();
+        let mut source_dirs: Vec<PathBuf> = [
+            &project.model_paths,
+            &project.macro_paths,
+            &project.seed_paths,
+            &project.snapshot_paths,
+            &project.test_paths,
+            &project.analysis_paths,
+            &project.docs_paths,
+            &project.function_paths,
+            &project.asset_paths,
+        ]
+        .into_iter()
+        .flatten()
+        .flatten()
+        .map(|dir| root.join(dir))
+        .collect();
+        source_dirs.sort();
+        // Sorted, a nested directory follows the one containing it
+        source_dirs.dedup_by(|nested, parent| nested.starts_with(parent));
+
+        let packages = packages_install_path
+            .map(Path::to_path_buf)
+            .or_else(|| project.packages_install_path.as_ref().map(PathBuf::from))
+            .unwrap_or_else(|| PathBuf::from(DBT_PACKAGES_DIR_NAME));
+        let packages = root.join(packages);
+        let output_dirs = vec![
+            out_dir.to_path_buf(),
+            root.join(log_path.unwrap_or(Path::new(DBT_LOG_DIR_NAME))),
+            packages.with_file_name(DBT_INTERNAL_PACKAGES_DIR_NAME),
+            packages,
+        ];
+        Self {
+            source_dirs,
+            output_dirs,
+        }
+    }
+}
+
 impl fmt::Display for ResolverState {
     fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
         write!(
@@ -822,10 +914,16 @@ pub struct CacheState {
     pub changed_nodes: Arc<HashSet<String>>,
     /// The impacted nodes, by unique id, from files changes.
     pub impacted_nodes: Arc<HashSet<String>>,
+    /// Dependency packages whose files changed. These packages are re-resolved as a
+    /// whole; their cached nodes and macros are not reused.
+    pub changed_packages: Arc<HashSet<String>>,
+    /// Root-package macro files that changed. Their macros are re-parsed, and the nodes
+    /// that invoked those macros while rendering are re-resolved.
+    pub changed_macro_files: Arc<HashSet<DbtPath>>,
 }
 impl CacheState {
     pub fn has_changes(&self) -> bool {
-        self.file_changes.has_changes()
+        self.file_changes.has_changes() || !self.changed_packages.is_empty()
     }
 }
 #[derive(Debug, Clone, Default)]
@@ -337,6 +337,10 @@ pub struct TaskRunnerCtx {
     /// Logical worker slot assigned by the visitor before task execution.
     /// Appears in stats as `"Thread-{N}"` and in Jinja as `{{ thread_id }}`.
     pub thread_id: i32,
+    /// Scheduling priority assigned by the visitor: the task's remaining critical
+    /// path in milliseconds. Tasks with a higher priority are admitted first when
+    /// waiting for connection capacity.
+    pub priority: u64,
     // **** DO NOT ADD Arc<> FIELDS HERE ****
     // Tokio spends a lot of time deallocating the TaskRunnerCtx for fast operations.
     // If you need to add a field, add it to TaskRunnerCtxInner instead.
@@ -174,6 +174,7 @@ pub trait TaskRunnerCtxFactory: Send + Sync + 'static {
                 rendering_listener_factory,
                 env: jinja_env,
                 thread_id: 0,
+                priority: 0,
             })
         })
     }
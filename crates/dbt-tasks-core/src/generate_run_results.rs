@@ -3,7 +3,7 @@ use std::collections::{BTreeMap, HashMap};
 use chrono::{DateTime, Utc};
 use dbt_adapter::response::AdapterResponse;
 use dbt_common::stats::Stat;
-use dbt_schemas::schemas::{ContextRunResult, TimingInfo};
+use dbt_schemas::schemas::{ContextRunResult, SchedulingPoolResult, TimingInfo};
 use dbt_schemas::stats::Stats;
 
 type YmlValue = dbt_yaml::Value;
@@ -81,6 +81,11 @@ pub fn generate_run_results(
 
     let compiled_code = stats.compiled_code.get(&stat.unique_id).cloned();
 
+    let scheduling_pool = stat.pool_wait.as_ref().map(|wait| SchedulingPoolResult {
+        name: wait.pool.clone(),
+        queue_wait: wait.queue_wait.as_secs_f64(),
+    });
+
     ContextRunResult {
         status,
         timing,
@@ -94,5 +99,6 @@ pub fn generate_run_results(
         batch_results,
         compiled_code,
         static_analysis_off_reason,
+        scheduling_pool,
     }
 }
@@ -7346,6 +7346,7 @@ mod tests {
             resolver_state,
             rendering_listener_factory: Arc::new(DefaultRenderingEventListenerFactory::default()),
             thread_id: 0,
+            priority: 0,
         }
     }
 
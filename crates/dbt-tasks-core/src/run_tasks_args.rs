@@ -7,7 +7,9 @@ use dbt_common::io_args::FsCommand;
 use dbt_common::io_args::IoArgs;
 use dbt_common::io_args::LocalExecutionBackendKind;
 use dbt_common::io_args::OptimizeTestsOptions;
+use dbt_common::io_args::SchedulingPools;
 use dbt_common::io_args::StaticAnalysisKind;
+use dbt_common::io_args::TestBatching;
 use dbt_common::io_args::{DisplayFormat, EvalArgs, ReplayMode};
 use dbt_common::io_args::{Phases, RunCacheMode};
 use dbt_common::node_selector::SelectExpression;
@@ -50,6 +52,8 @@ pub struct RunTasksArgs {
     pub write_json: bool,
     /// Whether to write metadata parquet epoch files during command execution.
     pub write_metadata: bool,
+    /// Metadata directory: `--metadata-dir` if set, else `<out_dir>/metadata`.
+    pub metadata_dir: PathBuf,
     /// Whether the Parquet index is being written (`--write-index`). Gates
     /// classifier propagation, which only has a consumer when the index is built.
     pub write_index: bool,
@@ -116,6 +120,10 @@ pub struct RunTasksArgs {
     pub skip_post_hooks: bool,
     /// Hidden test optimization flags.
     pub optimize_tests: dbt_common::collections::HashSet<OptimizeTestsOptions>,
+    /// How test aggregation batches generic tests into shared queries.
+    pub test_batching: TestBatching,
+    /// Named execution pools nodes are admitted through, by their `pool` meta.
+    pub scheduling_pools: SchedulingPools,
     /// Whether the gRPC run-cache service is explicitly requested via CLI flag.
     pub run_cache_service: bool,
     /// Per-invocation warn-error options resolved before task execution.
@@ -145,6 +153,7 @@ impl RunTasksArgs {
             limit: arg.limit,
             write_json: arg.write_json,
             write_metadata: arg.write_metadata,
+            metadata_dir: arg.metadata_dir(),
             write_index: arg.write_index,
             write_lineage: arg.write_lineage,
             from_main: arg.from_main,
@@ -172,6 +181,8 @@ impl RunTasksArgs {
             fail_fast_flag: arg.fail_fast,
             skip_post_hooks: arg.skip_post_hooks,
             optimize_tests: arg.optimize_tests.clone(),
+            test_batching: TestBatching::default(),
+            scheduling_pools: SchedulingPools::new(),
             run_cache_service: arg.run_cache_service,
             warn_error_options: arg.warn_error_options.clone(),
             empty: arg.empty,
@@ -116,6 +116,7 @@ impl<T: Send + 'static> TaskOp<T> {
                 max_threads,
             } => {
                 let _guard = ConnectionBackpressure::from_config(adapter_type, max_threads).await;
+                crate::timeline::mark_admitted();
                 dbt_common::tracing::spawn_blocking_traced(Box::new(move || {
                     let _recycle_guard = ThreadLocalConnectionRecycleGuard::new();
                     f()
@@ -154,8 +155,10 @@ pub trait Task: Send + Sync {
     ) -> Pin<Box<dyn Future<Output = FsResult<NodeStatus>> + Send + 'a>> {
         Box::pin(async move {
             let backpressure =
-                ConnectionBackpressure::from_config(ctx.adapter_type(), ctx.dbt_profile().threads);
+                ConnectionBackpressure::from_config(ctx.adapter_type(), ctx.dbt_profile().threads)
+                    .with_priority(ctx.priority);
             let _wake_next_on_drop = backpressure.await;
+            crate::timeline::mark_admitted();
             self.run_task(ctx).await
         })
     }
@@ -1,8 +1,9 @@
-use std::collections::{BTreeMap, HashMap};
+use std::collections::{BTreeMap, HashMap, HashSet};
 use std::path::PathBuf;
 use std::sync::Arc;
 
 use dbt_common::constants::DBT_GENERIC_TESTS_DIR_NAME;
+use dbt_common::io_args::{TestBatchScope, TestBatching};
 use dbt_common::path::DbtPath;
 use dbt_common::string_utils::maybe_truncate_test_name;
 use dbt_common::{CodeLocationWithFile, ErrorCode, FsResult, fs_err, stdfs};
@@ -17,6 +18,9 @@ use dbt_schemas::schemas::project::{
     DEFAULT_DATA_TEST_WARN_IF,
 };
 
+/// Test macro that runs a batch of generic tests spanning relations.
+const BATCHED_TEST_NAME: &str = "batched_generic_tests";
+
 // NOTE: This module intentionally mirrors the legacy resolve-phase aggregation logic
 // but runs at task time and only considers selected, enabled generic column tests.
 
@@ -26,6 +30,10 @@ pub struct GenericTest {
     pub schema: String,
     pub alias: String,
     pub column_name: String,
+    /// `column_name` the group's query reports this test's failures under: the
+    /// column itself in a relation's group, `<macro>:<relation>.<column>` in a
+    /// batch spanning relations.
+    pub result_key: String,
     pub severity: Option<Severity>,
     pub defined_at: Option<CodeLocationWithFile>,
 }
@@ -34,9 +42,11 @@ pub struct GenericTest {
 pub struct GenericTestGroup {
     pub unique_id: String,
     pub name: String,
-    /// Generic test macro shared by every member of the group, e.g. `not_null`.
+    /// Generic test macro shared by every member of the group, e.g. `not_null`,
+    /// or `batched_generic_tests` for a batch mixing macros or relations.
     pub macro_name: String,
-    /// unique_id of the node the group's tests are attached to.
+    /// unique_id of the node the group's tests are attached to, or
+    /// `<database>.<schema>` for a batch spanning relations.
     pub attached_node: String,
     pub aggregated_test: Arc<DbtTest>,
     pub member_tests: Vec<Arc<DbtTest>>,
@@ -49,7 +59,7 @@ pub struct GenericTestRelationships {
     pub group_names: HashMap<String, String>,
     // Map from test group name to list of test unique IDs
     pub unique_ids: HashMap<String, Vec<String>>,
-    // Map from test group name and normalized column name to GenericTest
+    // Map from test group name and normalized result key to GenericTest
     pub tests: HashMap<String, HashMap<String, GenericTest>>,
 }
 
@@ -103,6 +113,15 @@ fn is_data_test_aggregation_eligible(test: &DbtTest) -> bool {
         && has_safe_data_test_config(test)
 }
 
+/// Whether the test can share a batched query with tests of other relations:
+/// aggregatable tests, plus built-in `accepted_values` tests.
+fn is_data_test_batch_eligible(test: &DbtTest) -> bool {
+    let eligible = is_data_test_aggregation_eligible(test)
+        || (get_macro_name(test).as_deref() == Some("accepted_values")
+            && is_data_test_static_analysis_eligible(test));
+    eligible && get_column_name(test).is_some()
+}
+
 /// True if the test resolves to dbt's built-in `test_<name>` macro (direct overrides only; dispatch targets not covered).
 fn depends_on_builtin_test_macro(test: &DbtTest, name: &str) -> bool {
     // Built-in test macros are keyed `macro.dbt.test_<name>`.
@@ -132,6 +151,41 @@ fn get_test_group_key(test: &DbtTest) -> Option<(String, String)> {
     Some((resource_name, macro_name))
 }
 
+/// Tests sharing a key are batched together, up to `TestBatching::max_batch_size`
+/// at a time.
+#[derive(Debug, Clone, PartialEq, Eq, PartialOrd, Ord)]
+enum BatchKey {
+    /// Tests of one macro on columns of one relation.
+    Relation {
+        attached_node: String,
+        macro_name: String,
+    },
+    /// Tests on any relations of one schema.
+    Schema { database: String, schema: String },
+}
+
+fn get_test_batch_key(test: &DbtTest, nodes: &Nodes, scope: TestBatchScope) -> Option<BatchKey> {
+    if scope == TestBatchScope::Schema && is_data_test_batch_eligible(test) {
+        let attached_node = test
+            .__test_attr__
+            .attached_node
+            .as_deref()
+            .and_then(|unique_id| nodes.get_node(unique_id));
+        if let Some(node) = attached_node {
+            return Some(BatchKey::Schema {
+                database: node.database(),
+                schema: node.schema(),
+            });
+        }
+    }
+
+    let (attached_node, macro_name) = get_test_group_key(test)?;
+    Some(BatchKey::Relation {
+        attached_node,
+        macro_name,
+    })
+}
+
 /// Generates test group name using the same conventions as persist_generic_data_tests.
 fn get_group_name(
     macro_name: &str,
@@ -204,12 +258,12 @@ fn create_generic_test_relationships(
                 .group_names
                 .insert(test.unique_id.clone(), group_name.clone());
 
-            let column_name = normalize_column_name(&test.column_name);
+            let result_key = normalize_column_name(&test.result_key);
             relationships
                 .tests
                 .entry(group_name.clone())
                 .or_default()
-                .insert(column_name, test.clone());
+                .insert(result_key, test.clone());
         }
     }
 
@@ -218,29 +272,38 @@ fn create_generic_test_relationships(
 
 /// Create test aggregation from resolved nodes and the current schedule.
 ///
-/// Only selected, enabled generic column tests are considered.
+/// Only selected, enabled generic column tests are considered. With
+/// [`TestBatchScope::Relation`], `not_null` and `unique` tests are grouped per
+/// relation and macro; with [`TestBatchScope::Schema`], `not_null`, `unique` and
+/// `accepted_values` tests on any relations of a schema share batches. Either
+/// way a group holds at most `batching.max_batch_size` tests.
+///
+/// A group runs as one test node that depends on the upstream nodes of all its
+/// members, so in `build` a failed or skipped upstream skips every member of
+/// the group. For a schema batch that includes tests on relations that built
+/// fine; the batch is not split at run time.
 pub fn create_generic_test_aggregation(
     io: &dbt_common::io_args::IoArgs,
     schedule: &dbt_dag::schedule::Schedule<String>,
     nodes: &Nodes,
     execute: Execute,
+    batching: TestBatching,
 ) -> FsResult<Option<GenericTestAggregation>> {
     if execute != Execute::Remote {
         return Ok(None);
     }
 
-    // Collect eligible tests keyed by (attached_node, macro_name)
-    let mut grouped_tests: HashMap<(String, String), Vec<Arc<DbtTest>>> = HashMap::new();
+    let mut batched_tests: BTreeMap<BatchKey, Vec<Arc<DbtTest>>> = BTreeMap::new();
 
     for unique_id in &schedule.selected_nodes {
         let Some(test) = nodes.tests.get(unique_id) else {
             continue;
         };
-        let Some((resource_name, macro_name)) = get_test_group_key(test) else {
+        let Some(batch_key) = get_test_batch_key(test, nodes, batching.scope) else {
             continue;
         };
-        grouped_tests
-            .entry((resource_name, macro_name))
+        batched_tests
+            .entry(batch_key)
             .or_default()
             .push(test.clone());
     }
@@ -248,60 +311,32 @@ pub fn create_generic_test_aggregation(
     let mut groups: BTreeMap<String, Arc<GenericTestGroup>> = BTreeMap::new();
     let mut group_ids = HashMap::new();
 
-    for ((resource_name, macro_name), member_tests) in grouped_tests {
-        // Too few to aggregate
-        if member_tests.len() < 2 {
-            continue;
-        }
-
-        let mut tests = Vec::with_capacity(member_tests.len());
-        let mut column_names = Vec::new();
-
-        for test in &member_tests {
-            let column_name = get_column_name(test.as_ref()).expect("checked");
-            column_names.push(column_name.clone());
+    for (batch_key, member_tests) in batched_tests {
+        for members in
+            batch_members(&batch_key, member_tests, nodes).chunks(batching.max_batch_size.max(2))
+        {
+            // Too few to aggregate
+            if members.len() < 2 {
+                continue;
+            }
 
-            let test = GenericTest {
-                unique_id: test.common().unique_id.clone(),
-                schema: test.base().schema.clone(),
-                alias: test.base().alias.clone(),
-                column_name: column_name.clone(),
-                severity: test.deprecated_config.severity.clone(),
-                defined_at: test.defined_at.clone(),
+            let group = match relation_of(members) {
+                Some((attached_node, macro_name)) => {
+                    create_relation_group(io, attached_node, macro_name, members)?
+                }
+                None => {
+                    let BatchKey::Schema { database, schema } = &batch_key else {
+                        unreachable!("relation batches share a relation and macro");
+                    };
+                    create_schema_batch(io, database, schema, members)?
+                }
             };
-            tests.push(test);
-        }
 
-        let group_name = get_group_name(
-            &format!("aggregated_{macro_name}"),
-            &resource_name.replace('.', "_"),
-            &column_names,
-        );
-        let group_id = format!(
-            "test.{}.{}",
-            member_tests[0].common().package_name,
-            group_name
-        );
-
-        // Synthesize (aggregated) group test node
-        let aggregated_test =
-            create_aggregated_test(&group_name, &group_id, &member_tests[0], &column_names, io)?;
-
-        let group = GenericTestGroup {
-            unique_id: group_id.clone(),
-            name: group_name.clone(),
-            macro_name,
-            attached_node: resource_name,
-            aggregated_test: Arc::new(aggregated_test),
-            tests: tests.clone(),
-            member_tests: member_tests.clone(),
-        };
-
-        for test in &tests {
-            group_ids.insert(test.unique_id.clone(), group_id.clone());
+            for test in &group.tests {
+                group_ids.insert(test.unique_id.clone(), group.unique_id.clone());
+            }
+            groups.insert(group.unique_id.clone(), Arc::new(group));
         }
-
-        groups.insert(group_id, Arc::new(group));
     }
 
     if groups.is_empty() {
@@ -317,6 +352,158 @@ pub fn create_generic_test_aggregation(
     }))
 }
 
+/// A test in a batch, with what its query is built from.
+struct BatchMember {
+    test: Arc<DbtTest>,
+    attached_node: String,
+    macro_name: String,
+    column_name: String,
+    result_key: String,
+}
+
+/// Orders a batch's tests by relation, macro and column, so batches are chunked
+/// deterministically and a relation's tests stay together, and drops tests whose
+/// failures would be reported under the same key as an earlier test's; those
+/// run on their own.
+fn batch_members(
+    batch_key: &BatchKey,
+    member_tests: Vec<Arc<DbtTest>>,
+    nodes: &Nodes,
+) -> Vec<BatchMember> {
+    let mut members: Vec<BatchMember> = member_tests
+        .into_iter()
+        .map(|test| {
+            let attached_node = test.__test_attr__.attached_node.clone().unwrap_or_default();
+            let macro_name = get_macro_name(&test).expect("checked");
+            let column_name = get_column_name(&test).expect("checked");
+            let result_key = match batch_key {
+                BatchKey::Relation { .. } => column_name.clone(),
+                BatchKey::Schema { .. } => {
+                    let relation = nodes
+                        .get_node(&attached_node)
+                        .map(|node| node.name())
+                        .unwrap_or_default();
+                    format!(
+                        "{macro_name}:{relation}.{}",
+                        normalize_column_name(&column_name)
+                    )
+                }
+            };
+            BatchMember {
+                test,
+                attached_node,
+                macro_name,
+                column_name,
+                result_key,
+            }
+        })
+        .collect();
+
+    members.sort_by(|a, b| {
+        (&a.attached_node, &a.macro_name, &a.column_name)
+            .cmp(&(&b.attached_node, &b.macro_name, &b.column_name))
+            .then_with(|| a.test.common().unique_id.cmp(&b.test.common().unique_id))
+    });
+    let mut result_keys = HashSet::new();
+    members.retain(|member| result_keys.insert(normalize_column_name(&member.result_key)));
+    members
+}
+
+/// The relation and macro shared by all `members`, if they can use the
+/// relation's aggregated macro.
+fn relation_of(members: &[BatchMember]) -> Option<(&str, &str)> {
+    let first = members.first()?;
+    let shared = members
+        .iter()
+        .all(|m| m.attached_node == first.attached_node && m.macro_name == first.macro_name);
+    (shared && matches!(first.macro_name.as_str(), "not_null" | "unique"))
+        .then_some((first.attached_node.as_str(), first.macro_name.as_str()))
+}
+
+fn generic_test(member: &BatchMember, result_key: &str) -> GenericTest {
+    let test = &member.test;
+    GenericTest {
+        unique_id: test.common().unique_id.clone(),
+        schema: test.base().schema.clone(),
+        alias: test.base().alias.clone(),
+        column_name: member.column_name.clone(),
+        result_key: result_key.to_string(),
+        severity: test.deprecated_config.severity.clone(),
+        defined_at: test.defined_at.clone(),
+    }
+}
+
+/// Groups tests of one macro on columns of one relation, run through the
+/// macro's `aggregated_<macro>` test.
+fn create_relation_group(
+    io: &dbt_common::io_args::IoArgs,
+    resource_name: &str,
+    macro_name: &str,
+    members: &[BatchMember],
+) -> FsResult<GenericTestGroup> {
+    let column_names: Vec<String> = members.iter().map(|m| m.column_name.clone()).collect();
+    // The aggregated macros report failures under the column name
+    let tests = members
+        .iter()
+        .map(|member| generic_test(member, &member.column_name))
+        .collect();
+
+    let group_name = get_group_name(
+        &format!("aggregated_{macro_name}"),
+        &resource_name.replace('.', "_"),
+        &column_names,
+    );
+    let template = &members[0].test;
+    let group_id = format!("test.{}.{}", template.common().package_name, group_name);
+
+    // Synthesize (aggregated) group test node
+    let aggregated_test =
+        create_aggregated_test(&group_name, &group_id, template, &column_names, io)?;
+
+    Ok(GenericTestGroup {
+        unique_id: group_id,
+        name: group_name,
+        macro_name: macro_name.to_string(),
+        attached_node: resource_name.to_string(),
+        aggregated_test: Arc::new(aggregated_test),
+        member_tests: members.iter().map(|m| m.test.clone()).collect(),
+        tests,
+    })
+}
+
+/// Batches tests on relations of one schema into a single
+/// `batched_generic_tests` query.
+fn create_schema_batch(
+    io: &dbt_common::io_args::IoArgs,
+    database: &str,
+    schema: &str,
+    members: &[BatchMember],
+) -> FsResult<GenericTestGroup> {
+    let relation = format!("{database}.{schema}");
+    let test_names: Vec<String> = members
+        .iter()
+        .map(|m| m.test.common().name.clone())
+        .collect();
+    let group_name = get_group_name("batched_tests", &relation.replace('.', "_"), &test_names);
+    let template = &members[0].test;
+    let group_id = format!("test.{}.{}", template.common().package_name, group_name);
+
+    let batched_test = create_batched_test(&group_name, &group_id, members, io)?;
+
+    Ok(GenericTestGroup {
+        unique_id: group_id,
+        name: group_name,
+        macro_name: BATCHED_TEST_NAME.to_string(),
+        attached_node: relation,
+        aggregated_test: Arc::new(batched_test),
+        member_tests: members.iter().map(|m| m.test.clone()).collect(),
+        tests: members
+            .iter()
+            .map(|member| generic_test(member, &member.result_key))
+            .collect(),
+    })
+}
+
 fn create_aggregated_test(
     test_group_name: &str,
     test_group_id: &str,
@@ -432,13 +619,149 @@ fn build_aggregated_raw_code(
     ))
 }
 
+fn create_batched_test(
+    test_group_name: &str,
+    test_group_id: &str,
+    members: &[BatchMember],
+    io_args: &dbt_common::io_args::IoArgs,
+) -> FsResult<DbtTest> {
+    let path = PathBuf::from(DBT_GENERIC_TESTS_DIR_NAME).join(format!("{test_group_name}.sql"));
+    let absolute_path = io_args.out_dir.join(&path);
+
+    let raw_code = build_batched_raw_code(members, test_group_name)?;
+
+    // write SQL to target so render_sql_instruction can read it
+    if let Some(parent) = absolute_path.parent() {
+        stdfs::create_dir_all(parent)?;
+    }
+    stdfs::write(&absolute_path, &raw_code)?;
+
+    let mut test = members[0].test.as_ref().clone();
+
+    test.__common_attr__.name = test_group_name.to_string();
+    test.__common_attr__.unique_id = test_group_id.to_string();
+    test.__common_attr__.path = DbtPath::from(path);
+    test.__common_attr__.original_file_path = DbtPath::from(&absolute_path);
+    test.manifest_original_file_path = DbtPath::from(&absolute_path);
+    test.__common_attr__.raw_code = Some(raw_code.clone());
+    test.__common_attr__.checksum = DbtChecksum::hash(raw_code.trim().as_bytes());
+    test.__common_attr__.fqn = vec![
+        test.__common_attr__.package_name.clone(),
+        "test".to_string(),
+        test_group_name.to_string(),
+    ];
+
+    // update base attributes
+    test.__base_attr__.alias = test_group_name.to_string();
+    test.__base_attr__.relation_name = None;
+    test.__base_attr__.static_analysis_off_reason = None;
+    let mut depends_on_nodes: Vec<String> = members
+        .iter()
+        .flat_map(|m| m.test.__base_attr__.depends_on.nodes.iter().cloned())
+        .collect();
+    depends_on_nodes.sort();
+    depends_on_nodes.dedup();
+    test.__base_attr__.depends_on.nodes = depends_on_nodes;
+
+    // metadata
+    test.__test_attr__.column_name = None;
+    test.__test_attr__.attached_node = None;
+    test.__test_attr__.test_metadata = Some(TestMetadata {
+        name: BATCHED_TEST_NAME.to_string(),
+        kwargs: BTreeMap::from([(
+            "members".to_string(),
+            dbt_yaml::Value::Sequence(
+                members
+                    .iter()
+                    .map(|m| dbt_yaml::Value::string(m.test.common().unique_id.clone()))
+                    .collect(),
+                dbt_yaml::Span::default(),
+            ),
+        )]),
+        namespace: None,
+    });
+
+    Ok(test)
+}
+
+fn build_batched_raw_code(members: &[BatchMember], alias: &str) -> FsResult<String> {
+    let to_json = |value: &dbt_yaml::Value, argument: &str| {
+        serde_json::to_value(value).map_err(|e| {
+            fs_err!(
+                ErrorCode::Unexpected,
+                "Failed to serialize batched test {} argument: {}",
+                argument,
+                e
+            )
+        })
+    };
+
+    let mut members_json = Vec::with_capacity(members.len());
+    for member in members {
+        let kwargs = &member
+            .test
+            .__test_attr__
+            .test_metadata
+            .as_ref()
+            .ok_or_else(|| {
+                fs_err!(
+                    ErrorCode::Unexpected,
+                    "Generic test batching requires test metadata"
+                )
+            })?
+            .kwargs;
+        let model = kwargs.get("model").ok_or_else(|| {
+            fs_err!(
+                ErrorCode::Unexpected,
+                "Generic test batching requires test metadata with a model argument"
+            )
+        })?;
+        let model_json = to_json(model, "model")?;
+        if model_json.is_object() {
+            return Err(fs_err!(
+                ErrorCode::Unexpected,
+                "Batched test arguments do not support object values"
+            ));
+        }
+
+        let mut member_json = serde_json::Map::new();
+        member_json.insert("key".to_string(), member.result_key.clone().into());
+        member_json.insert("test".to_string(), member.macro_name.clone().into());
+        member_json.insert("model".to_string(), model_json);
+        member_json.insert("column_name".to_string(), member.column_name.clone().into());
+        if member.macro_name == "accepted_values" {
+            let values = match kwargs.get("values") {
+                Some(values) => to_json(values, "values")?,
+                None => serde_json::Value::Array(Vec::new()),
+            };
+            let quote = match kwargs.get("quote") {
+                Some(quote) => to_json(quote, "quote")?,
+                None => serde_json::Value::Bool(true),
+            };
+            member_json.insert("values".to_string(), values);
+            member_json.insert("quote".to_string(), quote);
+        }
+        members_json.push(serde_json::Value::Object(member_json));
+    }
+
+    let jinja_set_vars = BTreeMap::new();
+    let members_arg =
+        format_value_for_jinja(&serde_json::Value::Array(members_json), &jinja_set_vars);
+    let alias_arg = serde_json::to_string(alias).expect("string serialization should not fail");
+
+    Ok(format!(
+        "{{{{ test_{BATCHED_TEST_NAME}(members={members_arg}) }}}}{{{{ config(alias={alias_arg}) }}}}",
+    ))
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
     use std::collections::BTreeMap;
 
+    use dbt_common::io_args::DEFAULT_TEST_BATCH_SIZE;
     use dbt_schemas::schemas::common::StoreFailuresAs;
-    use dbt_schemas::schemas::nodes::{DbtTestAttr, Nodes};
+    use dbt_schemas::schemas::nodes::{DbtModel, DbtTestAttr, Nodes};
 
     fn test_node(unique_id: &str, macro_name: &str, column_name: &str) -> DbtTest {
         let mut test = DbtTest::default();
@@ -572,9 +895,15 @@ mod tests {
             ..Default::default()
         };
 
-        let aggregation = create_generic_test_aggregation(&io, &schedule, &nodes, Execute::Remote)
-            .expect("aggregation")
-            .expect("aggregated groups");
+        let aggregation = create_generic_test_aggregation(
+            &io,
+            &schedule,
+            &nodes,
+            Execute::Remote,
+            TestBatching::default(),
+        )
+        .expect("aggregation")
+        .expect("aggregated groups");
 
         // 4 models x 2 macros, each with 2 member columns.
         let group_ids: Vec<String> = aggregation.groups.keys().cloned().collect();
@@ -613,10 +942,15 @@ mod tests {
                 ..Default::default()
             };
 
-            let aggregation =
-                create_generic_test_aggregation(&io, &schedule, &nodes, Execute::Remote)
-                    .expect("aggregation")
-                    .expect("aggregated group");
+            let aggregation = create_generic_test_aggregation(
+                &io,
+                &schedule,
+                &nodes,
+                Execute::Remote,
+                TestBatching::default(),
+            )
+            .expect("aggregation")
+            .expect("aggregated group");
             assert_eq!(aggregation.groups.len(), 1);
 
             let group = aggregation.groups.values().next().expect("group");
@@ -790,8 +1124,224 @@ mod tests {
             ..Default::default()
         };
 
-        let aggregation = create_generic_test_aggregation(&io, &schedule, &nodes, Execute::Remote)
-            .expect("aggregation");
+        let aggregation = create_generic_test_aggregation(
+            &io,
+            &schedule,
+            &nodes,
+            Execute::Remote,
+            TestBatching::default(),
+        )
+        .expect("aggregation");
         assert!(aggregation.is_none());
     }
+
+    fn attached_test(macro_name: &str, model: &str, column_name: &str) -> DbtTest {
+        let mut test = test_node(
+            &format!("test.pkg.{macro_name}_{model}_{column_name}"),
+            macro_name,
+            column_name,
+        );
+        test.__common_attr__.name = format!("{macro_name}_{model}_{column_name}");
+        test.__base_attr__.depends_on.nodes = vec![format!("model.pkg.{model}")];
+        test.__test_attr__.attached_node = Some(format!("model.pkg.{model}"));
+        let metadata = test.__test_attr__.test_metadata.as_mut().expect("metadata");
+        metadata.kwargs.insert(
+            "model".to_string(),
+            dbt_yaml::Value::string(format!("{{{{ get_where_subquery(ref('{model}')) }}}}")),
+        );
+        if macro_name == "accepted_values" {
+            metadata.kwargs.insert(
+                "values".to_string(),
+                dbt_yaml::Value::Sequence(
+                    vec![dbt_yaml::Value::string("open".to_string())],
+                    dbt_yaml::Span::default(),
+                ),
+            );
+        }
+        resolved_default_config(&mut test);
+        test
+    }
+
+    fn insert_model(nodes: &mut Nodes, name: &str, schema: &str) {
+        let mut model = DbtModel::default();
+        model.__common_attr__.unique_id = format!("model.pkg.{name}");
+        model.__common_attr__.name = name.to_string();
+        model.__base_attr__.database = "db".to_string();
+        model.__base_attr__.schema = schema.to_string();
+        nodes
+            .models
+            .insert(model.__common_attr__.unique_id.clone(), Arc::new(model));
+    }
+
+    #[test]
+    fn schema_scope_batches_tests_across_relations() {
+        let tests = vec![
+            attached_test("not_null", "orders", "id"),
+            attached_test("unique", "orders", "id"),
+            attached_test("accepted_values", "orders", "status"),
+            attached_test("not_null", "customers", "id"),
+            attached_test("not_null", "payments", "id"),
+        ];
+        let (schedule, mut nodes) = schedule_and_nodes(tests);
+        insert_model(&mut nodes, "orders", "analytics");
+        insert_model(&mut nodes, "customers", "analytics");
+        insert_model(&mut nodes, "payments", "staging");
+        let temp_dir = tempfile::tempdir().expect("temp dir");
+        let io = dbt_common::io_args::IoArgs {
+            out_dir: temp_dir.path().to_path_buf(),
+            ..Default::default()
+        };
+        let batching = TestBatching {
+            scope: TestBatchScope::Schema,
+            max_batch_size: DEFAULT_TEST_BATCH_SIZE,
+        };
+
+        let aggregation =
+            create_generic_test_aggregation(&io, &schedule, &nodes, Execute::Remote, batching)
+                .expect("aggregation")
+                .expect("batched group");
+
+        // The lone test in `staging` runs on its own
+        assert_eq!(aggregation.groups.len(), 1);
+        let group = aggregation.groups.values().next().expect("group");
+        assert_eq!(group.macro_name, BATCHED_TEST_NAME);
+        assert_eq!(group.attached_node, "db.analytics");
+        assert!(
+            !aggregation
+                .group_ids
+                .contains_key("test.pkg.not_null_payments_id")
+        );
+        assert_eq!(
+            group.aggregated_test.__base_attr__.depends_on.nodes,
+            vec!["model.pkg.customers", "model.pkg.orders"]
+        );
+
+        // Failures reported under a member's key map back to that member
+        let keys = &aggregation.relationships.tests[&group.name];
+        assert_eq!(keys.len(), 4);
+        assert_eq!(
+            keys["accepted_values:orders.status"].unique_id,
+            "test.pkg.accepted_values_orders_status"
+        );
+        assert_eq!(
+            keys["not_null:customers.id"].unique_id,
+            "test.pkg.not_null_customers_id"
+        );
+        assert_eq!(
+            keys["unique:orders.id"].unique_id,
+            "test.pkg.unique_orders_id"
+        );
+
+        let raw_code = group
+            .aggregated_test
+            .__common_attr__
+            .raw_code
+            .as_deref()
+            .expect("raw code");
+        assert!(raw_code.starts_with(
+            "{{ test_batched_generic_tests(members=[{\"column_name\":\"id\",\"key\":\"not_null:customers.id\",\"model\":get_where_subquery(ref('customers')),\"test\":\"not_null\"},"
+        ));
+        assert!(
+            raw_code.contains("\"quote\":true,\"test\":\"accepted_values\",\"values\":[\"open\"]}")
+        );
+    }
+
+    #[test]
+    fn a_failed_upstream_blocks_its_whole_schema_batch() {
+        let tests = vec![
+            attached_test("not_null", "orders", "id"),
+            attached_test("not_null", "orders", "status"),
+            attached_test("not_null", "customers", "id"),
+            attached_test("not_null", "customers", "name"),
+        ];
+        let (schedule, mut nodes) = schedule_and_nodes(tests);
+        insert_model(&mut nodes, "orders", "analytics");
+        insert_model(&mut nodes, "customers", "analytics");
+        let temp_dir = tempfile::tempdir().expect("temp dir");
+        let io = dbt_common::io_args::IoArgs {
+            out_dir: temp_dir.path().to_path_buf(),
+            ..Default::default()
+        };
+        // Tests whose query waits on `customers`, which failed to build
+        let blocked = |scope: TestBatchScope| -> Vec<String> {
+            let batching = TestBatching {
+                scope,
+                max_batch_size: DEFAULT_TEST_BATCH_SIZE,
+            };
+            let aggregation =
+                create_generic_test_aggregation(&io, &schedule, &nodes, Execute::Remote, batching)
+                    .expect("aggregation")
+                    .expect("aggregated groups");
+            let mut blocked: Vec<String> = aggregation
+                .groups
+                .values()
+                .filter(|group| {
+                    group
+                        .aggregated_test
+                        .__base_attr__
+                        .depends_on
+                        .nodes
+                        .contains(&"model.pkg.customers".to_string())
+                })
+                .flat_map(|group| group.tests.iter().map(|test| test.unique_id.clone()))
+                .collect();
+            blocked.sort();
+            blocked
+        };
+
+        assert_eq!(
+            blocked(TestBatchScope::Relation),
+            vec![
+                "test.pkg.not_null_customers_id",
+                "test.pkg.not_null_customers_name"
+            ]
+        );
+        // A schema batch depends on every member's upstreams, so the tests on
+        // `orders` are skipped along with it
+        assert_eq!(
+            blocked(TestBatchScope::Schema),
+            vec![
+                "test.pkg.not_null_customers_id",
+                "test.pkg.not_null_customers_name",
+                "test.pkg.not_null_orders_id",
+                "test.pkg.not_null_orders_status",
+            ]
+        );
+    }
+
+    #[test]
+    fn max_batch_size_splits_groups() {
+        let tests = ["a", "b", "c", "d", "e"]
+            .into_iter()
+            .map(|column| attached_test("not_null", "orders", column))
+            .collect();
+        let (schedule, nodes) = schedule_and_nodes(tests);
+        let temp_dir = tempfile::tempdir().expect("temp dir");
+        let io = dbt_common::io_args::IoArgs {
+            out_dir: temp_dir.path().to_path_buf(),
+            ..Default::default()
+        };
+        let batching = TestBatching {
+            scope: TestBatchScope::Relation,
+            max_batch_size: 2,
+        };
+
+        let aggregation =
+            create_generic_test_aggregation(&io, &schedule, &nodes, Execute::Remote, batching)
+                .expect("aggregation")
+                .expect("aggregated groups");
+
+        // [a, b], [c, d] and a lone `e` that runs on its own
+        let members: Vec<Vec<String>> = aggregation
+            .groups
+            .values()
+            .map(|group| group.tests.iter().map(|t| t.column_name.clone()).collect())
+            .collect();
+        assert_eq!(members, vec![vec!["a", "b"], vec!["c", "d"]]);
+        assert!(
+            !aggregation
+                .group_ids
+                .contains_key("test.pkg.not_null_orders_e")
+        );
+    }
 }
@@ -0,0 +1,269 @@
+//! Scheduler timeline written by `--timeline`.
+//!
+//! For every task the visitor runs, records when it became ready, when it was
+//! started on a worker slot, when it was first admitted past the connection
+//! backpressure gate and when it finished. [`write_chrome_trace`] turns the
+//! records into a Chrome trace event file, which `chrome://tracing` and
+//! Perfetto (ui.perfetto.dev) open:
+//!
+//! * every worker slot (`Thread-N` in run results) is a thread of the trace, and
+//!   every task a slice on it from admission (or start, for tasks that never
+//!   borrow a connection) to finish, categorized by its phase (`render` for
+//!   compile, `run` for execute, ...);
+//! * the time between becoming ready and that point, spent in the ready queue
+//!   or at the backpressure gate, is a separate `queued` slice on the
+//!   "Ready queue" track.
+//!
+//! Recording is process-wide and off by default: the caller brackets task
+//! execution with [`start`] and [`finish`]. While disabled, the visitor's record
+//! calls cost one relaxed atomic load.
+
+use std::path::Path;
+use std::sync::atomic::{AtomicBool, Ordering};
+use std::sync::{Arc, Mutex, OnceLock};
+use std::time::{Duration, Instant};
+
+use dbt_common::stats::NodeStatus;
+use dbt_common::{ErrorCode, FsResult, fs_err};
+use serde::Serialize;
+use serde_json::json;
+
+use crate::task::Task;
+
+/// When each step of one task happened, relative to [`start`].
+#[derive(Debug, Clone, PartialEq, Serialize)]
+pub struct TaskTiming {
+    /// The task's work node, e.g. `model.my_project.orders`.
+    pub unique_id: String,
+    pub task_type: String,
+    /// `render`, `analyze`, `run`, ...; `None` for tasks outside any phase.
+    pub phase: Option<String>,
+    /// Worker slot the task ran on.
+    pub slot: i32,
+    pub status: String,
+    pub ready: Duration,
+    pub started: Duration,
+    /// First admission past the connection backpressure gate, if the task
+    /// needed a connection.
+    pub admitted: Option<Duration>,
+    pub finished: Duration,
+}
+
+/// Timestamps of one running task. The visitor creates it when the task starts
+/// and the task marks its admission through [`mark_admitted`].
+#[derive(Debug)]
+pub struct TaskClock {
+    ready: Instant,
+    started: Instant,
+    admitted: OnceLock<Instant>,
+}
+
+impl TaskClock {
+    /// A clock for a task starting now that became ready at `ready`.
+    pub fn new(ready: Instant) -> Self {
+        Self {
+            ready,
+            started: Instant::now(),
+            admitted: OnceLock::new(),
+        }
+    }
+}
+
+tokio::task_local! {
+    static CURRENT_TASK: Arc<TaskClock>;
+}
+
+static ENABLED: AtomicBool = AtomicBool::new(false);
+static TIMELINE: Mutex<Option<(Instant, Vec<TaskTiming>)>> = Mutex::new(None);
+
+/// Starts recording, discarding anything left over from an earlier timeline.
+pub fn start() {
+    *TIMELINE.lock().unwrap_or_else(|e| e.into_inner()) = Some((Instant::now(), Vec::new()));
+    ENABLED.store(true, Ordering::Relaxed);
+}
+
+/// Stops recording and returns every recorded task, in order of readiness.
+pub fn finish() -> Vec<TaskTiming> {
+    ENABLED.store(false, Ordering::Relaxed);
+    let timeline = TIMELINE.lock().unwrap_or_else(|e| e.into_inner()).take();
+    let mut timings = timeline.map(|(_, timings)| timings).unwrap_or_default();
+    timings.sort_by_key(|timing| (timing.ready, timing.started));
+    timings
+}
+
+/// Whether a timeline is being recorded.
+pub fn is_enabled() -> bool {
+    ENABLED.load(Ordering::Relaxed)
+}
+
+/// Runs `task` with `clock` as the clock [`mark_admitted`] records into.
+pub async fn with_clock<F: Future>(clock: Arc<TaskClock>, task: F) -> F::Output {
+    CURRENT_TASK.scope(clock, task).await
+}
+
+/// Records that the current task was admitted past the backpressure gate. Only
+/// the first admission of a task counts; outside a timed task this does nothing.
+pub fn mark_admitted() {
+    let _ = CURRENT_TASK.try_with(|clock| clock.admitted.set(Instant::now()));
+}
+
+/// Records a finished task that ran on worker `slot`.
+pub fn record(task: &dyn Task, slot: i32, result: &FsResult<NodeStatus>, clock: &TaskClock) {
+    if !is_enabled() {
+        return;
+    }
+    let finished = Instant::now();
+    let mut timeline = TIMELINE.lock().unwrap_or_else(|e| e.into_inner());
+    let Some((origin, timings)) = timeline.as_mut() else {
+        return;
+    };
+    let since_origin = |instant: Instant| instant.saturating_duration_since(*origin);
+    timings.push(TaskTiming {
+        unique_id: task.work_node_id().to_string(),
+        task_type: task.task_type().to_string(),
+        phase: task.task_phase().map(|phase| phase.to_string()),
+        slot,
+        status: match result {
+            Ok(status) => status.default_message(),
+            Err(_) => NodeStatus::Errored.default_message(),
+        },
+        ready: since_origin(clock.ready),
+        started: since_origin(clock.started),
+        admitted: clock.admitted.get().copied().map(since_origin),
+        finished: since_origin(finished),
+    });
+}
+
+/// Track of the `queued` slices; worker slots start at 1.
+const READY_QUEUE_TID: i32 = 0;
+
+/// The Chrome trace event document of `timings`.
+pub fn chrome_trace(timings: &[TaskTiming]) -> serde_json::Value {
+    let micros = |duration: Duration| duration.as_micros() as u64;
+    let mut events = vec![
+        json!({"name": "process_name", "ph": "M", "pid": 1, "args": {"name": "dbt"}}),
+        json!({
+            "name": "thread_name", "ph": "M", "pid": 1, "tid": READY_QUEUE_TID,
+            "args": {"name": "Ready queue"},
+        }),
+    ];
+    let mut slots: Vec<i32> = timings.iter().map(|timing| timing.slot).collect();
+    slots.sort_unstable();
+    slots.dedup();
+    events.extend(slots.into_iter().map(|slot| {
+        json!({
+            "name": "thread_name", "ph": "M", "pid": 1, "tid": slot,
+            "args": {"name": format!("Thread-{slot}")},
+        })
+    }));
+
+    for (id, timing) in timings.iter().enumerate() {
+        let begin = timing.admitted.unwrap_or(timing.started);
+        let args = json!({
+            "task_type": timing.task_type,
+            "status": timing.status,
+            "ready_us": micros(timing.ready),
+            "started_us": micros(timing.started),
+            "admitted_us": timing.admitted.map(micros),
+            "finished_us": micros(timing.finished),
+        });
+        // Async events, so overlapping waits stack instead of being clipped
+        if begin > timing.ready {
+            for (ph, ts) in [("b", timing.ready), ("e", begin)] {
+                events.push(json!({
+                    "name": timing.unique_id, "cat": "queued", "ph": ph, "id": id,
+                    "ts": micros(ts), "pid": 1, "tid": READY_QUEUE_TID,
+                }));
+            }
+        }
+        events.push(json!({
+            "name": timing.unique_id,
+            "cat": timing.phase.as_deref().unwrap_or(&timing.task_type),
+            "ph": "X",
+            "ts": micros(begin),
+            "dur": micros(timing.finished.saturating_sub(begin)),
+            "pid": 1,
+            "tid": timing.slot,
+            "args": args,
+        }));
+    }
+    json!({"traceEvents": events, "displayTimeUnit": "ms"})
+}
+
+/// Writes the Chrome trace of `timings` to `path`, creating its directory.
+pub fn write_chrome_trace(path: &Path, timings: &[TaskTiming]) -> FsResult<()> {
+    if let Some(parent) = path.parent() {
+        std::fs::create_dir_all(parent).map_err(|e| {
+            fs_err!(
+                ErrorCode::IoError,
+                "Failed to create {}: {e}",
+                parent.display()
+            )
+        })?;
+    }
+    let trace = serde_json::to_vec(&chrome_trace(timings))
+        .map_err(|e| fs_err!(ErrorCode::Generic, "Failed to serialize timeline: {e}"))?;
+    std::fs::write(path, trace).map_err(|e| {
+        fs_err!(
+            ErrorCode::IoError,
+            "Failed to write {}: {e}",
+            path.display()
+        )
+    })
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn timing(unique_id: &str, phase: &str, slot: i32, times_ms: [u64; 4]) -> TaskTiming {
+        let [ready, started, admitted, finished] = times_ms.map(Duration::from_millis);
+        TaskTiming {
+            unique_id: unique_id.to_string(),
+            task_type: "model".to_string(),
+            phase: Some(phase.to_string()),
+            slot,
+            status: "Succeeded".to_string(),
+            ready,
+            started,
+            admitted: Some(admitted),
+            finished,
+        }
+    }
+
+    #[test]
+    fn queue_waits_and_task_slices_are_separate_events() {
+        let trace = chrome_trace(&[
+            timing("model.p.a", "render", 1, [0, 0, 0, 20]),
+            timing("model.p.a", "run", 2, [20, 20, 50, 80]),
+        ]);
+        let events = trace["traceEvents"].as_array().unwrap();
+
+        let slices: Vec<_> = events.iter().filter(|e| e["ph"] == "X").collect();
+        assert_eq!(slices.len(), 2);
+        assert_eq!(slices[1]["cat"], "run");
+        assert_eq!(slices[1]["tid"], 2);
+        assert_eq!(slices[1]["ts"], 50_000);
+        assert_eq!(slices[1]["dur"], 30_000);
+        assert_eq!(slices[1]["args"]["ready_us"], 20_000);
+
+        // Only the run task waited for admission
+        let queued: Vec<_> = events.iter().filter(|e| e["cat"] == "queued").collect();
+        assert_eq!(queued.len(), 2);
+        assert_eq!(
+            (&queued[0]["ph"], &queued[0]["ts"]),
+            (&json!("b"), &json!(20_000))
+        );
+        assert_eq!(
+            (&queued[1]["ph"], &queued[1]["ts"]),
+            (&json!("e"), &json!(50_000))
+        );
+
+        let thread_names: Vec<_> = events
+            .iter()
+            .filter(|e| e["name"] == "thread_name")
+            .map(|e| e["args"]["name"].as_str().unwrap())
+            .collect();
+        assert_eq!(thread_names, ["Ready queue", "Thread-1", "Thread-2"]);
+    }
+}
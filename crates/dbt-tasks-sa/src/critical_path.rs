@@ -0,0 +1,258 @@
+//! Critical-path priorities for the task visitor.
+//!
+//! Ready tasks used to start in no particular order, so a long model at the head
+//! of a long chain could queue behind dozens of short, independent views and
+//! stretch the whole run. Each task is now given the length of the longest path
+//! from it to the end of the schedule, weighing `run` tasks by how long their
+//! nodes took in previous invocations. The visitor starts, and the connection
+//! backpressure admits, the task with the longest remaining path first.
+//!
+//! Execution times come from the runtime results parquet (`metadata/run/results`)
+//! and the previous `run_results.json`. Without any history no priorities are
+//! assigned and tasks keep their existing order.
+
+use std::collections::HashMap;
+use std::sync::Arc;
+
+use dbt_metadata_parquet::runtime_results::latest_execution_times;
+use dbt_schemas::schemas::RunResultsArtifact;
+use dbt_tasks_core::RunTasksArgs;
+use dbt_tasks_core::task::{TP, Task};
+use petgraph::Direction;
+use petgraph::algo::toposort;
+use petgraph::graph::DiGraph;
+
+/// Execution time, in seconds, of every node in previous invocations.
+pub fn historical_execution_times(arg: &RunTasksArgs) -> HashMap<String, f64> {
+    let mut times = latest_execution_times(&arg.metadata_dir.join("run").join("results"));
+    // `run_results.json` is only replaced once this invocation finishes, so it
+    // still holds the most recent one.
+    if let Ok(run_results) = RunResultsArtifact::from_file(&arg.io.out_dir.join("run_results.json"))
+    {
+        for result in run_results.results {
+            if !matches!(result.status.as_str(), "skipped" | "reused") {
+                times.insert(result.unique_id, result.execution_time);
+            }
+        }
+    }
+    times
+}
+
+/// Scheduling priority of every task in `schedule`, indexed by node index: the
+/// length, in milliseconds, of the longest path from the task to the end of the
+/// schedule, the task itself included.
+///
+/// `run` tasks weigh their nodes' recorded execution time; nodes without one are
+/// assumed to take the median recorded time. Every other task weighs nothing.
+/// Returns `None` if there is no history or the schedule has a cycle.
+pub fn task_priorities(
+    schedule: &DiGraph<Arc<dyn Task>, ()>,
+    execution_times: &HashMap<String, f64>,
+) -> Option<Vec<u64>> {
+    let default_time = median(execution_times.values().copied())?;
+    let weights: Vec<f64> = schedule
+        .node_weights()
+        .map(|task| {
+            if !matches!(task.task_phase(), Some(TP::Run)) {
+                return 0.0;
+            }
+            // Nodes sharing a task share its query, so the slowest one bounds it.
+            task.dbt_nodes()
+                .iter()
+                .map(|node| {
+                    execution_times
+                        .get(&node.common().unique_id)
+                        .copied()
+                        .unwrap_or(default_time)
+                })
+                .fold(0.0, f64::max)
+        })
+        .collect();
+    Some(to_millis(longest_remaining_paths(schedule, &weights)?))
+}
+
+fn median(values: impl Iterator<Item = f64>) -> Option<f64> {
+    let mut values: Vec<f64> = values.collect();
+    values.sort_by(f64::total_cmp);
+    values.get(values.len() / 2).copied()
+}
+
+fn to_millis(seconds: Vec<f64>) -> Vec<u64> {
+    seconds
+        .into_iter()
+        .map(|s| (s * 1000.0).round() as u64)
+        .collect()
+}
+
+/// For every node, the heaviest path from it to a sink, the node included.
+fn longest_remaining_paths<N, E>(graph: &DiGraph<N, E>, weights: &[f64]) -> Option<Vec<f64>> {
+    let order = toposort(graph, None).ok()?;
+    let mut paths = weights.to_vec();
+    for node in order.into_iter().rev() {
+        let longest_downstream = graph
+            .neighbors_directed(node, Direction::Outgoing)
+            .map(|next| paths[next.index()])
+            .fold(0.0, f64::max);
+        paths[node.index()] += longest_downstream;
+    }
+    Some(paths)
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use petgraph::graph::NodeIndex;
+    use std::cmp::Reverse;
+    use std::collections::BinaryHeap;
+
+    /// Makespan of `graph` on `workers` workers under list scheduling: whenever a
+    /// worker is free it starts the ready node with the highest priority, nodes
+    /// of equal priority in the order they became ready.
+    fn simulate_makespan(
+        graph: &DiGraph<(), ()>,
+        durations: &[u64],
+        workers: usize,
+        priorities: &[u64],
+    ) -> u64 {
+        let mut indegree: Vec<usize> = graph
+            .node_indices()
+            .map(|node| graph.neighbors_directed(node, Direction::Incoming).count())
+            .collect();
+        // (priority, readiness order, node): a max-heap pops the highest
+        // priority first, then the node that became ready earliest.
+        let mut ready: BinaryHeap<(u64, Reverse<usize>, NodeIndex)> = graph
+            .externals(Direction::Incoming)
+            .enumerate()
+            .map(|(seq, node)| (priorities[node.index()], Reverse(seq), node))
+            .collect();
+        let mut seq = ready.len();
+
+        let mut running = BinaryHeap::new();
+        let mut now = 0;
+        loop {
+            while running.len() < workers {
+                let Some((_, _, node)) = ready.pop() else {
+                    break;
+                };
+                running.push(Reverse((now + durations[node.index()], node)));
+            }
+            let Some(Reverse((finish, node))) = running.pop() else {
+                break;
+            };
+            now = finish;
+            for next in graph.neighbors_directed(node, Direction::Outgoing) {
+                indegree[next.index()] -= 1;
+                if indegree[next.index()] == 0 {
+                    ready.push((priorities[next.index()], Reverse(seq), next));
+                    seq += 1;
+                }
+            }
+        }
+        now
+    }
+
+    fn critical_path_priorities(graph: &DiGraph<(), ()>, durations: &[u64]) -> Vec<u64> {
+        let weights: Vec<f64> = durations.iter().map(|&d| d as f64).collect();
+        to_millis(longest_remaining_paths(graph, &weights).unwrap())
+    }
+
+    /// Deterministic pseudo-random numbers (Knuth's MMIX LCG).
+    struct Lcg(u64);
+
+    impl Lcg {
+        fn below(&mut self, bound: u64) -> u64 {
+            self.0 = self
+                .0
+                .wrapping_mul(6364136223846793005)
+                .wrapping_add(1442695040888963407);
+            (self.0 >> 33) % bound
+        }
+    }
+
+    /// A project-shaped DAG: mostly short models, one in ten slow, each model
+    /// reading from up to three earlier ones.
+    fn random_project(seed: u64, size: usize) -> (DiGraph<(), ()>, Vec<u64>) {
+        let mut rng = Lcg(seed);
+        let mut graph = DiGraph::new();
+        let mut durations = Vec::with_capacity(size);
+        for i in 0..size {
+            let node = graph.add_node(());
+            durations.push(if rng.below(10) == 0 {
+                60 + rng.below(540)
+            } else {
+                1 + rng.below(5)
+            });
+            if i >= 10 {
+                for _ in 0..rng.below(4) {
+                    let parent = NodeIndex::new(rng.below(i as u64) as usize);
+                    graph.update_edge(parent, node, ());
+                }
+            }
+        }
+        (graph, durations)
+    }
+
+    #[test]
+    fn remaining_path_follows_the_heaviest_branch() {
+        // a → b → d, a → c → d
+        let mut graph = DiGraph::<(), ()>::new();
+        let [a, b, c, d] = [(); 4].map(|_| graph.add_node(()));
+        graph.extend_with_edges([(a, b), (a, c), (b, d), (c, d)]);
+
+        let paths = longest_remaining_paths(&graph, &[1.0, 10.0, 2.0, 3.0]).unwrap();
+        assert_eq!(paths, [14.0, 13.0, 5.0, 3.0]);
+
+        graph.add_edge(d, a, ());
+        assert!(longest_remaining_paths(&graph, &[0.0; 4]).is_none());
+    }
+
+    #[test]
+    fn long_chain_no_longer_waits_behind_short_views() {
+        // 600 independent 2s views, then a 30 minute model feeding three 1 minute ones.
+        let mut graph = DiGraph::<(), ()>::new();
+        let mut durations = vec![2; 600];
+        for _ in 0..600 {
+            graph.add_node(());
+        }
+        let chain: Vec<NodeIndex> = [1800, 60, 60, 60]
+            .into_iter()
+            .map(|duration| {
+                durations.push(duration);
+                graph.add_node(())
+            })
+            .collect();
+        for pair in chain.windows(2) {
+            graph.add_edge(pair[0], pair[1], ());
+        }
+
+        let fifo = simulate_makespan(&graph, &durations, 2, &vec![0; durations.len()]);
+        let priorities = critical_path_priorities(&graph, &durations);
+        let critical_path = simulate_makespan(&graph, &durations, 2, &priorities);
+        // FIFO starts the chain once the views have drained from the queue.
+        assert_eq!(fifo, 600 + 1980);
+        assert_eq!(critical_path, 1980);
+    }
+
+    #[test]
+    fn simulated_makespan_benchmark() {
+        let workers = 8;
+        let (mut fifo_total, mut critical_path_total) = (0, 0);
+        for seed in 0..20 {
+            let (graph, durations) = random_project(seed, 400);
+            let fifo = simulate_makespan(&graph, &durations, workers, &vec![0; durations.len()]);
+            let priorities = critical_path_priorities(&graph, &durations);
+            let critical_path = simulate_makespan(&graph, &durations, workers, &priorities);
+
+            let lower_bound = (priorities.iter().max().unwrap() / 1000)
+                .max(durations.iter().sum::<u64>().div_ceil(workers as u64));
+            assert!(critical_path >= lower_bound);
+            fifo_total += fifo;
+            critical_path_total += critical_path;
+        }
+        assert!(critical_path_total < fifo_total);
+        println!(
+            "makespan over 20 projects: FIFO {fifo_total}s, critical path {critical_path_total}s ({:.1}% shorter)",
+            100.0 * (fifo_total - critical_path_total) as f64 / fifo_total as f64
+        );
+    }
+}
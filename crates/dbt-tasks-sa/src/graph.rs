@@ -110,7 +110,13 @@ impl GraphBuilder {
             .contains(&OptimizeTestsOptions::TestAggregation)
             && command_uses_generic_test_aggregation(self.arg.command)
         {
-            create_generic_test_aggregation(&self.arg.io, schedule, nodes, self.execute)?
+            create_generic_test_aggregation(
+                &self.arg.io,
+                schedule,
+                nodes,
+                self.execute,
+                self.arg.test_batching,
+            )?
         } else {
             None
         };
@@ -508,15 +514,16 @@ fn create_aggregated_schedule_and_nodes(
     let mut aggregated_schedule = schedule.clone();
 
     for (test_group_id, test_group) in test_aggregation.groups.iter() {
-        let test_unique_ids: Vec<String> = test_group
-            .tests
+        let test_unique_ids: HashSet<&String> =
+            test_group.tests.iter().map(|m| &m.unique_id).collect();
+        // A batch can span relations, so it depends on every member's nodes: a
+        // failed upstream of one member skips the whole batch
+        let test_deps: BTreeSet<String> = test_unique_ids
             .iter()
-            .map(|m| m.unique_id.clone())
+            .filter_map(|id| aggregated_schedule.deps.get(*id))
+            .flatten()
+            .cloned()
             .collect();
-        let test_deps = test_unique_ids
-            .iter()
-            .find_map(|id| aggregated_schedule.deps.get(id).cloned())
-            .unwrap_or_default();
 
         // Remove aggregated individual tests
         aggregated_schedule
@@ -540,7 +547,7 @@ fn create_aggregated_schedule_and_nodes(
 
         // Replace dependencies
         for unique_id in &test_unique_ids {
-            aggregated_schedule.deps.remove(unique_id);
+            aggregated_schedule.deps.remove(*unique_id);
         }
         for deps in aggregated_schedule.deps.values_mut() {
             deps.retain(|dep| !test_unique_ids.contains(dep));
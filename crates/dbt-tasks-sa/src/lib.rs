@@ -12,6 +12,7 @@ pub mod cloneable;
 pub mod compilation_pipeline;
 pub mod compiled_sql_cache;
 pub mod constraints;
+pub mod critical_path;
 pub mod debug;
 pub mod extract_sources;
 pub mod graph;
@@ -303,9 +303,9 @@ impl AggregatedTestRunRemoteTask {
         let mut worst_status = TestExecutionStatus::Passed;
 
         for test in &self.group.tests {
-            let column_name =
-                dbt_tasks_core::test_aggregation::normalize_column_name(&test.column_name);
-            let column_result = column_results.get(&column_name).copied();
+            let result_key =
+                dbt_tasks_core::test_aggregation::normalize_column_name(&test.result_key);
+            let column_result = column_results.get(&result_key).copied();
 
             let status = match column_result {
                 Some(result) => {
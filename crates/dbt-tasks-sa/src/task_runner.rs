@@ -421,6 +421,7 @@ impl TaskRunner {
                                 status: NodeStatus::SkippedUpstreamFailed,
                                 thread_id: "main".to_string(),
                                 message: None,
+                                pool_wait: None,
                             });
                             continue;
                         }
@@ -473,6 +474,7 @@ impl TaskRunner {
                             status,
                             thread_id: "main".to_string(),
                             message: error_message,
+                            pool_wait: None,
                         });
 
                         if let Err(e) = result {
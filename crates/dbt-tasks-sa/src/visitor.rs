@@ -1,6 +1,8 @@
 use std::{
-    collections::{HashMap, HashSet},
+    cmp::Reverse,
+    collections::{BinaryHeap, HashMap, HashSet},
     sync::Arc,
+    time::Instant,
 };
 
 use petgraph::algo::{Cycle, toposort};
@@ -13,20 +15,24 @@ use tokio::{sync::mpsc, task::JoinHandle};
 use tracing::Instrument;
 
 use dbt_common::cancellation::{CancellationToken, CancelledError};
-use dbt_common::io_args::StaticAnalysisKind;
-use dbt_common::stats::{NodeStatus, Stat};
+use dbt_common::io_args::{DEFAULT_SCHEDULING_POOL, SchedulingPools, StaticAnalysisKind};
+use dbt_common::stats::{NodeStatus, PoolWait, Stat};
 use dbt_common::tracing::dbt_emit::{emit_error_log_from_fs_error, emit_trace_log_message};
 use dbt_common::{ErrorCode, FsError, fs_err, status_reporter::report_completed};
 use dbt_common::{FsResult, io_args::IoArgs, unexpected_err};
 use dbt_schemas::schemas::common::OnError;
 use dbt_schemas::schemas::{DbtModel, InternalDbtNodeAttributes, NodePathKind};
+use dbt_tasks_core::RunTasksArgs;
 use dbt_tasks_core::context::TaskRunnerCtx;
 use dbt_tasks_core::task::TP;
 use dbt_tasks_core::task::Task;
+use dbt_tasks_core::timeline::{self, TaskClock};
 use dbt_tasks_core::visitor::SkipReason;
 use dbt_telemetry::{ExecutionPhase, NodeOutcome, NodeType};
 use dbt_yaml::Span;
 
+use crate::critical_path;
+
 /// Pool of reusable logical worker slot IDs (1, 2, 3, …).
 ///
 /// Tasks are assigned a slot before execution and release it after.
@@ -60,6 +66,198 @@ impl WorkerSlotPool {
     }
 }
 
+/// Work items yet to be started, popped highest pool priority first, then
+/// highest priority.
+///
+/// Items of equal priority pop in LIFO order, the order the visitor used before
+/// priorities existed (and the one sequential visits rely on).
+struct ReadyQueue {
+    heap: BinaryHeap<(u64, u64, u64, NodeIndex)>,
+    next_seq: u64,
+    /// Priority per node index; everything has priority 0 when `None`.
+    priorities: Option<Vec<u64>>,
+    /// Priority of each node's scheduling pool, while pools are configured.
+    pool_priorities: Option<Vec<u64>>,
+    /// When each queued node became ready, while a timeline is recorded or
+    /// pools are configured. Nodes requeued by their pool keep their time.
+    ready_at: HashMap<NodeIndex, Instant>,
+}
+
+impl ReadyQueue {
+    fn new(priorities: Option<Vec<u64>>) -> Self {
+        Self {
+            heap: BinaryHeap::new(),
+            next_seq: 0,
+            priorities,
+            pool_priorities: None,
+            ready_at: HashMap::new(),
+        }
+    }
+
+    fn with_pool_priorities(mut self, pool_priorities: Option<Vec<u64>>) -> Self {
+        self.pool_priorities = pool_priorities;
+        self
+    }
+
+    fn priority(&self, node_index: NodeIndex) -> u64 {
+        self.priorities
+            .as_ref()
+            .map_or(0, |priorities| priorities[node_index.index()])
+    }
+
+    fn pool_priority(&self, node_index: NodeIndex) -> u64 {
+        self.pool_priorities
+            .as_ref()
+            .map_or(0, |priorities| priorities[node_index.index()])
+    }
+
+    fn push(&mut self, node_index: NodeIndex) {
+        self.heap.push((
+            self.pool_priority(node_index),
+            self.priority(node_index),
+            self.next_seq,
+            node_index,
+        ));
+        self.next_seq += 1;
+        if self.pool_priorities.is_some() || timeline::is_enabled() {
+            self.ready_at.entry(node_index).or_insert_with(Instant::now);
+        }
+    }
+
+    fn pop(&mut self) -> Option<NodeIndex> {
+        self.heap.pop().map(|(_, _, _, node_index)| node_index)
+    }
+
+    fn is_empty(&self) -> bool {
+        self.heap.is_empty()
+    }
+
+    /// When `node_index`, just popped, became ready; now if unknown.
+    fn take_ready_at(&mut self, node_index: NodeIndex) -> Instant {
+        self.ready_at
+            .remove(&node_index)
+            .unwrap_or_else(Instant::now)
+    }
+}
+
+/// Named execution pools, each bounding how many of its nodes run at once.
+///
+/// Run tasks of nodes whose `meta` names a configured `pool`, or of any other
+/// node if a `default` pool is configured, take a slot of their pool before
+/// starting. Tasks popped while their pool is full are held back; whenever a
+/// task of the pool completes, the held-back task with the highest priority is
+/// requeued.
+#[derive(Default)]
+struct PoolGate {
+    pools: Vec<PoolState>,
+    /// Pool per node index.
+    pool_of: Vec<Option<usize>>,
+}
+
+struct PoolState {
+    name: String,
+    threads: Option<usize>,
+    priority: u64,
+    running: usize,
+    /// Held-back nodes, by priority then arrival.
+    held: BinaryHeap<(u64, Reverse<u64>, NodeIndex)>,
+    next_seq: u64,
+}
+
+impl PoolGate {
+    fn new(schedule: &DiGraph<Arc<dyn Task>, ()>, pools: &SchedulingPools) -> Self {
+        if pools.is_empty() {
+            return Self::default();
+        }
+        let index: HashMap<&str, usize> = pools
+            .keys()
+            .enumerate()
+            .map(|(pool, name)| (name.as_str(), pool))
+            .collect();
+        let default_pool = index.get(DEFAULT_SCHEDULING_POOL).copied();
+        let pool_of = schedule
+            .node_weights()
+            .map(|task| {
+                if !matches!(task.task_phase(), Some(TP::Run)) {
+                    return None;
+                }
+                let nodes = task.dbt_nodes();
+                nodes
+                    .first()
+                    .and_then(|node| node.common().meta.get("pool"))
+                    .and_then(|pool| pool.as_str())
+                    .and_then(|name| index.get(name).copied())
+                    .or(default_pool)
+            })
+            .collect();
+        let pools = pools
+            .iter()
+            .map(|(name, pool)| PoolState {
+                name: name.clone(),
+                threads: pool.threads,
+                priority: pool.priority,
+                running: 0,
+                held: BinaryHeap::new(),
+                next_seq: 0,
+            })
+            .collect();
+        Self { pools, pool_of }
+    }
+
+    /// The priority of each node's pool, if any pools are configured.
+    fn priorities(&self) -> Option<Vec<u64>> {
+        (!self.pools.is_empty()).then(|| {
+            self.pool_of
+                .iter()
+                .map(|pool| pool.map_or(0, |pool| self.pools[pool].priority))
+                .collect()
+        })
+    }
+
+    fn pool_index(&self, node_index: NodeIndex) -> Option<usize> {
+        self.pool_of.get(node_index.index()).copied().flatten()
+    }
+
+    /// The name of the pool `node_index` runs in, if any.
+    fn pool(&self, node_index: NodeIndex) -> Option<&str> {
+        self.pool_index(node_index)
+            .map(|pool| self.pools[pool].name.as_str())
+    }
+
+    /// Takes a slot in the pool of `node_index`. If the pool is full, holds the
+    /// node back until [`Self::release`] requeues it and returns false.
+    fn try_admit(&mut self, node_index: NodeIndex, priority: u64) -> bool {
+        let Some(pool) = self.pool_index(node_index) else {
+            return true;
+        };
+        let pool = &mut self.pools[pool];
+        if pool.threads.is_some_and(|threads| pool.running >= threads) {
+            pool.held
+                .push((priority, Reverse(pool.next_seq), node_index));
+            pool.next_seq += 1;
+            return false;
+        }
+        pool.running += 1;
+        true
+    }
+
+    /// Frees the slot of the completed `node_index`, returning the held-back
+    /// node of its pool to requeue, if any.
+    fn release(&mut self, node_index: NodeIndex) -> Option<NodeIndex> {
+        let pool = &mut self.pools[self.pool_index(node_index)?];
+        pool.running -= 1;
+        pool.held.pop().map(|(_, _, node_index)| node_index)
+    }
+}
+
+impl Extend<NodeIndex> for ReadyQueue {
+    fn extend<I: IntoIterator<Item = NodeIndex>>(&mut self, iter: I) {
+        for node_index in iter {
+            self.push(node_index);
+        }
+    }
+}
+
 type SkippedNodes = Vec<Arc<dyn InternalDbtNodeAttributes>>;
 
 // Handle skipping of the task
@@ -342,6 +540,15 @@ fn record_skipped_stats(
     }
 }
 
+/// Attaches the pool queue wait of a completed task to the run stats of its nodes.
+fn record_pool_wait(ctx: &TaskRunnerCtx, node: &dyn Task, pool_wait: PoolWait) {
+    for dbt_node in node.dbt_nodes() {
+        if let Some(mut stat) = ctx.inner.run_stats.get_mut(&dbt_node.common().unique_id) {
+            stat.pool_wait = Some(pool_wait.clone());
+        }
+    }
+}
+
 fn task_graph_cycle_error(
     cycle: Cycle<NodeIndex>,
     schedule: &DiGraph<Arc<dyn Task>, ()>,
@@ -431,21 +638,34 @@ enum VisitStrategy {
 }
 
 impl VisitStrategy {
-    fn new_pending_nodes(self, schedule: &DiGraph<Arc<dyn Task>, ()>) -> FsResult<Vec<NodeIndex>> {
+    fn new_pending_nodes(
+        self,
+        schedule: &DiGraph<Arc<dyn Task>, ()>,
+        arg: &RunTasksArgs,
+        pool_gate: &PoolGate,
+    ) -> FsResult<ReadyQueue> {
         // Invariant check - task graph must be a DAG.
         // We use `toposort` to check for cycles as it uses iterative algorithm,
         // while pergraph::algo::is_cyclic_directed uses recursive which may cause stack overflow on large graphs.
         let sorted_nodes =
             toposort(schedule, None).map_err(|cycle| task_graph_cycle_error(cycle, schedule))?;
 
-        let mut pending = vec![];
         if matches!(self, VisitStrategy::Parallel) {
+            // Start the tasks with the longest remaining critical path first.
+            let priorities = critical_path::task_priorities(
+                schedule,
+                &critical_path::historical_execution_times(arg),
+            );
+            let mut pending =
+                ReadyQueue::new(priorities).with_pool_priorities(pool_gate.priorities());
             // Initialize worklist with nodes that have an indegree of 0
             pending.extend(schedule.externals(Direction::Incoming));
+            Ok(pending)
         } else {
+            let mut pending = ReadyQueue::new(None);
             pending.extend(sorted_nodes.iter().rev().copied());
+            Ok(pending)
         }
-        Ok(pending)
     }
 
     /// If not parallel, returns empty.
@@ -476,7 +696,7 @@ impl VisitStrategy {
     fn try_pop_pending_node(
         self,
         waiting: &HashMap<NodeIndex, tracing::Span>,
-        pending: &mut Vec<NodeIndex>,
+        pending: &mut ReadyQueue,
     ) -> Option<NodeIndex> {
         if !matches!(self, VisitStrategy::Parallel) && !waiting.is_empty() {
             return None;
@@ -492,7 +712,7 @@ impl VisitStrategy {
         node_index: NodeIndex,
         dependents: &[HashSet<NodeIndex>],
         indegree: &mut [i32],
-        pending: &mut Vec<NodeIndex>,
+        pending: &mut ReadyQueue,
     ) {
         if matches!(self, VisitStrategy::Parallel) {
             for &dependent in &dependents[node_index.index()] {
@@ -509,16 +729,23 @@ impl VisitStrategy {
         mut ctx: TaskRunnerCtx,
         task_span: &tracing::Span,
         node: Arc<dyn Task>,
+        clock: Option<Arc<TaskClock>>,
     ) -> JoinHandle<Result<NodeStatus, Box<FsError>>> {
         tokio::spawn(
             async move {
                 // Note: this send may fail if the main loop gets terminated
                 // by should_cancel_compilation, in which case we simply
                 // ignore the error
-                if matches!(self, VisitStrategy::Parallel) {
-                    node.run_task_with_backpressure(&mut ctx).await
-                } else {
-                    node.run_task(&mut ctx).await
+                let run = async {
+                    if matches!(self, VisitStrategy::Parallel) {
+                        node.run_task_with_backpressure(&mut ctx).await
+                    } else {
+                        node.run_task(&mut ctx).await
+                    }
+                };
+                match clock {
+                    Some(clock) => timeline::with_clock(clock, run).await,
+                    None => run.await,
                 }
             }
             // Instrument the task with the span and assign parent
@@ -542,12 +769,21 @@ async fn visit(
     dbt_adapter::connection::recycle_thread_local_connection();
 
     let mut slot_pool = WorkerSlotPool::new();
+    // Scheduling pools, which bound concurrency per resource class:
+    let mut pool_gate = match strategy {
+        VisitStrategy::Parallel => PoolGate::new(schedule, &ctx.inner.arg.scheduling_pools),
+        VisitStrategy::Sequential => PoolGate::default(),
+    };
     // Work items yet to be started:
-    let mut pending = strategy.new_pending_nodes(schedule)?;
+    let mut pending = strategy.new_pending_nodes(schedule, &ctx.inner.arg, &pool_gate)?;
     // Work items that are in progress:
     let mut waiting = HashMap::<NodeIndex, tracing::Span>::new();
     // Work items that need to be skipped
     let mut skip_set = SkipSet::new();
+    // Clocks of work items in progress, while a timeline is recorded
+    let mut clocks = HashMap::<NodeIndex, Arc<TaskClock>>::new();
+    // Pool queue waits of work items in progress
+    let mut pool_waits = HashMap::<NodeIndex, PoolWait>::new();
 
     // Used in span creation
     let span_manager = ctx.inner.span_manager();
@@ -579,12 +815,15 @@ async fn visit(
     // was either skipped (in the inner while-loop) or its completion was received from
     // the channel.
     //
-    // 1. Each node enters `pending` at most once: after initialization `indegree[v]`
+    // 1. Each node becomes ready at most once: after initialization `indegree[v]`
     //    is only decremented (lines that do `-= 1`), never incremented, so the
     //    `== 0` guard that triggers `pending.push` fires at most once per node.
+    //    A node its pool holds back leaves `pending` and is pushed again only when
+    //    a task of that pool completes, which can happen only once per spawn.
     //
     // 2. The inner while-loop terminates: it pops from `pending`, and by (1) at most
-    //    N items ever enter `pending`.
+    //    N items plus one per completion ever enter `pending`. A node is held back
+    //    only while its pool has a task running, so `waiting` is non-empty then.
     //
     // 3. Every spawned task sends exactly one completion message: the wrapper task
     //    catches panics via JoinError and always calls `sender.send(...)`.
@@ -615,6 +854,11 @@ async fn visit(
         while let Some(node_index) = strategy.try_pop_pending_node(&waiting, &mut pending) {
             if let Some(node) = schedule.node_weight(node_index) {
                 let skip_reason = skip_set.skip.get(&node_index);
+                if skip_reason.is_none()
+                    && !pool_gate.try_admit(node_index, pending.priority(node_index))
+                {
+                    continue;
+                }
                 let task_span = span_manager.get_task_span(node.telemetry_request(
                     &io.in_dir,
                     &io.out_dir,
@@ -639,6 +883,7 @@ async fn visit(
                 let mut ctx_clone = ctx.clone();
                 let thread_id = slot_pool.acquire();
                 ctx_clone.thread_id = thread_id;
+                ctx_clone.priority = pending.priority(node_index);
 
                 let work_node_id_for_send = node_clone.work_node_id().to_string();
 
@@ -648,7 +893,21 @@ async fn visit(
                 // dropping the sender. If the sender were dropped without a send, the main
                 // loop's `receiver.recv().await` would block forever because the original
                 // `sender` kept the channel open.
-                let task_handle = strategy.spawn_task(ctx_clone, &task_span, node_clone);
+                let ready_at = pending.take_ready_at(node_index);
+                if let Some(pool) = pool_gate.pool(node_index) {
+                    pool_waits.insert(
+                        node_index,
+                        PoolWait {
+                            pool: pool.to_string(),
+                            queue_wait: ready_at.elapsed(),
+                        },
+                    );
+                }
+                let clock = timeline::is_enabled().then(|| Arc::new(TaskClock::new(ready_at)));
+                if let Some(clock) = &clock {
+                    clocks.insert(node_index, clock.clone());
+                }
+                let task_handle = strategy.spawn_task(ctx_clone, &task_span, node_clone, clock);
 
                 // Spawn under current visitor span, not task span
                 dbt_common::tracing::spawn_traced(async move {
@@ -685,10 +944,19 @@ async fn visit(
             };
 
             slot_pool.release(thread_id);
+            if let Some(requeued) = pool_gate.release(node_idx) {
+                pending.push(requeued);
+            }
 
             let maybe_node = schedule.node_weight(node_idx);
             if let Some(node) = maybe_node {
                 report_node_evaluation(ctx, node.as_ref(), result.as_ref().ok());
+                if let Some(pool_wait) = pool_waits.remove(&node_idx) {
+                    record_pool_wait(ctx, node.as_ref(), pool_wait);
+                }
+                if let Some(clock) = clocks.remove(&node_idx) {
+                    timeline::record(node.as_ref(), thread_id, &result, &clock);
+                }
             }
 
             let task_span = waiting
@@ -924,6 +1192,111 @@ mod tests {
         (schedule, dependents, model_idx, test_idx)
     }
 
+    #[test]
+    fn ready_queue_pops_by_priority_then_lifo() {
+        let nodes: Vec<NodeIndex> = (0..4).map(NodeIndex::new).collect();
+
+        let mut unprioritized = ReadyQueue::new(None);
+        unprioritized.extend(nodes.iter().copied());
+        let order: Vec<_> = std::iter::from_fn(|| unprioritized.pop()).collect();
+        assert_eq!(order, [nodes[3], nodes[2], nodes[1], nodes[0]]);
+
+        let mut prioritized = ReadyQueue::new(Some(vec![5, 0, 9, 0]));
+        prioritized.extend(nodes.iter().copied());
+        let order: Vec<_> = std::iter::from_fn(|| prioritized.pop()).collect();
+        assert_eq!(order, [nodes[2], nodes[0], nodes[3], nodes[1]]);
+        assert!(prioritized.is_empty());
+    }
+
+    #[test]
+    fn ready_queue_pops_by_pool_priority_first() {
+        let nodes: Vec<NodeIndex> = (0..3).map(NodeIndex::new).collect();
+
+        let mut pending =
+            ReadyQueue::new(Some(vec![9, 1, 5])).with_pool_priorities(Some(vec![0, 10, 0]));
+        pending.extend(nodes.iter().copied());
+        let order: Vec<_> = std::iter::from_fn(|| pending.pop()).collect();
+        assert_eq!(order, [nodes[1], nodes[0], nodes[2]]);
+    }
+
+    fn pooled_model_task(name: &str, pool: Option<&str>) -> Arc<dyn Task> {
+        let mut model = DbtModel::default();
+        model.__common_attr__.unique_id = format!("model.test.{name}");
+        if let Some(pool) = pool {
+            model
+                .__common_attr__
+                .meta
+                .insert("pool".to_string(), dbt_yaml::Value::from(pool));
+        }
+        let work_node_id = model.__common_attr__.unique_id.clone();
+        let node: Arc<dyn InternalDbtNodeAttributes> = Arc::new(model);
+        Arc::new(TestTask {
+            resource_type: NodeType::Model,
+            task_type: "run",
+            work_node_id,
+            nodes: vec![node],
+        })
+    }
+
+    #[test]
+    fn pool_gate_holds_nodes_beyond_pool_threads() {
+        let mut schedule: DiGraph<Arc<dyn Task>, ()> = DiGraph::new();
+        let heavy: Vec<NodeIndex> = (0..3)
+            .map(|i| schedule.add_node(pooled_model_task(&format!("heavy_{i}"), Some("heavy"))))
+            .collect();
+        let other = schedule.add_node(pooled_model_task("other", None));
+        let unknown = schedule.add_node(pooled_model_task("unknown", Some("missing")));
+
+        let pools = SchedulingPools::from([(
+            "heavy".to_string(),
+            dbt_common::io_args::SchedulingPool {
+                threads: Some(1),
+                priority: 10,
+            },
+        )]);
+        let mut gate = PoolGate::new(&schedule, &pools);
+        assert_eq!(gate.priorities(), Some(vec![10, 10, 10, 0, 0]));
+        assert_eq!(gate.pool(heavy[0]), Some("heavy"));
+        // Without a `default` pool, other nodes run unpooled
+        assert_eq!(gate.pool(other), None);
+        assert_eq!(gate.pool(unknown), None);
+
+        assert!(gate.try_admit(heavy[0], 0));
+        assert!(!gate.try_admit(heavy[1], 1));
+        assert!(!gate.try_admit(heavy[2], 5));
+        assert!(gate.try_admit(other, 0));
+        assert!(gate.try_admit(unknown, 0));
+        assert_eq!(gate.release(other), None);
+
+        // The held-back node with the highest priority is requeued first
+        assert_eq!(gate.release(heavy[0]), Some(heavy[2]));
+        assert!(gate.try_admit(heavy[2], 5));
+        assert_eq!(gate.release(heavy[2]), Some(heavy[1]));
+        assert!(gate.try_admit(heavy[1], 1));
+        assert_eq!(gate.release(heavy[1]), None);
+    }
+
+    #[test]
+    fn pool_gate_default_pool_takes_unpooled_nodes() {
+        let mut schedule: DiGraph<Arc<dyn Task>, ()> = DiGraph::new();
+        let other = schedule.add_node(pooled_model_task("other", None));
+        let unknown = schedule.add_node(pooled_model_task("unknown", Some("missing")));
+
+        let pools = SchedulingPools::from([(
+            DEFAULT_SCHEDULING_POOL.to_string(),
+            dbt_common::io_args::SchedulingPool {
+                threads: Some(1),
+                priority: 0,
+            },
+        )]);
+        let mut gate = PoolGate::new(&schedule, &pools);
+        assert_eq!(gate.pool(other), Some(DEFAULT_SCHEDULING_POOL));
+        assert_eq!(gate.pool(unknown), Some(DEFAULT_SCHEDULING_POOL));
+        assert!(gate.try_admit(other, 0));
+        assert!(!gate.try_admit(unknown, 0));
+        assert_eq!(gate.release(other), Some(unknown));
+    }
+
     #[test]
     fn reused_model_does_not_preempt_downstream_tests_when_state_data_tests_run() {
         let (schedule, dependents, model_idx, test_idx) = model_with_downstream_test_schedule();